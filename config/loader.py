@@ -52,7 +52,8 @@ def reset_config_service():
 class ClientConfig:
     """Load and validate client configuration from database"""
 
-    def __init__(self, client_id: str, base_path: Optional[str] = None):
+    def __init__(self, client_id: str, base_path: Optional[str] = None,
+                 config: Optional[Dict[str, Any]] = None):
         """
         Initialize client configuration from database.
 
@@ -65,6 +66,8 @@ class ClientConfig:
         Args:
             client_id: Unique client identifier (e.g., 'africastay')
             base_path: Base directory path (defaults to project root)
+            config: Already loaded configuration (e.g. from a bulk load);
+                    skips the database lookup
         """
         self.client_id = client_id
 
@@ -76,6 +79,11 @@ class ClientConfig:
         self.schema_path = self.base_path / "config" / "schema.json"
         self._config_source = 'database'
 
+        if config is not None:
+            self.config = config
+            self._config_source = config.get('_meta', {}).get('source', 'database')
+            return
+
         # Load from database (single source of truth)
         try:
             service = get_config_service()
@@ -479,23 +487,31 @@ class ClientConfig:
         return f"ClientConfig(client_id='{self.client_id}', name='{self.name}')"
 
 
-# Singleton pattern for easy access
+# Tenant config snapshots, owned by src.services.tenant_config_registry
+# (shared with the get_client_config dependency)
 _config_cache = {}
 
 
 def clear_config_cache(client_id: str = None):
     """
-    Clear the config cache.
+    Clear the config cache after a tenant's config changed.
+
+    The change is published through the tenant config registry, so every
+    instance reloads the tenant.
 
     Args:
         client_id: If provided, only clear cache for this client.
                    If None, clear entire cache.
     """
-    global _config_cache
-    if client_id:
-        _config_cache.pop(client_id, None)
-    else:
-        _config_cache = {}
+    try:
+        from src.services.tenant_config_registry import publish_tenant_config_change
+        publish_tenant_config_change(client_id)
+    except Exception as e:
+        logger.warning(f"Tenant config change not published: {e}")
+        if client_id:
+            _config_cache.pop(client_id, None)
+        else:
+            _config_cache.clear()
 
     # Also reset TenantConfigService instance to force refresh
     reset_config_service()
@@ -511,23 +527,27 @@ def get_config(client_id: str) -> ClientConfig:
     Returns:
         ClientConfig instance
     """
-    if client_id not in _config_cache:
-        _config_cache[client_id] = ClientConfig(client_id)
-    return _config_cache[client_id]
+    config = _config_cache.get(client_id)
+    if config is not None:
+        return config
+    from src.services.tenant_config_registry import get_tenant_config_registry
+    return get_tenant_config_registry().get(client_id, factory=ClientConfig)
 
 
 def list_clients() -> List[str]:
     """
     List all available client IDs from database.
 
-    Database (Supabase tenants table) is the single source of truth.
+    Database (Supabase tenants table) is the single source of truth. The
+    list comes from the tenant config registry's bulk load, which also
+    caches every listed tenant's config.
 
     Returns:
         List of active tenant IDs
     """
     try:
-        service = get_config_service()
-        return service.list_tenants(active_only=True)
+        from src.services.tenant_config_registry import get_tenant_config_registry
+        return get_tenant_config_registry().list_tenants()
     except Exception as e:
         logger.error(f"Failed to list tenants from database: {e}")
         return []
@@ -0,0 +1,161 @@
+-- Migration 021: Server-side ranked full-text search for tenant knowledge
+-- Adds a tsvector column + GIN index on knowledge_documents, a chunk-level
+-- knowledge_chunks table, and the search_knowledge_chunks RPC so helpdesk
+-- queries are ranked inside Postgres and only the top-k chunks are returned.
+-- Uses IF NOT EXISTS / OR REPLACE so it's safe to re-run.
+
+-- Document-level search vector (title + extracted content)
+ALTER TABLE knowledge_documents ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        to_tsvector('english', COALESCE(title, '') || ' ' || COALESCE(content, ''))
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_knowledge_docs_search_vector
+ON knowledge_documents USING gin(search_vector);
+
+-- Superseded by the stored search_vector column above
+DROP INDEX IF EXISTS idx_knowledge_docs_content_search;
+
+-- Chunk-level rows (one per content chunk)
+CREATE TABLE IF NOT EXISTS knowledge_chunks (
+    id BIGSERIAL PRIMARY KEY,
+    tenant_id TEXT NOT NULL,
+    document_id TEXT NOT NULL REFERENCES knowledge_documents(document_id) ON DELETE CASCADE,
+    chunk_index INTEGER NOT NULL,
+    content TEXT NOT NULL,
+
+    -- Denormalized from knowledge_documents so filters don't need a join
+    category TEXT DEFAULT 'general',
+    visibility TEXT DEFAULT 'public' CHECK (visibility IN ('public', 'private')),
+
+    search_vector tsvector GENERATED ALWAYS AS (to_tsvector('english', content)) STORED,
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+
+    CONSTRAINT uq_knowledge_chunks_doc_chunk UNIQUE (document_id, chunk_index)
+);
+
+CREATE INDEX IF NOT EXISTS idx_knowledge_chunks_search_vector
+ON knowledge_chunks USING gin(search_vector);
+
+CREATE INDEX IF NOT EXISTS idx_knowledge_chunks_tenant_filters
+ON knowledge_chunks(tenant_id, visibility, category);
+
+-- RLS policies
+ALTER TABLE knowledge_chunks ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS knowledge_chunks_tenant_isolation ON knowledge_chunks;
+CREATE POLICY knowledge_chunks_tenant_isolation ON knowledge_chunks
+    FOR ALL
+    USING (tenant_id = current_setting('app.tenant_id', true));
+
+-- Backfill chunk rows from existing content_chunks JSONB
+INSERT INTO knowledge_chunks (tenant_id, document_id, chunk_index, content, category, visibility)
+SELECT
+    d.tenant_id,
+    d.document_id,
+    (chunk->>'index')::INTEGER,
+    chunk->>'content',
+    COALESCE(d.category, 'general'),
+    COALESCE(d.visibility, 'public')
+FROM knowledge_documents d,
+     jsonb_array_elements(COALESCE(d.content_chunks, '[]'::jsonb)) AS chunk
+WHERE d.status = 'indexed'
+  AND chunk->>'content' IS NOT NULL
+ON CONFLICT (document_id, chunk_index) DO NOTHING;
+
+-- Ranked chunk search
+-- Candidates are any chunk matching at least one query lexeme, ordered by
+-- ts_rank_cd. The returned score keeps the 0-1 scale of the Python scorer:
+-- fraction of query lexemes present + 0.3 when the query matches as a phrase.
+CREATE OR REPLACE FUNCTION search_knowledge_chunks(
+    p_tenant_id TEXT,
+    p_query TEXT,
+    p_top_k INTEGER DEFAULT 5,
+    p_category TEXT DEFAULT NULL,
+    p_visibility TEXT DEFAULT NULL,
+    p_min_score REAL DEFAULT 0.1
+)
+RETURNS TABLE (
+    document_id TEXT,
+    chunk_index INTEGER,
+    content TEXT,
+    filename TEXT,
+    category TEXT,
+    visibility TEXT,
+    score REAL,
+    rank REAL
+)
+LANGUAGE plpgsql
+STABLE
+AS $$
+#variable_conflict use_column
+DECLARE
+    v_lexemes TEXT[];
+    v_any tsquery;
+    v_phrase tsquery;
+BEGIN
+    v_lexemes := tsvector_to_array(to_tsvector('english', COALESCE(p_query, '')));
+
+    IF cardinality(v_lexemes) = 0 THEN
+        RETURN;
+    END IF;
+
+    v_any := array_to_string(
+        ARRAY(SELECT quote_literal(l) FROM unnest(v_lexemes) AS l), ' | '
+    )::tsquery;
+    v_phrase := phraseto_tsquery('english', p_query);
+
+    RETURN QUERY
+    WITH candidates AS (
+        SELECT
+            c.document_id,
+            c.chunk_index,
+            c.content,
+            c.category,
+            c.visibility,
+            c.search_vector,
+            ts_rank_cd(c.search_vector, v_any, 32) AS rank
+        FROM knowledge_chunks c
+        WHERE c.tenant_id = p_tenant_id
+          AND c.search_vector @@ v_any
+          AND (p_category IS NULL OR c.category = p_category)
+          AND (p_visibility IS NULL OR c.visibility = p_visibility)
+        ORDER BY rank DESC
+        LIMIT GREATEST(p_top_k, 1) * 4
+    ),
+    scored AS (
+        SELECT
+            cand.*,
+            LEAST(
+                cardinality(ARRAY(
+                    SELECT unnest(tsvector_to_array(cand.search_vector))
+                    INTERSECT
+                    SELECT unnest(v_lexemes)
+                ))::REAL / cardinality(v_lexemes)
+                + CASE WHEN cand.search_vector @@ v_phrase THEN 0.3 ELSE 0 END,
+                1.0
+            )::REAL AS score
+        FROM candidates cand
+    )
+    SELECT
+        s.document_id,
+        s.chunk_index,
+        s.content,
+        d.filename,
+        s.category,
+        s.visibility,
+        s.score,
+        s.rank::REAL
+    FROM scored s
+    JOIN knowledge_documents d
+      ON d.document_id = s.document_id
+     AND d.tenant_id = p_tenant_id
+     AND d.status = 'indexed'
+    WHERE s.score >= p_min_score
+    ORDER BY s.score DESC, s.rank DESC
+    LIMIT p_top_k;
+END;
+$$;
+
+COMMENT ON TABLE knowledge_chunks IS 'Chunk-level full-text index for tenant knowledge documents';
+COMMENT ON FUNCTION search_knowledge_chunks IS 'Ranked top-k chunk search used by SupabaseKnowledgeManager.search';
@@ -0,0 +1,55 @@
+-- Migration 022: Durable background jobs
+-- Side effects of quote generation (PDF/email delivery, CRM sync,
+-- notifications) are persisted here by src/services/job_queue.py so they
+-- are retried on failure and recovered after a restart.
+-- Uses IF NOT EXISTS so it's safe to re-run.
+
+CREATE TABLE IF NOT EXISTS background_jobs (
+    id BIGSERIAL PRIMARY KEY,
+    job_id TEXT NOT NULL UNIQUE,
+    tenant_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    reference_id TEXT,
+    payload JSONB DEFAULT '{}'::jsonb,
+    status TEXT NOT NULL DEFAULT 'queued'
+        CHECK (status IN ('queued', 'running', 'retrying', 'completed', 'failed')),
+    attempts INTEGER DEFAULT 0,
+    max_attempts INTEGER DEFAULT 5,
+    state JSONB DEFAULT '{}'::jsonb,
+    error TEXT,
+    run_after TIMESTAMPTZ,
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    updated_at TIMESTAMPTZ,
+    finished_at TIMESTAMPTZ
+);
+
+-- Status endpoint: jobs for one quote
+CREATE INDEX IF NOT EXISTS idx_background_jobs_reference
+ON background_jobs(tenant_id, reference_id);
+
+-- Startup recovery: unfinished jobs per tenant
+CREATE INDEX IF NOT EXISTS idx_background_jobs_pending
+ON background_jobs(tenant_id, created_at)
+WHERE status IN ('queued', 'running', 'retrying');
+
+ALTER TABLE background_jobs ENABLE ROW LEVEL SECURITY;
+
+-- RLS Policy: Service role has full access
+DROP POLICY IF EXISTS background_jobs_service_policy ON background_jobs;
+CREATE POLICY background_jobs_service_policy ON background_jobs
+    FOR ALL
+    TO service_role
+    USING (true)
+    WITH CHECK (true);
+
+-- RLS Policy: Tenants can only see their own jobs
+DROP POLICY IF EXISTS background_jobs_tenant_policy ON background_jobs;
+CREATE POLICY background_jobs_tenant_policy ON background_jobs
+    FOR ALL
+    TO authenticated
+    USING (tenant_id = current_setting('app.tenant_id', true))
+    WITH CHECK (tenant_id = current_setting('app.tenant_id', true));
+
+COMMENT ON TABLE background_jobs IS 'Retried background jobs (quote delivery, CRM sync, notifications)';
+COMMENT ON COLUMN background_jobs.reference_id IS 'Record the job belongs to, e.g. a quote_id';
+COMMENT ON COLUMN background_jobs.state IS 'Checkpoints written by the handler so retries skip finished steps, plus the result';
@@ -0,0 +1,12 @@
+-- Migration 023: Background job leases
+-- Every uvicorn worker runs src/services/job_queue.py against the same
+-- table. A worker claims a job with a conditional update that sets owner
+-- and lease_until; other workers only take a running job over once its
+-- lease has expired.
+-- Uses IF NOT EXISTS so it's safe to re-run.
+
+ALTER TABLE background_jobs ADD COLUMN IF NOT EXISTS owner TEXT;
+ALTER TABLE background_jobs ADD COLUMN IF NOT EXISTS lease_until TIMESTAMPTZ;
+
+COMMENT ON COLUMN background_jobs.owner IS 'Worker (host:pid:id) running the current attempt';
+COMMENT ON COLUMN background_jobs.lease_until IS 'Until when the owner holds the job; renewed by every checkpoint';
@@ -17,6 +17,7 @@ if hasattr(sys.stdout, 'reconfigure'):
     sys.stderr.reconfigure(line_buffering=True)
 
 import os
+import threading
 from dotenv import load_dotenv
 
 # Load environment variables from .env file BEFORE other imports
@@ -89,9 +90,119 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"Tracing setup skipped: {e}")
 
+    # Load the re-ranking model in the background so the first helpdesk query doesn't wait for it
+    try:
+        from src.services.reranker_service import warm_up_reranker
+        threading.Thread(target=warm_up_reranker, name="reranker-warmup", daemon=True).start()
+    except Exception as e:
+        logger.warning(f"Re-ranker warm-up skipped: {e}")
+
+    # Start the PDF renderer processes so the first quote/invoice PDF doesn't pay for backend imports
+    try:
+        from src.services.pdf_render_service import warm_up_pdf_render_service
+        threading.Thread(target=warm_up_pdf_render_service, name="pdf-render-warmup", daemon=True).start()
+    except Exception as e:
+        logger.warning(f"PDF render warm-up skipped: {e}")
+
+    # Apply user deactivations and tenant suspensions broadcast by other instances
+    try:
+        from src.services.auth_context_cache import start_invalidation_listener
+        if start_invalidation_listener():
+            logger.info("Auth invalidation listener started")
+    except Exception as e:
+        logger.warning(f"Auth invalidation listener skipped: {e}")
+
+    # Refresh tenant config snapshots in the background and apply changes made on other instances
+    try:
+        from src.services.tenant_config_registry import start_tenant_config_sync
+        if start_tenant_config_sync():
+            logger.info("Tenant config sync started")
+    except Exception as e:
+        logger.warning(f"Tenant config sync skipped: {e}")
+
+    # Stop serving rates replica snapshots when another instance writes to the pricing tables
+    try:
+        from src.services.rates_replica import start_rates_replica_sync
+        if start_rates_replica_sync():
+            logger.info("Rates replica invalidation listener started")
+    except Exception as e:
+        logger.warning(f"Rates replica invalidation listener skipped: {e}")
+
+    # Load every tenant's config in one query and open their Supabase clients before taking traffic
+    try:
+        from src.services.tenant_config_registry import start_tenant_config_warm_up
+        start_tenant_config_warm_up()
+    except Exception as e:
+        logger.warning(f"Tenant config warm-up skipped: {e}")
+
+    # Re-queue background jobs (quote delivery, CRM, notifications) left unfinished by the last run
+    try:
+        from src.services.job_queue import recover_all_tenants
+        threading.Thread(target=recover_all_tenants, name="job-recovery", daemon=True).start()
+    except Exception as e:
+        logger.warning(f"Background job recovery skipped: {e}")
+
     yield
     logger.info("Shutting down...")
 
+    # Each step is guarded so one failure does not leave the rest unclosed
+
+    # Stop knowledge ingestion workers (extraction processes + job threads)
+    try:
+        from src.services.knowledge_ingestion_service import shutdown_ingestion_service
+        shutdown_ingestion_service()
+    except Exception as e:
+        logger.warning(f"Knowledge ingestion shutdown failed: {e}")
+
+    # Stop the retrieval worker pool
+    try:
+        from src.services.retrieval_orchestrator import shutdown_retrieval_orchestrator
+        shutdown_retrieval_orchestrator()
+    except Exception as e:
+        logger.warning(f"Retrieval worker pool shutdown failed: {e}")
+
+    # Stop background job workers (unfinished jobs are recovered on next start)
+    try:
+        from src.services.job_queue import shutdown_job_queue
+        shutdown_job_queue()
+    except Exception as e:
+        logger.warning(f"Background job queue shutdown failed: {e}")
+
+    # Stop the PDF renderer processes
+    try:
+        from src.services.pdf_render_service import shutdown_pdf_render_service
+        shutdown_pdf_render_service()
+    except Exception as e:
+        logger.warning(f"PDF renderer shutdown failed: {e}")
+
+    # Close the rate limiter's Redis connections
+    try:
+        from src.middleware.rate_limiter import close_async_rate_limiter
+        await close_async_rate_limiter()
+    except Exception as e:
+        logger.warning(f"Rate limiter close failed: {e}")
+
+    # Close the async Supabase clients' connection pools
+    try:
+        from src.tools.async_supabase_tool import close_async_supabase_clients
+        await close_async_supabase_clients()
+    except Exception as e:
+        logger.warning(f"Async Supabase client close failed: {e}")
+
+    # Close pooled connections to the Rates Engine
+    try:
+        from src.services.travel_platform_rates_client import close_travel_platform_rates_client
+        await close_travel_platform_rates_client()
+    except Exception as e:
+        logger.warning(f"Rates Engine client close failed: {e}")
+
+    # Stop the sync-to-async bridge loop (closing its Rates Engine connections on it first)
+    try:
+        from src.services.travel_platform_rates_client import close_travel_platform_rates_client
+        from src.utils.async_bridge import shutdown_async_bridge
+        shutdown_async_bridge(close_travel_platform_rates_client)
+    except Exception as e:
+        logger.warning(f"Async bridge shutdown failed: {e}")
 
 # Create FastAPI app
 # Disable API docs endpoints in production to prevent information disclosure
@@ -247,11 +358,21 @@ async def readiness_check(config: ClientConfig = Depends(get_client_config)):
     Use for Kubernetes readiness probes.
     """
     checks = {
+        "tenant_configs": "unknown",
         "database": "unknown",
         "bigquery": "unknown",
     }
     all_healthy = True
 
+    # Not ready until the startup tenant warm-up finishes (a failed warm-up falls back to lazy loading)
+    try:
+        from src.services.tenant_config_registry import get_tenant_config_registry
+        checks["tenant_configs"] = get_tenant_config_registry().warm_state
+        if checks["tenant_configs"] == "warming":
+            all_healthy = False
+    except Exception as e:
+        checks["tenant_configs"] = f"unhealthy: {str(e)[:50]}"
+
     # Check Supabase connection
     try:
         from src.tools.supabase_tool import SupabaseTool
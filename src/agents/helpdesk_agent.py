@@ -14,7 +14,7 @@ Maintains persona as "Zara" - friendly Zorah Travel assistant.
 import os
 import json
 import logging
-from typing import Dict, Any, Optional, List
+from typing import AsyncIterator, Dict, Any, Optional, List, Tuple
 from datetime import datetime
 
 from config.loader import ClientConfig
@@ -167,6 +167,22 @@ RESPONSE STYLE:
 - Never say "as an AI" - you're Zara from Zorah Travel"""
 
 
+# Guidance for the answer written from tool results
+SYNTHESIS_PROMPT = """You just searched the knowledge base and got results. Now provide a natural, helpful response.
+
+IMPORTANT GUIDELINES:
+- When you found relevant documents/information, ALWAYS use that information to answer the user's question
+- Include specific details from the search results (property names, amenities, features, etc.)
+- DO NOT say "I don't have enough information" if you found relevant documents
+- If the documents don't perfectly match the query, still share what you found and note any limitations
+- Be helpful and conversational - you're a travel assistant recommending properties
+- For travel/hotel questions, describe the properties enthusiastically with key highlights
+
+Example good response: "Great taste! Based on our knowledge base, I'd recommend [Property Name] - it offers [specific amenities]. Another excellent option is [Property 2] which features [details]..."
+
+Example BAD response: "I don't have enough information to answer this question." (NEVER say this when you found sources)"""
+
+
 class HelpdeskAgent:
     """
     AI-powered helpdesk agent using OpenAI function calling.
@@ -185,6 +201,7 @@ class HelpdeskAgent:
         self.config = config
         self.openai_api_key = os.getenv('OPENAI_API_KEY')
         self._client = None
+        self._async_client = None
 
         # Track conversation for context
         self.conversation_history: List[Dict[str, str]] = []
@@ -208,6 +225,28 @@ class HelpdeskAgent:
                 self._client = None
         return self._client
 
+    @property
+    def async_client(self):
+        """Lazy-load async OpenAI client (used for streaming)"""
+        if self._async_client is None and self.openai_api_key:
+            try:
+                import openai
+                self._async_client = openai.AsyncOpenAI(api_key=self.openai_api_key)
+            except Exception as e:
+                logger.error(f"Failed to create async OpenAI client: {e}")
+                self._async_client = None
+        return self._async_client
+
+    def _remember_user_message(self, user_message: str):
+        """Add user message to history, trimmed to max_history exchanges"""
+        self.conversation_history.append({
+            "role": "user",
+            "content": user_message
+        })
+
+        if len(self.conversation_history) > self.max_history * 2:
+            self.conversation_history = self.conversation_history[-self.max_history * 2:]
+
     def chat(self, user_message: str) -> Dict[str, Any]:
         """
         Process a user message and return an AI response.
@@ -227,15 +266,7 @@ class HelpdeskAgent:
         if not self.client:
             return self._fallback_response(user_message)
 
-        # Add user message to history
-        self.conversation_history.append({
-            "role": "user",
-            "content": user_message
-        })
-
-        # Trim history if too long
-        if len(self.conversation_history) > self.max_history * 2:
-            self.conversation_history = self.conversation_history[-self.max_history * 2:]
+        self._remember_user_message(user_message)
 
         try:
             # Call OpenAI with tools
@@ -286,64 +317,19 @@ class HelpdeskAgent:
             func_name = tool_call.function.name
             func_args = json.loads(tool_call.function.arguments)
 
-            logger.info(f"Tool call: {func_name}({func_args})")
-            self.tool_calls.append({
-                "timestamp": datetime.now().isoformat(),
-                "tool": func_name,
-                "args": func_args
-            })
-
-            # Execute the tool
-            if func_name == "search_knowledge_base":
-                result, src = self._execute_search(func_args)
-                sources.extend(src)
-            elif func_name == "start_quote":
-                result = self._execute_start_quote(func_args)
-            elif func_name == "platform_help":
-                result = self._execute_platform_help(func_args)
-            elif func_name == "route_to_human":
-                result = self._execute_route_to_human(func_args)
-            else:
-                result = f"Unknown tool: {func_name}"
-
+            result, src = self._run_tool(func_name, func_args)
+            sources.extend(src)
             tool_results.append({
                 "tool": func_name,
                 "result": result
             })
 
         # Get final response with tool results
-        # Add tool results to conversation
-        tool_results_text = "\n".join([
-            f"[{r['tool']}]: {r['result']}" for r in tool_results
-        ])
-
-        self.conversation_history.append({
-            "role": "assistant",
-            "content": f"[Tool results]\n{tool_results_text}"
-        })
-
-        # Get synthesized response with better guidance for using sources
-        synthesis_prompt = """You just searched the knowledge base and got results. Now provide a natural, helpful response.
-
-IMPORTANT GUIDELINES:
-- When you found relevant documents/information, ALWAYS use that information to answer the user's question
-- Include specific details from the search results (property names, amenities, features, etc.)
-- DO NOT say "I don't have enough information" if you found relevant documents
-- If the documents don't perfectly match the query, still share what you found and note any limitations
-- Be helpful and conversational - you're a travel assistant recommending properties
-- For travel/hotel questions, describe the properties enthusiastically with key highlights
-
-Example good response: "Great taste! Based on our knowledge base, I'd recommend [Property Name] - it offers [specific amenities]. Another excellent option is [Property 2] which features [details]..."
-
-Example BAD response: "I don't have enough information to answer this question." (NEVER say this when you found sources)"""
+        self._remember_tool_results(tool_results)
 
         final_response = self.client.chat.completions.create(
             model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": AGENT_SYSTEM_PROMPT + "\n\n" + synthesis_prompt},
-                *self.conversation_history,
-                {"role": "user", "content": f"Based on the tool results above, provide a helpful response to: {user_message}"}
-            ],
+            messages=self._synthesis_messages(user_message),
             temperature=0.7,
             max_tokens=800
         )
@@ -363,6 +349,151 @@ Example BAD response: "I don't have enough information to answer this question."
             "sources": sources
         }
 
+    async def chat_stream(self, user_message: str) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Streaming variant of chat() on the async OpenAI client.
+
+        Yields (event, data) pairs:
+        - ('citations', {tool_used, sources}) before the answer text
+        - ('token', {delta}) answer text as it is generated
+        - ('done', {response, tool_used, sources, method})
+
+        A direct answer streams straight away; when the model calls tools,
+        they run on the retrieval worker pool and the synthesized answer
+        streams after the citations.
+        """
+        if not self.async_client:
+            fallback = self._fallback_response(user_message)
+            yield "citations", {"tool_used": None, "sources": []}
+            yield "token", {"delta": fallback["response"]}
+            yield "done", fallback
+            return
+
+        self._remember_user_message(user_message)
+
+        stream = await self.async_client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": AGENT_SYSTEM_PROMPT},
+                *self.conversation_history
+            ],
+            tools=HELPDESK_TOOLS,
+            tool_choice="auto",
+            temperature=0.7,
+            max_tokens=800,
+            stream=True
+        )
+
+        # Tool calls arrive as name/argument fragments keyed by index
+        parts = []
+        calls: Dict[int, Dict[str, str]] = {}
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta
+            for call in delta.tool_calls or []:
+                entry = calls.setdefault(call.index, {"name": "", "arguments": ""})
+                if call.function and call.function.name:
+                    entry["name"] += call.function.name
+                if call.function and call.function.arguments:
+                    entry["arguments"] += call.function.arguments
+            if delta.content:
+                if not parts:
+                    yield "citations", {"tool_used": None, "sources": []}
+                parts.append(delta.content)
+                yield "token", {"delta": delta.content}
+
+        if not calls:
+            assistant_response = "".join(parts) or "I'm here to help! What would you like to know?"
+            if not parts:
+                yield "citations", {"tool_used": None, "sources": []}
+                yield "token", {"delta": assistant_response}
+            self.conversation_history.append({
+                "role": "assistant",
+                "content": assistant_response
+            })
+            yield "done", {"response": assistant_response, "tool_used": None, "sources": [], "method": "direct"}
+            return
+
+        from src.services.retrieval_orchestrator import get_retrieval_orchestrator
+
+        orchestrator = get_retrieval_orchestrator()
+        tool_results = []
+        sources = []
+        for index in sorted(calls):
+            func_name = calls[index]["name"]
+            func_args = json.loads(calls[index]["arguments"] or "{}")
+            result, src = await orchestrator.offload(self._run_tool, func_name, func_args)
+            sources.extend(src)
+            tool_results.append({"tool": func_name, "result": result})
+
+        tool_used = tool_results[0]["tool"]
+        if not parts:
+            yield "citations", {"tool_used": tool_used, "sources": sources}
+
+        self._remember_tool_results(tool_results)
+
+        stream = await self.async_client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=self._synthesis_messages(user_message),
+            temperature=0.7,
+            max_tokens=800,
+            stream=True
+        )
+
+        parts = []
+        async for chunk in stream:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                parts.append(delta)
+                yield "token", {"delta": delta}
+
+        assistant_response = "".join(parts)
+        self.conversation_history[-1] = {
+            "role": "assistant",
+            "content": assistant_response
+        }
+
+        yield "done", {"response": assistant_response, "tool_used": tool_used, "sources": sources, "method": "agent"}
+
+    def _run_tool(self, func_name: str, func_args: Dict) -> Tuple[str, List[Dict[str, Any]]]:
+        """Execute one tool call; returns (result text, sources)"""
+        logger.info(f"Tool call: {func_name}({func_args})")
+        self.tool_calls.append({
+            "timestamp": datetime.now().isoformat(),
+            "tool": func_name,
+            "args": func_args
+        })
+
+        if func_name == "search_knowledge_base":
+            return self._execute_search(func_args)
+        if func_name == "start_quote":
+            return self._execute_start_quote(func_args), []
+        if func_name == "platform_help":
+            return self._execute_platform_help(func_args), []
+        if func_name == "route_to_human":
+            return self._execute_route_to_human(func_args), []
+        return f"Unknown tool: {func_name}", []
+
+    def _remember_tool_results(self, tool_results: List[Dict[str, str]]):
+        """Add tool results to conversation (replaced by the synthesized answer)"""
+        tool_results_text = "\n".join([
+            f"[{r['tool']}]: {r['result']}" for r in tool_results
+        ])
+
+        self.conversation_history.append({
+            "role": "assistant",
+            "content": f"[Tool results]\n{tool_results_text}"
+        })
+
+    def _synthesis_messages(self, user_message: str) -> List[Dict[str, str]]:
+        """Messages for the answer written from tool results"""
+        return [
+            {"role": "system", "content": AGENT_SYSTEM_PROMPT + "\n\n" + SYNTHESIS_PROMPT},
+            *self.conversation_history,
+            {"role": "user", "content": f"Based on the tool results above, provide a helpful response to: {user_message}"}
+        ]
+
     def _execute_search(self, args: Dict) -> tuple:
         """Execute knowledge base search via Travel Platform RAG"""
         try:
@@ -3,12 +3,16 @@ Quote Agent - Multi-Tenant Version
 
 Orchestrates the full quote generation flow:
 1. Parse customer requirements
-2. Find matching hotels
+2. Find matching hotels (consultant round-robin runs alongside)
 3. Calculate pricing
 4. Generate PDF
 5. Send email
 6. Save to Supabase
-7. Auto-add to CRM
+7. Auto-add to CRM and notify (concurrently)
+
+With deliver_async=True the quote is saved first and steps 4-5 (plus the
+follow-up call), CRM and notifications run as background jobs with retries
+(see src/services/job_queue.py); the caller gets the quote_id immediately.
 
 Usage:
     from config.loader import ClientConfig
@@ -34,31 +38,27 @@ from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta, date
 import uuid
 import json
+from concurrent.futures import ThreadPoolExecutor
 
 from config.loader import ClientConfig
 from config.database import DatabaseTables
 from src.tools.bigquery_tool import BigQueryTool
-from src.utils.pdf_generator import PDFGenerator
+from src.services.pdf_render_service import PooledPDFGenerator
 from src.utils.email_sender import EmailSender
 from src.utils.field_normalizers import normalize_quote_status
+from src.services.job_queue import Job, job_handler, get_job_queue
+from src.utils.async_bridge import run_sync
 
 logger = logging.getLogger(__name__)
 
+# Runs independent quote steps (consultant lookup, notifications) alongside
+# the request thread
+_pipeline_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="quote-pipeline")
+
 
 def run_async(coro):
-    """Helper to run async code from sync context"""
-    try:
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            # If there's a running loop, create a new task
-            import concurrent.futures
-            with concurrent.futures.ThreadPoolExecutor() as pool:
-                future = pool.submit(asyncio.run, coro)
-                return future.result()
-        else:
-            return loop.run_until_complete(coro)
-    except RuntimeError:
-        return asyncio.run(coro)
+    """Run async code from sync context on the shared bridge loop"""
+    return run_sync(coro)
 
 
 class QuoteAgent:
@@ -119,9 +119,9 @@ class QuoteAgent:
 
     @property
     def pdf_generator(self):
-        """Lazy-load PDF generator (only needed for quote generation/resend)."""
+        """Lazy-load PDF generator (only needed for quote generation/resend); renders in the PDF worker pool."""
         if self._pdf_generator is None:
-            self._pdf_generator = PDFGenerator(self.config)
+            self._pdf_generator = PooledPDFGenerator(self.config)
         return self._pdf_generator
 
     @property
@@ -138,7 +138,9 @@ class QuoteAgent:
         assign_consultant: bool = True,
         selected_hotels: Optional[List[str]] = None,
         initial_status: str = "quoted",
-        use_live_rates: bool = True
+        use_live_rates: bool = True,
+        deliver_async: bool = False,
+        live_hotel_options: Optional[List[Dict[str, Any]]] = None
     ) -> Dict[str, Any]:
         """
         Generate a complete quote for customer
@@ -153,6 +155,11 @@ class QuoteAgent:
                            consultant review before sending.
             use_live_rates: Whether to use live Juniper rates (default: True).
                            If False, falls back to BigQuery cached rates.
+            deliver_async: Return as soon as the quote is saved and run PDF/email,
+                           CRM and notifications as background jobs. The result
+                           lists the jobs (see GET /api/v1/quotes/{quote_id}/jobs).
+            live_hotel_options: Live rate options already fetched by the caller
+                           (generate_quote_async); skips the Rates Engine call.
         """
         try:
             logger.info(f"Generating quote for {customer_data.get('email')} (live_rates={use_live_rates})")
@@ -168,8 +175,14 @@ class QuoteAgent:
             # Find matching hotels - use live rates or BigQuery based on flag
             hotels = []
             hotel_options = []
+            consultant_future = None
 
-            if use_live_rates and self.rates_client:
+            if use_live_rates and live_hotel_options is not None:
+                hotel_options = live_hotel_options
+                if not hotel_options:
+                    logger.warning("No live rates available, falling back to BigQuery")
+                    use_live_rates = False
+            elif use_live_rates and self.rates_client:
                 # Use live Juniper rates via Rates Engine
                 logger.info(f"Using live rates for {normalized['destination']}")
                 hotel_options = self._find_hotels_live(normalized, selected_hotels)
@@ -205,6 +218,11 @@ class QuoteAgent:
                         'status': 'no_availability'
                     }
 
+                # The round-robin advances a shared counter, so only take a slot once
+                # there is something to quote; look it up while the hotels are priced
+                if assign_consultant:
+                    consultant_future = _pipeline_executor.submit(self.bq_tool.get_next_consultant_round_robin)
+
                 # Calculate pricing for each hotel (BigQuery path)
                 hotel_options = self._calculate_hotel_options(hotels, normalized)
 
@@ -220,9 +238,11 @@ class QuoteAgent:
             # Select top hotels (limit to max)
             final_hotels = hotel_options[:self.max_hotels_per_quote]
 
-            # Assign consultant if requested
+            # Assign consultant if requested (live rates arrive priced, so look it up now)
             consultant = None
-            if assign_consultant:
+            if consultant_future:
+                consultant = consultant_future.result()
+            elif assign_consultant:
                 consultant = self.bq_tool.get_next_consultant_round_robin()
 
             # Build quote object
@@ -245,6 +265,11 @@ class QuoteAgent:
                 'created_at': datetime.utcnow().isoformat()
             }
 
+            if deliver_async:
+                return self._save_and_queue_delivery(
+                    quote, normalized, send_email=send_email and initial_status != 'draft'
+                )
+
             # Generate PDF
             pdf_bytes = None
             try:
@@ -259,21 +284,7 @@ class QuoteAgent:
             email_error = None
             if initial_status != 'draft' and send_email and pdf_bytes:
                 try:
-                    email_sent = self.email_sender.send_quote_email(
-                        customer_email=normalized['email'],
-                        customer_name=normalized['name'],
-                        quote_pdf_data=pdf_bytes,
-                        destination=normalized['destination'],
-                        quote_details={
-                            'check_in': normalized.get('check_in'),
-                            'check_out': normalized.get('check_out'),
-                            'adults': normalized.get('adults', 0),
-                            'children': normalized.get('children', 0),
-                            'nights': normalized.get('nights', 0),
-                            'room_count': len(normalized.get('rooms', [{}])),
-                        },
-                        hotels=final_hotels,
-                    )
+                    email_sent = self._send_quote_email(normalized, final_hotels, pdf_bytes)
                     if email_sent:
                         quote['sent_at'] = datetime.utcnow().isoformat()
                 except Exception as e:
@@ -311,18 +322,11 @@ class QuoteAgent:
                     'quote_id': None,
                 }
 
-            # Auto-add to CRM
+            # Auto-add to CRM while the new-quote notification goes out
+            notify_future = _pipeline_executor.submit(self._notify_quote_request, normalized, quote_id)
             crm_result = self._add_to_crm(normalized, quote_id)
-
-            # Trigger notification for new quote
             try:
-                from src.api.notifications_routes import NotificationService
-                notification_service = NotificationService(self.config)
-                notification_service.notify_quote_request(
-                    customer_name=normalized['name'],
-                    destination=normalized['destination'],
-                    quote_id=quote_id
-                )
+                notify_future.result()
             except Exception as e:
                 logger.warning(f"Failed to send notification: {e}")
 
@@ -349,15 +353,203 @@ class QuoteAgent:
                 'status': 'error'
             }
 
-    def _add_to_crm(self, customer_data: Dict[str, Any], quote_id: str) -> Optional[Dict[str, Any]]:
+    async def generate_quote_async(
+        self,
+        customer_data: Dict[str, Any],
+        send_email: bool = True,
+        assign_consultant: bool = True,
+        selected_hotels: Optional[List[str]] = None,
+        initial_status: str = "quoted",
+        use_live_rates: bool = True,
+        deliver_async: bool = False
+    ) -> Dict[str, Any]:
+        """
+        generate_quote for async callers (FastAPI async routes).
+
+        The live rates search is awaited on the caller's loop; the blocking
+        steps (BigQuery, PDF, email, Supabase) then run in a worker thread.
+        Arguments and result are the same as generate_quote.
+        """
+        live_hotel_options = None
+        if use_live_rates and self.rates_client:
+            normalized = self._normalize_customer_data(customer_data)
+            logger.info(f"Using live rates for {normalized['destination']}")
+            live_hotel_options = await self._find_hotels_live_async(normalized, selected_hotels)
+            if live_hotel_options:
+                logger.info(f"Found {len(live_hotel_options)} hotels from live rates")
+
+        return await asyncio.to_thread(
+            self.generate_quote,
+            customer_data,
+            send_email=send_email,
+            assign_consultant=assign_consultant,
+            selected_hotels=selected_hotels,
+            initial_status=initial_status,
+            use_live_rates=use_live_rates,
+            deliver_async=deliver_async,
+            live_hotel_options=live_hotel_options
+        )
+
+    def _send_quote_email(
+        self,
+        customer_data: Dict[str, Any],
+        hotels: List[Dict[str, Any]],
+        pdf_bytes: bytes
+    ) -> bool:
+        """Email the quote PDF to the customer"""
+        return self.email_sender.send_quote_email(
+            customer_email=customer_data['email'],
+            customer_name=customer_data['name'],
+            quote_pdf_data=pdf_bytes,
+            destination=customer_data['destination'],
+            quote_details={
+                'check_in': customer_data.get('check_in'),
+                'check_out': customer_data.get('check_out'),
+                'adults': customer_data.get('adults', 0),
+                'children': customer_data.get('children', 0),
+                'nights': customer_data.get('nights', 0),
+                'room_count': len(customer_data.get('rooms', [{}])),
+            },
+            hotels=hotels,
+        )
+
+    def _notify_quote_request(self, customer_data: Dict[str, Any], quote_id: str):
+        """Notify the tenant's team about a new quote"""
+        from src.api.notifications_routes import NotificationService
+        notification_service = NotificationService(self.config)
+        notification_service.notify_quote_request(
+            customer_name=customer_data['name'],
+            destination=customer_data['destination'],
+            quote_id=quote_id
+        )
+
+    # ==================== Background Delivery ====================
+
+    def _save_and_queue_delivery(
+        self,
+        quote: Dict[str, Any],
+        customer_data: Dict[str, Any],
+        send_email: bool
+    ) -> Dict[str, Any]:
+        """
+        Save a quote, then hand PDF/email, CRM and notifications to the job queue.
+
+        The quote is saved as 'quoted' (or 'draft'); the quote.deliver job
+        moves it to 'sent' once the email has gone out.
+        """
+        quote_id = quote['quote_id']
+        quote['pdf_generated'] = False
+        quote['email_sent'] = False
+        quote['call_queued'] = False
+
+        if not self._save_quote_to_supabase(quote):
+            logger.error(f"Quote {quote_id} generated but failed to save to Supabase")
+            return {
+                'success': False,
+                'error': 'Quote generated but failed to save. Please try again.',
+                'quote_id': None,
+            }
+
+        queue = get_job_queue()
+        tenant_id = self.config.client_id
+        jobs = []
+        if send_email:
+            jobs.append(queue.enqueue(
+                tenant_id, 'quote.deliver', {'quote': quote, 'customer': customer_data}, reference_id=quote_id
+            ))
+        jobs.append(queue.enqueue(tenant_id, 'quote.crm', {'customer': customer_data}, reference_id=quote_id))
+        jobs.append(queue.enqueue(tenant_id, 'quote.notify', {'customer': customer_data}, reference_id=quote_id))
+
+        logger.info(f"Quote {quote_id} saved; {len(jobs)} delivery jobs queued (email_queued={send_email})")
+
+        return {
+            'success': True,
+            'quote_id': quote_id,
+            'quote': quote,
+            'hotels_count': len(quote['hotels']),
+            'email_sent': False,
+            'email_queued': send_email,
+            'email_error': None,
+            'consultant': quote['consultant'],
+            'status': quote['status'],
+            'crm_added': False,
+            'call_queued': False,
+            'jobs': [job.to_dict() for job in jobs]
+        }
+
+    def deliver_queued_quote(self, job: Job) -> Dict[str, Any]:
+        """
+        Run a quote.deliver job: render the PDF, email it, mark the quote sent
+        and queue the follow-up call.
+
+        Raises on failure so the job queue retries; completed steps are
+        checkpointed on the job, so a retry never emails the customer twice.
+        """
+        quote = job.payload['quote']
+        customer = job.payload['customer']
+        quote_id = quote['quote_id']
+
+        if not job.state.get('email_sent'):
+            pdf_bytes = self.pdf_generator.generate_quote_pdf(quote, quote['hotels'], customer)
+            if not pdf_bytes:
+                # A timed-out or failed render returns b""; never email a quote without its PDF
+                raise RuntimeError(f"Quote PDF for {quote_id} was not rendered")
+            job.checkpoint(pdf_generated=True)
+            if not self._send_quote_email(customer, quote['hotels'], pdf_bytes):
+                raise RuntimeError(f"Quote email for {quote_id} was not sent")
+            job.checkpoint(email_sent=True, sent_at=datetime.utcnow().isoformat())
+
+        if not job.state.get('quote_updated'):
+            if not self.supabase or not self.supabase.client:
+                raise ConnectionError("Supabase not available for quote update")
+            self.supabase.client.table('quotes')\
+                .update({
+                    'status': 'sent',
+                    'email_sent': True,
+                    'pdf_generated': True,
+                    'sent_at': job.state['sent_at'],
+                    'updated_at': datetime.utcnow().isoformat()
+                })\
+                .eq('tenant_id', self.config.client_id)\
+                .eq('quote_id', quote_id)\
+                .execute()
+            job.checkpoint(quote_updated=True)
+
+        if 'call_queued' not in job.state:
+            call_queued = False
+            if customer.get('phone'):
+                call_queued = self._schedule_follow_up_call(
+                    quote_id=quote_id,
+                    customer_name=customer['name'],
+                    customer_email=customer['email'],
+                    customer_phone=customer['phone'],
+                    destination=customer['destination']
+                )
+            job.checkpoint(call_queued=call_queued)
+
+        logger.info(f"Quote {quote_id} delivered to {customer['email']}")
+        return {'email_sent': True, 'call_queued': job.state['call_queued']}
+
+    def _add_to_crm(
+        self,
+        customer_data: Dict[str, Any],
+        quote_id: str,
+        job: Optional[Job] = None
+    ) -> Optional[Dict[str, Any]]:
         """
         Add customer to CRM automatically
         - First quote: QUOTED stage
         - Subsequent quotes: NEGOTIATING stage
+
+        When run as a 'quote.crm' job, the quote count and the activity are
+        checkpointed on the job, so a retry does not count the quote twice.
         """
         if not self.crm:
             return None
 
+        state = job.state if job else {}
+        checkpoint = job.checkpoint if job else (lambda **values: None)
+
         try:
             from src.services.crm_service import PipelineStage
             
@@ -367,13 +559,17 @@ class QuoteAgent:
             if existing:
                 # Client exists - check if we should move to NEGOTIATING
                 current_stage = existing.get('pipeline_stage', 'QUOTED')
-                quote_count = existing.get('quote_count', 1) + 1
-                
-                # Update quote count
-                self.crm.update_client(
-                    client_id=existing['client_id'],
-                    quote_count=quote_count
-                )
+
+                if state.get('quote_count'):
+                    # Counted by an earlier attempt of this job
+                    quote_count = state['quote_count']
+                else:
+                    quote_count = existing.get('quote_count', 1) + 1
+                    self.crm.update_client(
+                        client_id=existing['client_id'],
+                        quote_count=quote_count
+                    )
+                    checkpoint(quote_count=quote_count)
                 
                 # Move to NEGOTIATING if this is their 2nd+ quote and still in QUOTED
                 if quote_count >= 2 and current_stage == 'QUOTED':
@@ -384,13 +580,14 @@ class QuoteAgent:
                     logger.info(f"Client {customer_data['email']} moved to NEGOTIATING (quote #{quote_count})")
                 
                 # Log activity
-                if self.supabase:
+                if self.supabase and not state.get('activity_logged'):
                     self.supabase.log_activity(
                         client_id=existing['client_id'],
                         activity_type='quote_generated',
                         description=f"Quote {quote_id} generated for {customer_data.get('destination', 'destination')}",
                         metadata={'quote_id': quote_id}
                     )
+                    checkpoint(activity_logged=True)
                 
                 return {'success': True, 'created': False, 'client_id': existing['client_id']}
             else:
@@ -403,6 +600,9 @@ class QuoteAgent:
                 )
                 
                 if result:
+                    # A retry finds this client existing; it must not count the quote again
+                    checkpoint(quote_count=1)
+
                     # Log activity
                     if self.supabase:
                         self.supabase.log_activity(
@@ -411,6 +611,7 @@ class QuoteAgent:
                             description=f"Quote {quote_id} generated for {customer_data.get('destination', 'destination')}",
                             metadata={'quote_id': quote_id}
                         )
+                        checkpoint(activity_logged=True)
                     
                     logger.info(f"New client {customer_data['email']} added to CRM in QUOTED stage")
                     return {'success': True, 'created': True, 'client_id': result['client_id']}
@@ -527,175 +728,202 @@ class QuoteAgent:
             return []
 
         try:
-            # Parse dates
-            check_in = datetime.strptime(customer_data['check_in'], '%Y-%m-%d').date()
-            check_out = datetime.strptime(customer_data['check_out'], '%Y-%m-%d').date()
-
-            # Call rates engine async
-            logger.info(
-                f"Live rates search: destination={customer_data['destination']}, "
-                f"dates={check_in} to {check_out}, adults={customer_data['adults']}"
-            )
+            result = run_async(self._search_live_rates(customer_data))
+            return self._live_hotel_options(result, customer_data, selected_hotels)
+        except Exception as e:
+            logger.error(f"Live rates search failed: {e}", exc_info=True)
+            return []
 
-            result = run_async(
-                self.rates_client.search_hotels(
-                    destination=customer_data['destination'],
-                    check_in=check_in,
-                    check_out=check_out,
-                    adults=customer_data['adults'],
-                    children_ages=customer_data.get('children_ages', []),
-                    max_hotels=100  # Get more to filter/select from
-                )
-            )
+    async def _find_hotels_live_async(
+        self,
+        customer_data: Dict[str, Any],
+        selected_hotels: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """_find_hotels_live for async callers (awaits the Rates Engine directly)"""
+        if not self.rates_client:
+            logger.warning("Rates client not available for live search")
+            return []
 
-            if not result.get('success') or not result.get('hotels'):
-                logger.warning(f"No live rates found: {result.get('error', 'No hotels returned')}")
-                return []
+        try:
+            result = await self._search_live_rates(customer_data)
+            return self._live_hotel_options(result, customer_data, selected_hotels)
+        except Exception as e:
+            logger.error(f"Live rates search failed: {e}", exc_info=True)
+            return []
 
-            # Transform hotels to quote format
-            hotel_options = []
-            nights = customer_data['nights']
-            total_guests = customer_data['adults'] + customer_data.get('children', 0)
+    def _search_live_rates(self, customer_data: Dict[str, Any]):
+        """Coroutine for the Rates Engine hotel search"""
+        # Parse dates
+        check_in = datetime.strptime(customer_data['check_in'], '%Y-%m-%d').date()
+        check_out = datetime.strptime(customer_data['check_out'], '%Y-%m-%d').date()
 
-            for hotel in result['hotels']:
-                hotel_name = hotel.get('hotel_name', 'Unknown Hotel')
+        logger.info(
+            f"Live rates search: destination={customer_data['destination']}, "
+            f"dates={check_in} to {check_out}, adults={customer_data['adults']}"
+        )
 
-                # Filter by selected hotels if provided
-                if selected_hotels:
-                    # Fuzzy match - check if any selected hotel name matches
-                    matched = False
-                    hotel_name_lower = hotel_name.lower()
-                    for selected in selected_hotels:
-                        if selected.lower() in hotel_name_lower or hotel_name_lower in selected.lower():
-                            matched = True
-                            break
-                    if not matched:
-                        continue
-
-                # Get hotel details
-                stars = hotel.get('stars') or 4
-                rating = f"{stars}*"
-                image_url = hotel.get('image_url')
-                description = hotel.get('description')
-                images = hotel.get('images', [])
-
-                # Process each room option
-                options = hotel.get('options', [])
-                if not options:
-                    # Use cheapest_price if no options array
-                    if hotel.get('cheapest_price'):
-                        options = [{
-                            'room_type': 'Standard Room',
-                            'meal_plan': hotel.get('cheapest_meal_plan', 'Bed & Breakfast'),
-                            'price_total': hotel.get('cheapest_price'),
-                            'price_per_night': hotel.get('cheapest_price') / max(nights, 1),
-                            'currency': 'ZAR'
-                        }]
-                    else:
-                        continue  # Skip hotels with no pricing
-
-                for option in options:
-                    room_type = option.get('room_type', 'Standard Room')
-                    meal_plan = option.get('meal_plan', 'Bed & Breakfast')
-                    total_price = option.get('price_total', 0)
-                    price_per_night = option.get('price_per_night', 0)
-                    currency = option.get('currency', 'ZAR')
-
-                    if total_price <= 0:
-                        continue
-
-                    # Calculate per-person price
-                    price_per_person = total_price / max(total_guests, 1)
-
-                    # Build pricing breakdown for PDF template
-                    pricing_breakdown = {
-                        'per_person_rates': {
-                            'adult_sharing': round(price_per_person, 2)
-                        },
-                        'totals': {
-                            'accommodation': round(total_price, 2),
-                            'flights': 0,
-                            'transfers': 0,
-                            'grand_total': round(total_price, 2)
-                        },
-                        'nights': nights,
-                        'currency': currency
-                    }
+        return self.rates_client.search_hotels(
+            destination=customer_data['destination'],
+            check_in=check_in,
+            check_out=check_out,
+            adults=customer_data['adults'],
+            children_ages=customer_data.get('children_ages', []),
+            max_hotels=100  # Get more to filter/select from
+        )
 
-                    hotel_option = {
-                        'name': hotel_name,
-                        'hotel_name': hotel_name,
-                        'rating': rating,
-                        'star_rating': stars,
-                        'room_type': room_type,
-                        'meal_plan': meal_plan,
-                        'price_per_person': round(price_per_person, 2),
-                        'total_price': round(total_price, 2),
-                        'price_per_night': round(price_per_night, 2),
-                        'includes_flights': False,
-                        'includes_transfers': False,  # Live rates = accommodation only
-                        'rate_id': hotel.get('hotel_id'),
-                        'currency': currency,
-                        'image_url': image_url,
-                        'description': description,
-                        'images': images[:3] if images else [],
-                        'pricing_breakdown': pricing_breakdown,
-                        'source': 'live_rates'  # Mark as live rates for tracking
-                    }
+    def _live_hotel_options(
+        self,
+        result: Dict[str, Any],
+        customer_data: Dict[str, Any],
+        selected_hotels: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Turn a Rates Engine search result into quote hotel options"""
+        if not result.get('success') or not result.get('hotels'):
+            logger.warning(f"No live rates found: {result.get('error', 'No hotels returned')}")
+            return []
 
-                    hotel_options.append(hotel_option)
+        # Transform hotels to quote format
+        hotel_options = []
+        nights = customer_data['nights']
+        total_guests = customer_data['adults'] + customer_data.get('children', 0)
 
-            # Sort by total price (cheapest first)
-            hotel_options.sort(key=lambda x: x['total_price'])
+        for hotel in result['hotels']:
+            hotel_name = hotel.get('hotel_name', 'Unknown Hotel')
 
-            # If budget specified, prefer hotels closest to budget
-            budget = customer_data.get('budget')
-            if budget:
-                try:
-                    budget_value = float(budget)
-                    # Sort by proximity to budget (prefer slightly under to over)
-                    hotel_options.sort(key=lambda x: abs(x['price_per_person'] - budget_value))
-                except (ValueError, TypeError):
-                    pass  # Keep price-based sort
-
-            # Deduplicate by hotel name (keep best option per hotel)
-            seen_hotels = set()
-            unique_options = []
-            for option in hotel_options:
-                if option['hotel_name'] not in seen_hotels:
-                    unique_options.append(option)
-                    seen_hotels.add(option['hotel_name'])
-
-            logger.info(f"Live rates: {len(unique_options)} unique hotel options")
-            return unique_options
+            # Filter by selected hotels if provided
+            if selected_hotels:
+                # Fuzzy match - check if any selected hotel name matches
+                matched = False
+                hotel_name_lower = hotel_name.lower()
+                for selected in selected_hotels:
+                    if selected.lower() in hotel_name_lower or hotel_name_lower in selected.lower():
+                        matched = True
+                        break
+                if not matched:
+                    continue
+
+            # Get hotel details
+            stars = hotel.get('stars') or 4
+            rating = f"{stars}*"
+            image_url = hotel.get('image_url')
+            description = hotel.get('description')
+            images = hotel.get('images', [])
+
+            # Process each room option
+            options = hotel.get('options', [])
+            if not options:
+                # Use cheapest_price if no options array
+                if hotel.get('cheapest_price'):
+                    options = [{
+                        'room_type': 'Standard Room',
+                        'meal_plan': hotel.get('cheapest_meal_plan', 'Bed & Breakfast'),
+                        'price_total': hotel.get('cheapest_price'),
+                        'price_per_night': hotel.get('cheapest_price') / max(nights, 1),
+                        'currency': 'ZAR'
+                    }]
+                else:
+                    continue  # Skip hotels with no pricing
+
+            for option in options:
+                room_type = option.get('room_type', 'Standard Room')
+                meal_plan = option.get('meal_plan', 'Bed & Breakfast')
+                total_price = option.get('price_total', 0)
+                price_per_night = option.get('price_per_night', 0)
+                currency = option.get('currency', 'ZAR')
+
+                if total_price <= 0:
+                    continue
+
+                # Calculate per-person price
+                price_per_person = total_price / max(total_guests, 1)
+
+                # Build pricing breakdown for PDF template
+                pricing_breakdown = {
+                    'per_person_rates': {
+                        'adult_sharing': round(price_per_person, 2)
+                    },
+                    'totals': {
+                        'accommodation': round(total_price, 2),
+                        'flights': 0,
+                        'transfers': 0,
+                        'grand_total': round(total_price, 2)
+                    },
+                    'nights': nights,
+                    'currency': currency
+                }
+
+                hotel_option = {
+                    'name': hotel_name,
+                    'hotel_name': hotel_name,
+                    'rating': rating,
+                    'star_rating': stars,
+                    'room_type': room_type,
+                    'meal_plan': meal_plan,
+                    'price_per_person': round(price_per_person, 2),
+                    'total_price': round(total_price, 2),
+                    'price_per_night': round(price_per_night, 2),
+                    'includes_flights': False,
+                    'includes_transfers': False,  # Live rates = accommodation only
+                    'rate_id': hotel.get('hotel_id'),
+                    'currency': currency,
+                    'image_url': image_url,
+                    'description': description,
+                    'images': images[:3] if images else [],
+                    'pricing_breakdown': pricing_breakdown,
+                    'source': 'live_rates'  # Mark as live rates for tracking
+                }
+
+                hotel_options.append(hotel_option)
+
+        # Sort by total price (cheapest first)
+        hotel_options.sort(key=lambda x: x['total_price'])
+
+        # If budget specified, prefer hotels closest to budget
+        budget = customer_data.get('budget')
+        if budget:
+            try:
+                budget_value = float(budget)
+                # Sort by proximity to budget (prefer slightly under to over)
+                hotel_options.sort(key=lambda x: abs(x['price_per_person'] - budget_value))
+            except (ValueError, TypeError):
+                pass  # Keep price-based sort
+
+        # Deduplicate by hotel name (keep best option per hotel)
+        seen_hotels = set()
+        unique_options = []
+        for option in hotel_options:
+            if option['hotel_name'] not in seen_hotels:
+                unique_options.append(option)
+                seen_hotels.add(option['hotel_name'])
+
+        logger.info(f"Live rates: {len(unique_options)} unique hotel options")
+        return unique_options
 
-        except Exception as e:
-            logger.error(f"Live rates search failed: {e}", exc_info=True)
-            return []
 
     def _calculate_hotel_options(
         self,
         hotels: List[Dict[str, Any]],
         customer_data: Dict[str, Any]
     ) -> List[Dict[str, Any]]:
-        """Calculate pricing for hotel options"""
+        """Calculate pricing for hotel options (one batched pricing call for all rows)"""
         options = []
         seen_hotels = set()
 
-        for hotel in hotels:
+        # Rows from find_matching_hotels already carry their prices, so this
+        # is priced in-process; only rows without them cost one query
+        prices = self.bq_tool.calculate_quote_prices(
+            hotels,
+            adults=customer_data['adults'],
+            children_ages=customer_data.get('children_ages'),
+            single_adults=0
+        )
+
+        for hotel, pricing in zip(hotels, prices):
             hotel_name = hotel.get('hotel_name')
 
             if hotel_name in seen_hotels:
                 continue
 
-            pricing = self.bq_tool.calculate_quote_price(
-                rate_id=hotel.get('rate_id'),
-                adults=customer_data['adults'],
-                children_ages=customer_data.get('children_ages'),
-                flight_price_pp=0,
-                single_adults=0
-            )
-
             if not pricing:
                 continue
 
@@ -1251,3 +1479,31 @@ class QuoteAgent:
                 'quote_id': quote_id,
                 'error': 'Failed to resend quote'
             }
+
+
+# ==================== Job Handlers ====================
+
+def _agent_for_job(job: Job) -> QuoteAgent:
+    from config.loader import get_config
+    return QuoteAgent(get_config(job.tenant_id))
+
+
+@job_handler("quote.deliver")
+def _run_quote_delivery(job: Job) -> Dict[str, Any]:
+    """Background PDF + email + follow-up call for a saved quote"""
+    return _agent_for_job(job).deliver_queued_quote(job)
+
+
+@job_handler("quote.crm")
+def _run_quote_crm(job: Job) -> Optional[Dict[str, Any]]:
+    """Background CRM upsert for a saved quote"""
+    result = _agent_for_job(job)._add_to_crm(job.payload['customer'], job.reference_id, job=job)
+    if result and not result.get('success'):
+        raise RuntimeError(result.get('error') or 'CRM update failed')
+    return result
+
+
+@job_handler("quote.notify")
+def _run_quote_notification(job: Job) -> None:
+    """Background new-quote notification"""
+    _agent_for_job(job)._notify_quote_request(job.payload['customer'], job.reference_id)
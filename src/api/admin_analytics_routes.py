@@ -17,7 +17,7 @@ from datetime import datetime, timedelta
 from fastapi import APIRouter, HTTPException, Depends, Query
 from pydantic import BaseModel, Field
 
-from config.loader import list_clients, ClientConfig
+from config.loader import list_clients, get_config
 from src.api.admin_routes import verify_admin_token
 from src.utils.error_handler import log_and_raise
 
@@ -477,7 +477,7 @@ async def get_top_tenants(
         tenant_stats = []
         for tenant_id in client_ids:
             try:
-                config = ClientConfig(tenant_id)
+                config = get_config(tenant_id)
                 company_name = getattr(config, 'company_name', tenant_id)
 
                 tenant_stats.append(TenantUsageStats(
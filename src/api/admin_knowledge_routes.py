@@ -24,6 +24,7 @@ from pydantic import BaseModel, Field
 
 from src.api.admin_routes import verify_admin_token
 from src.utils.error_handler import log_and_raise
+from src.services.answer_cache import GLOBAL_KB, invalidate_answer_cache
 
 logger = logging.getLogger(__name__)
 
@@ -498,6 +499,7 @@ def create_knowledge_document(
 
         # Invalidate cache after document creation
         invalidate_cache("documents")
+        invalidate_answer_cache(GLOBAL_KB)
 
         return {
             "success": True,
@@ -587,6 +589,7 @@ def update_knowledge_document(
 
         # Invalidate cache after update
         invalidate_cache("documents")
+        invalidate_answer_cache(GLOBAL_KB)
 
         return {
             "success": True,
@@ -628,6 +631,7 @@ def delete_knowledge_document(
 
         # Invalidate cache after deletion
         invalidate_cache("documents")
+        invalidate_answer_cache(GLOBAL_KB)
 
         return {
             "success": True,
@@ -661,6 +665,7 @@ def rebuild_knowledge_index(
             indexed_count += 1
 
         save_documents_metadata(documents)
+        invalidate_answer_cache(GLOBAL_KB)
 
         logger.info(f"[ADMIN] Rebuilt knowledge index with {indexed_count} documents")
 
@@ -540,10 +540,9 @@ def update_tenant_config_file(
 
         logger.info(f"Updated VAPI config for {tenant_id}")
 
-        # Clear config cache to reload
-        from config.loader import _config_cache
-        if tenant_id in _config_cache:
-            del _config_cache[tenant_id]
+        # Reload the tenant's config on every instance
+        from config.loader import clear_config_cache
+        clear_config_cache(tenant_id)
 
         return True
 
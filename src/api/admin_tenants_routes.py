@@ -18,10 +18,12 @@ from datetime import datetime, timedelta
 from fastapi import APIRouter, HTTPException, Depends, Query, FastAPI
 from pydantic import BaseModel, Field
 
-from config.loader import ClientConfig, list_clients
+from config.loader import ClientConfig, get_config, list_clients
 from src.api.admin_routes import verify_admin_token
 from src.utils.error_handler import log_and_raise
 from src.services.tenant_config_service import get_service as get_config_service
+from src.services.auth_context_cache import set_tenant_status
+from src.services.tenant_config_registry import publish_tenant_config_change
 
 logger = logging.getLogger(__name__)
 
@@ -203,14 +205,14 @@ async def list_tenants(
     List all tenants with optional filtering and pagination.
     """
     try:
-        # Get all client IDs from config
-        client_ids = list_clients()
+        # Get all client IDs (one bulk query that also caches every tenant's config)
+        client_ids = await asyncio.to_thread(list_clients)
         logger.info(f"Found {len(client_ids)} tenant configurations")
 
         tenants = []
         for client_id in client_ids:
             try:
-                config = ClientConfig(client_id)
+                config = get_config(client_id)
 
                 # Get stats from database
                 stats = await get_tenant_stats_from_db(client_id)
@@ -351,6 +353,9 @@ async def create_tenant(
             except Exception as e:
                 logger.warning(f"Could not update additional tenant fields: {e}")
 
+        # Replace any fallback config other instances serve for this tenant
+        await asyncio.to_thread(publish_tenant_config_change, request.tenant_id)
+
         logger.info(f"[ADMIN] Created new tenant: {request.tenant_id}")
 
         return {
@@ -495,6 +500,10 @@ async def suspend_tenant(
             except Exception as e:
                 logger.warning(f"Could not update tenant status in DB: {e}")
 
+        # Push the new status to AuthMiddleware and tenant config on every instance
+        await asyncio.to_thread(set_tenant_status, tenant_id, "suspended")
+        await asyncio.to_thread(publish_tenant_config_change, tenant_id)
+
         # Log admin action
         logger.info(f"[ADMIN] Tenant {tenant_id} suspended. Reason: {request.reason}")
 
@@ -546,6 +555,10 @@ async def activate_tenant(
             except Exception as e:
                 logger.warning(f"Could not update tenant status in DB: {e}")
 
+        # Push the new status to AuthMiddleware and tenant config on every instance
+        await asyncio.to_thread(set_tenant_status, tenant_id, "active")
+        await asyncio.to_thread(publish_tenant_config_change, tenant_id)
+
         logger.info(f"[ADMIN] Tenant {tenant_id} activated")
 
         return {
@@ -619,6 +632,10 @@ async def delete_tenant(
             except Exception as e:
                 logger.error(f"Error deleting tenant data from DB: {e}")
 
+        # Push the new status to AuthMiddleware and tenant config on every instance
+        await asyncio.to_thread(set_tenant_status, tenant_id, "deleted")
+        await asyncio.to_thread(publish_tenant_config_change, tenant_id)
+
         # Note: Config files should be manually removed or archived
         logger.warning(f"[ADMIN] Tenant {tenant_id} deleted. Config files at clients/{tenant_id}/ should be manually archived.")
 
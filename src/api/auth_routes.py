@@ -17,6 +17,7 @@ from slowapi.errors import RateLimitExceeded
 
 from src.services.auth_service import AuthService
 from src.services.login_throttle import check_login_allowed, record_failure, record_success
+from src.services.auth_context_cache import invalidate_user
 from config.loader import get_config, ClientConfig
 
 logger = logging.getLogger(__name__)
@@ -419,6 +420,9 @@ async def update_profile(
         if not updated:
             raise HTTPException(status_code=500, detail="Failed to update profile")
 
+        # The cached auth context carries the user's name; drop it on every instance
+        invalidate_user(tenant_id, user_id=user["id"])
+
         return {
             "success": True,
             "message": "Profile updated successfully",
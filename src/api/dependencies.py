@@ -9,11 +9,12 @@ import os
 import logging
 from typing import Optional
 from fastapi import Header, HTTPException
-from config.loader import ClientConfig
+from config.loader import ClientConfig, _config_cache
 
 logger = logging.getLogger(__name__)
 
-_client_configs: dict[str, ClientConfig] = {}
+# Tenant config snapshots (the registry's table, shared with config.loader)
+_client_configs: dict[str, ClientConfig] = _config_cache
 
 
 class FallbackClientConfig:
@@ -308,8 +309,9 @@ class FallbackClientConfig:
 def get_client_config(x_client_id: Optional[str] = Header(None, alias="X-Client-ID")) -> ClientConfig:
     """Get client configuration from X-Client-ID header with caching.
 
-    Resolves the tenant from the X-Client-ID header (or CLIENT_ID env var fallback),
-    loads the ClientConfig, and caches it for subsequent requests.
+    Resolves the tenant from the X-Client-ID header (or CLIENT_ID env var fallback)
+    and returns its snapshot from the tenant config registry, loading the
+    ClientConfig on first use.
 
     If tenant is not found in database OR config loading fails for any reason,
     returns a FallbackClientConfig that uses environment variables for shared
@@ -318,17 +320,26 @@ def get_client_config(x_client_id: Optional[str] = Header(None, alias="X-Client-
     """
     client_id = x_client_id or os.getenv("CLIENT_ID", "example")
 
-    if client_id not in _client_configs:
-        try:
-            _client_configs[client_id] = ClientConfig(client_id)
-            logger.info(f"Loaded configuration for client: {client_id}")
-        except FileNotFoundError:
-            logger.warning(f"Tenant '{client_id}' not found in database, using fallback config")
-            _client_configs[client_id] = FallbackClientConfig(client_id)
-        except Exception as e:
-            # Config loading failed (DB connectivity, import error, etc.)
-            # Use fallback instead of crashing - the app should always work
-            logger.error(f"Failed to load config for {client_id}: {e}, using fallback config")
-            _client_configs[client_id] = FallbackClientConfig(client_id)
-
-    return _client_configs[client_id]
+    config = _client_configs.get(client_id)
+    if config is not None:
+        return config
+
+    from src.services.tenant_config_registry import get_tenant_config_registry
+    return get_tenant_config_registry().get(
+        client_id, factory=_load_client_config, fallback=FallbackClientConfig
+    )
+
+
+def _load_client_config(client_id: str) -> ClientConfig:
+    try:
+        config = ClientConfig(client_id)
+    except FileNotFoundError:
+        logger.warning(f"Tenant '{client_id}' not found in database, using fallback config")
+        raise
+    except Exception as e:
+        # Config loading failed (DB connectivity, import error, etc.)
+        # Use fallback instead of crashing - the app should always work
+        logger.error(f"Failed to load config for {client_id}: {e}, using fallback config")
+        raise
+    logger.info(f"Loaded configuration for client: {client_id}")
+    return config
@@ -12,6 +12,7 @@ Key features:
 - Natural conversational responses via GPT-4o-mini
 """
 
+import asyncio
 import logging
 import time
 from typing import Any, Dict, List, Optional
@@ -26,6 +27,10 @@ from src.services.query_classifier import get_query_classifier, QueryType
 from src.services.reranker_service import get_reranker
 from src.services.travel_platform_rag_client import get_travel_platform_rag_client
 from src.api.knowledge_routes import get_index_manager
+from src.services.knowledge_vector_index import get_dense_retrieval_status
+from src.services.retrieval_orchestrator import get_retrieval_orchestrator
+from src.services.answer_cache import get_answer_cache
+from src.utils.sse import sse_response
 
 logger = logging.getLogger(__name__)
 
@@ -241,7 +246,9 @@ def search_dual_knowledge_base(
     """
     Search BOTH global (Travel Platform RAG) and private knowledge bases.
 
-    Merges results from both sources and ranks by relevance score.
+    Both sources are searched concurrently (see retrieval_orchestrator.py),
+    so latency is the slower of the two rather than their sum. Merges
+    results from both sources and ranks by relevance score.
 
     Args:
         config: Client configuration for tenant isolation
@@ -252,10 +259,18 @@ def search_dual_knowledge_base(
     Returns:
         Dict with 'success', 'answer', 'citations', 'sources_breakdown'
     """
-    # Search both knowledge bases in parallel concept (sequential for simplicity)
+    # 1-2. Search Global KB (Travel Platform RAG) and Private KB concurrently.
+    # Each has its own deadline; a source that misses it is left out (partial results).
+    outcomes = get_retrieval_orchestrator().run({
+        "global": lambda: search_travel_platform_rag(query, top_k=top_k, use_rerank=use_rerank),
+        "private": lambda: search_private_knowledge_base(config, query, top_k=top_k),
+    })
+    global_result = outcomes["global"].value(
+        {"success": False, "answer": "", "citations": [], "error": "Knowledge search temporarily unavailable"}
+    )
+    private_results = outcomes["private"].value([])
+    timed_out = [name for name, outcome in outcomes.items() if outcome.status == "timeout"]
 
-    # 1. Search Global KB (Travel Platform RAG)
-    global_result = search_travel_platform_rag(query, top_k=top_k, use_rerank=use_rerank)
     global_citations = []
     global_answer = ""
 
@@ -276,9 +291,6 @@ def search_dual_knowledge_base(
             if not any(phrase in (c.get("content", "") or "").lower() for phrase in _IRRELEVANT_CONTENT)
         ]
 
-    # 2. Search Private KB
-    private_results = search_private_knowledge_base(config, query, top_k=top_k)
-
     # 3. Merge and rank results
     # Note: global_citations have visibility="public", private_results have visibility="private".
     # Each source is pre-filtered by its respective search function.
@@ -309,7 +321,8 @@ def search_dual_knowledge_base(
             "global": global_count,
             "private": private_count,
             "total": len(merged_citations)
-        }
+        },
+        "timed_out": timed_out
     }
 
 
@@ -576,6 +589,29 @@ _LOW_QUALITY_PHRASES = [
 ]
 
 
+def _should_web_search(citations: List[Dict[str, Any]], needs_web_search: bool, query_type: QueryType) -> bool:
+    """Web search when asked for, or when KB results are sparse or weak for travel queries"""
+    max_citation_score = max((c.get("score", 0) for c in citations), default=0)
+    return needs_web_search or (
+        (len(citations) < 3 or max_citation_score < 0.45)
+        and query_type in _WEB_SEARCH_QUERY_TYPES
+    )
+
+
+# Answers that depend only on the knowledge bases (not on live web search),
+# and so can be reused until a tenant's documents change
+_CACHEABLE_METHODS = {"dual_kb", "private_kb_synthesis", "llm_synthesis"}
+
+
+def _cache_answer(config: ClientConfig, question: str, query_type: str, response: Dict[str, Any]):
+    """Store a successful answer in the semantic answer cache"""
+    cache = get_answer_cache()
+    if cache is None or not response.get("answer") or response.get("method") not in _CACHEABLE_METHODS:
+        return
+    cached = {k: v for k, v in response.items() if k != "timing"}
+    cache.put(config.client_id, question, cached, query_type=query_type)
+
+
 def _is_low_quality_answer(answer: str, confidence: float) -> bool:
     """Detect fallback/low-quality RAG answers that should yield to private KB."""
     if confidence < 0.5:
@@ -619,6 +655,30 @@ def ask_helpdesk(
         search_params = classifier.get_search_params(query_type)
 
         logger.info(f"Query classified as {query_type.value} (confidence: {confidence:.2f})")
+        query_type_value = query_type.value if hasattr(query_type, 'value') else str(query_type)
+
+        # Check if this is a practical travel question that the KB can't answer well.
+        # For questions about weather, visas, currency etc., the KB only has hotel
+        # fact sheets — web search will give a MUCH better answer.
+        q_lower = question.lower()
+        needs_web_search = any(kw in q_lower for kw in _WEB_SEARCH_KEYWORDS)
+
+        # Repeated and near-duplicate questions are served from the answer cache
+        answer_cache = get_answer_cache()
+        if answer_cache is not None and not needs_web_search:
+            cached = answer_cache.get(config.client_id, question, query_type=query_type_value)
+            if cached:
+                total_time = time.time() - start_time
+                logger.info(f"Helpdesk answer cache hit ({cached['cache']['match']}): total={total_time:.3f}s")
+                return {
+                    **cached,
+                    "cached": True,
+                    "timing": {
+                        "search_ms": 0,
+                        "synthesis_ms": 0,
+                        "total_ms": int(total_time * 1000)
+                    }
+                }
 
         # Step 2: Search BOTH knowledge bases (Global + Private)
         search_start = time.time()
@@ -635,12 +695,6 @@ def ask_helpdesk(
         global_answer = dual_result.get("answer", "")
         sources_breakdown = dual_result.get("sources_breakdown", {})
 
-        # Check if this is a practical travel question that the KB can't answer well.
-        # For questions about weather, visas, currency etc., the KB only has hotel
-        # fact sheets — web search will give a MUCH better answer.
-        q_lower = question.lower()
-        needs_web_search = any(kw in q_lower for kw in _WEB_SEARCH_KEYWORDS)
-
         if dual_result.get("success") and global_answer and not needs_web_search:
             # Check if private KB has better results before returning global answer
             has_private_kb = any(
@@ -671,7 +725,7 @@ def ask_helpdesk(
                         "is_private": source_type == "private_kb"
                     })
 
-                return {
+                response = {
                     "success": True,
                     "answer": global_answer,
                     "sources": sources,
@@ -686,6 +740,10 @@ def ask_helpdesk(
                         "rag_latency_ms": dual_result.get("latency_ms", 0)
                     }
                 }
+                # Don't pin an answer that is missing a source that timed out
+                if not dual_result.get("timed_out"):
+                    _cache_answer(config, question, query_type_value, response)
+                return response
 
         if needs_web_search:
             logger.info(f"Question matches web search keywords, will supplement KB with web search")
@@ -722,7 +780,9 @@ def ask_helpdesk(
                 llm_response = rag_service.generate_response(
                     question=question,
                     search_results=combined_results,
-                    query_type=query_type.value if hasattr(query_type, 'value') else str(query_type)
+                    query_type=query_type.value if hasattr(query_type, 'value') else str(query_type),
+                    # Web results go stale; only KB-grounded answers are cached
+                    tenant_id=config.client_id if not web_supplement else None
                 )
                 synthesis_time = time.time() - synthesis_start
                 total_time = time.time() - start_time
@@ -745,7 +805,7 @@ def ask_helpdesk(
                     })
                 sources.extend(web_supplement_sources)
 
-                return {
+                response = {
                     "success": True,
                     "answer": llm_response.get("answer", ""),
                     "sources": sources,
@@ -763,6 +823,9 @@ def ask_helpdesk(
                         "total_ms": int(total_time * 1000)
                     }
                 }
+                if llm_response.get("method") == "rag" and not dual_result.get("timed_out"):
+                    _cache_answer(config, question, query_type_value, response)
+                return response
             except Exception as synth_error:
                 logger.warning(f"Private KB synthesis failed: {synth_error}")
                 # Fall through to static responses
@@ -803,12 +866,7 @@ def ask_helpdesk(
         #   - OR KB results exist but are all low relevance (< 0.45 max score)
         all_context = list(citations)
         web_sources = []
-        max_citation_score = max((c.get("score", 0) for c in citations), default=0) if citations else 0
-        should_web_search = needs_web_search or (
-            (len(citations) < 3 or max_citation_score < 0.45)
-            and query_type in _WEB_SEARCH_QUERY_TYPES
-        )
-        if should_web_search:
+        if _should_web_search(citations, needs_web_search, query_type):
             web_results = _web_search_supplement(question, query_type)
             all_context.extend(web_results)
             web_sources = [
@@ -823,7 +881,9 @@ def ask_helpdesk(
             llm_response = rag_service.generate_response(
                 question=question,
                 search_results=all_context,
-                query_type=query_type.value if hasattr(query_type, 'value') else str(query_type)
+                query_type=query_type.value if hasattr(query_type, 'value') else str(query_type),
+                # Web results go stale; only KB-grounded answers are cached
+                tenant_id=config.client_id if not web_sources else None
             )
             synthesis_time = time.time() - synthesis_start
             total_time = time.time() - start_time
@@ -834,7 +894,7 @@ def ask_helpdesk(
             # Merge sources: LLM sources + web sources
             combined_sources = llm_response.get("sources", []) + web_sources
 
-            return {
+            response = {
                 "success": True,
                 "answer": llm_response.get("answer", "I'm not sure how to help with that. Could you try rephrasing your question?"),
                 "sources": combined_sources,
@@ -846,6 +906,9 @@ def ask_helpdesk(
                     "total_ms": int(total_time * 1000)
                 }
             }
+            if llm_response.get("method") == "rag" and not dual_result.get("timed_out"):
+                _cache_answer(config, question, query_type_value, response)
+            return response
         except Exception as llm_error:
             logger.warning(f"LLM synthesis failed: {llm_error}, using static fallback")
             total_time = time.time() - start_time
@@ -879,6 +942,152 @@ def ask_helpdesk(
         }
 
 
+async def _stream_helpdesk_answer(config: ClientConfig, question: str):
+    """
+    Streaming counterpart of ask_helpdesk's answer selection.
+
+    Yields ('citations', ...) as soon as retrieval is done, then ('token', ...)
+    deltas from the LLM, then ('done', ...) with the full answer and timing.
+    Blocking retrieval runs on the retrieval worker pool, synthesis on the
+    async OpenAI client, so the request holds no threadpool worker while
+    tokens stream.
+    """
+    start_time = time.time()
+    orchestrator = get_retrieval_orchestrator()
+
+    classifier = get_query_classifier()
+    query_type, confidence = classifier.classify(question)
+    search_params = classifier.get_search_params(query_type)
+    query_type_value = query_type.value if hasattr(query_type, 'value') else str(query_type)
+    needs_web_search = any(kw in question.lower() for kw in _WEB_SEARCH_KEYWORDS)
+
+    def elapsed_ms() -> int:
+        return int((time.time() - start_time) * 1000)
+
+    answer_cache = get_answer_cache()
+    if answer_cache is not None and not needs_web_search:
+        # The Redis round trip and the MinHash/LSH lookup block; keep them off the event loop
+        cached = await asyncio.to_thread(answer_cache.get, config.client_id, question, query_type=query_type_value)
+        if cached:
+            yield "citations", {"sources": cached.get("sources", []), "method": cached.get("method"),
+                                "query_type": query_type_value, "cached": True}
+            yield "token", {"delta": cached.get("answer", "")}
+            yield "done", {**cached, "cached": True, "timing": {"search_ms": 0, "total_ms": elapsed_ms()}}
+            return
+
+    search_start = time.time()
+    dual_result = await orchestrator.offload(
+        search_dual_knowledge_base,
+        config,
+        question,
+        top_k=search_params.get('k', 10),
+        use_rerank=search_params.get('use_rerank', True)
+    )
+    search_ms = int((time.time() - search_start) * 1000)
+
+    citations = dual_result.get("citations", [])
+    global_answer = dual_result.get("answer", "")
+    private_results = [
+        c for c in citations
+        if c.get("source_type") == "private_kb" and c.get("score", 0) >= 0.2
+    ]
+
+    # Global KB answered already (synthesized by Travel Platform) - nothing to stream
+    if (dual_result.get("success") and global_answer and not needs_web_search
+            and not (private_results and _is_low_quality_answer(global_answer, dual_result.get("confidence", 0)))):
+        sources = [
+            {
+                "filename": c.get("source", "Knowledge Base"),
+                "score": c.get("score", 0),
+                "type": c.get("source_type", "global_kb"),
+                "is_private": c.get("source_type") == "private_kb"
+            }
+            for c in citations[:5]
+        ]
+        response = {
+            "success": True,
+            "answer": global_answer,
+            "sources": sources,
+            "method": "dual_kb",
+            "query_type": query_type_value,
+            "confidence": dual_result.get("confidence", 0),
+            "sources_breakdown": dual_result.get("sources_breakdown", {}),
+        }
+        yield "citations", {"sources": sources, "method": "dual_kb", "query_type": query_type_value}
+        yield "token", {"delta": global_answer}
+        yield "done", {**response, "timing": {"search_ms": search_ms, "total_ms": elapsed_ms()}}
+        if not dual_result.get("timed_out"):
+            await asyncio.to_thread(_cache_answer, config, question, query_type_value, response)
+        return
+
+    if private_results:
+        web_results = await orchestrator.offload(_web_search_supplement, question, query_type) if needs_web_search else []
+        context = private_results + web_results
+        method = "private_kb_synthesis" if not web_results else "combined_kb_web_synthesis"
+    else:
+        # Curated static answers for platform questions need no LLM at all
+        static_answer, topic, static_sources = get_smart_response(question)
+        if topic != "general" or "quote" in question.lower() or "invoice" in question.lower():
+            yield "citations", {"sources": static_sources, "method": "smart_static", "query_type": query_type_value}
+            yield "token", {"delta": static_answer}
+            yield "done", {"success": True, "answer": static_answer, "sources": static_sources,
+                           "method": "smart_static", "query_type": query_type_value,
+                           "timing": {"search_ms": search_ms, "total_ms": elapsed_ms()}}
+            return
+
+        web_results = []
+        if _should_web_search(citations, needs_web_search, query_type):
+            web_results = await orchestrator.offload(_web_search_supplement, question, query_type)
+        context = citations + web_results
+        method = "llm_synthesis" if not web_results else "llm_synthesis_web"
+
+    stream = get_rag_service().stream_response(question, context, query_type=query_type_value)
+    yield "citations", {"sources": stream.sources, "method": method, "query_type": query_type_value}
+
+    first_token_ms = None
+    async for delta in stream:
+        if first_token_ms is None:
+            first_token_ms = elapsed_ms()
+            if first_token_ms > 3000:
+                logger.warning(f"Helpdesk stream first token exceeded 3s target: {first_token_ms}ms")
+        yield "token", {"delta": delta}
+
+    response = {
+        "success": True,
+        "answer": stream.answer,
+        "sources": stream.sources,
+        "method": method,
+        "query_type": query_type_value,
+    }
+    total_ms = elapsed_ms()
+    logger.info(f"Helpdesk stream ({method}): search={search_ms}ms, first_token={first_token_ms}ms, total={total_ms}ms")
+    yield "done", {**response, "timing": {"search_ms": search_ms, "first_token_ms": first_token_ms, "total_ms": total_ms}}
+
+    if stream.method == "rag" and not dual_result.get("timed_out"):
+        await asyncio.to_thread(_cache_answer, config, question, query_type_value, response)
+
+
+@helpdesk_router.post("/ask/stream")
+async def ask_helpdesk_stream(
+    request: AskQuestion,
+    user: Optional[dict] = Depends(get_current_user_optional),
+    config: ClientConfig = Depends(get_client_config)
+):
+    """
+    Streaming variant of /ask (server-sent events).
+
+    Events:
+    - citations: {sources, method, query_type} - sent once retrieval is done
+    - token: {delta} - answer text as the LLM produces it
+    - done: the full /ask response including timing (first_token_ms)
+    - error: {message} - the stream failed part-way
+    """
+    return sse_response(
+        _stream_helpdesk_answer(config, request.question),
+        error_message="Oops, hit a small snag there! Could you try asking that a different way?"
+    )
+
+
 @helpdesk_router.get("/topics")
 def get_helpdesk_topics(
     user: Optional[dict] = Depends(get_current_user_optional)
@@ -941,10 +1150,23 @@ def get_rag_status() -> Dict[str, Any]:
 @helpdesk_router.get("/faiss-status")
 def get_faiss_status() -> Dict[str, Any]:
     """
-    Legacy endpoint - redirects to /rag-status.
+    Legacy endpoint - /rag-status plus the local dense retrieval status.
     Kept for backward compatibility.
     """
-    return get_rag_status()
+    status = get_rag_status()
+    status["local_vectors"] = get_dense_retrieval_status()
+    return status
+
+
+@helpdesk_router.get("/answer-cache")
+def get_answer_cache_status() -> Dict[str, Any]:
+    """
+    Semantic answer cache hit rates (exact / near-duplicate) and LLM calls saved.
+    """
+    cache = get_answer_cache()
+    if cache is None:
+        return {"success": True, "data": {"enabled": False}}
+    return {"success": True, "data": cache.get_stats()}
 
 
 @helpdesk_router.get("/test-search")
@@ -1092,6 +1314,42 @@ def agent_chat(
         }
 
 
+@helpdesk_router.post("/agent/chat/stream")
+async def agent_chat_stream(
+    request: AskQuestion,
+    user: Optional[dict] = Depends(get_current_user_optional),
+    config: ClientConfig = Depends(get_client_config)
+):
+    """
+    Streaming variant of /agent/chat (server-sent events).
+
+    Events:
+    - citations: {tool_used, sources} - sent before the answer text
+    - token: {delta} - answer text as the LLM produces it
+    - done: {answer, tool_used, sources, method, timing_ms}
+    - error: {message} - the stream failed part-way
+    """
+    from src.agents.helpdesk_agent import get_helpdesk_agent
+
+    agent = get_helpdesk_agent(config)
+
+    async def events():
+        start_time = time.time()
+        async for event, data in agent.chat_stream(request.question):
+            if event == "done":
+                data = {
+                    "success": True,
+                    "answer": data.get("response", ""),
+                    "tool_used": data.get("tool_used"),
+                    "sources": data.get("sources", []),
+                    "method": data.get("method", "direct"),
+                    "timing_ms": int((time.time() - start_time) * 1000)
+                }
+            yield event, data
+
+    return sse_response(events(), error_message="Oops, hit a small snag! Could you try that again?")
+
+
 @helpdesk_router.post("/agent/reset")
 def agent_reset() -> Dict[str, Any]:
     """Reset the agent's conversation history for a new session."""
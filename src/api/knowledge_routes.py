@@ -6,6 +6,8 @@ Per-tenant document storage with Supabase backend.
 
 Endpoints:
 - /api/v1/knowledge/documents - Document CRUD
+- /api/v1/knowledge/documents/bulk - Multi-file upload, indexed in the background
+- /api/v1/knowledge/jobs - Background ingestion progress
 - /api/v1/knowledge/search - Search knowledge base
 - /api/v1/knowledge/status - Index status
 
@@ -20,6 +22,7 @@ import uuid
 import os
 import json
 import hashlib
+import threading
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 from pathlib import Path
@@ -34,6 +37,16 @@ from config.loader import ClientConfig
 from src.api.dependencies import get_client_config
 from src.utils.error_handler import log_and_raise
 from src.utils.field_normalizers import normalize_kb_source
+from src.services.knowledge_search_index import get_index_store, get_search_index
+from src.services.answer_cache import invalidate_answer_cache
+from src.services.knowledge_vector_index import KNOWLEDGE_VECTOR_MIN_SCORE, get_embedder, get_vector_index
+from src.services.knowledge_ingestion_service import (
+    SUPPORTED_FILE_TYPES,
+    DocumentExtractionError,
+    IngestSource,
+    extract_text,
+    get_ingestion_service
+)
 
 # Import the new Supabase-based knowledge manager
 from src.services.knowledge_storage_service import (
@@ -107,6 +120,9 @@ class SearchResult(BaseModel):
 class KnowledgeIndexManager:
     """Manages per-tenant knowledge base with text-based search"""
 
+    # Ingestion jobs update metadata from background threads
+    _metadata_lock = threading.RLock()
+
     def __init__(self, config: ClientConfig):
         self.config = config
         self.client_id = config.client_id
@@ -133,52 +149,31 @@ class KnowledgeIndexManager:
                 for doc_id, doc in data.get("documents", {}).items():
                     if "visibility" not in doc:
                         doc["visibility"] = "public"
+                # Migration: chunks now live in per-document index segments
+                data.pop("chunks", None)
                 return data
-        return {"documents": {}, "chunks": [], "last_updated": None}
+        return {"documents": {}, "last_updated": None}
 
     def _save_metadata(self):
         """Save document metadata"""
-        self.metadata["last_updated"] = datetime.utcnow().isoformat()
-        with open(self.metadata_file, 'w') as f:
-            json.dump(self.metadata, f, indent=2)
+        with self._metadata_lock:
+            self.metadata["last_updated"] = datetime.utcnow().isoformat()
+            with open(self.metadata_file, 'w') as f:
+                json.dump(self.metadata, f, indent=2)
 
     def _normalize_text(self, text: str) -> str:
         """Normalize text for search"""
         return text.lower().strip()
 
     def _extract_text(self, file_path: Path, file_type: str) -> str:
-        """Extract text from document"""
-        text = ""
-
-        if file_type in ['txt', 'md']:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                text = f.read()
-
-        elif file_type == 'pdf':
-            try:
-                import pypdf
-                reader = pypdf.PdfReader(str(file_path))
-                text = "\n".join(page.extract_text() for page in reader.pages)
-            except ImportError:
-                try:
-                    import fitz  # PyMuPDF
-                    doc = fitz.open(str(file_path))
-                    text = "\n".join(page.get_text() for page in doc)
-                except ImportError:
-                    raise HTTPException(status_code=500, detail="No PDF library available (install pypdf or pymupdf)")
-
-        elif file_type == 'docx':
-            try:
-                from docx import Document
-                doc = Document(str(file_path))
-                text = "\n".join(para.text for para in doc.paragraphs)
-            except ImportError:
-                raise HTTPException(status_code=500, detail="python-docx not installed")
-
-        else:
+        """Extract text from document in-process (indexing goes through the ingestion pool)"""
+        if file_type not in SUPPORTED_FILE_TYPES:
             raise HTTPException(status_code=400, detail=f"Unsupported file type: {file_type}")
 
-        return text
+        try:
+            return extract_text(str(file_path), file_type)
+        except DocumentExtractionError as e:
+            raise HTTPException(status_code=500, detail=str(e))
 
     def _chunk_text(self, text: str, chunk_size: int = 500, overlap: int = 50) -> List[str]:
         """Split text into chunks"""
@@ -192,6 +187,20 @@ class KnowledgeIndexManager:
 
         return chunks
 
+    def _chunk_records(self, document_id: str, doc: Dict, chunks: List[str], start_index: int = 0) -> List[Dict]:
+        """Index segment records for a document's chunks (including visibility)"""
+        return [
+            {
+                "document_id": document_id,
+                "chunk_index": start_index + i,
+                "content": chunk,
+                "content_normalized": self._normalize_text(chunk),
+                "category": doc["category"],
+                "visibility": doc.get("visibility", "public")
+            }
+            for i, chunk in enumerate(chunks)
+        ]
+
     def add_document(
         self,
         file: UploadFile,
@@ -212,7 +221,7 @@ class KnowledgeIndexManager:
         filename = file.filename
         file_type = filename.split('.')[-1].lower()
 
-        if file_type not in ['txt', 'md', 'pdf', 'docx']:
+        if file_type not in SUPPORTED_FILE_TYPES:
             raise HTTPException(status_code=400, detail=f"Unsupported file type: {file_type}")
 
         # Save file
@@ -239,72 +248,138 @@ class KnowledgeIndexManager:
             "error_message": None
         }
 
-        self.metadata["documents"][document_id] = doc_metadata
-        self._save_metadata()
+        with self._metadata_lock:
+            self.metadata["documents"][document_id] = doc_metadata
+            self._save_metadata()
 
         return DocumentMetadata(**doc_metadata)
 
     def index_document(self, document_id: str) -> DocumentMetadata:
-        """Index a document for text-based search"""
+        """
+        Index a document for text-based search.
+
+        Extraction runs in the ingestion process pool; chunks are staged
+        page batch by page batch and replace the document's segment once
+        extraction completes.
+        """
 
         if document_id not in self.metadata["documents"]:
             raise HTTPException(status_code=404, detail="Document not found")
 
-        doc = self.metadata["documents"][document_id]
-
         try:
-            # Extract text
-            file_path = Path(doc["file_path"])
-            text = self._extract_text(file_path, doc["file_type"])
+            return get_ingestion_service().run(self, document_id, self.client_id)
 
-            # Chunk text
-            chunks = self._chunk_text(text)
+        except Exception as e:
+            logger.error(f"Failed to index document {document_id}: {e}")
+            log_and_raise(500, f"indexing document {document_id}", e, logger)
 
-            if not chunks:
-                raise ValueError("No content extracted from document")
+    # ==================== Ingestion Hooks ====================
 
-            # Load existing chunks
-            chunks_file = self.index_path / "chunks.json"
-            if chunks_file.exists():
-                with open(chunks_file, 'r') as f:
-                    all_chunks = json.load(f)
+    def ingest_source(self, document_id: str) -> IngestSource:
+        """Locate a stored document for the ingestion pipeline"""
+        doc = self.metadata["documents"].get(document_id)
+        if not doc:
+            raise HTTPException(status_code=404, detail="Document not found")
+
+        return IngestSource(
+            document_id=document_id,
+            file_path=doc["file_path"],
+            file_type=doc["file_type"],
+            filename=doc["filename"],
+            metadata=doc
+        )
+
+    def ingest_chunks(self, source: IngestSource, chunks: List[str], start_index: int):
+        """
+        Stage a batch of chunks and their embeddings until finish_ingest.
+
+        The document's previous segment and vectors stay searchable until the
+        whole document is extracted, so a failed re-index leaves them intact.
+        """
+        records = self._chunk_records(source.document_id, source.metadata, chunks, start_index)
+        staged = source.staged
+        if start_index == 0:
+            staged.update(records=[], vectors=[], model=None)
+        staged["records"].extend(records)
+
+        # Embed as batches arrive so the model runs while later pages are parsed
+        if staged["vectors"] is not None:
+            embedded = self._embed_records(source.document_id, records)
+            if embedded is None:
+                staged["vectors"] = None
             else:
-                all_chunks = []
-
-            # Add chunk metadata (including visibility)
-            for i, chunk in enumerate(chunks):
-                all_chunks.append({
-                    "document_id": document_id,
-                    "chunk_index": i,
-                    "content": chunk,
-                    "content_normalized": self._normalize_text(chunk),
-                    "category": doc["category"],
-                    "visibility": doc.get("visibility", "public")
-                })
+                staged["model"], vectors = embedded
+                staged["vectors"].append(vectors)
+
+    def _embed_records(self, document_id: str, records: List[Dict]) -> Optional[tuple]:
+        """(embedder name, vectors) for chunk records, or None without a working embedder"""
+        embedder = get_embedder()
+        if embedder is None:
+            return None
 
-            # Save chunks
-            with open(chunks_file, 'w') as f:
-                json.dump(all_chunks, f)
+        try:
+            return embedder.name, embedder.embed([record["content"] for record in records])
+        except Exception as e:
+            # Keyword search still covers the document
+            logger.warning(f"Failed to embed chunks of {document_id}, keeping it keyword-only: {e}")
+            return None
 
-            # Update metadata
+    def _swap_in_staged(self, source: IngestSource):
+        """Replace the document's segment and vectors with the staged batches"""
+        document_id = source.document_id
+        records = source.staged.get("records", [])
+        vectors = source.staged.get("vectors")
+
+        get_index_store(self.index_path).append_segment(document_id, records, replace=True)
+
+        if get_embedder() is None:
+            return
+
+        vector_index = get_vector_index(self.index_path)
+        if not vectors:
+            # Embedding failed for this version; drop any stale vectors of a re-index
+            vector_index.delete_document(document_id)
+            return
+
+        import numpy as np
+        try:
+            vector_index.add_document(
+                document_id, records, np.concatenate(vectors), source.staged["model"], replace=True
+            )
+        except Exception as e:
+            logger.warning(f"Failed to store vectors of {document_id}, keeping it keyword-only: {e}")
+            vector_index.delete_document(document_id)
+
+    def finish_ingest(self, source: IngestSource, text: str, chunks: List[str]) -> DocumentMetadata:
+        """Swap the staged chunks into the index and mark the document indexed"""
+        doc = source.metadata
+        self._swap_in_staged(source)
+
+        with self._metadata_lock:
             doc["status"] = "indexed"
             doc["chunk_count"] = len(chunks)
             doc["indexed_at"] = datetime.utcnow().isoformat()
             doc["error_message"] = None
-
-            self.metadata["chunks"] = all_chunks
             self._save_metadata()
 
-            logger.info(f"Indexed document {document_id}: {len(chunks)} chunks, visibility: {doc.get('visibility', 'public')}")
+        invalidate_answer_cache(self.client_id)
+        logger.info(f"Indexed document {source.document_id}: {len(chunks)} chunks, visibility: {doc.get('visibility', 'public')}")
 
-            return DocumentMetadata(**doc)
+        return DocumentMetadata(**doc)
 
-        except Exception as e:
-            logger.error(f"Failed to index document {document_id}: {e}")
-            doc["status"] = "error"
-            doc["error_message"] = str(e)
-            self._save_metadata()
-            log_and_raise(500, f"indexing document {document_id}", e, logger)
+    def fail_ingest(self, document_id: str, error: str):
+        """
+        Record an ingestion failure on the document.
+
+        Staged batches are dropped with the job's source, so the previous
+        segment and vectors of a re-indexed document are left in place.
+        """
+        with self._metadata_lock:
+            doc = self.metadata["documents"].get(document_id)
+            if doc:
+                doc["status"] = "error"
+                doc["error_message"] = error
+                self._save_metadata()
 
     def search(
         self,
@@ -312,7 +387,8 @@ class KnowledgeIndexManager:
         top_k: int = 5,
         category: Optional[str] = None,
         visibility: Optional[str] = None,
-        min_score: float = 0.05  # Lowered from 0.3 - Jaccard is naturally low for long texts
+        min_score: float = 0.05,  # Lowered from 0.3 - Jaccard is naturally low for long texts
+        scorer: Optional[str] = None
     ) -> List[Dict]:
         """
         Search the knowledge base using improved text matching.
@@ -321,110 +397,113 @@ class KnowledgeIndexManager:
         1. Keyword overlap (weighted by rarity)
         2. Phrase matching (consecutive word sequences)
         3. Key term presence (important domain words)
-        """
 
-        chunks_file = self.index_path / "chunks.json"
+        or BM25 when scorer="bm25" (default from KNOWLEDGE_SCORER).
 
-        if not chunks_file.exists():
-            logger.debug(f"No chunks file found at {chunks_file}")
-            return []
+        Chunks are scored from the tenant's index (see
+        knowledge_search_index.py and knowledge_sparse_scorer.py), so only
+        chunks sharing a query term are considered.
+        """
 
         try:
-            with open(chunks_file, 'r') as f:
-                all_chunks = json.load(f)
+            index = get_search_index(self.index_path)
 
-            logger.debug(f"Searching {len(all_chunks)} chunks for query: '{query[:50]}...'")
-
-            # Normalize query
-            query_normalized = self._normalize_text(query)
-            query_words = query_normalized.split()
-            query_word_set = set(query_words)
-
-            # Extract key terms (words 4+ chars, excluding common stop words)
-            stop_words = {'what', 'that', 'this', 'with', 'from', 'have', 'will', 'been', 'were', 'they',
-                          'their', 'when', 'which', 'about', 'would', 'there', 'could', 'should', 'does',
-                          'need', 'want', 'make', 'like', 'just', 'into', 'over', 'also', 'some', 'more',
-                          'only', 'than', 'then', 'most', 'very', 'other', 'these', 'those'}
-            key_terms = {w for w in query_word_set if len(w) >= 4 and w not in stop_words}
-
-            results = []
-            for chunk in all_chunks:
-                # Filter by category
-                if category and chunk.get("category") != category:
-                    continue
+            if index is None:
+                logger.debug(f"No index segments found in {self.index_path}")
+                return []
 
-                # Filter by visibility
-                if visibility and chunk.get("visibility", "public") != visibility:
-                    continue
+            logger.debug(f"Searching {len(index)} chunks for query: '{query[:50]}...'")
 
-                # Get content
-                content_normalized = chunk.get("content_normalized", self._normalize_text(chunk["content"]))
-                content_words = content_normalized.split()
-                content_word_set = set(content_words)
+            hits = index.search(
+                query,
+                category=category,
+                visibility=visibility,
+                min_score=min_score,
+                scorer=scorer,
+                top_k=top_k
+            )
 
-                if not query_word_set or not content_word_set:
-                    continue
+            results = [
+                {
+                    "content": chunk["content"],
+                    "source": self.metadata["documents"].get(chunk["document_id"], {}).get("filename", "Unknown"),
+                    "score": round(score, 3),
+                    "document_id": chunk["document_id"],
+                    "chunk_index": chunk["chunk_index"],
+                    "visibility": chunk.get("visibility", "public"),
+                    # Debug info
+                    "match_details": match_details
+                }
+                for chunk, score, match_details in hits
+            ]
 
-                # Signal 1: Keyword overlap (weighted by query size, not union)
-                # This gives higher scores for matching most query words
-                intersection = query_word_set & content_word_set
-                keyword_score = len(intersection) / len(query_word_set) if query_word_set else 0
-
-                # Signal 2: Key term matching (important domain words)
-                key_term_matches = key_terms & content_word_set
-                key_term_score = len(key_term_matches) / len(key_terms) if key_terms else 0
-
-                # Signal 3: Phrase matching (2-gram overlap for consecutive words)
-                query_bigrams = set(zip(query_words[:-1], query_words[1:]))
-                content_bigrams = set(zip(content_words[:-1], content_words[1:]))
-                bigram_matches = query_bigrams & content_bigrams
-                phrase_score = len(bigram_matches) / len(query_bigrams) if query_bigrams else 0
-
-                # Signal 4: Substring match (exact phrase appears)
-                substring_boost = 0.3 if query_normalized in content_normalized else 0
-
-                # Combined score with weights
-                # keyword_score: 40%, key_term_score: 30%, phrase_score: 20%, substring: 10% bonus
-                score = (
-                    keyword_score * 0.4 +
-                    key_term_score * 0.3 +
-                    phrase_score * 0.2 +
-                    substring_boost
-                )
-
-                # Normalize to 0-1 range
-                score = min(score, 1.0)
-
-                if score >= min_score:
-                    results.append({
-                        "content": chunk["content"],
-                        "source": self.metadata["documents"].get(chunk["document_id"], {}).get("filename", "Unknown"),
-                        "score": round(score, 3),
-                        "document_id": chunk["document_id"],
-                        "chunk_index": chunk["chunk_index"],
-                        "visibility": chunk.get("visibility", "public"),
-                        # Debug info
-                        "match_details": {
-                            "keywords": len(intersection),
-                            "key_terms": len(key_term_matches),
-                            "phrases": len(bigram_matches)
-                        }
-                    })
-
-            # Sort by score descending and take top_k
-            results.sort(key=lambda x: x["score"], reverse=True)
-
-            if results:
-                logger.info(f"Private KB search found {len(results)} results (top score: {results[0]['score']:.3f})")
+            if hits:
+                logger.info(f"Private KB search found {len(hits)} results (top score: {results[0]['score']:.3f})")
             else:
                 logger.info(f"Private KB search found 0 results for query: '{query[:50]}...'")
 
-            return results[:top_k]
+            return results
 
         except Exception as e:
             logger.error(f"Search failed: {e}", exc_info=True)
             return []
 
+    def vector_search(
+        self,
+        query: str,
+        top_k: int = 5,
+        category: Optional[str] = None,
+        visibility: Optional[str] = None,
+        min_score: float = KNOWLEDGE_VECTOR_MIN_SCORE
+    ) -> List[Dict]:
+        """
+        Dense search over the tenant's chunk embeddings.
+
+        Returns results shaped like search() (score = cosine similarity), or
+        an empty list when no local embedder is configured. See
+        knowledge_vector_index.py.
+        """
+        embedder = get_embedder()
+        if embedder is None:
+            return []
+
+        try:
+            index = get_search_index(self.index_path)
+            if index is None:
+                return []
+
+            query_vector = embedder.embed([query])[0]
+            hits = get_vector_index(self.index_path).search(
+                query_vector,
+                top_k=top_k,
+                category=category,
+                visibility=visibility,
+                min_score=min_score
+            )
+
+            results = []
+            for row, score in hits:
+                # The segment is the source of truth for content (and liveness)
+                chunk = index.get_chunk(row["document_id"], row["chunk_index"])
+                if chunk is None:
+                    continue
+                results.append({
+                    "content": chunk["content"],
+                    "source": self.metadata["documents"].get(row["document_id"], {}).get("filename", "Unknown"),
+                    "score": round(score, 3),
+                    "document_id": row["document_id"],
+                    "chunk_index": row["chunk_index"],
+                    "visibility": row["visibility"],
+                    "match_details": {"vector": round(score, 3)}
+                })
+
+            logger.info(f"Private KB vector search found {len(results)} results for query: '{query[:50]}...'")
+            return results
+
+        except Exception as e:
+            logger.error(f"Vector search failed: {e}", exc_info=True)
+            return []
+
     def get_documents(self, visibility: Optional[str] = None) -> List[DocumentMetadata]:
         """Get all documents, optionally filtered by visibility"""
         docs = [DocumentMetadata(**doc) for doc in self.metadata["documents"].values()]
@@ -452,59 +531,60 @@ class KnowledgeIndexManager:
             file_path.unlink()
 
         # Remove from metadata
-        del self.metadata["documents"][document_id]
+        with self._metadata_lock:
+            del self.metadata["documents"][document_id]
 
-        # Remove chunks and rebuild index
-        self._rebuild_index()
+        # Drop this document's segment; its chunks are tombstoned until compaction
+        get_index_store(self.index_path).delete_segment(document_id)
+        get_vector_index(self.index_path).delete_document(document_id)
 
         self._save_metadata()
+        invalidate_answer_cache(self.client_id)
         return True
 
     def _rebuild_index(self):
-        """Rebuild index from remaining documents"""
+        """
+        Rebuild index from remaining documents.
+
+        Re-extracts every indexed document, so only used for the explicit
+        /rebuild endpoint - deletes and re-indexes are incremental. Documents
+        are queued as ingestion jobs so they are extracted in parallel.
+        """
         try:
-            all_chunks = []
+            store = get_index_store(self.index_path)
 
-            for doc_id, doc in self.metadata["documents"].items():
+            vector_index = get_vector_index(self.index_path)
+            for doc_id in store.document_ids() - set(self.metadata["documents"]):
+                store.delete_segment(doc_id)
+                vector_index.delete_document(doc_id)
+
+            service = get_ingestion_service()
+            jobs = []
+            for doc_id, doc in list(self.metadata["documents"].items()):
                 if doc["status"] != "indexed":
                     continue
 
-                file_path = Path(doc["file_path"])
-                if not file_path.exists():
+                if not Path(doc["file_path"]).exists():
+                    store.delete_segment(doc_id)
+                    vector_index.delete_document(doc_id)
                     continue
 
-                text = self._extract_text(file_path, doc["file_type"])
-                chunks = self._chunk_text(text)
-
-                for i, chunk in enumerate(chunks):
-                    all_chunks.append({
-                        "document_id": doc_id,
-                        "chunk_index": i,
-                        "content": chunk,
-                        "content_normalized": self._normalize_text(chunk),
-                        "category": doc["category"],
-                        "visibility": doc.get("visibility", "public")
-                    })
+                jobs.append(service.submit(self, doc_id, self.client_id, doc["filename"]))
 
-            chunks_file = self.index_path / "chunks.json"
+            service.wait(jobs)
 
-            if all_chunks:
-                with open(chunks_file, 'w') as f:
-                    json.dump(all_chunks, f)
-            else:
-                # Remove index file
-                if chunks_file.exists():
-                    chunks_file.unlink()
+            failed = [job.document_id for job in jobs if job.status == "failed"]
+            if failed:
+                logger.warning(f"Rebuild could not re-index {len(failed)} documents: {failed}")
 
-            self.metadata["chunks"] = all_chunks
+            if store.get_index() is not None:
+                store.compact()
 
         except Exception as e:
             logger.error(f"Failed to rebuild index: {e}")
 
     def get_status(self) -> Dict:
         """Get index status"""
-        chunks_file = self.index_path / "chunks.json"
-
         total_docs = len(self.metadata["documents"])
         indexed_docs = sum(1 for d in self.metadata["documents"].values() if d["status"] == "indexed")
         pending_docs = sum(1 for d in self.metadata["documents"].values() if d["status"] == "pending")
@@ -514,7 +594,10 @@ class KnowledgeIndexManager:
         public_docs = sum(1 for d in self.metadata["documents"].values() if d.get("visibility", "public") == "public")
         private_docs = sum(1 for d in self.metadata["documents"].values() if d.get("visibility") == "private")
 
-        index_size = chunks_file.stat().st_size if chunks_file.exists() else 0
+        total_chunks = sum(
+            d.get("chunk_count", 0) for d in self.metadata["documents"].values() if d["status"] == "indexed"
+        )
+        index_size = get_index_store(self.index_path).size_bytes()
 
         return {
             "total_documents": total_docs,
@@ -523,8 +606,9 @@ class KnowledgeIndexManager:
             "error_documents": error_docs,
             "public_documents": public_docs,
             "private_documents": private_docs,
-            "total_chunks": len(self.metadata.get("chunks", [])),
+            "total_chunks": total_chunks,
             "index_size_bytes": index_size,
+            "vector_index": get_vector_index(self.index_path).get_status() if get_embedder() else None,
             "last_updated": self.metadata.get("last_updated")
         }
 
@@ -619,6 +703,83 @@ def upload_document(
     }
 
 
+@knowledge_router.post("/documents/bulk")
+def upload_documents_bulk(
+    files: List[UploadFile] = File(...),
+    category: str = Form(default="general"),
+    tags: str = Form(default=""),
+    visibility: str = Form(default="public"),
+    config: ClientConfig = Depends(get_client_config)
+):
+    """
+    Upload several documents at once.
+
+    Files are stored immediately and queued for background indexing; poll
+    /jobs/{job_id} for progress. A file that cannot be stored is reported
+    in its own entry without failing the rest of the batch.
+    """
+    manager = get_index_manager(config)
+    service = get_ingestion_service()
+
+    tag_list = [t.strip() for t in tags.split(",") if t.strip()]
+
+    if visibility not in ["public", "private"]:
+        visibility = "public"
+
+    results = []
+    for file in files:
+        try:
+            doc = manager.add_document(file, category, tag_list, visibility)
+        except HTTPException as e:
+            results.append({"filename": file.filename, "error": e.detail})
+            continue
+
+        job = service.submit(manager, doc.document_id, config.client_id, doc.filename)
+        results.append({
+            "filename": doc.filename,
+            "document": doc.model_dump(),
+            "job": job.to_dict()
+        })
+
+    return {
+        "success": True,
+        "data": results,
+        "count": len(results),
+        "queued": sum(1 for r in results if "job" in r)
+    }
+
+
+@knowledge_router.get("/jobs")
+def list_ingestion_jobs(
+    config: ClientConfig = Depends(get_client_config)
+):
+    """List this tenant's recent ingestion jobs"""
+    jobs = get_ingestion_service().list_jobs(config.client_id)
+
+    return {
+        "success": True,
+        "data": [job.to_dict() for job in jobs],
+        "count": len(jobs)
+    }
+
+
+@knowledge_router.get("/jobs/{job_id}")
+def get_ingestion_job(
+    job_id: str,
+    config: ClientConfig = Depends(get_client_config)
+):
+    """Get progress of a background ingestion job"""
+    job = get_ingestion_service().get_job(job_id, tenant_id=config.client_id)
+
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return {
+        "success": True,
+        "data": job.to_dict()
+    }
+
+
 @knowledge_router.get("/documents/{document_id}")
 def get_document(
     document_id: str,
@@ -39,6 +39,13 @@ try:
         ["method", "path", "status"],
     )
 
+    SUPABASE_OPERATION_DURATION = Histogram(
+        "supabase_operation_duration_seconds",
+        "Supabase (PostgREST) operation duration in seconds",
+        ["operation", "outcome"],
+        buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+    )
+
     PROMETHEUS_AVAILABLE = True
 
 except ImportError:
@@ -46,6 +53,7 @@ except ImportError:
     REQUEST_COUNT = None
     REQUEST_DURATION = None
     ERROR_COUNT = None
+    SUPABASE_OPERATION_DURATION = None
 
 
 # ── Path normalizer (reduce cardinality) ──
@@ -18,6 +18,7 @@ from datetime import datetime, timedelta
 from config.loader import ClientConfig
 from src.api.dependencies import get_client_config
 from src.middleware.auth_middleware import get_current_user, UserContext
+from src.tools.async_supabase_tool import AsyncSupabaseTool
 from src.tools.supabase_tool import SupabaseTool
 from src.utils.error_handler import log_and_raise
 
@@ -74,7 +75,7 @@ def get_current_user_id(
 # ==================== Endpoints ====================
 
 @notifications_router.get("")
-def list_notifications(
+async def list_notifications(
     config: ClientConfig = Depends(get_client_config),
     user_id: str = Depends(get_current_user_id),
     limit: int = Query(default=20, le=100),
@@ -87,7 +88,7 @@ def list_notifications(
     Returns paginated list of notifications, newest first.
     """
     try:
-        supabase = SupabaseTool(config)
+        supabase = await AsyncSupabaseTool.create(config)
 
         query = supabase.client.table('notifications')\
             .select('*')\
@@ -100,7 +101,7 @@ def list_notifications(
         if unread_only:
             query = query.eq('read', False)
 
-        result = query.execute()
+        result = await supabase.execute(query, operation="list_notifications")
 
         # Get total count for pagination
         count_query = supabase.client.table('notifications')\
@@ -111,7 +112,7 @@ def list_notifications(
         if unread_only:
             count_query = count_query.eq('read', False)
 
-        count_result = count_query.execute()
+        count_result = await supabase.execute(count_query, operation="count_notifications")
 
         # Format timestamps for frontend
         notifications = []
@@ -141,20 +142,20 @@ def list_notifications(
 
 
 @notifications_router.get("/unread-count")
-def get_unread_count(
+async def get_unread_count(
     config: ClientConfig = Depends(get_client_config),
     user_id: str = Depends(get_current_user_id)
 ):
     """Get count of unread notifications"""
     try:
-        supabase = SupabaseTool(config)
+        supabase = await AsyncSupabaseTool.create(config)
 
-        result = supabase.client.table('notifications')\
+        query = supabase.client.table('notifications')\
             .select('id', count='exact')\
             .eq('tenant_id', config.client_id)\
             .or_(f'user_id.eq.{user_id},user_id.is.null')\
-            .eq('read', False)\
-            .execute()
+            .eq('read', False)
+        result = await supabase.execute(query, operation="count_unread_notifications")
 
         return {
             'success': True,
@@ -166,21 +167,21 @@ def get_unread_count(
 
 
 @notifications_router.patch("/{notification_id}/read")
-def mark_notification_read(
+async def mark_notification_read(
     notification_id: str,
     config: ClientConfig = Depends(get_client_config),
     user_id: str = Depends(get_current_user_id)
 ):
     """Mark a single notification as read"""
     try:
-        supabase = SupabaseTool(config)
+        supabase = await AsyncSupabaseTool.create(config)
 
-        result = supabase.client.table('notifications')\
+        query = supabase.client.table('notifications')\
             .update({'read': True, 'read_at': datetime.utcnow().isoformat()})\
             .eq('id', notification_id)\
             .eq('tenant_id', config.client_id)\
-            .or_(f'user_id.eq.{user_id},user_id.is.null')\
-            .execute()
+            .or_(f'user_id.eq.{user_id},user_id.is.null')
+        await supabase.execute(query, operation="mark_notification_read")
 
         return {
             'success': True,
@@ -192,29 +193,29 @@ def mark_notification_read(
 
 
 @notifications_router.post("/mark-all-read")
-def mark_all_read(
+async def mark_all_read(
     config: ClientConfig = Depends(get_client_config),
     user_id: str = Depends(get_current_user_id)
 ):
     """Mark all notifications as read for current user"""
     try:
-        supabase = SupabaseTool(config)
+        supabase = await AsyncSupabaseTool.create(config)
 
         # Update all unread notifications for this user
-        result = supabase.client.table('notifications')\
+        query = supabase.client.table('notifications')\
             .update({'read': True, 'read_at': datetime.utcnow().isoformat()})\
             .eq('tenant_id', config.client_id)\
             .eq('user_id', user_id)\
-            .eq('read', False)\
-            .execute()
+            .eq('read', False)
+        await supabase.execute(query, operation="mark_all_notifications_read")
 
         # Also mark system-wide notifications as read
-        supabase.client.table('notifications')\
+        query = supabase.client.table('notifications')\
             .update({'read': True, 'read_at': datetime.utcnow().isoformat()})\
             .eq('tenant_id', config.client_id)\
             .is_('user_id', None)\
-            .eq('read', False)\
-            .execute()
+            .eq('read', False)
+        await supabase.execute(query, operation="mark_all_notifications_read")
 
         return {
             'success': True,
@@ -23,7 +23,9 @@ from pydantic import BaseModel, Field
 from google.cloud import bigquery
 
 from config.loader import ClientConfig
+from config.database import DatabaseTables
 from src.api.dependencies import get_client_config
+from src.services.rates_replica import get_rates_replica, invalidate_rates_replica
 from src.utils.error_handler import log_and_raise
 
 logger = logging.getLogger(__name__)
@@ -181,6 +183,12 @@ async def get_bigquery_client_async(config: ClientConfig):
         return None
 
 
+def _rates_snapshot(config: ClientConfig, client):
+    """Local replica of the shared pricing tables, or None to query BigQuery"""
+    replica = get_rates_replica(DatabaseTables(config))
+    return replica.snapshot(client) if replica and client else None
+
+
 # ==================== Rate Endpoints ====================
 
 @pricing_router.get("/rates")
@@ -340,6 +348,7 @@ async def create_rate(
         }
         
         errors = client.insert_rows_json(table_id, [row])
+        invalidate_rates_replica(DatabaseTables(config))
         
         if errors:
             logger.error(f"BigQuery insert errors: {errors}")
@@ -364,21 +373,25 @@ async def get_rate(
     """Get rate by ID"""
     try:
         client = await get_bigquery_client_async(config)
-        
-        query = f"""
-        SELECT * FROM `{config.gcp_project_id}.{config.shared_pricing_dataset}.hotel_rates`
-        WHERE rate_id = @rate_id
-        LIMIT 1
-        """
-        
-        job_config = bigquery.QueryJobConfig(
-            query_parameters=[
-                bigquery.ScalarQueryParameter("rate_id", "STRING", rate_id)
-            ]
-        )
-        
-        results = client.query(query, job_config=job_config).result()
-        rate = next((dict(row) for row in results), None)
+
+        snapshot = _rates_snapshot(config, client)
+        if snapshot is not None:
+            rate = snapshot.get_rate(rate_id)
+        else:
+            query = f"""
+            SELECT * FROM `{config.gcp_project_id}.{config.shared_pricing_dataset}.hotel_rates`
+            WHERE rate_id = @rate_id
+            LIMIT 1
+            """
+
+            job_config = bigquery.QueryJobConfig(
+                query_parameters=[
+                    bigquery.ScalarQueryParameter("rate_id", "STRING", rate_id)
+                ]
+            )
+
+            results = client.query(query, job_config=job_config).result()
+            rate = next((dict(row) for row in results), None)
         
         if not rate:
             raise HTTPException(status_code=404, detail="Rate not found")
@@ -445,6 +458,7 @@ async def update_rate(
         
         job_config = bigquery.QueryJobConfig(query_parameters=params)
         client.query(query, job_config=job_config).result()
+        invalidate_rates_replica(DatabaseTables(config))
         
         # Fetch updated rate
         return await get_rate(rate_id, config)
@@ -484,6 +498,7 @@ async def delete_rate(
         )
         
         client.query(query, job_config=job_config).result()
+        invalidate_rates_replica(DatabaseTables(config))
         
         return {
             "success": True,
@@ -572,6 +587,9 @@ async def import_rates(
                     errors.append({"row": i + err.get('index', 0), "error": str(err.get('errors'))})
             else:
                 imported += len(batch)
+
+        if rows:
+            invalidate_rates_replica(DatabaseTables(config))
         
         return {
             "success": len(errors) == 0,
@@ -733,7 +751,11 @@ async def get_hotel_rates(
         def _execute_query():
             return list(client.query(query, job_config=job_config).result())
 
-        results = await asyncio.to_thread(_execute_query)
+        snapshot = _rates_snapshot(config, client)
+        if snapshot is not None:
+            results = snapshot.hotel_rates(hotel_name)
+        else:
+            results = await asyncio.to_thread(_execute_query)
 
         rates = []
         for row in results:
@@ -140,65 +140,56 @@ async def _apply_currency_conversion(hotels: list, target_currency: str = "ZAR",
     """Apply currency conversion to hotels with non-ZAR pricing.
 
     Handles both merged profile format (all_rates[], best_rate) and
-    legacy format (options[]).
+    legacy format (options[]). Prices are collected in one pass and
+    converted together (one rate lookup per currency), then written back.
     """
     currency_svc = get_currency_service()
+    target = target_currency.upper()
 
-    # Pre-collect all unique source currencies and warm the cache
-    source_currencies = set()
+    # (container, field written, amount, currency) for every price to convert
+    pending = []
     for hotel in hotels:
-        cur = _get_hotel_currency(hotel)
-        if cur and cur.upper() != target_currency.upper():
-            source_currencies.add(cur.upper())
-    if source_currencies:
-        await currency_svc.ensure_rates_cached(source_currencies, target_currency)
-
-    for hotel in hotels:
-        # Determine base currency from best_rate, options, or hotel level
-        hotel_currency = None
-        if hotel.get("best_rate"):
-            hotel_currency = hotel["best_rate"].get("currency")
-        if not hotel_currency and hotel.get("options"):
-            hotel_currency = hotel["options"][0].get("currency")
-        if not hotel_currency:
-            hotel_currency = hotel.get("currency", "ZAR")
+        hotel_currency = _get_hotel_currency(hotel)
 
         # Convert cheapest_price
-        if hotel_currency.upper() != target_currency.upper() and hotel.get("cheapest_price"):
-            conversion = await currency_svc.convert(
-                hotel["cheapest_price"], hotel_currency, target_currency, margin_pct
-            )
-            hotel["display_price_zar"] = conversion["amount"]
-            hotel["original_currency"] = conversion["original_currency"]
-            hotel["exchange_rate"] = conversion["rate"]
+        if hotel_currency.upper() != target and hotel.get("cheapest_price"):
+            pending.append((hotel, "display_price_zar", hotel["cheapest_price"], hotel_currency))
 
         # Convert best_rate if present
         best_rate = hotel.get("best_rate")
         if best_rate:
             rate_currency = best_rate.get("currency", hotel_currency)
-            if rate_currency.upper() != target_currency.upper():
+            if rate_currency.upper() != target:
                 if best_rate.get("rate_per_night") and not best_rate.get("rate_per_night_zar"):
-                    conv = await currency_svc.convert(best_rate["rate_per_night"], rate_currency, target_currency, margin_pct)
-                    best_rate["rate_per_night_zar"] = conv["amount"]
+                    pending.append((best_rate, "rate_per_night_zar", best_rate["rate_per_night"], rate_currency))
 
         # Convert all_rates[] if present
         for rate in hotel.get("all_rates", []):
             rate_currency = rate.get("currency", hotel_currency)
-            if rate_currency.upper() != target_currency.upper():
+            if rate_currency.upper() != target:
                 if rate.get("rate_per_night") and not rate.get("rate_per_night_zar"):
-                    conv = await currency_svc.convert(rate["rate_per_night"], rate_currency, target_currency, margin_pct)
-                    rate["rate_per_night_zar"] = conv["amount"]
+                    pending.append((rate, "rate_per_night_zar", rate["rate_per_night"], rate_currency))
 
         # Convert options[] (backward compat)
         for opt in hotel.get("options", []):
             opt_currency = opt.get("currency", hotel_currency)
-            if opt_currency.upper() != target_currency.upper():
+            if opt_currency.upper() != target:
                 if opt.get("price_total"):
-                    conv = await currency_svc.convert(opt["price_total"], opt_currency, target_currency, margin_pct)
-                    opt["price_total_zar"] = conv["amount"]
+                    pending.append((opt, "price_total_zar", opt["price_total"], opt_currency))
                 if opt.get("price_per_night") and not opt.get("price_per_night_zar"):
-                    conv = await currency_svc.convert(opt["price_per_night"], opt_currency, target_currency, margin_pct)
-                    opt["price_per_night_zar"] = conv["amount"]
+                    pending.append((opt, "price_per_night_zar", opt["price_per_night"], opt_currency))
+
+    if not pending:
+        return hotels
+
+    amounts, rates = await currency_svc.convert_many(
+        [p[2] for p in pending], [p[3] for p in pending], target_currency, margin_pct
+    )
+    for (container, field, _, currency), amount, rate in zip(pending, amounts.tolist(), rates.tolist()):
+        container[field] = amount
+        if field == "display_price_zar":
+            container["original_currency"] = currency
+            container["exchange_rate"] = rate
     return hotels
 
 
@@ -341,6 +332,9 @@ async def search_hotels_aggregated(
     check_out: date = Query(..., description="Check-out date (YYYY-MM-DD)"),
     adults: int = Query(default=2, ge=1, le=20, description="Number of adults"),
     children: int = Query(default=0, ge=0, le=10, description="Number of children"),
+    sort_by: Optional[str] = Query(default=None, pattern="^(price|stars)$", description="price | stars (default: provider order)"),
+    offset: int = Query(default=0, ge=0, description="Hotels to skip"),
+    limit: Optional[int] = Query(default=None, ge=1, le=500, description="Page size (default: all)"),
     config: ClientConfig = Depends(get_client_config),
 ) -> Dict[str, Any]:
     """
@@ -349,6 +343,10 @@ async def search_hotels_aggregated(
     Returns hotels from multiple providers (HotelBeds, Juniper, Hummingbird, RTTC)
     via the Zorah Travel Platform aggregation endpoint.
 
+    Results are converted to ZAR, sorted and paged on the columnar HotelFrame;
+    hotel dicts are only built for the returned page. total_hotels is the
+    count before paging.
+
     Falls back to BigQuery hotel_rates pricing data when the Rates Engine
     returns 0 results for a destination.
     """
@@ -356,7 +354,7 @@ async def search_hotels_aggregated(
 
     try:
         client = get_travel_platform_rates_client()
-        result = await client.search_hotels_aggregated(
+        result, frame = await client.search_hotels_aggregated_frame(
             destination=destination,
             check_in=check_in,
             check_out=check_out,
@@ -364,13 +362,14 @@ async def search_hotels_aggregated(
             children=children,
         )
 
-        # Apply currency conversion for non-ZAR results
-        if result.get("hotels"):
-            await _apply_currency_conversion(result["hotels"])
-
-        # If Cloud Run returned hotels, return them
-        if result.get("hotels"):
+        # If Cloud Run returned hotels, convert and return the requested page
+        if frame is not None and len(frame):
+            await frame.convert_currency("ZAR")
+            order = frame.order(sort_by)
+            page = order[offset:offset + limit] if limit else order[offset:]
+            result["hotels"] = frame.to_hotels(page)
             return result
+        result.setdefault("hotels", [])
 
         # Fallback: query BigQuery hotel_rates for this destination
         logger.info(f"Aggregated search returned 0 hotels for {destination}, trying BigQuery fallback")
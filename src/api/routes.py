@@ -9,6 +9,7 @@ All API endpoints organized by domain:
 Each endpoint uses the X-Client-ID header for tenant identification.
 """
 
+import asyncio
 import logging
 from functools import lru_cache
 from fastapi import APIRouter, HTTPException, Depends, Header, Query, Body, Request, BackgroundTasks
@@ -220,10 +221,45 @@ async def sendgrid_inbound_legacy(
     return await receive_inbound_email(request, background_tasks)
 
 
+# ==================== PDF Responses ====================
+
+def _pdf_response(
+    kind: str,
+    config: ClientConfig,
+    payload: Any,
+    render,
+    disposition: str,
+    if_none_match: Optional[str] = None,
+    headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """
+    Serve a PDF from the content-addressed cache (src/services/pdf_cache.py).
+
+    The cache key is the ETag: a matching If-None-Match gets a 304 without
+    rendering, and a cache hit skips PDFGenerator entirely.
+    """
+    from src.services.pdf_cache import get_pdf_cache, pdf_cache_key, etag_matches
+
+    cache = get_pdf_cache()
+    key = pdf_cache_key(kind, config, payload) if cache else None
+    response_headers = {"Content-Disposition": disposition, **(headers or {})}
+    if key:
+        response_headers["ETag"] = f'"{key}"'
+        response_headers["Cache-Control"] = "private, no-cache"
+        if etag_matches(if_none_match, key):
+            return Response(status_code=304, headers=response_headers)
+
+    pdf_bytes = cache.get_or_render(key, render) if cache else render()
+    if not pdf_bytes:
+        raise HTTPException(status_code=500, detail=f"Failed to generate {kind} PDF")
+
+    return Response(content=pdf_bytes, media_type="application/pdf", headers=response_headers)
+
+
 # ==================== Quote Endpoints ====================
 
 @quotes_router.post("/generate")
-def generate_quote(
+async def generate_quote(
     request: QuoteGenerateRequest,
     config: ClientConfig = Depends(get_client_config),
     user: UserContext = Depends(get_current_user),
@@ -231,40 +267,31 @@ def generate_quote(
     """
     Generate a travel quote
 
-    Matches hotels, calculates pricing, generates PDF, and optionally sends email.
+    Matches hotels, calculates pricing and saves the quote. The PDF/email,
+    CRM update and notifications run as background jobs; poll
+    GET /quotes/{quote_id}/jobs for their outcome.
     """
-    from src.agents.quote_agent import QuoteAgent
-
     try:
-        agent = get_quote_agent(config)
+        agent = await asyncio.to_thread(get_quote_agent, config)
 
         # Convert inquiry to dict
         inquiry_data = request.inquiry.model_dump()
 
-        # Pass selected hotels if provided
-        result = agent.generate_quote(
+        # Pass selected hotels if provided; live rates are awaited on this loop
+        result = await agent.generate_quote_async(
             customer_data=inquiry_data,
             send_email=False if request.save_as_draft else request.send_email,
             assign_consultant=request.assign_consultant,
             selected_hotels=request.selected_hotels,
             initial_status='draft' if request.save_as_draft else 'quoted',
+            deliver_async=True,
         )
 
         # If quote was generated from an enquiry ticket, resolve the ticket
         if request.ticket_id and result.get('success'):
-            try:
-                from src.tools.supabase_tool import SupabaseTool
-                supabase = SupabaseTool(config)
-                supabase.update_ticket(
-                    ticket_id=request.ticket_id,
-                    status='resolved',
-                    notes=f"Quote {result.get('quote_id')} generated and sent to customer"
-                )
-                result['ticket_resolved'] = True
-                logger.info(f"Resolved ticket {request.ticket_id} after generating quote {result.get('quote_id')}")
-            except Exception as e:
-                logger.warning(f"Failed to resolve ticket {request.ticket_id}: {e}")
-                result['ticket_resolved'] = False
+            result['ticket_resolved'] = await asyncio.to_thread(
+                _resolve_quote_ticket, config, request.ticket_id, result.get('quote_id')
+            )
 
         return result
 
@@ -272,6 +299,23 @@ def generate_quote(
         log_and_raise(500, "generating quote", e, logger)
 
 
+def _resolve_quote_ticket(config: ClientConfig, ticket_id: str, quote_id: str) -> bool:
+    """Mark the enquiry ticket a quote was generated from as resolved"""
+    try:
+        from src.tools.supabase_tool import SupabaseTool
+        supabase = SupabaseTool(config)
+        supabase.update_ticket(
+            ticket_id=ticket_id,
+            status='resolved',
+            notes=f"Quote {quote_id} generated and sent to customer"
+        )
+        logger.info(f"Resolved ticket {ticket_id} after generating quote {quote_id}")
+        return True
+    except Exception as e:
+        logger.warning(f"Failed to resolve ticket {ticket_id}: {e}")
+        return False
+
+
 @quotes_router.post("/create-with-items")
 def create_quote_with_items(
     request: QuoteWithItemsRequest,
@@ -407,8 +451,8 @@ def create_quote_with_items(
         pdf_generated = False
         pdf_bytes = None
         try:
-            from src.utils.pdf_generator import PDFGenerator
-            pdf_generator = PDFGenerator(config)
+            from src.services.pdf_render_service import PooledPDFGenerator
+            pdf_generator = PooledPDFGenerator(config)
             customer_data = {
                 'name': inquiry.name,
                 'email': inquiry.email,
@@ -603,14 +647,43 @@ def get_quote(
         log_and_raise(500, "retrieving quote", e, logger)
 
 
+@quotes_router.get("/{quote_id}/jobs")
+def get_quote_jobs(
+    quote_id: str,
+    config: ClientConfig = Depends(get_client_config),
+    user: UserContext = Depends(get_current_user),
+):
+    """
+    Background job status for a quote (PDF/email delivery, CRM, notifications)
+
+    Each job reports status queued/running/retrying/completed/failed, its
+    attempts and last error; a completed quote.deliver job has
+    state.email_sent = true.
+    """
+    from src.services.job_queue import get_job_queue
+
+    try:
+        jobs = get_job_queue().list_jobs(config.client_id, quote_id)
+        return {
+            "success": True,
+            "quote_id": quote_id,
+            "data": [job.to_dict() for job in jobs],
+            "count": len(jobs)
+        }
+
+    except Exception as e:
+        log_and_raise(500, "retrieving quote jobs", e, logger)
+
+
 @quotes_router.get("/{quote_id}/pdf")
 def download_quote_pdf(
     quote_id: str,
     config: ClientConfig = Depends(get_client_config),
     user: UserContext = Depends(get_current_user),
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
 ):
-    """Generate and download quote PDF"""
-    from src.utils.pdf_generator import PDFGenerator
+    """Download quote PDF (cached; supports If-None-Match)"""
+    from src.services.pdf_render_service import render_pdf
 
     try:
         agent = get_quote_agent(config)
@@ -636,16 +709,11 @@ def download_quote_pdf(
 
         hotels = quote.get('hotels', [])
 
-        pdf_generator = PDFGenerator(config)
-        pdf_bytes = pdf_generator.generate_quote_pdf(quote, hotels, customer_data)
-
-        if not pdf_bytes:
-            raise HTTPException(status_code=500, detail="Failed to generate quote PDF")
-
-        return Response(
-            content=pdf_bytes,
-            media_type="application/pdf",
-            headers={"Content-Disposition": f'attachment; filename="Quote_{quote_id}.pdf"'}
+        return _pdf_response(
+            "quote", config, [quote, hotels, customer_data],
+            lambda: render_pdf("quote", config, quote, hotels, customer_data),
+            f'attachment; filename="Quote_{quote_id}.pdf"',
+            if_none_match
         )
 
     except HTTPException:
@@ -1285,7 +1353,7 @@ def create_manual_invoice(
 
 
 @invoices_router.get("")
-def list_invoices(
+async def list_invoices(
     status: Optional[str] = None,
     search: Optional[str] = Query(None, description="Search by customer name or invoice ID"),
     limit: int = Query(default=50, le=100),
@@ -1294,12 +1362,12 @@ def list_invoices(
     user: UserContext = Depends(get_current_user),
 ):
     """List invoices"""
-    from src.tools.supabase_tool import SupabaseTool
+    from src.tools.async_supabase_tool import AsyncSupabaseTool
 
     try:
         logger.info(f"[LIST_INVOICES] tenant_id={config.client_id}, status={status}, limit={limit}")
-        supabase = SupabaseTool(config)
-        invoices = supabase.list_invoices(status=status, search=search, limit=limit, offset=offset)
+        supabase = await AsyncSupabaseTool.create(config)
+        invoices = await supabase.list_invoices(status=status, search=search, limit=limit, offset=offset)
         logger.info(f"[LIST_INVOICES] Found {len(invoices)} invoices for tenant {config.client_id}")
 
         return {
@@ -1313,17 +1381,17 @@ def list_invoices(
 
 
 @invoices_router.get("/{invoice_id}")
-def get_invoice(
+async def get_invoice(
     invoice_id: str,
     config: ClientConfig = Depends(get_client_config),
     user: UserContext = Depends(get_current_user),
 ):
     """Get invoice by ID"""
-    from src.tools.supabase_tool import SupabaseTool
+    from src.tools.async_supabase_tool import AsyncSupabaseTool
 
     try:
-        supabase = SupabaseTool(config)
-        invoice = supabase.get_invoice(invoice_id)
+        supabase = await AsyncSupabaseTool.create(config)
+        invoice = await supabase.get_invoice(invoice_id)
 
         if not invoice:
             raise HTTPException(status_code=404, detail="Invoice not found")
@@ -1659,7 +1727,7 @@ def send_invoice_email(
 ):
     """Generate and send invoice PDF via email"""
     from src.tools.supabase_tool import SupabaseTool
-    from src.utils.pdf_generator import PDFGenerator
+    from src.services.pdf_render_service import render_pdf
     from src.utils.email_sender import EmailSender
     from src.agents.quote_agent import QuoteAgent
 
@@ -1702,8 +1770,7 @@ def send_invoice_email(
         }
 
         # Generate PDF
-        pdf_generator = PDFGenerator(config)
-        pdf_bytes = pdf_generator.generate_invoice_pdf(invoice_data, invoice.get('items', []), customer_data)
+        pdf_bytes = render_pdf("invoice", config, invoice_data, invoice.get('items', []), customer_data)
 
         if not pdf_bytes:
             raise HTTPException(status_code=500, detail="Failed to generate invoice PDF")
@@ -1745,10 +1812,11 @@ def download_invoice_pdf(
     invoice_id: str,
     config: ClientConfig = Depends(get_client_config),
     user: UserContext = Depends(get_current_user),
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
 ):
-    """Generate and download invoice PDF"""
+    """Download invoice PDF (cached; supports If-None-Match)"""
     from src.tools.supabase_tool import SupabaseTool
-    from src.utils.pdf_generator import PDFGenerator
+    from src.services.pdf_render_service import render_pdf
     from src.agents.quote_agent import QuoteAgent
 
     try:
@@ -1792,22 +1860,14 @@ def download_invoice_pdf(
             'phone': invoice.get('customer_phone', '')
         }
 
-        pdf_generator = PDFGenerator(config)
-        logger.info(f"Calling PDF generator with invoice_data keys: {list(invoice_data.keys())}")
-        pdf_bytes = pdf_generator.generate_invoice_pdf(invoice_data, invoice.get('items', []), customer_data)
+        items = invoice.get('items', [])
 
-        if not pdf_bytes:
-            logger.error("PDF generator returned empty bytes")
-            raise HTTPException(status_code=500, detail="Failed to generate invoice PDF - empty result")
-
-        logger.info(f"PDF generated successfully: {len(pdf_bytes)} bytes")
-        return Response(
-            content=pdf_bytes,
-            media_type="application/pdf",
-            headers={
-                "Content-Disposition": f'attachment; filename="Invoice_{invoice_id}.pdf"',
-                "Access-Control-Expose-Headers": "Content-Disposition"
-            }
+        return _pdf_response(
+            "invoice", config, [invoice_data, items, customer_data],
+            lambda: render_pdf("invoice", config, invoice_data, items, customer_data),
+            f'attachment; filename="Invoice_{invoice_id}.pdf"',
+            if_none_match,
+            headers={"Access-Control-Expose-Headers": "Content-Disposition, ETag"}
         )
 
     except HTTPException:
@@ -1907,13 +1967,15 @@ def get_invoice_public(invoice_id: str):
 @public_router.get("/invoices/{invoice_id}/pdf")
 def public_invoice_pdf(
     invoice_id: str,
-    x_client_id: Optional[str] = Header(None, alias="X-Client-ID")
+    x_client_id: Optional[str] = Header(None, alias="X-Client-ID"),
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match")
 ):
     """
     Public endpoint to download invoice PDF.
     Used for shareable invoice links that don't require authentication.
+    Served from the PDF cache with an ETag.
     """
-    from src.utils.pdf_generator import PDFGenerator
+    from src.services.pdf_render_service import render_pdf
 
     try:
         # Get invoice without tenant filter (public access)
@@ -1966,17 +2028,14 @@ def public_invoice_pdf(
             'phone': invoice.get('customer_phone', '')
         }
 
-        pdf_generator = PDFGenerator(config)
-        pdf_bytes = pdf_generator.generate_invoice_pdf(invoice_data, invoice.get('items', []), customer_data)
-
-        if not pdf_bytes:
-            raise HTTPException(status_code=500, detail="Failed to generate invoice PDF")
+        items = invoice.get('items', [])
 
         # Return as inline PDF (viewable in browser)
-        return Response(
-            content=pdf_bytes,
-            media_type="application/pdf",
-            headers={"Content-Disposition": f'inline; filename="Invoice_{invoice_id}.pdf"'}
+        return _pdf_response(
+            "invoice", config, [invoice_data, items, customer_data],
+            lambda: render_pdf("invoice", config, invoice_data, items, customer_data),
+            f'inline; filename="Invoice_{invoice_id}.pdf"',
+            if_none_match
         )
 
     except HTTPException:
@@ -2033,12 +2092,16 @@ def get_quote_public(quote_id: str):
 
 
 @public_router.get("/quotes/{quote_id}/pdf")
-def public_quote_pdf(quote_id: str):
+def public_quote_pdf(
+    quote_id: str,
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match")
+):
     """
     Public endpoint to view quote PDF.
     Used for shareable quote links that don't require authentication.
+    Served from the PDF cache with an ETag.
     """
-    from src.utils.pdf_generator import PDFGenerator
+    from src.services.pdf_render_service import render_pdf
 
     try:
         # Get quote without tenant filter (public access)
@@ -2074,17 +2137,12 @@ def public_quote_pdf(quote_id: str):
 
         hotels = quote.get('hotels', [])
 
-        pdf_generator = PDFGenerator(config)
-        pdf_bytes = pdf_generator.generate_quote_pdf(quote, hotels, customer_data)
-
-        if not pdf_bytes:
-            raise HTTPException(status_code=500, detail="Failed to generate quote PDF")
-
         # Return as inline PDF (viewable in browser)
-        return Response(
-            content=pdf_bytes,
-            media_type="application/pdf",
-            headers={"Content-Disposition": f'inline; filename="Quote_{quote_id}.pdf"'}
+        return _pdf_response(
+            "quote", config, [quote, hotels, customer_data],
+            lambda: render_pdf("quote", config, quote, hotels, customer_data),
+            f'inline; filename="Quote_{quote_id}.pdf"',
+            if_none_match
         )
 
     except HTTPException:
@@ -14,9 +14,7 @@ Endpoints:
 """
 
 import logging
-import asyncio
-import time
-from typing import List, Optional, Dict, Any, Tuple
+from typing import List, Optional, Dict, Any
 from datetime import date
 
 from fastapi import APIRouter, HTTPException, Depends, Query
@@ -24,56 +22,23 @@ from pydantic import BaseModel, Field
 
 from config.loader import ClientConfig
 from src.api.dependencies import get_client_config
+from src.services.search_cache import get_search_cache, search_key
 
 logger = logging.getLogger(__name__)
 
 # ============================================================
 # FLIGHT SEARCH DEDUP CACHE (single-flight pattern)
 # ============================================================
-# Prevents duplicate RTTC requests for the same route.
-# Uses asyncio.Lock per cache key so concurrent requests coalesce.
-
-_flight_cache: Dict[str, Tuple[float, dict]] = {}
-_flight_locks: Dict[str, asyncio.Lock] = {}
-FLIGHT_CACHE_TTL = 300  # 5 minutes
-
-
-def _evict_flight_cache():
-    """Remove expired entries from flight cache and stale locks."""
-    now = time.time()
-    expired = [k for k, (ts, _) in _flight_cache.items() if now - ts >= FLIGHT_CACHE_TTL]
-    for k in expired:
-        del _flight_cache[k]
-    # Clean up locks not used in 10 minutes
-    stale_locks = [k for k in _flight_locks if k not in _flight_cache]
-    for k in stale_locks:
-        del _flight_locks[k]
-
+# Prevents duplicate RTTC requests for the same route: concurrent
+# requests for a cache key share one fetch (see search_cache.py).
+# Other live searches are cached inside TravelPlatformRatesClient.
 
 async def get_flights_cached(cache_key: str, fetcher):
     """Single-flight pattern: only one request per cache key at a time."""
-    # Prune stale entries if cache is large
-    if len(_flight_cache) > 200:
-        _evict_flight_cache()
-
-    # Fast path: cache hit
-    if cache_key in _flight_cache:
-        ts, data = _flight_cache[cache_key]
-        if time.time() - ts < FLIGHT_CACHE_TTL:
-            logger.info(f"Flight cache hit for {cache_key}")
-            return data
-
-    # Slow path: acquire lock (coalescing)
-    lock = _flight_locks.setdefault(cache_key, asyncio.Lock())
-    async with lock:
-        # Double-check after acquiring lock
-        if cache_key in _flight_cache:
-            ts, data = _flight_cache[cache_key]
-            if time.time() - ts < FLIGHT_CACHE_TTL:
-                return data
-        result = await fetcher()
-        _flight_cache[cache_key] = (time.time(), result)
-        return result
+    cache = get_search_cache("flights")
+    if cache is None:
+        return await fetcher()
+    return await cache.get_or_fetch(search_key("flights", route=cache_key), fetcher)
 
 travel_router = APIRouter(prefix="/api/v1/travel", tags=["Travel Services"])
 
@@ -23,6 +23,7 @@ from src.services.unified_rag_service import (
     LocalKnowledgeService,
     RAGResponse
 )
+from src.services.retrieval_orchestrator import get_retrieval_orchestrator
 
 logger = logging.getLogger(__name__)
 
@@ -71,6 +72,10 @@ class UnifiedSearchResponse(BaseModel):
     )
     latency_ms: int
     query_id: str
+    timed_out: list = Field(
+        default=[],
+        description="Sources that missed their deadline (results are partial)"
+    )
 
 
 class HealthResponse(BaseModel):
@@ -148,7 +153,8 @@ async def unified_search(
             citations=response.citations,
             sources=response.sources,
             latency_ms=response.latency_ms,
-            query_id=response.query_id
+            query_id=response.query_id,
+            timed_out=response.timed_out
         )
 
     except Exception as e:
@@ -234,42 +240,28 @@ async def retrieve_only(
         local_service = LocalKnowledgeService(local_manager)
 
         results = []
+        client = TravelPlatformRAGClient()
 
-        # Search local knowledge
+        # Search local and global knowledge concurrently
+        sources = {}
         if request.include_local:
-            local_results = await local_service.search(
-                query=request.query,
-                top_k=request.top_k
-            )
-            results.extend([
-                {
-                    "content": r.content,
-                    "score": r.score,
-                    "source": "local",
-                    "doc_id": r.doc_id,
-                    "source_title": r.source_title
-                }
-                for r in local_results
-            ])
-
-        # Search global knowledge
+            sources["local"] = local_service.search(query=request.query, top_k=request.top_k)
         if request.include_global:
-            client = TravelPlatformRAGClient()
-            global_results = await client.retrieve_only(
-                query=request.query,
-                top_k=request.top_k
-            )
-            await client.close()
+            sources["global"] = client.retrieve_only(query=request.query, top_k=request.top_k)
+
+        outcomes = await get_retrieval_orchestrator().gather(sources)
+        await client.close()
 
+        for name, outcome in outcomes.items():
             results.extend([
                 {
                     "content": r.content,
                     "score": r.score,
-                    "source": "global",
+                    "source": name,
                     "doc_id": r.doc_id,
                     "source_title": r.source_title
                 }
-                for r in global_results
+                for r in outcome.value([])
             ])
 
         # Sort by score
@@ -279,7 +271,8 @@ async def retrieve_only(
             "success": True,
             "query": request.query,
             "results": results[:request.top_k],
-            "total": len(results)
+            "total": len(results),
+            "timed_out": [name for name, outcome in outcomes.items() if outcome.status == "timeout"]
         }
 
     except Exception as e:
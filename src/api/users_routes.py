@@ -15,6 +15,7 @@ from typing import Optional, List
 
 from src.middleware.auth_middleware import get_current_user, require_admin, UserContext
 from src.tools.supabase_tool import SupabaseTool
+from src.services.auth_context_cache import invalidate_user
 from src.utils.email_sender import EmailSender
 from config.loader import get_config
 
@@ -421,6 +422,9 @@ def update_user(
         if not updated_user:
             raise HTTPException(status_code=500, detail="Failed to update user")
 
+        # Role/name changes apply to the user's next request, not after the auth cache TTL
+        invalidate_user(user.tenant_id, user_id=user_id)
+
         return {
             "success": True,
             "user": UserResponse(
@@ -469,6 +473,9 @@ def deactivate_user(
         if not success:
             raise HTTPException(status_code=500, detail="Failed to deactivate user")
 
+        # Revoke cached sessions on every instance
+        invalidate_user(user.tenant_id, user_id=user_id)
+
         return {
             "success": True,
             "message": f"User {target_user['email']} has been deactivated"
@@ -16,63 +16,35 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import JSONResponse
 
 from src.services.auth_service import AuthService
+from src.services.auth_context_cache import get_auth_context_cache
 from src.utils.structured_logger import set_tenant_id
 from config.loader import get_config
 
 logger = logging.getLogger(__name__)
 
 
-# ==================== Tenant Suspension Cache ====================
+# ==================== Auth Context ====================
 
-# Simple time-based cache for tenant suspension status (avoids DB hit on every request)
-_tenant_status_cache: dict[str, tuple[str, float]] = {}
-_TENANT_STATUS_TTL = 300  # 5 minutes
+# Principals, tenant statuses and per-tenant AuthService instances are cached in
+# src/services/auth_context_cache.py, so steady-state requests do no I/O here.
 
 
-def _is_tenant_suspended(tenant_id: str) -> bool:
-    """
-    Check if a tenant is suspended, using a cached lookup.
-    Returns True if the tenant is confirmed suspended.
-    Returns False if active, unknown, or if the check fails (fail-open).
-    """
-    # Evict stale entries if cache is too large
-    if len(_tenant_status_cache) > 500:
-        now_evict = time.time()
-        expired = [k for k, (_, ts) in _tenant_status_cache.items()
-                   if now_evict - ts >= _TENANT_STATUS_TTL]
-        for k in expired:
-            del _tenant_status_cache[k]
-        if len(_tenant_status_cache) > 500:
-            for k in list(_tenant_status_cache.keys())[:len(_tenant_status_cache) // 2]:
-                del _tenant_status_cache[k]
-
-    now = time.time()
-    cached = _tenant_status_cache.get(tenant_id)
-    if cached and (now - cached[1]) < _TENANT_STATUS_TTL:
-        return cached[0] == "suspended"
-
-    # Refresh from DB
+def _build_auth_service(tenant_id: str) -> Optional[AuthService]:
+    """AuthService for a tenant (None if the tenant is unknown and no env fallback exists)"""
     try:
+        config = get_config(tenant_id)
+        return AuthService(
+            supabase_url=config.supabase_url,
+            supabase_key=config.supabase_service_key
+        )
+    except FileNotFoundError:
+        # Fallback to env vars - all tenants share the same Supabase instance
         supabase_url = os.getenv("SUPABASE_URL")
-        supabase_key = os.getenv("SUPABASE_SERVICE_KEY") or os.getenv("SUPABASE_KEY")
+        supabase_key = os.getenv("SUPABASE_SERVICE_KEY")
         if not supabase_url or not supabase_key:
-            return False
-
-        from supabase import create_client
-        client = create_client(supabase_url, supabase_key)
-        result = client.table("tenants").select("status").eq(
-            "tenant_id", tenant_id
-        ).execute()
-
-        if result.data and result.data[0].get("status") == "suspended":
-            _tenant_status_cache[tenant_id] = ("suspended", now)
-            return True
-        else:
-            _tenant_status_cache[tenant_id] = ("active", now)
-            return False
-    except Exception as e:
-        logger.debug(f"Tenant status check failed (fail-open): {e}")
-        return False
+            return None
+        logger.info(f"Tenant '{tenant_id}' not in DB config cache, using env vars for auth")
+        return AuthService(supabase_url=supabase_url, supabase_key=supabase_key)
 
 
 # ==================== Spoofing Rate Limiter ====================
@@ -149,6 +121,7 @@ PUBLIC_PATHS = {
     "/api/v1/helpdesk/faiss-status",
     "/api/v1/helpdesk/test-search",
     "/api/v1/helpdesk/ask",
+    "/api/v1/helpdesk/ask/stream",
     "/api/v1/helpdesk/topics",
     "/api/v1/helpdesk/search",
 }
@@ -233,7 +206,7 @@ class AuthMiddleware:
 
     For authenticated requests:
     - Validates the JWT token from Authorization header
-    - Fetches user from organization_users table
+    - Fetches user from organization_users table (cached per token, see auth_context_cache)
     - Verifies user belongs to the tenant (from X-Client-ID)
     - Attaches UserContext to request.state.user
 
@@ -292,22 +265,13 @@ class AuthMiddleware:
         tenant_id = headers_dict.get("x-client-id") or os.getenv("CLIENT_ID", "africastay")
 
         try:
-            # Get tenant config for Supabase credentials
-            try:
-                config = get_config(tenant_id)
-                auth_service = AuthService(
-                    supabase_url=config.supabase_url,
-                    supabase_key=config.supabase_service_key
-                )
-            except FileNotFoundError:
-                # Fallback to env vars - all tenants share the same Supabase instance
-                supabase_url = os.getenv("SUPABASE_URL")
-                supabase_key = os.getenv("SUPABASE_SERVICE_KEY")
-                if not supabase_url or not supabase_key:
-                    await self._send_json(send, 400, {"detail": f"Unknown client: {tenant_id}"})
-                    return
-                logger.info(f"Tenant '{tenant_id}' not in DB config cache, using env vars for auth")
-                auth_service = AuthService(supabase_url=supabase_url, supabase_key=supabase_key)
+            auth_context = get_auth_context_cache()
+
+            # Reused per tenant (no client construction per request)
+            auth_service = auth_context.get_auth_service(tenant_id, lambda: _build_auth_service(tenant_id))
+            if auth_service is None:
+                await self._send_json(send, 400, {"detail": f"Unknown client: {tenant_id}"})
+                return
 
             # Verify JWT (sync - fast operation, just decodes token)
             valid, payload = auth_service.verify_jwt(token)
@@ -321,11 +285,16 @@ class AuthMiddleware:
                 await self._send_json(send, 401, {"detail": "Invalid token payload"})
                 return
 
-            # Fetch user from database (uses asyncio.to_thread internally)
-            user = await auth_service.get_user_by_auth_id(auth_user_id, tenant_id)
-            if not user:
-                await self._send_json(send, 401, {"detail": "User not found in this organization"})
-                return
+            # Cached per (tenant, sub, iat); only a miss reaches the database
+            principal_key = (tenant_id, auth_user_id, payload.get("iat"))
+            user = auth_context.get_principal(principal_key)
+            if user is None:
+                user = await auth_service.get_user_by_auth_id(auth_user_id, tenant_id)
+                if not user:
+                    await self._send_json(send, 401, {"detail": "User not found in this organization"})
+                    return
+                if user.get("is_active", False):
+                    auth_context.put_principal(principal_key, user)
 
             if not user.get("is_active", False):
                 await self._send_json(send, 401, {"detail": "User account is deactivated"})
@@ -358,8 +327,8 @@ class AuthMiddleware:
                 await self._send_json(send, 403, {"detail": "Access denied: tenant mismatch"})
                 return
 
-            # Check if tenant is suspended
-            if _is_tenant_suspended(user["tenant_id"]):
+            # Check if tenant is suspended (cached, refreshed in the background)
+            if await auth_context.is_tenant_suspended(user["tenant_id"]):
                 await self._send_json(send, 403, {"detail": "Tenant account is suspended"})
                 return
 
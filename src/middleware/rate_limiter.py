@@ -4,6 +4,20 @@ Rate Limiting Middleware for Multi-Tenant API
 Provides per-tenant rate limiting with configurable limits.
 Uses in-memory storage for development, Redis for production.
 
+RateLimitMiddleware uses AsyncRateLimiter: a GCRA limit (N requests per
+window, bursts up to N) keyed by tenant and route template, so
+/quotes/Q-123 and /quotes/Q-124 share one counter. With REDIS_URL set the
+limit is enforced by one Lua script per Redis round trip (atomic across
+instances) through the asyncio client, and each instance leases a small
+batch of tokens at a time, so most requests are decided locally without
+touching Redis. x-ratelimit-reset is the number of seconds until the full
+quota is available again; 429 responses carry Retry-After.
+
+Configuration via environment variables:
+- REDIS_URL: Share limits across instances
+- RATE_LIMIT_LEASE_MAX: Most tokens an instance leases per Redis call (default: 20; 1 = no leasing)
+- RATE_LIMIT_LEASE_TTL: Seconds an unused lease is kept (default: 1)
+
 Usage:
     from src.middleware.rate_limiter import RateLimiter, rate_limit
     
@@ -16,11 +30,15 @@ Usage:
         pass
 """
 
+import os
+import math
 import time
+import heapq
 import logging
-from typing import Dict, Optional, Callable
+from typing import Dict, List, Optional, Callable, Tuple
 from functools import wraps
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 
 from fastapi import Request, HTTPException, Response
@@ -49,14 +67,17 @@ class InMemoryRateLimitStore(RateLimitStore):
     def __init__(self):
         self._counts: Dict[str, int] = defaultdict(int)
         self._expiry: Dict[str, float] = {}
+        self._expiry_heap: List[Tuple[float, str]] = []  # (expiry, key), soonest first
     
     def _clean_expired(self):
-        """Remove expired entries"""
+        """Remove expired entries (pops only the expired heads of the expiry heap)"""
         now = time.time()
-        expired = [k for k, exp in self._expiry.items() if exp < now]
-        for k in expired:
-            del self._counts[k]
-            del self._expiry[k]
+        while self._expiry_heap and self._expiry_heap[0][0] < now:
+            exp, k = heapq.heappop(self._expiry_heap)
+            # Skip heap entries superseded by a newer window for the same key
+            if self._expiry.get(k) == exp:
+                del self._counts[k]
+                del self._expiry[k]
     
     def get_count(self, key: str) -> int:
         self._clean_expired()
@@ -74,6 +95,7 @@ class InMemoryRateLimitStore(RateLimitStore):
         if key not in self._expiry or self._expiry[key] < now:
             self._counts[key] = 1
             self._expiry[key] = now + window_seconds
+            heapq.heappush(self._expiry_heap, (self._expiry[key], key))
             return 1
         
         # Increment existing
@@ -323,10 +345,282 @@ class RateLimiter:
             self.store.increment(key, 86400)  # 24 hours
 
 
+# ==================== Async Rate Limiter ====================
+
+RATE_LIMIT_LEASE_MAX = max(1, int(os.getenv("RATE_LIMIT_LEASE_MAX", "20")))
+RATE_LIMIT_LEASE_TTL = float(os.getenv("RATE_LIMIT_LEASE_TTL", "1"))
+
+# Share of a limit one instance may lease at once (limit 600 -> 12 tokens per Redis call)
+LEASE_FRACTION = 50
+
+# Route templates remembered per raw path
+MAX_ROUTE_TEMPLATES = 4096
+
+# Single bucket for paths that match no route (404 scans stay one key per tenant)
+UNMATCHED_ROUTE = "<unmatched>"
+
+# GCRA (generic cell rate algorithm): one value per key, the theoretical
+# arrival time (TAT) of the next request in ms. A limit of N per W seconds
+# emits a token every W/N seconds and allows bursts of N. The script grants
+# up to `cost` tokens atomically and reports what it granted, so an instance
+# can lease a batch of tokens in one round trip. Server time (TIME) keeps
+# instances with skewed clocks consistent.
+GCRA_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2]) * 1000
+local cost = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local interval = window / limit
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then tat = now end
+local granted = math.min(cost, math.floor((now + window - tat) / interval + 1e-6))
+if granted > 0 then
+  tat = tat + granted * interval
+  redis.call('SET', KEYS[1], string.format('%.3f', tat), 'PX', math.ceil(tat - now))
+else
+  granted = 0
+end
+local remaining = math.floor((now + window - tat) / interval + 1e-6)
+local retry_after = 0
+if granted == 0 then retry_after = tat + interval - window - now end
+return {granted, remaining, math.ceil(tat - now), math.ceil(retry_after)}
+"""
+
+
+@dataclass
+class RateLimitResult:
+    """Outcome of a rate limit check (times in seconds from now)"""
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_after: float  # until the full quota is available again
+    retry_after: float = 0.0  # until the next request would be allowed (denied requests)
+
+    def headers(self) -> List[Tuple[bytes, bytes]]:
+        headers = [
+            (b"x-ratelimit-limit", str(self.limit).encode()),
+            (b"x-ratelimit-remaining", str(max(0, self.remaining)).encode()),
+            (b"x-ratelimit-reset", str(math.ceil(self.reset_after)).encode()),
+        ]
+        if not self.allowed:
+            headers.append((b"retry-after", str(max(1, math.ceil(self.retry_after))).encode()))
+        return headers
+
+
+def _tokens(span: float, interval: float) -> int:
+    """Whole tokens that fit in span (tolerating float rounding)"""
+    return math.floor(span / interval + 1e-6)
+
+
+class LocalGCRA:
+    """
+    In-process GCRA with the same semantics as GCRA_SCRIPT.
+
+    Keys are kept in update order; expired keys are dropped from the front,
+    so upkeep is O(1) amortized instead of a scan per request.
+    """
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._tat: "OrderedDict[str, float]" = OrderedDict()
+
+    def acquire(self, key: str, limit: int, window: float, cost: int = 1) -> Tuple[int, int, float, float]:
+        """Grant up to cost tokens; returns (granted, remaining, reset_after, retry_after)"""
+        now = time.monotonic()
+        interval = window / limit
+        tat = max(self._tat.get(key, now), now)
+        granted = max(0, min(cost, _tokens(now + window - tat, interval)))
+        if granted:
+            tat += granted * interval
+            self._tat[key] = tat
+            self._tat.move_to_end(key)
+        remaining = _tokens(now + window - tat, interval)
+        retry_after = 0.0 if granted else tat + interval - window - now
+        self._evict(now)
+        return granted, remaining, tat - now, retry_after
+
+    def _evict(self, now: float):
+        while self._tat:
+            key, tat = next(iter(self._tat.items()))
+            if tat > now and len(self._tat) <= self.max_keys:
+                break
+            del self._tat[key]
+
+    def clear(self):
+        self._tat.clear()
+
+
+@dataclass
+class _Lease:
+    """Tokens granted by Redis that this instance may hand out locally"""
+    tokens: int
+    remaining: int  # quota left in Redis after the lease was granted
+    reset_at: float
+    expires_at: float
+
+
+class AsyncRateLimiter:
+    """
+    Non-blocking rate limiter used by RateLimitMiddleware.
+
+    Without Redis every check is a LocalGCRA lookup. With Redis, a check
+    first consumes a locally leased token; only when the lease is empty or
+    stale does it run GCRA_SCRIPT (asking for a batch of tokens). Keys that
+    Redis rejected are answered locally until their retry time passes.
+    """
+
+    def __init__(self, redis_url: Optional[str] = None):
+        self.redis_url = redis_url
+        self._redis = None
+        self._script = None
+        self._local = LocalGCRA()
+        self._leases: Dict[str, _Lease] = {}
+        self._blocked_until: Dict[str, float] = {}
+        self._stats = {"local": 0, "redis_calls": 0, "redis_errors": 0}
+
+    def _get_script(self):
+        if self._script is None and self.redis_url:
+            try:
+                import redis.asyncio as aioredis
+                self._redis = aioredis.from_url(self.redis_url)
+                self._script = self._redis.register_script(GCRA_SCRIPT)
+                logger.info("Using Redis GCRA rate limiting")
+            except Exception as e:
+                logger.warning(f"Async Redis unavailable, rate limiting in-process: {e}")
+                self.redis_url = None
+        return self._script
+
+    @staticmethod
+    def lease_size(limit: int) -> int:
+        return max(1, min(RATE_LIMIT_LEASE_MAX, limit // LEASE_FRACTION))
+
+    def _check_local(self, key: str, limit: int, window: int) -> RateLimitResult:
+        granted, remaining, reset_after, retry_after = self._local.acquire(key, limit, window)
+        return RateLimitResult(bool(granted), limit, remaining, reset_after, retry_after)
+
+    async def check(self, key: str, limit: int, window: int) -> RateLimitResult:
+        """Consume one request for a key"""
+        script = self._get_script()
+        if script is None:
+            self._stats["local"] += 1
+            return self._check_local(key, limit, window)
+
+        now = time.monotonic()
+        lease = self._leases.get(key)
+        if lease and lease.tokens > 0 and lease.expires_at > now:
+            lease.tokens -= 1
+            self._stats["local"] += 1
+            return RateLimitResult(True, limit, lease.remaining + lease.tokens, max(0.0, lease.reset_at - now))
+
+        blocked_until = self._blocked_until.get(key)
+        if blocked_until is not None:
+            if blocked_until > now:
+                self._stats["local"] += 1
+                return RateLimitResult(False, limit, 0, blocked_until - now + window, blocked_until - now)
+            del self._blocked_until[key]
+
+        try:
+            self._stats["redis_calls"] += 1
+            granted, remaining, reset_ms, retry_ms = await script(
+                keys=[key], args=[limit, window, self.lease_size(limit)]
+            )
+        except Exception as e:
+            # Redis trouble must not take the API down: enforce per instance meanwhile
+            self._stats["redis_errors"] += 1
+            logger.warning(f"Redis rate limit check failed, using in-process limit: {e}")
+            return self._check_local(key, limit, window)
+
+        now = time.monotonic()
+        reset_after = int(reset_ms) / 1000
+        if int(granted) <= 0:
+            retry_after = int(retry_ms) / 1000
+            self._blocked_until[key] = now + retry_after
+            return RateLimitResult(False, limit, 0, reset_after, retry_after)
+
+        extra = int(granted) - 1
+        if extra:
+            if len(self._leases) > MAX_ROUTE_TEMPLATES * 4:
+                self._leases = {k: v for k, v in self._leases.items() if v.expires_at > now}
+            self._leases[key] = _Lease(extra, int(remaining), now + reset_after, now + RATE_LIMIT_LEASE_TTL)
+        return RateLimitResult(True, limit, int(remaining) + extra, reset_after)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {**self._stats, "leases": len(self._leases)}
+
+    async def close(self):
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+            self._script = None
+
+
+_async_limiter: Optional[AsyncRateLimiter] = None
+
+
+def get_async_rate_limiter() -> AsyncRateLimiter:
+    """Get the process-wide middleware rate limiter"""
+    global _async_limiter
+    if _async_limiter is None:
+        _async_limiter = AsyncRateLimiter(os.getenv("REDIS_URL"))
+    return _async_limiter
+
+
+async def close_async_rate_limiter():
+    """Close the middleware rate limiter's Redis connections (application shutdown)"""
+    if _async_limiter is not None:
+        await _async_limiter.close()
+
+
+def reset_async_rate_limiter():
+    """Forget the middleware rate limiter and its local state (for testing)"""
+    global _async_limiter
+    _async_limiter = None
+    _route_templates.clear()
+
+
+_route_templates: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+
+
+def route_template(scope) -> str:
+    """
+    Route path template for a request (e.g. /api/v1/quotes/{quote_id}).
+
+    Matched against the app's routes once per distinct path, then cached.
+    Falls back to the raw path when the app exposes no router.
+    """
+    path = scope.get("path", "")
+    router = getattr(scope.get("app"), "router", None)
+    if router is None:
+        return path
+
+    cache_key = (scope.get("method", ""), path)
+    template = _route_templates.get(cache_key)
+    if template is not None:
+        _route_templates.move_to_end(cache_key)
+        return template
+
+    from starlette.routing import Match
+
+    template = UNMATCHED_ROUTE
+    for route in router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            template = getattr(route, "path", path)
+            break
+        if match == Match.PARTIAL and template == UNMATCHED_ROUTE:
+            template = getattr(route, "path", path)
+
+    _route_templates[cache_key] = template
+    if len(_route_templates) > MAX_ROUTE_TEMPLATES:
+        _route_templates.popitem(last=False)
+    return template
+
+
 # ==================== Middleware ====================
 
 class RateLimitMiddleware:
-    """Pure ASGI middleware for rate limiting"""
+    """Pure ASGI middleware for rate limiting (see AsyncRateLimiter)"""
 
     # Paths to skip rate limiting
     SKIP_PATHS = {
@@ -355,7 +649,6 @@ class RateLimitMiddleware:
             return
 
         # Get tenant ID from headers
-        import os
         tenant_id = None
         for key, value in scope.get("headers", []):
             if key == b"x-client-id":
@@ -367,26 +660,20 @@ class RateLimitMiddleware:
         # Get rate limit for this endpoint
         max_requests, window_seconds = RateLimitConfig.get_limit(path)
 
-        # Check rate limit
-        limiter = RateLimiter()
-        allowed, current, limit, reset = limiter.check_rate_limit(
-            tenant_id, path, max_requests, window_seconds
-        )
+        # One counter per tenant and route template (not per concrete path)
+        key = f"ratelimit:{tenant_id}:{route_template(scope)}"
+        result = await get_async_rate_limiter().check(key, max_requests, window_seconds)
 
         # Rate limit headers to add
-        rl_headers = [
-            (b"x-ratelimit-limit", str(limit).encode()),
-            (b"x-ratelimit-remaining", str(max(0, limit - current)).encode()),
-            (b"x-ratelimit-reset", str(reset).encode()),
-        ]
+        rl_headers = result.headers()
 
-        if not allowed:
+        if not result.allowed:
             logger.warning(f"Rate limit exceeded for {tenant_id} on {path}")
             import json
             body = json.dumps({
                 'error': 'Rate limit exceeded',
-                'message': f'Too many requests. Limit: {limit} per {window_seconds}s',
-                'retry_after': reset
+                'message': f'Too many requests. Limit: {result.limit} per {window_seconds}s',
+                'retry_after': max(1, math.ceil(result.retry_after))
             }).encode()
             await send({
                 "type": "http.response.start",
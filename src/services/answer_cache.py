@@ -0,0 +1,567 @@
+"""
+Answer Cache - Semantic Cache for Helpdesk and RAG Answers
+
+Helpdesk traffic repeats itself: many agents ask the same handful of
+questions, phrased slightly differently. Every miss costs a Travel Platform
+RAG round trip and/or an OpenAI synthesis call, so answers are cached per
+tenant and reused for exact and near-duplicate questions.
+
+Keys:
+- Scope: namespace + tenant + QueryClassifier type + knowledge base version.
+  Uploading, re-indexing or deleting a tenant document bumps the tenant's
+  version (admin changes to the shared KB bump the global one), so stale
+  answers are never served - they just stop matching and expire.
+- Exact match: the normalized question (lowercased, punctuation and
+  stopwords dropped, plurals folded).
+- Near-duplicate match: MinHash signatures over word unigrams + bigrams,
+  bucketed with LSH (8 bands x 4 rows) and confirmed by exact Jaccard
+  similarity >= ANSWER_CACHE_SIMILARITY. A near match also needs the
+  same numbers, months/weekdays and capitalized names as the cached
+  question: "price in December" must not reuse the answer for "price in
+  January" just because the rest of the wording is identical.
+
+Storage:
+- L1: per-process LRU with a short TTL
+- L2: Redis (REDIS_URL), shared by all workers, including KB versions and
+  hit-rate counters. Without Redis the cache is process-local and KB
+  invalidation only reaches the worker that made the change; the L1 TTL
+  bounds staleness elsewhere.
+"""
+
+import os
+import re
+import json
+import time
+import random
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+ANSWER_CACHE_ENABLED = os.getenv("ANSWER_CACHE_ENABLED", "true").lower() == "true"
+ANSWER_CACHE_TTL = int(os.getenv("ANSWER_CACHE_TTL", "3600"))
+ANSWER_CACHE_L1_TTL = int(os.getenv("ANSWER_CACHE_L1_TTL", "300"))
+ANSWER_CACHE_L1_SIZE = int(os.getenv("ANSWER_CACHE_L1_SIZE", "2048"))
+ANSWER_CACHE_SIMILARITY = float(os.getenv("ANSWER_CACHE_SIMILARITY", "0.8"))
+
+# MinHash / LSH layout: 32 hashes split into 8 bands of 4 rows. Questions
+# with Jaccard 0.8 share a band with probability ~0.98, at 0.4 ~0.2.
+MINHASH_PERMUTATIONS = 32
+LSH_BANDS = 8
+LSH_ROWS = MINHASH_PERMUTATIONS // LSH_BANDS
+
+# Cap on near-duplicate candidates verified per lookup
+MAX_CANDIDATES = 32
+
+# Tenant id for the shared (Travel Platform / admin) knowledge base
+GLOBAL_KB = "__global__"
+
+REDIS_PREFIX = "answer_cache:"
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(20240611)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(MINHASH_PERMUTATIONS)
+]
+
+# Words that do not change what is being asked. Question words and
+# negations are deliberately kept.
+_STOPWORDS = frozenset({
+    "a", "an", "the", "is", "are", "was", "were", "be", "been", "am",
+    "do", "does", "did", "can", "could", "would", "should", "will", "shall",
+    "i", "me", "my", "we", "us", "our", "you", "your", "it", "its",
+    "this", "that", "these", "those", "there", "to", "of", "for", "in", "on",
+    "at", "by", "and", "or", "about", "with", "please", "tell", "know",
+    "hi", "hello", "hey", "thanks", "thank", "any", "some", "just",
+})
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_RAW_WORD_RE = re.compile(r"[A-Za-z0-9]+")
+
+# Date words that change the answer. "may" is left out (it is mostly the
+# verb); a capitalized "May" is still caught as a name.
+_DATE_WORDS = frozenset({
+    "january", "february", "march", "april", "june", "july", "august",
+    "september", "october", "november", "december",
+    "jan", "feb", "mar", "apr", "jun", "jul", "aug", "sep", "sept", "oct", "nov", "dec",
+    "monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday",
+})
+
+
+def _fold(word: str) -> str:
+    """Crude plural folding so 'hotels' and 'hotel' match"""
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def normalize_question(question: str) -> List[str]:
+    """Tokens of a question with case, punctuation, stopwords and plurals removed"""
+    text = (question or "").lower().replace("'s", "").replace("'", "")
+    words = _WORD_RE.findall(text)
+    tokens = [_fold(w) for w in words if w not in _STOPWORDS]
+    # A question made only of stopwords still needs a key
+    return tokens or words
+
+
+def question_entities(question: str) -> FrozenSet[str]:
+    """
+    Tokens a near match must share exactly: numbers, months/weekdays and
+    capitalized words (names, places) after the first word.
+    """
+    text = (question or "").replace("'s", "").replace("'", "")
+    entities = set()
+    for i, word in enumerate(_RAW_WORD_RE.findall(text)):
+        lowered = word.lower()
+        if lowered in _STOPWORDS:
+            continue
+        if any(c.isdigit() for c in word) or lowered in _DATE_WORDS or (i > 0 and word[0].isupper()):
+            entities.add(_fold(lowered))
+    return frozenset(entities)
+
+
+def question_shingles(tokens: List[str]) -> FrozenSet[str]:
+    """Word unigrams and bigrams"""
+    bigrams = (f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+    return frozenset(tokens).union(bigrams)
+
+
+def _shingle_hash(shingle: str) -> int:
+    return int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=8).digest(), "big")
+
+
+def minhash_signature(shingles: FrozenSet[str]) -> List[int]:
+    """MinHash signature (one minimum per permutation)"""
+    hashes = [_shingle_hash(s) for s in shingles]
+    if not hashes:
+        return [0] * MINHASH_PERMUTATIONS
+    return [min((a * h + b) % _MERSENNE_PRIME for h in hashes) for a, b in _PERMUTATIONS]
+
+
+def lsh_bands(signature: List[int]) -> List[str]:
+    """One bucket key per band"""
+    bands = []
+    for band in range(LSH_BANDS):
+        rows = signature[band * LSH_ROWS:(band + 1) * LSH_ROWS]
+        digest = hashlib.blake2b(repr(rows).encode(), digest_size=8).hexdigest()
+        bands.append(f"{band}:{digest}")
+    return bands
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class _Fingerprint:
+    """Exact key, shingles and LSH buckets of one question"""
+
+    __slots__ = ("key", "shingles", "bands", "entities")
+
+    def __init__(self, question: str):
+        tokens = normalize_question(question)
+        self.key = hashlib.sha1(" ".join(tokens).encode()).hexdigest()
+        self.shingles = question_shingles(tokens)
+        self.bands = lsh_bands(minhash_signature(self.shingles))
+        self.entities = question_entities(question)
+
+
+def _same_entities(fingerprint: _Fingerprint, entry: Dict[str, Any], shingles: FrozenSet[str]) -> bool:
+    """
+    True if each question's numbers, dates and names all appear in the
+    other question (case-insensitively, so "zanzibar" matches "Zanzibar").
+    Entries stored before entities were recorded only match exactly.
+    """
+    entities = entry.get("entities")
+    if entities is None:
+        return False
+    return set(entities) <= fingerprint.shingles and fingerprint.entities <= shingles
+
+
+class AnswerCache:
+    """
+    Tenant-scoped exact + near-duplicate answer cache.
+
+    Thread-safe; one instance per process via get_answer_cache().
+    """
+
+    STAT_FIELDS = ("lookups", "hits_exact", "hits_near", "misses", "stores", "invalidations", "llm_calls_saved")
+
+    def __init__(
+        self,
+        ttl: int = ANSWER_CACHE_TTL,
+        l1_ttl: int = ANSWER_CACHE_L1_TTL,
+        l1_size: int = ANSWER_CACHE_L1_SIZE,
+        similarity: float = ANSWER_CACHE_SIMILARITY
+    ):
+        self.ttl = ttl
+        self.l1_ttl = min(l1_ttl, ttl)
+        self.l1_size = l1_size
+        self.similarity = similarity
+
+        self._lock = threading.Lock()
+        # (scope, question key) -> entry, in LRU order
+        self._entries: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+        self._buckets: Dict[Tuple[str, str], set] = {}
+        self._versions: Dict[str, int] = {}
+        self._stats = {field: 0 for field in self.STAT_FIELDS}
+
+        self._redis = None
+        self._redis_available = None
+
+    # ==================== Redis ====================
+
+    def _get_redis_client(self):
+        """Get Redis client (lazy initialization with fallback)"""
+        if self._redis_available is False:
+            return None
+
+        if self._redis is None:
+            redis_url = os.getenv("REDIS_URL")
+            if redis_url:
+                try:
+                    import redis
+                    self._redis = redis.from_url(redis_url)
+                    self._redis.ping()
+                    self._redis_available = True
+                    logger.info("Redis connected for answer cache")
+                except Exception as e:
+                    logger.warning(f"Redis not available for answer cache, using in-process cache only: {e}")
+                    self._redis_available = False
+                    self._redis = None
+            else:
+                self._redis_available = False
+
+        return self._redis
+
+    def _count(self, **counts: int):
+        with self._lock:
+            for field, amount in counts.items():
+                self._stats[field] += amount
+
+        redis_client = self._get_redis_client()
+        if redis_client:
+            try:
+                pipe = redis_client.pipeline(transaction=False)
+                for field, amount in counts.items():
+                    pipe.hincrby(f"{REDIS_PREFIX}stats", field, amount)
+                pipe.execute()
+            except Exception as e:
+                logger.debug(f"Answer cache stats write failed: {e}")
+
+    # ==================== KB versions ====================
+
+    def kb_version(self, tenant_id: str) -> str:
+        """Combined tenant + shared knowledge base version"""
+        redis_client = self._get_redis_client()
+        if redis_client:
+            try:
+                tenant_v, global_v = redis_client.mget(
+                    f"{REDIS_PREFIX}kbv:{tenant_id}", f"{REDIS_PREFIX}kbv:{GLOBAL_KB}"
+                )
+                return f"{int(tenant_v or 0)}.{int(global_v or 0)}"
+            except Exception as e:
+                logger.warning(f"Answer cache version read failed: {e}")
+
+        with self._lock:
+            return f"{self._versions.get(tenant_id, 0)}.{self._versions.get(GLOBAL_KB, 0)}"
+
+    def bump_kb_version(self, tenant_id: str):
+        """Invalidate every cached answer of a tenant (GLOBAL_KB: of all tenants)"""
+        with self._lock:
+            self._versions[tenant_id] = self._versions.get(tenant_id, 0) + 1
+            stale = [
+                key for key in self._entries
+                if tenant_id == GLOBAL_KB or key[0].split(":")[1] == tenant_id
+            ]
+            for key in stale:
+                self._drop(key)
+
+        redis_client = self._get_redis_client()
+        if redis_client:
+            try:
+                redis_client.incr(f"{REDIS_PREFIX}kbv:{tenant_id}")
+            except Exception as e:
+                logger.warning(f"Answer cache version bump failed for {tenant_id}: {e}")
+
+        self._count(invalidations=1)
+        logger.info(f"Answer cache invalidated for {tenant_id}")
+
+    # ==================== Lookup / store ====================
+
+    def _scope(self, namespace: str, tenant_id: str, query_type: str) -> str:
+        return f"{namespace}:{tenant_id}:{query_type}:{self.kb_version(tenant_id)}"
+
+    def get(
+        self,
+        tenant_id: str,
+        question: str,
+        query_type: str = "general",
+        namespace: str = "helpdesk"
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached answer.
+
+        Returns:
+            A copy of the cached response with 'cache' details
+            ({'match': 'exact'|'near', 'similarity'}), or None on a miss
+        """
+        scope = self._scope(namespace, tenant_id, query_type)
+        fingerprint = _Fingerprint(question)
+
+        hit = self._get_local(scope, fingerprint)
+        if hit is None:
+            hit = self._get_redis(scope, fingerprint)
+
+        if hit is None:
+            self._count(lookups=1, misses=1)
+            return None
+
+        entry, similarity = hit
+        match = "exact" if similarity >= 1.0 else "near"
+        self._count(lookups=1, llm_calls_saved=entry.get("llm_calls", 1), **{f"hits_{match}": 1})
+
+        response = json.loads(entry["response"])
+        response["cache"] = {"match": match, "similarity": round(similarity, 3)}
+        return response
+
+    def put(
+        self,
+        tenant_id: str,
+        question: str,
+        response: Dict[str, Any],
+        query_type: str = "general",
+        namespace: str = "helpdesk",
+        llm_calls: int = 1
+    ):
+        """
+        Cache an answer.
+
+        Args:
+            response: JSON-serializable response dict
+            llm_calls: LLM calls a hit on this entry saves
+        """
+        scope = self._scope(namespace, tenant_id, query_type)
+        fingerprint = _Fingerprint(question)
+
+        try:
+            entry = {
+                "key": fingerprint.key,
+                "bands": fingerprint.bands,
+                "shingles": sorted(fingerprint.shingles),
+                "entities": sorted(fingerprint.entities),
+                "response": json.dumps(response, default=str),
+                "llm_calls": llm_calls,
+            }
+        except (TypeError, ValueError) as e:
+            logger.debug(f"Answer not cacheable: {e}")
+            return
+
+        self._put_local(scope, entry)
+        self._put_redis(scope, entry)
+        self._count(stores=1)
+
+    def _best_match(self, fingerprint: _Fingerprint, candidates) -> Optional[Tuple[Dict[str, Any], float]]:
+        best = None
+        for entry in candidates:
+            shingles = frozenset(entry["shingles"])
+            similarity = jaccard(fingerprint.shingles, shingles)
+            if similarity >= self.similarity and (best is None or similarity > best[1]) \
+                    and _same_entities(fingerprint, entry, shingles):
+                best = (entry, similarity)
+        return best
+
+    # L1
+
+    def _drop(self, key: Tuple[str, str]):
+        """Remove an L1 entry and its bucket references (lock held)"""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for band in entry["bands"]:
+            bucket = self._buckets.get((key[0], band))
+            if bucket is not None:
+                bucket.discard(key[1])
+                if not bucket:
+                    del self._buckets[(key[0], band)]
+
+    def _get_local(self, scope: str, fingerprint: _Fingerprint):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get((scope, fingerprint.key))
+            if entry is not None and entry["expires"] > now:
+                self._entries.move_to_end((scope, fingerprint.key))
+                return entry, 1.0
+
+            candidates = set()
+            for band in fingerprint.bands:
+                candidates |= self._buckets.get((scope, band), set())
+
+            live = []
+            for key in list(candidates)[:MAX_CANDIDATES]:
+                entry = self._entries.get((scope, key))
+                if entry is None:
+                    continue
+                if entry["expires"] <= now:
+                    self._drop((scope, key))
+                    continue
+                live.append(entry)
+
+            best = self._best_match(fingerprint, live)
+            if best is not None:
+                self._entries.move_to_end((scope, best[0]["key"]))
+            return best
+
+    def _put_local(self, scope: str, entry: Dict[str, Any]):
+        key = entry["key"]
+        local = dict(entry, expires=time.monotonic() + self.l1_ttl)
+        with self._lock:
+            self._drop((scope, key))
+            self._entries[(scope, key)] = local
+            for band in entry["bands"]:
+                self._buckets.setdefault((scope, band), set()).add(key)
+            while len(self._entries) > self.l1_size:
+                self._drop(next(iter(self._entries)))
+
+    # L2
+
+    def _get_redis(self, scope: str, fingerprint: _Fingerprint):
+        redis_client = self._get_redis_client()
+        if not redis_client:
+            return None
+
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            pipe.get(f"{REDIS_PREFIX}e:{scope}:{fingerprint.key}")
+            for band in fingerprint.bands:
+                pipe.smembers(f"{REDIS_PREFIX}b:{scope}:{band}")
+            exact, *buckets = pipe.execute()
+
+            if exact:
+                entry = json.loads(exact)
+                self._put_local(scope, entry)
+                return entry, 1.0
+
+            keys = set()
+            for members in buckets:
+                keys |= {m.decode() if isinstance(m, bytes) else m for m in members}
+            if not keys:
+                return None
+
+            keys = list(keys)[:MAX_CANDIDATES]
+            raw = redis_client.mget([f"{REDIS_PREFIX}e:{scope}:{key}" for key in keys])
+            best = self._best_match(fingerprint, [json.loads(r) for r in raw if r])
+            if best is not None:
+                self._put_local(scope, best[0])
+            return best
+        except Exception as e:
+            logger.warning(f"Answer cache read failed: {e}")
+            return None
+
+    def _put_redis(self, scope: str, entry: Dict[str, Any]):
+        redis_client = self._get_redis_client()
+        if not redis_client:
+            return
+
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            pipe.setex(f"{REDIS_PREFIX}e:{scope}:{entry['key']}", self.ttl, json.dumps(entry))
+            for band in entry["bands"]:
+                bucket = f"{REDIS_PREFIX}b:{scope}:{band}"
+                pipe.sadd(bucket, entry["key"])
+                pipe.expire(bucket, self.ttl)
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"Answer cache write failed: {e}")
+
+    # ==================== Status ====================
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit-rate metrics for this process and, with Redis, all workers"""
+        with self._lock:
+            process = dict(self._stats)
+            l1_entries = len(self._entries)
+
+        stats = {
+            "enabled": ANSWER_CACHE_ENABLED,
+            "backend": "redis" if self._get_redis_client() else "memory",
+            "ttl_seconds": self.ttl,
+            "similarity_threshold": self.similarity,
+            "l1_entries": l1_entries,
+            "process": _with_hit_rate(process),
+        }
+
+        redis_client = self._get_redis_client()
+        if redis_client:
+            try:
+                raw = redis_client.hgetall(f"{REDIS_PREFIX}stats")
+                cluster = {field: 0 for field in self.STAT_FIELDS}
+                for field, value in raw.items():
+                    field = field.decode() if isinstance(field, bytes) else field
+                    cluster[field] = int(value)
+                stats["cluster"] = _with_hit_rate(cluster)
+            except Exception as e:
+                logger.debug(f"Answer cache stats read failed: {e}")
+
+        return stats
+
+    def clear(self):
+        """Drop the in-process cache and counters"""
+        with self._lock:
+            self._entries.clear()
+            self._buckets.clear()
+            self._versions.clear()
+            self._stats = {field: 0 for field in self.STAT_FIELDS}
+
+
+def _with_hit_rate(counters: Dict[str, int]) -> Dict[str, Any]:
+    hits = counters.get("hits_exact", 0) + counters.get("hits_near", 0)
+    lookups = counters.get("lookups", 0)
+    return {**counters, "hits": hits, "hit_rate": round(hits / lookups, 4) if lookups else 0.0}
+
+
+# Singleton instance
+_answer_cache: Optional[AnswerCache] = None
+_answer_cache_lock = threading.Lock()
+
+
+def get_answer_cache() -> Optional[AnswerCache]:
+    """Get the shared answer cache (None when ANSWER_CACHE_ENABLED=false)"""
+    global _answer_cache
+    if not ANSWER_CACHE_ENABLED:
+        return None
+    if _answer_cache is None:
+        with _answer_cache_lock:
+            if _answer_cache is None:
+                _answer_cache = AnswerCache()
+    return _answer_cache
+
+
+def invalidate_answer_cache(tenant_id: str):
+    """
+    Invalidate cached answers after a knowledge base change.
+
+    Never raises - a failed invalidation must not fail the document
+    operation that triggered it.
+    """
+    cache = get_answer_cache()
+    if cache is None:
+        return
+    try:
+        cache.bump_kb_version(tenant_id)
+    except Exception as e:
+        logger.warning(f"Failed to invalidate answer cache for {tenant_id}: {e}")
+
+
+def clear_answer_cache():
+    """Reset the shared answer cache (tests)"""
+    global _answer_cache
+    with _answer_cache_lock:
+        _answer_cache = None
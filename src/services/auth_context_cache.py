@@ -0,0 +1,390 @@
+"""
+Auth Context Cache - Zero-I/O Fast Path for Authenticated Requests
+
+AuthMiddleware used to build an AuthService, look the user up (60s cache)
+and check tenant suspension (a fresh Supabase client and a blocking query
+on the event loop) for every protected request. Steady-state traffic is
+now served from memory:
+- Principals: the organization_users row per (tenant, token sub, token
+  iat), in a bounded LRU with a TTL (AUTH_PRINCIPAL_TTL). A new login
+  issues a new iat and therefore a fresh lookup.
+- Tenant status: active/suspended per tenant. The first request for a
+  tenant loads it off the event loop; after AUTH_TENANT_STATUS_TTL the
+  cached status keeps being served while one background task refreshes
+  every stale tenant with a single query.
+- AuthService: one instance per tenant, reused across requests and
+  dropped when the tenant's config changes.
+
+Tenant statuses and AuthServices are keyed by the X-Client-ID header before
+the token is verified, so both are LRU-bounded (AUTH_TENANT_MAX).
+
+Because entries live longer than before, changes are pushed instead of
+waiting for expiry:
+- invalidate_user(tenant_id, user_id=..., auth_user_id=...) after a user is
+  deactivated, deleted or has their role changed
+- set_tenant_status(tenant_id, status) after a tenant is suspended,
+  activated or deleted
+
+With REDIS_URL set, both are broadcast on a pub/sub channel so every
+instance applies them (start_invalidation_listener() runs at startup).
+
+Configuration via environment variables:
+- AUTH_PRINCIPAL_TTL: Seconds a looked-up user is trusted (default: 300)
+- AUTH_PRINCIPAL_MAX: Principals kept before LRU eviction (default: 10000)
+- AUTH_TENANT_STATUS_TTL: Seconds before a tenant's status is refreshed (default: 300)
+- AUTH_TENANT_MAX: Tenant statuses / AuthServices kept before LRU eviction (default: 1000)
+- REDIS_URL: Broadcast invalidations to all instances
+"""
+
+import os
+import json
+import time
+import asyncio
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from src.services.tenant_config_registry import add_config_listener
+
+logger = logging.getLogger(__name__)
+
+AUTH_PRINCIPAL_TTL = float(os.getenv("AUTH_PRINCIPAL_TTL", "300"))
+AUTH_PRINCIPAL_MAX = int(os.getenv("AUTH_PRINCIPAL_MAX", "10000"))
+AUTH_TENANT_STATUS_TTL = float(os.getenv("AUTH_TENANT_STATUS_TTL", "300"))
+AUTH_TENANT_MAX = int(os.getenv("AUTH_TENANT_MAX", "1000"))
+
+# Seconds before retrying a tenant whose status could not be loaded
+TENANT_STATUS_RETRY = 30
+
+INVALIDATION_CHANNEL = "auth:invalidate"
+
+PrincipalKey = Tuple[str, str, Any]  # (tenant_id, auth_user_id, token iat)
+
+
+def fetch_tenant_statuses(tenant_ids: Iterable[str]) -> Optional[Dict[str, str]]:
+    """
+    Load the status of several tenants with one query.
+
+    Returns:
+        {tenant_id: status} (tenants without a row are left out), or None if
+        the lookup failed or Supabase is not configured
+    """
+    tenant_ids = list(tenant_ids)
+    supabase_url = os.getenv("SUPABASE_URL")
+    supabase_key = os.getenv("SUPABASE_SERVICE_KEY") or os.getenv("SUPABASE_KEY")
+    if not tenant_ids or not supabase_url or not supabase_key:
+        return None
+    try:
+        from src.services.auth_service import get_cached_auth_client
+
+        client = get_cached_auth_client(supabase_url, supabase_key)
+        result = client.table("tenants").select("tenant_id, status").in_(
+            "tenant_id", tenant_ids
+        ).execute()
+        return {row["tenant_id"]: row.get("status") or "active" for row in result.data or []}
+    except Exception as e:
+        logger.debug(f"Tenant status lookup failed (fail-open): {e}")
+        return None
+
+
+class AuthContextCache:
+    """In-memory principals, tenant statuses and AuthService instances"""
+
+    def __init__(
+        self,
+        principal_ttl: float = AUTH_PRINCIPAL_TTL,
+        max_principals: int = AUTH_PRINCIPAL_MAX,
+        tenant_status_ttl: float = AUTH_TENANT_STATUS_TTL,
+        max_tenants: int = AUTH_TENANT_MAX
+    ):
+        self.principal_ttl = principal_ttl
+        self.max_principals = max_principals
+        self.tenant_status_ttl = tenant_status_ttl
+        self.max_tenants = max_tenants
+
+        self._principals: "OrderedDict[PrincipalKey, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._tenant_status: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()  # tenant_id -> (status, refresh_at)
+        self._auth_services: "OrderedDict[str, Any]" = OrderedDict()
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._lock = threading.Lock()
+        self._stats = {"principal_hits": 0, "principal_misses": 0, "tenant_loads": 0, "tenant_refreshes": 0}
+
+    # ==================== AuthService ====================
+
+    def get_auth_service(self, tenant_id: str, factory: Callable[[], Any]) -> Any:
+        """The tenant's AuthService, created by factory() on first use (None results are not kept)"""
+        with self._lock:
+            service = self._auth_services.get(tenant_id)
+            if service is not None:
+                self._auth_services.move_to_end(tenant_id)
+                return service
+
+        service = factory()
+        if service is not None:
+            with self._lock:
+                self._auth_services[tenant_id] = service
+                self._auth_services.move_to_end(tenant_id)
+                while len(self._auth_services) > self.max_tenants:
+                    self._auth_services.popitem(last=False)
+        return service
+
+    def drop_auth_service(self, tenant_id: Optional[str] = None):
+        """Forget a tenant's AuthService (every tenant's when tenant_id is None)"""
+        with self._lock:
+            if tenant_id is None:
+                self._auth_services.clear()
+            else:
+                self._auth_services.pop(tenant_id, None)
+
+    # ==================== Principals ====================
+
+    def get_principal(self, key: PrincipalKey) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._principals.get(key)
+            if entry is None or entry[1] <= time.monotonic():
+                if entry is not None:
+                    del self._principals[key]
+                self._stats["principal_misses"] += 1
+                return None
+            self._principals.move_to_end(key)
+            self._stats["principal_hits"] += 1
+            return entry[0]
+
+    def put_principal(self, key: PrincipalKey, user: Dict[str, Any]):
+        with self._lock:
+            self._principals[key] = (user, time.monotonic() + self.principal_ttl)
+            self._principals.move_to_end(key)
+            while len(self._principals) > self.max_principals:
+                self._principals.popitem(last=False)
+
+    def drop_user(self, tenant_id: str, user_id: Optional[str] = None, auth_user_id: Optional[str] = None) -> int:
+        """Forget cached principals of one user (or every user of the tenant when no id is given)"""
+        with self._lock:
+            stale = [
+                key for key, (user, _) in self._principals.items()
+                if key[0] == tenant_id and (
+                    (user_id is None and auth_user_id is None)
+                    or (auth_user_id is not None and key[1] == auth_user_id)
+                    or (user_id is not None and user.get("id") == user_id)
+                )
+            ]
+            for key in stale:
+                del self._principals[key]
+
+        # AuthService.get_user_by_auth_id keeps its own short-lived copy
+        from src.services import auth_service
+        for cache_key, cached in list(auth_service._user_cache.items()):
+            user = cached.get("user") or {}
+            if cache_key.startswith(f"{tenant_id}:") and (
+                (user_id is None and auth_user_id is None)
+                or cache_key == f"{tenant_id}:{auth_user_id}"
+                or (user_id is not None and user.get("id") == user_id)
+            ):
+                auth_service._user_cache.pop(cache_key, None)
+        return len(stale)
+
+    # ==================== Tenant Status ====================
+
+    def set_status(self, tenant_id: str, status: str, ttl: Optional[float] = None):
+        with self._lock:
+            self._tenant_status[tenant_id] = (status, time.monotonic() + (self.tenant_status_ttl if ttl is None else ttl))
+            self._tenant_status.move_to_end(tenant_id)
+            while len(self._tenant_status) > self.max_tenants:
+                self._tenant_status.popitem(last=False)
+
+    def get_status(self, tenant_id: str) -> Optional[str]:
+        entry = self._tenant_status.get(tenant_id)
+        return entry[0] if entry else None
+
+    async def is_tenant_suspended(self, tenant_id: str) -> bool:
+        """
+        Whether a tenant is suspended (fail-open: unknown tenants count as active).
+
+        Only a tenant's first request waits for the lookup (in a worker
+        thread); afterwards the cached status is returned and refreshed in
+        the background once it is older than tenant_status_ttl.
+        """
+        entry = self._tenant_status.get(tenant_id)
+        if entry is None:
+            self._stats["tenant_loads"] += 1
+            statuses = await asyncio.to_thread(fetch_tenant_statuses, [tenant_id])
+            self._store_statuses([tenant_id], statuses)
+            return self.get_status(tenant_id) == "suspended"
+
+        with self._lock:
+            if tenant_id in self._tenant_status:
+                self._tenant_status.move_to_end(tenant_id)
+        if entry[1] <= time.monotonic():
+            self._schedule_refresh()
+        return entry[0] == "suspended"
+
+    def _store_statuses(self, tenant_ids: Iterable[str], statuses: Optional[Dict[str, str]]):
+        for tenant_id in tenant_ids:
+            if statuses is None:
+                # Lookup failed: keep what we had, try again shortly
+                self.set_status(tenant_id, self.get_status(tenant_id) or "unknown", ttl=TENANT_STATUS_RETRY)
+            else:
+                self.set_status(tenant_id, statuses.get(tenant_id, "unknown"))
+
+    def _schedule_refresh(self):
+        """Refresh every stale tenant status with one background query (single-flight)"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = self._refresh_task
+        if task is not None and not task.done() and task.get_loop() is loop:
+            return
+        self._refresh_task = loop.create_task(self._refresh_stale())
+
+    async def _refresh_stale(self):
+        now = time.monotonic()
+        stale = [tenant_id for tenant_id, (_, refresh_at) in list(self._tenant_status.items()) if refresh_at <= now]
+        if not stale:
+            return
+        self._stats["tenant_refreshes"] += 1
+        statuses = await asyncio.to_thread(fetch_tenant_statuses, stale)
+        self._store_statuses(stale, statuses)
+
+    # ==================== Housekeeping ====================
+
+    def clear(self):
+        with self._lock:
+            self._principals.clear()
+            self._tenant_status.clear()
+            self._auth_services.clear()
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self._stats,
+                "principals": len(self._principals),
+                "tenants": len(self._tenant_status),
+                "auth_services": len(self._auth_services),
+            }
+
+
+# ==================== Singleton ====================
+
+_auth_context_cache: Optional[AuthContextCache] = None
+_auth_context_cache_lock = threading.Lock()
+
+
+def get_auth_context_cache() -> AuthContextCache:
+    """Get the process-wide auth context cache"""
+    global _auth_context_cache
+    if _auth_context_cache is None:
+        with _auth_context_cache_lock:
+            if _auth_context_cache is None:
+                _auth_context_cache = AuthContextCache()
+    return _auth_context_cache
+
+
+def reset_auth_context_cache():
+    """Drop every cached principal, tenant status and AuthService (for testing)"""
+    global _auth_context_cache
+    with _auth_context_cache_lock:
+        cache, _auth_context_cache = _auth_context_cache, None
+    if cache:
+        cache.clear()
+
+
+# ==================== Push Invalidation ====================
+
+_redis = None
+_redis_available: Optional[bool] = None
+_listener_thread: Optional[threading.Thread] = None
+
+
+def _get_redis_client():
+    """Redis client for invalidation broadcasts (None when REDIS_URL is unset or unreachable)"""
+    global _redis, _redis_available
+    if _redis_available is False:
+        return None
+    if _redis is None:
+        redis_url = os.getenv("REDIS_URL")
+        if not redis_url:
+            _redis_available = False
+            return None
+        try:
+            import redis
+            _redis = redis.from_url(redis_url)
+            _redis.ping()
+            _redis_available = True
+        except Exception as e:
+            logger.warning(f"Auth invalidation broadcast unavailable: {e}")
+            _redis_available = False
+            _redis = None
+    return _redis
+
+
+def _apply(message: Dict[str, Any]):
+    cache = get_auth_context_cache()
+    if message.get("type") == "user":
+        cache.drop_user(message["tenant_id"], message.get("user_id"), message.get("auth_user_id"))
+    elif message.get("type") == "tenant":
+        cache.set_status(message["tenant_id"], message["status"])
+        if message["status"] != "active":
+            cache.drop_user(message["tenant_id"])
+
+
+def _publish(message: Dict[str, Any]):
+    _apply(message)
+    redis_client = _get_redis_client()
+    if redis_client:
+        try:
+            redis_client.publish(INVALIDATION_CHANNEL, json.dumps(message))
+        except Exception as e:
+            logger.warning(f"Auth invalidation broadcast failed: {e}")
+
+
+def invalidate_user(tenant_id: str, user_id: Optional[str] = None, auth_user_id: Optional[str] = None):
+    """Forget a user's cached principals on every instance (deactivation, role change)"""
+    _publish({"type": "user", "tenant_id": tenant_id, "user_id": user_id, "auth_user_id": auth_user_id})
+
+
+def set_tenant_status(tenant_id: str, status: str):
+    """Record a tenant's new status on every instance (suspension, activation, deletion)"""
+    _publish({"type": "tenant", "tenant_id": tenant_id, "status": status})
+
+
+def _on_tenant_config_change(tenant_id: Optional[str]):
+    """Rebuild a tenant's AuthService from its new config on the next request"""
+    cache = _auth_context_cache
+    if cache is not None:
+        cache.drop_auth_service(tenant_id)
+
+
+add_config_listener(_on_tenant_config_change)
+
+
+def _listen():
+    while True:
+        redis_client = _get_redis_client()
+        if not redis_client:
+            return
+        try:
+            pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(INVALIDATION_CHANNEL)
+            for item in pubsub.listen():
+                try:
+                    _apply(json.loads(item["data"]))
+                except Exception as e:
+                    logger.warning(f"Ignoring malformed auth invalidation: {e}")
+        except Exception as e:
+            logger.warning(f"Auth invalidation listener reconnecting: {e}")
+            time.sleep(5)
+
+
+def start_invalidation_listener() -> bool:
+    """Apply invalidations broadcast by other instances (no-op without REDIS_URL)"""
+    global _listener_thread
+    if _listener_thread is not None or not _get_redis_client():
+        return False
+    _listener_thread = threading.Thread(target=_listen, name="auth-invalidation", daemon=True)
+    _listener_thread.start()
+    return True
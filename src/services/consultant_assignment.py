@@ -0,0 +1,249 @@
+"""
+Consultant Assignment - Weighted Round-Robin Without BigQuery DML
+
+Assigns new quotes to consultants in rotation. Instead of a SELECT ordered
+by last_assigned plus an UPDATE per quote (two BigQuery jobs, racy under
+concurrent quotes), each tenant has:
+- A cached roster of active consultants (one BigQuery query per
+  CONSULTANT_ROSTER_TTL), weighted by open-quote load
+- An atomic rotation counter: Redis INCR when REDIS_URL is set (shared by
+  all instances), otherwise an in-process counter
+
+The n-th assignment picks slot n of a smooth weighted round-robin schedule,
+so concurrent quotes always get distinct slots, and consultants with fewer
+open quotes get proportionally more turns.
+
+Usage:
+    from src.services.consultant_assignment import assign_consultant
+
+    consultant = assign_consultant(config, bq_tool)
+
+Configuration via environment variables:
+- CONSULTANT_ROSTER_TTL: Seconds a roster (and its load weights) is reused (default: 300)
+- CONSULTANT_LOAD_WINDOW_DAYS: Quotes created this recently count as open load (default: 14)
+- CONSULTANT_MAX_WEIGHT: Turns for the least-loaded consultant per turn of
+  the most-loaded one; 1 disables load weighting (default: 4)
+- REDIS_URL: Share the rotation across instances
+"""
+
+import os
+import time
+import logging
+import itertools
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+CONSULTANT_ROSTER_TTL = float(os.getenv("CONSULTANT_ROSTER_TTL", "300"))
+CONSULTANT_LOAD_WINDOW_DAYS = int(os.getenv("CONSULTANT_LOAD_WINDOW_DAYS", "14"))
+CONSULTANT_MAX_WEIGHT = max(1, int(os.getenv("CONSULTANT_MAX_WEIGHT", "4")))
+
+# Quote statuses a consultant still has to work on
+OPEN_QUOTE_STATUSES = ("draft", "quoted", "sent")
+
+ROTATION_KEY_PREFIX = "consultant_rr:"
+
+
+# ==================== Weighting ====================
+
+def load_weights(consultant_ids: List[str], open_quotes: Dict[str, int]) -> Dict[str, int]:
+    """Weight 1..CONSULTANT_MAX_WEIGHT per consultant, highest for the least loaded"""
+    loads = {cid: open_quotes.get(cid, 0) for cid in consultant_ids}
+    busiest = max(loads.values(), default=0)
+    if not busiest or CONSULTANT_MAX_WEIGHT == 1:
+        return {cid: 1 for cid in consultant_ids}
+    return {
+        cid: 1 + round((busiest - load) / busiest * (CONSULTANT_MAX_WEIGHT - 1))
+        for cid, load in loads.items()
+    }
+
+
+def weighted_schedule(weights: List[int]) -> List[int]:
+    """
+    Smooth weighted round-robin order (indexes into weights).
+
+    Each index appears weights[i] times, spread out rather than in runs:
+    weights [3, 1] give [0, 0, 1, 0].
+    """
+    total = sum(weights)
+    current = [0] * len(weights)
+    schedule = []
+    for _ in range(total):
+        for i, weight in enumerate(weights):
+            current[i] += weight
+        best = max(range(len(weights)), key=lambda i: current[i])
+        current[best] -= total
+        schedule.append(best)
+    return schedule
+
+
+@dataclass
+class ConsultantRoster:
+    """Active consultants for one tenant and their rotation schedule"""
+    consultants: List[Dict[str, Any]]
+    weights: List[int]
+    loaded_at: float = field(default_factory=time.monotonic)
+
+    def __post_init__(self):
+        self.schedule = weighted_schedule(self.weights)
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() - self.loaded_at > CONSULTANT_ROSTER_TTL
+
+    def pick(self, turn: int) -> Optional[Dict[str, Any]]:
+        if not self.schedule:
+            return None
+        return dict(self.consultants[self.schedule[turn % len(self.schedule)]])
+
+
+# ==================== Rotation Counters ====================
+
+class RotationCounter:
+    """Base class for per-tenant assignment counters"""
+
+    def next(self, tenant_id: str) -> int:
+        raise NotImplementedError
+
+
+class InMemoryRotationCounter(RotationCounter):
+    """Process-local counter (single instance)"""
+
+    def __init__(self):
+        self._counters: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def next(self, tenant_id: str) -> int:
+        counter = self._counters.get(tenant_id)
+        if counter is None:
+            with self._lock:
+                counter = self._counters.setdefault(tenant_id, itertools.count())
+        # next() on itertools.count is atomic under the GIL
+        return next(counter)
+
+
+class RedisRotationCounter(RotationCounter):
+    """Redis INCR counter shared by all instances"""
+
+    def __init__(self, redis_url: str):
+        self._fallback = InMemoryRotationCounter()
+        try:
+            import redis
+            self._redis = redis.from_url(redis_url)
+            self._redis.ping()
+            logger.info("Connected to Redis for consultant assignment")
+        except Exception as e:
+            logger.warning(f"Redis not available for consultant assignment, using in-memory rotation: {e}")
+            self._redis = None
+
+    def next(self, tenant_id: str) -> int:
+        if not self._redis:
+            return self._fallback.next(tenant_id)
+        try:
+            return int(self._redis.incr(f"{ROTATION_KEY_PREFIX}{tenant_id}")) - 1
+        except Exception as e:
+            logger.warning(f"Redis INCR failed for consultant rotation, using in-memory: {e}")
+            return self._fallback.next(tenant_id)
+
+
+# ==================== Assigner ====================
+
+class ConsultantAssigner:
+    """Per-tenant weighted round-robin over cached consultant rosters"""
+
+    def __init__(self, counter: Optional[RotationCounter] = None):
+        self.counter = counter or InMemoryRotationCounter()
+        self._rosters: Dict[str, ConsultantRoster] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def next_consultant(self, config, bq_tool) -> Optional[Dict[str, Any]]:
+        """Next consultant for the tenant, or None if it has none"""
+        roster = self._roster(config, bq_tool)
+        if not roster.consultants:
+            return None
+        return roster.pick(self.counter.next(config.client_id))
+
+    def invalidate(self, tenant_id: Optional[str] = None):
+        """Drop cached rosters (e.g. after consultants change)"""
+        with self._lock:
+            if tenant_id is None:
+                self._rosters.clear()
+            else:
+                self._rosters.pop(tenant_id, None)
+
+    def _roster(self, config, bq_tool) -> ConsultantRoster:
+        tenant_id = config.client_id
+        roster = self._rosters.get(tenant_id)
+        if roster is not None and not roster.expired:
+            return roster
+
+        with self._lock:
+            lock = self._locks.setdefault(tenant_id, threading.Lock())
+        with lock:
+            roster = self._rosters.get(tenant_id)
+            if roster is None or roster.expired:
+                roster = self._load_roster(config, bq_tool)
+                self._rosters[tenant_id] = roster
+            return roster
+
+    def _load_roster(self, config, bq_tool) -> ConsultantRoster:
+        consultants = bq_tool.get_active_consultants()
+        ids = [c['consultant_id'] for c in consultants]
+        weights = load_weights(ids, self._open_quotes(config)) if consultants else {}
+        logger.info(f"Consultant roster loaded for {config.client_id}: {len(consultants)} active")
+        return ConsultantRoster(consultants, [weights[cid] for cid in ids])
+
+    def _open_quotes(self, config) -> Dict[str, int]:
+        """Open quotes per consultant (empty if Supabase is unavailable)"""
+        if CONSULTANT_MAX_WEIGHT == 1:
+            return {}
+        try:
+            from src.tools.supabase_tool import SupabaseTool
+            client = SupabaseTool(config).client
+            if not client:
+                return {}
+            since = (datetime.utcnow() - timedelta(days=CONSULTANT_LOAD_WINDOW_DAYS)).isoformat()
+            result = client.table('quotes').select('consultant_id')\
+                .eq('tenant_id', config.client_id)\
+                .in_('status', list(OPEN_QUOTE_STATUSES))\
+                .gte('created_at', since)\
+                .execute()
+            return Counter(row['consultant_id'] for row in result.data or [] if row.get('consultant_id'))
+        except Exception as e:
+            logger.warning(f"Consultant load lookup failed, using equal weights: {e}")
+            return {}
+
+
+# ==================== Singleton ====================
+
+_assigner: Optional[ConsultantAssigner] = None
+_assigner_lock = threading.Lock()
+
+
+def get_consultant_assigner() -> ConsultantAssigner:
+    """Get the process-wide assigner (Redis rotation when REDIS_URL is set)"""
+    global _assigner
+    if _assigner is None:
+        with _assigner_lock:
+            if _assigner is None:
+                redis_url = os.getenv("REDIS_URL")
+                counter = RedisRotationCounter(redis_url) if redis_url else InMemoryRotationCounter()
+                _assigner = ConsultantAssigner(counter)
+    return _assigner
+
+
+def assign_consultant(config, bq_tool) -> Optional[Dict[str, Any]]:
+    """Next consultant for a tenant's new quote"""
+    return get_consultant_assigner().next_consultant(config, bq_tool)
+
+
+def reset_consultant_assigner():
+    """Forget rosters and rotation state (for testing)"""
+    global _assigner
+    with _assigner_lock:
+        _assigner = None
@@ -10,9 +10,10 @@ Fallback: EUR_ZAR_RATE env var if Frankfurter API is unreachable.
 import os
 import time
 import logging
-from typing import Dict, Optional
+from typing import Dict, Optional, Sequence, Tuple
 
 import httpx
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
@@ -117,3 +118,27 @@ class CurrencyService:
         for from_cur in from_currencies:
             if from_cur.upper() != to_currency.upper():
                 await self.get_rate(from_cur, to_currency)
+
+    async def convert_many(
+        self,
+        amounts: np.ndarray,
+        currencies: Sequence[str],
+        to_currency: str = "ZAR",
+        margin_pct: float = 5.0,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized convert(): one rate lookup per distinct currency.
+
+        Returns (converted amounts, rates). Amounts already in to_currency
+        are only rounded, with a rate of 1.0 - the same as convert().
+        """
+        amounts = np.asarray(amounts, dtype=np.float64)
+        codes, inverse = np.unique(np.char.upper(np.asarray(currencies, dtype=str)), return_inverse=True)
+        rates = np.ones(len(codes))
+        factors = np.ones(len(codes))
+        for i, code in enumerate(codes):
+            if code != to_currency.upper():
+                rates[i] = await self.get_rate(code, to_currency)
+                factors[i] = 1 + margin_pct / 100
+        inverse = inverse.reshape(-1)
+        return np.round(amounts * rates[inverse] * factors[inverse], 2), rates[inverse]
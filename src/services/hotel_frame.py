@@ -0,0 +1,334 @@
+"""
+Hotel Frame - Columnar View of Aggregated Hotel Search Results
+
+The aggregated search returns merged hotel profiles, each with a list of
+rates. A destination can come back with 500+ hotels and dozens of rates
+each; building the API dicts (options[] mirroring all_rates[], converted
+prices) for all of them, then filtering and converting again per hotel, is
+the slow part of a search.
+
+HotelFrame parses the upstream profiles once into NumPy columns:
+- per hotel: cheapest price, star rating, currency, placeholder flag
+- per rate (CSR layout, rate_offsets[i]:rate_offsets[i + 1] are hotel i's
+  rates): nightly price, total price, upstream ZAR price, currency
+
+Price and quality filtering, currency conversion with margin and sorting
+are array operations. API dicts are built by to_hotels() only for the rows
+actually returned (one page), in the same shape search_hotels_aggregated
+has always returned.
+"""
+
+import re
+import html
+import logging
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Juniper placeholder hotels carry internal codes instead of names
+_PLACEHOLDER_NAME = re.compile(r'^Hotel\s+JP[A-Z0-9]+')
+
+SORT_KEYS = ("price", "stars")
+
+
+def _number(value: Any) -> float:
+    """Upstream price or rating as float (NaN when missing or unparseable)"""
+    if value is None or value == "":
+        return np.nan
+    try:
+        return float(str(value).replace("*", "")) if isinstance(value, str) else float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _price_column(values: List[Any]) -> np.ndarray:
+    """Prices as float64; missing and unparseable prices are 0 (like `price or 0`)"""
+    values = [value or 0 for value in values]
+    try:
+        return np.array(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        return np.nan_to_num(np.array([_number(value) for value in values]), nan=0.0)
+
+
+def _optional_column(values: List[Any]) -> np.ndarray:
+    """Values as float64, NaN where missing"""
+    values = [np.nan if value is None or value == "" else value for value in values]
+    try:
+        return np.array(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        return np.array([_number(value) for value in values])
+
+
+def _https(url: Optional[str]) -> Optional[str]:
+    return (url or "").replace("http://photos.hotelbeds.com", "https://photos.hotelbeds.com") or None
+
+
+class HotelFrame:
+    """Array-backed hotels and rates from one aggregated search"""
+
+    HOTEL_COLUMNS = ("cheapest", "stars", "currency", "best_nightly", "best_zar", "has_best_rate",
+                     "display_zar", "exchange_rate", "best_zar_converted")
+    RATE_COLUMNS = ("rate_nightly", "rate_total", "rate_zar", "rate_currency", "option_currency",
+                    "rate_is_flat", "rate_zar_converted", "option_total_zar", "option_nightly_zar")
+
+    def __init__(
+        self,
+        profiles: List[Dict[str, Any]],
+        names: List[str],
+        rate_offsets: np.ndarray,
+        rate_profiles: List[Dict[str, Any]],
+    ):
+        self.profiles = profiles
+        self.names = names
+        n = len(profiles)
+
+        # ---- hotel columns ----
+        best_rates = [h.get("best_rate") or {} for h in profiles]
+        self.cheapest = _price_column([
+            b.get("rate_per_night_zar") or b.get("rate_per_night") or h.get("total_price") or h.get("cheapest_price")
+            for h, b in zip(profiles, best_rates)
+        ])
+        self.stars = np.array([_number(h.get("star_rating")) if h.get("star_rating") else np.nan for h in profiles])
+        # Currency of the first option, as _apply_currency_conversion picks it
+        option_currencies = [((h.get("all_rates") or [h])[0]).get("currency", "EUR") for h in profiles]
+        self.currency = np.array(
+            [b.get("currency") or c for b, c in zip(best_rates, option_currencies)], dtype=object
+        ).reshape(n)
+        self.best_nightly = _price_column([b.get("rate_per_night") for b in best_rates])
+        self.best_zar = _optional_column([b.get("rate_per_night_zar") for b in best_rates])
+        self.has_best_rate = np.array([bool(b) for b in best_rates], dtype=bool).reshape(n)
+
+        # ---- rate columns (hotels without all_rates get one row from their flat fields) ----
+        self.rate_offsets = rate_offsets
+        self.rate_profiles = rate_profiles
+        counts = np.diff(rate_offsets)
+        self.rate_hotel = np.repeat(np.arange(n), counts)
+        m = len(rate_profiles)
+        # Rows built from flat hotel fields are options only, not all_rates[]
+        self.rate_is_flat = np.repeat(np.array([not h.get("all_rates") for h in profiles], dtype=bool).reshape(n), counts)
+        self.rate_nightly = _price_column([r.get("rate_per_night") for r in rate_profiles])
+        self.rate_total = np.where(
+            self.rate_is_flat,
+            _price_column([r.get("total_price") for r in rate_profiles]),
+            _price_column([r.get("total_price") or r.get("rate_per_night") for r in rate_profiles]),
+        )
+        self.rate_zar = _optional_column([r.get("rate_per_night_zar") for r in rate_profiles])
+        self.option_currency = np.array([r.get("currency", "EUR") for r in rate_profiles], dtype=object).reshape(m)
+        own_currency = np.array([r.get("currency") for r in rate_profiles], dtype=object).reshape(m)
+        self.rate_currency = np.where(own_currency == None, self.currency[self.rate_hotel], own_currency)  # noqa: E711
+
+        # ---- conversion results (NaN until convert_currency) ----
+        self.display_zar = np.full(n, np.nan)
+        self.exchange_rate = np.full(n, np.nan)
+        self.best_zar_converted = np.full(n, np.nan)
+        self.rate_zar_converted = np.full(m, np.nan)
+        self.option_total_zar = np.full(m, np.nan)
+        self.option_nightly_zar = np.full(m, np.nan)
+        self.target_currency: Optional[str] = None
+
+    @classmethod
+    def from_profiles(cls, hotels: Sequence[Dict[str, Any]]) -> "HotelFrame":
+        """Parse upstream merged profiles (one pass over hotels and rates)"""
+        names = []
+        rate_profiles = []
+        offsets = [0]
+        for h in hotels:
+            name = h.get("name") or h.get("hotel_name") or ""
+            names.append(html.unescape(name) if "&" in name else name)
+            rate_profiles.extend(h.get("all_rates") or [h])
+            offsets.append(len(rate_profiles))
+        return cls(list(hotels), names, np.asarray(offsets, dtype=np.int64), rate_profiles)
+
+    def __len__(self) -> int:
+        return len(self.profiles)
+
+    # ==================== Filtering ====================
+
+    def quality_mask(self) -> np.ndarray:
+        """False for Juniper placeholder hotels and missing names"""
+        return np.fromiter(
+            (len(name) >= 3 and not _PLACEHOLDER_NAME.match(name) for name in self.names),
+            dtype=bool,
+            count=len(self.names),
+        )
+
+    def take(self, indices: np.ndarray) -> "HotelFrame":
+        """Frame with only the given hotels (and their rates), sliced column-wise"""
+        indices = np.asarray(indices, dtype=np.int64)
+        counts = np.diff(self.rate_offsets)[indices]
+        offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+        rate_idx = np.repeat(self.rate_offsets[indices] - offsets[:-1], counts) + np.arange(offsets[-1])
+
+        frame = HotelFrame.__new__(HotelFrame)
+        frame.profiles = [self.profiles[i] for i in indices]
+        frame.names = [self.names[i] for i in indices]
+        frame.rate_profiles = [self.rate_profiles[j] for j in rate_idx]
+        frame.rate_offsets = offsets
+        frame.rate_hotel = np.repeat(np.arange(len(indices)), counts)
+        frame.target_currency = self.target_currency
+        for column in self.HOTEL_COLUMNS:
+            setattr(frame, column, getattr(self, column)[indices])
+        for column in self.RATE_COLUMNS:
+            setattr(frame, column, getattr(self, column)[rate_idx])
+        return frame
+
+    def filter_priced(self) -> "HotelFrame":
+        """Drop hotels without a positive price and placeholder hotels"""
+        keep = np.flatnonzero((self.cheapest > 0) & self.quality_mask())
+        if len(keep) == len(self):
+            return self
+        return self.take(keep)
+
+    # ==================== Conversion ====================
+
+    async def convert_currency(self, target_currency: str = "ZAR", margin_pct: float = 5.0):
+        """
+        Convert prices not already in target_currency, with margin.
+
+        Fills the same fields _apply_currency_conversion sets on hotel dicts:
+        display price, best_rate and all_rates[] nightly prices (unless
+        upstream supplied them), and options[] totals / nightly prices.
+        """
+        from src.services.currency_service import get_currency_service
+
+        currency_svc = get_currency_service()
+        target = target_currency.upper()
+        self.target_currency = target_currency
+
+        def foreign(currencies: np.ndarray) -> np.ndarray:
+            return np.char.upper(currencies.astype(str)) != target
+
+        async def convert(amounts: np.ndarray, currencies: np.ndarray, mask: np.ndarray, out: np.ndarray):
+            idx = np.flatnonzero(mask)
+            if len(idx):
+                converted, rates = await currency_svc.convert_many(amounts[idx], currencies[idx], target_currency, margin_pct)
+                out[idx] = converted
+                return idx, rates
+            return idx, np.empty(0)
+
+        hotel_foreign = foreign(self.currency)
+        idx, rates = await convert(self.cheapest, self.currency, hotel_foreign & (self.cheapest != 0), self.display_zar)
+        self.exchange_rate[idx] = rates
+
+        best_mask = hotel_foreign & (self.best_nightly != 0) & (np.isnan(self.best_zar) | (self.best_zar == 0))
+        best_mask &= self.has_best_rate
+        await convert(self.best_nightly, self.currency, best_mask, self.best_zar_converted)
+
+        upstream_zar = ~np.isnan(self.rate_zar) & (self.rate_zar != 0)
+        await convert(
+            self.rate_nightly, self.rate_currency,
+            foreign(self.rate_currency) & (self.rate_nightly != 0) & ~upstream_zar & ~self.rate_is_flat,
+            self.rate_zar_converted,
+        )
+
+        option_foreign = foreign(self.option_currency)
+        await convert(self.rate_total, self.option_currency, option_foreign & (self.rate_total != 0), self.option_total_zar)
+        await convert(
+            self.rate_nightly, self.option_currency,
+            option_foreign & (self.rate_nightly != 0) & ~upstream_zar,
+            self.option_nightly_zar,
+        )
+
+    # ==================== Ordering ====================
+
+    def order(self, sort_by: Optional[str] = None) -> np.ndarray:
+        """
+        Row order for the response: upstream order, cheapest first ('price')
+        or highest star rating first, cheapest within a rating ('stars').
+        """
+        if sort_by is None:
+            return np.arange(len(self))
+        if sort_by not in SORT_KEYS:
+            raise ValueError(f"Unknown sort key: {sort_by}")
+
+        price = np.where(np.isnan(self.display_zar), self.cheapest, self.display_zar)
+        if sort_by == "price":
+            return np.argsort(price, kind="stable")
+        stars = np.nan_to_num(self.stars, nan=-1.0)
+        return np.lexsort((price, -stars))
+
+    # ==================== Materialization ====================
+
+    def to_hotels(self, indices: Optional[Sequence[int]] = None) -> List[Dict[str, Any]]:
+        """API hotel dicts for the given rows (default: all, in upstream order)"""
+        if indices is None:
+            indices = range(len(self))
+        return [self._hotel(int(i)) for i in indices]
+
+    def _hotel(self, i: int) -> Dict[str, Any]:
+        h = self.profiles[i]
+        upstream_best = h.get("best_rate") or {}
+        cheapest_price = (
+            upstream_best.get("rate_per_night_zar")
+            or upstream_best.get("rate_per_night")
+            or h.get("total_price")
+            or h.get("cheapest_price")
+            or 0
+        )
+        best_rate = dict(upstream_best)
+        if not np.isnan(self.best_zar_converted[i]):
+            best_rate["rate_per_night_zar"] = float(self.best_zar_converted[i])
+
+        all_rates = []
+        options = []
+        for j in range(self.rate_offsets[i], self.rate_offsets[i + 1]):
+            rate = self.rate_profiles[j]
+            if self.rate_is_flat[j]:
+                price_total = rate.get("total_price", 0)
+            else:
+                price_total = rate.get("total_price") or rate.get("rate_per_night", 0)
+            option = {
+                "room_type": rate.get("room_type", "Standard Room"),
+                "meal_plan": rate.get("meal_plan", ""),
+                "price_total": price_total,
+                "price_per_night": rate.get("rate_per_night", 0),
+                "price_per_night_zar": rate.get("rate_per_night_zar"),
+                "currency": rate.get("currency", "EUR"),
+                "source": rate.get("source"),
+                "provider": rate.get("source"),
+            }
+            if not np.isnan(self.option_total_zar[j]):
+                option["price_total_zar"] = float(self.option_total_zar[j])
+            if not np.isnan(self.option_nightly_zar[j]):
+                option["price_per_night_zar"] = float(self.option_nightly_zar[j])
+            options.append(option)
+
+            if not self.rate_is_flat[j]:
+                if not np.isnan(self.rate_zar_converted[j]):
+                    rate = {**rate, "rate_per_night_zar": float(self.rate_zar_converted[j])}
+                all_rates.append(rate)
+
+        sources = h.get("sources") or ([h.get("source")] if h.get("source") else [])
+        star_rating = None if np.isnan(self.stars[i]) else int(self.stars[i])
+        hotel = {
+            "hotel_id": h.get("hotel_id"),
+            "hotel_name": self.names[i],
+            "star_rating": star_rating,
+            "stars": star_rating,  # backward compat
+            "destination": h.get("destination"),
+            "zone": h.get("zone_name"),
+            "image_url": _https(h.get("image_url")),
+            "latitude": float(h["latitude"]) if h.get("latitude") else None,
+            "longitude": float(h["longitude"]) if h.get("longitude") else None,
+            "cheapest_price": cheapest_price,
+            "cheapest_meal_plan": best_rate.get("meal_plan") or h.get("meal_plan"),
+            "best_rate": best_rate,
+            "all_rates": all_rates,
+            "sources": sources,
+            "source": sources[0] if sources else h.get("source"),
+            "merge_method": h.get("merge_method"),
+            "provider_codes": h.get("provider_codes"),
+            "options": options,
+            # Content enrichment fields (pass through from upstream when available)
+            "description": h.get("description"),
+            "amenities": h.get("amenities") or h.get("facilities"),
+            "address": h.get("address"),
+            "images": [img.replace("http://", "https://") if isinstance(img, str) else img for img in (h.get("images") or [])],
+        }
+        if not np.isnan(self.display_zar[i]):
+            hotel["display_price_zar"] = float(self.display_zar[i])
+            hotel["original_currency"] = self.currency[i]
+            hotel["exchange_rate"] = float(self.exchange_rate[i])
+        return hotel
@@ -0,0 +1,584 @@
+"""
+Job Queue - Durable Background Jobs with Retries
+
+Side effects that should not hold up an API response (quote email
+delivery, CRM sync, notifications) run as background jobs:
+- Jobs are persisted to the tenant's Supabase `background_jobs` table
+  (migration 022) before they run, and after every state change
+- A small worker thread pool runs them; a failed attempt is retried with
+  exponential backoff (JOB_RETRY_DELAY * 2^n) up to max_attempts
+- Handlers can checkpoint progress (job.checkpoint(email_sent=True)) so a
+  retry skips steps that already happened
+- recover(tenant_id) re-queues a tenant's unfinished jobs after a restart;
+  recover_all_tenants() does it for every tenant at startup
+
+Several processes (uvicorn workers, instances) share the table, so a job
+is claimed before every attempt with a conditional update: it only
+succeeds while the job is queued/retrying, or running with an expired
+lease, and nobody else has started the same attempt. The claim sets the
+owner and a lease (JOB_LEASE_SECONDS) that every checkpoint renews.
+Recovery re-queues a `running` job only once its lease has expired, so a
+job still running in another worker is not started again.
+
+Jobs are tracked in memory as well, so status lookups for recent jobs do
+not touch the database, and the queue keeps working (without durability)
+when Supabase is unavailable.
+
+Handlers are registered per job kind:
+
+    @job_handler("quote.deliver")
+    def deliver_quote(job: Job) -> Optional[Dict[str, Any]]:
+        ...
+
+Configuration via environment variables:
+- JOB_QUEUE_WORKERS: Jobs run at once (default: 4)
+- JOB_MAX_ATTEMPTS: Attempts before a job is marked failed (default: 5)
+- JOB_RETRY_DELAY: Seconds before the first retry, doubled each time (default: 10)
+- JOB_LEASE_SECONDS: How long a claimed job is reserved for its worker
+  without a checkpoint (default: 300)
+"""
+
+import os
+import json
+import uuid
+import socket
+import logging
+import importlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUE_WORKERS = int(os.getenv("JOB_QUEUE_WORKERS", "4"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "5"))
+JOB_RETRY_DELAY = float(os.getenv("JOB_RETRY_DELAY", "10"))
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "300"))
+
+JOBS_TABLE = "background_jobs"
+
+# Finished jobs kept in memory for the status endpoint
+MAX_TRACKED_JOBS = 1000
+
+# Modules that register handlers, imported before recovered jobs run
+HANDLER_MODULES = ("src.agents.quote_agent",)
+
+PENDING_STATUSES = ("queued", "running", "retrying")
+CLAIMABLE_STATUSES = ("queued", "retrying")
+
+# Identifies this process as a job owner
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+@dataclass
+class Job:
+    """One background job and its progress"""
+    job_id: str
+    tenant_id: str
+    kind: str
+    payload: Dict[str, Any] = field(default_factory=dict)
+    reference_id: Optional[str] = None  # e.g. the quote_id the job belongs to
+    status: str = "queued"  # queued, running, retrying, completed, failed
+    attempts: int = 0
+    max_attempts: int = JOB_MAX_ATTEMPTS
+    state: Dict[str, Any] = field(default_factory=dict)  # checkpoints and result
+    error: Optional[str] = None
+    run_after: Optional[str] = None
+    created_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    updated_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    owner: Optional[str] = None  # worker holding the current attempt
+    lease_until: Optional[str] = None
+    future: Optional[Future] = field(default=None, repr=False, compare=False)
+    _on_checkpoint: Optional[Callable[["Job"], None]] = field(default=None, repr=False, compare=False)
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("completed", "failed")
+
+    def checkpoint(self, **values: Any):
+        """Record progress that must survive a retry (persisted immediately)"""
+        self.state.update(values)
+        if self._on_checkpoint:
+            self._on_checkpoint(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Public view (no payload)"""
+        return {
+            "job_id": self.job_id,
+            "kind": self.kind,
+            "reference_id": self.reference_id,
+            "status": self.status,
+            "attempts": self.attempts,
+            "max_attempts": self.max_attempts,
+            "state": self.state,
+            "error": self.error,
+            "run_after": self.run_after,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "finished_at": self.finished_at,
+        }
+
+    def to_record(self) -> Dict[str, Any]:
+        record = self.to_dict()
+        record["tenant_id"] = self.tenant_id
+        record["payload"] = self.payload
+        record["owner"] = self.owner
+        record["lease_until"] = self.lease_until
+        return record
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> "Job":
+        return cls(
+            job_id=record["job_id"],
+            tenant_id=record["tenant_id"],
+            kind=record["kind"],
+            payload=record.get("payload") or {},
+            reference_id=record.get("reference_id"),
+            status=record.get("status", "queued"),
+            attempts=record.get("attempts") or 0,
+            max_attempts=record.get("max_attempts") or JOB_MAX_ATTEMPTS,
+            state=record.get("state") or {},
+            error=record.get("error"),
+            run_after=record.get("run_after"),
+            created_at=record.get("created_at") or datetime.utcnow().isoformat(),
+            updated_at=record.get("updated_at"),
+            finished_at=record.get("finished_at"),
+            owner=record.get("owner"),
+            lease_until=record.get("lease_until"),
+        )
+
+    def lease_expired(self) -> bool:
+        """True if a running job's lease has run out (its worker is gone)"""
+        lease_until = _parse_utc(self.lease_until)
+        return lease_until is None or lease_until <= datetime.utcnow()
+
+
+def _parse_utc(value: Optional[str]) -> Optional[datetime]:
+    """Naive UTC datetime from a stored ISO timestamp"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).replace(tzinfo=None)
+    except ValueError:
+        return None
+
+
+# ==================== Stores ====================
+
+class JobStore:
+    """Base class for job persistence"""
+
+    def save(self, job: Job):
+        raise NotImplementedError
+
+    def get(self, tenant_id: str, job_id: str) -> Optional[Job]:
+        raise NotImplementedError
+
+    def list_for_reference(self, tenant_id: str, reference_id: str) -> List[Job]:
+        raise NotImplementedError
+
+    def list_pending(self, tenant_id: str) -> List[Job]:
+        raise NotImplementedError
+
+    def claim(self, job: Job, expected_attempts: int) -> bool:
+        """
+        Save job as this worker's new attempt if nobody else holds it.
+
+        Succeeds only if the stored job is queued/retrying, or running with
+        an expired lease, and still has expected_attempts attempts. A job
+        that is not stored at all (its first save failed) is saved and
+        claimed.
+        """
+        raise NotImplementedError
+
+
+class InMemoryJobStore(JobStore):
+    """Process-local job storage (for development and tests)"""
+
+    def __init__(self):
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def save(self, job: Job):
+        with self._lock:
+            self._records[job.job_id] = json.loads(json.dumps(job.to_record(), default=str))
+
+    def _jobs(self, tenant_id: str) -> List[Job]:
+        with self._lock:
+            records = [r for r in self._records.values() if r["tenant_id"] == tenant_id]
+        return [Job.from_record(r) for r in records]
+
+    def get(self, tenant_id: str, job_id: str) -> Optional[Job]:
+        return next((job for job in self._jobs(tenant_id) if job.job_id == job_id), None)
+
+    def list_for_reference(self, tenant_id: str, reference_id: str) -> List[Job]:
+        return [job for job in self._jobs(tenant_id) if job.reference_id == reference_id]
+
+    def list_pending(self, tenant_id: str) -> List[Job]:
+        return [job for job in self._jobs(tenant_id) if job.status in PENDING_STATUSES]
+
+    def claim(self, job: Job, expected_attempts: int) -> bool:
+        with self._lock:
+            record = self._records.get(job.job_id)
+            if record is not None:
+                stored = Job.from_record(record)
+                claimable = stored.status in CLAIMABLE_STATUSES or \
+                    (stored.status == "running" and stored.lease_expired())
+                if not claimable or stored.attempts != expected_attempts:
+                    return False
+            self._records[job.job_id] = json.loads(json.dumps(job.to_record(), default=str))
+            return True
+
+
+class SupabaseJobStore(JobStore):
+    """Jobs in each tenant's Supabase `background_jobs` table"""
+
+    def _client(self, tenant_id: str):
+        from config.loader import get_config
+        from src.tools.supabase_tool import SupabaseTool
+        return SupabaseTool(get_config(tenant_id)).client
+
+    def save(self, job: Job):
+        client = self._client(job.tenant_id)
+        if client is None:
+            raise ConnectionError("Supabase not available")
+        record = json.loads(json.dumps(job.to_record(), default=str))
+        client.table(JOBS_TABLE).upsert(record, on_conflict="job_id").execute()
+
+    def get(self, tenant_id: str, job_id: str) -> Optional[Job]:
+        client = self._client(tenant_id)
+        if client is None:
+            return None
+        result = client.table(JOBS_TABLE).select("*")\
+            .eq("tenant_id", tenant_id)\
+            .eq("job_id", job_id)\
+            .limit(1)\
+            .execute()
+        return Job.from_record(result.data[0]) if result.data else None
+
+    def list_for_reference(self, tenant_id: str, reference_id: str) -> List[Job]:
+        client = self._client(tenant_id)
+        if client is None:
+            return []
+        result = client.table(JOBS_TABLE).select("*")\
+            .eq("tenant_id", tenant_id)\
+            .eq("reference_id", reference_id)\
+            .order("created_at")\
+            .execute()
+        return [Job.from_record(r) for r in result.data or []]
+
+    def list_pending(self, tenant_id: str) -> List[Job]:
+        client = self._client(tenant_id)
+        if client is None:
+            return []
+        result = client.table(JOBS_TABLE).select("*")\
+            .eq("tenant_id", tenant_id)\
+            .in_("status", list(PENDING_STATUSES))\
+            .order("created_at")\
+            .execute()
+        return [Job.from_record(r) for r in result.data or []]
+
+    def claim(self, job: Job, expected_attempts: int) -> bool:
+        client = self._client(job.tenant_id)
+        if client is None:
+            raise ConnectionError("Supabase not available")
+        record = json.loads(json.dumps(job.to_record(), default=str))
+        now = datetime.utcnow().isoformat()
+        # One conditional UPDATE: only one worker can move attempts past expected_attempts
+        result = client.table(JOBS_TABLE).update(record)\
+            .eq("tenant_id", job.tenant_id)\
+            .eq("job_id", job.job_id)\
+            .eq("attempts", expected_attempts)\
+            .or_(f"status.in.({','.join(CLAIMABLE_STATUSES)}),lease_until.lt.{now},"
+                 f"and(status.eq.running,lease_until.is.null)")\
+            .execute()
+        if result.data:
+            return True
+        if self.get(job.tenant_id, job.job_id) is None:
+            client.table(JOBS_TABLE).upsert(record, on_conflict="job_id").execute()
+            return True
+        return False
+
+
+# ==================== Queue ====================
+
+_handlers: Dict[str, Callable[[Job], Optional[Dict[str, Any]]]] = {}
+
+
+def job_handler(kind: str):
+    """Register the function that runs jobs of a kind"""
+    def decorator(func):
+        _handlers[kind] = func
+        return func
+    return decorator
+
+
+def _get_handler(kind: str) -> Callable[[Job], Optional[Dict[str, Any]]]:
+    if kind not in _handlers:
+        for module in HANDLER_MODULES:
+            importlib.import_module(module)
+    handler = _handlers.get(kind)
+    if handler is None:
+        raise LookupError(f"No handler registered for job kind '{kind}'")
+    return handler
+
+
+class JobQueue:
+    """Runs persisted jobs on a worker pool, retrying failures with backoff"""
+
+    def __init__(
+        self,
+        store: Optional[JobStore] = None,
+        workers: int = JOB_QUEUE_WORKERS,
+        retry_delay: float = JOB_RETRY_DELAY,
+        lease_seconds: float = JOB_LEASE_SECONDS
+    ):
+        self.store = store or SupabaseJobStore()
+        self.workers = workers
+        self.retry_delay = retry_delay
+        self.lease_seconds = lease_seconds
+
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._timers: Dict[str, threading.Timer] = {}
+        self._recovered: set = set()
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="job-queue")
+            return self._pool
+
+    def shutdown(self):
+        """Stop the workers; unfinished jobs stay in the store for recover()"""
+        with self._lock:
+            self._closed = True
+            pool, self._pool = self._pool, None
+            timers, self._timers = self._timers, {}
+        for timer in timers.values():
+            timer.cancel()
+        if pool:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    # ==================== Tracking ====================
+
+    def _track(self, job: Job) -> Job:
+        job._on_checkpoint = self._persist
+        with self._lock:
+            self._jobs[job.job_id] = job
+            for job_id in list(self._jobs):
+                if len(self._jobs) <= MAX_TRACKED_JOBS:
+                    break
+                if self._jobs[job_id].done:
+                    del self._jobs[job_id]
+        return job
+
+    def _persist(self, job: Job):
+        job.updated_at = datetime.utcnow().isoformat()
+        if job.status == "running":
+            # Every checkpoint renews the lease
+            job.lease_until = (datetime.utcnow() + timedelta(seconds=self.lease_seconds)).isoformat()
+        try:
+            self.store.save(job)
+        except Exception as e:
+            # Keep running from memory; the job is just not durable for now
+            logger.warning(f"Could not persist job {job.job_id} ({job.kind}): {e}")
+
+    def get_job(self, job_id: str, tenant_id: str) -> Optional[Job]:
+        """A tenant's job (in memory first, then the store)"""
+        job = self._jobs.get(job_id)
+        if job is not None:
+            return job if job.tenant_id == tenant_id else None
+        try:
+            return self.store.get(tenant_id, job_id)
+        except Exception as e:
+            logger.warning(f"Job lookup failed for {job_id}: {e}")
+            return None
+
+    def list_jobs(self, tenant_id: str, reference_id: str) -> List[Job]:
+        """Jobs for one reference (e.g. a quote), oldest first"""
+        with self._lock:
+            tracked = {job.job_id: job for job in self._jobs.values()
+                       if job.tenant_id == tenant_id and job.reference_id == reference_id}
+        try:
+            stored = self.store.list_for_reference(tenant_id, reference_id)
+        except Exception as e:
+            logger.warning(f"Job listing failed for {reference_id}: {e}")
+            stored = []
+        jobs = {job.job_id: job for job in stored}
+        jobs.update(tracked)
+        return sorted(jobs.values(), key=lambda job: job.created_at)
+
+    # ==================== Running ====================
+
+    def enqueue(
+        self,
+        tenant_id: str,
+        kind: str,
+        payload: Optional[Dict[str, Any]] = None,
+        reference_id: Optional[str] = None,
+        max_attempts: int = JOB_MAX_ATTEMPTS
+    ) -> Job:
+        """Persist a job and start it as soon as a worker is free"""
+        job = self._track(Job(
+            job_id=f"JOB-{uuid.uuid4().hex[:12].upper()}",
+            tenant_id=tenant_id,
+            kind=kind,
+            payload=payload or {},
+            reference_id=reference_id,
+            max_attempts=max_attempts
+        ))
+        self._persist(job)
+        self._submit(job)
+        return job
+
+    def _submit(self, job: Job):
+        with self._lock:
+            self._timers.pop(job.job_id, None)
+            if self._closed:
+                return
+        job.future = self._get_pool().submit(self._run, job)
+
+    def _claim(self, job: Job) -> bool:
+        """Start a new attempt if no other worker has the job"""
+        expected_attempts = job.attempts
+        job.status = "running"
+        job.attempts += 1
+        job.run_after = None
+        job.owner = WORKER_ID
+        job.updated_at = datetime.utcnow().isoformat()
+        job.lease_until = (datetime.utcnow() + timedelta(seconds=self.lease_seconds)).isoformat()
+        try:
+            claimed = self.store.claim(job, expected_attempts)
+        except Exception as e:
+            # Keep running from memory, as _persist does; the job is just not durable for now
+            logger.warning(f"Could not claim job {job.job_id} ({job.kind}), running it unclaimed: {e}")
+            return True
+
+        if not claimed:
+            logger.info(f"Job {job.job_id} ({job.kind}) is held by another worker, skipping")
+            with self._lock:
+                if self._jobs.get(job.job_id) is job:
+                    del self._jobs[job.job_id]
+        return claimed
+
+    def _run(self, job: Job):
+        if not self._claim(job):
+            return
+
+        try:
+            result = _get_handler(job.kind)(job)
+            if result is not None:
+                job.state["result"] = result
+            job.status = "completed"
+            job.error = None
+            job.lease_until = None
+            job.finished_at = datetime.utcnow().isoformat()
+            self._persist(job)
+            logger.info(f"Job {job.job_id} ({job.kind}) completed after {job.attempts} attempt(s)")
+        except Exception as e:
+            job.error = str(e)[:500]
+            if job.attempts < job.max_attempts:
+                delay = self.retry_delay * (2 ** (job.attempts - 1))
+                job.status = "retrying"
+                job.lease_until = None
+                job.run_after = (datetime.utcnow() + timedelta(seconds=delay)).isoformat()
+                self._persist(job)
+                logger.warning(f"Job {job.job_id} ({job.kind}) attempt {job.attempts} failed, retrying in {delay:.0f}s: {e}")
+                self._schedule(job, delay)
+            else:
+                job.status = "failed"
+                job.lease_until = None
+                job.finished_at = datetime.utcnow().isoformat()
+                self._persist(job)
+                logger.error(f"Job {job.job_id} ({job.kind}) failed after {job.attempts} attempts: {e}")
+
+    def _schedule(self, job: Job, delay: float):
+        timer = threading.Timer(delay, self._submit, args=(job,))
+        timer.daemon = True
+        with self._lock:
+            if self._closed:
+                return
+            self._timers[job.job_id] = timer
+        timer.start()
+
+    def wait(self, jobs: List[Job], timeout: Optional[float] = None):
+        """Block until the given jobs' current attempts have finished"""
+        wait([job.future for job in jobs if job.future is not None], timeout=timeout)
+
+    def recover(self, tenant_id: str) -> int:
+        """
+        Re-queue a tenant's unfinished jobs from the store (once per process).
+
+        A `running` job is only retried after its lease expires; until then
+        it belongs to the worker running it. Every attempt is claimed first,
+        so workers recovering the same tenant never run a job twice.
+        """
+        with self._lock:
+            if tenant_id in self._recovered:
+                return 0
+            self._recovered.add(tenant_id)
+
+        try:
+            pending = self.store.list_pending(tenant_id)
+        except Exception as e:
+            logger.warning(f"Job recovery failed for {tenant_id}: {e}")
+            return 0
+
+        recovered = 0
+        for job in pending:
+            if job.job_id in self._jobs:
+                continue
+            self._track(job)
+            # A running job waits for its lease to expire, a retry for its run_after
+            start_at = _parse_utc(job.lease_until if job.status == "running" else job.run_after)
+            delay = max(0.0, (start_at - datetime.utcnow()).total_seconds()) if start_at else 0.0
+            if delay:
+                self._schedule(job, delay)
+            else:
+                self._submit(job)
+            recovered += 1
+
+        if recovered:
+            logger.info(f"Recovered {recovered} background jobs for {tenant_id}")
+        return recovered
+
+
+# ==================== Singleton ====================
+
+_job_queue: Optional[JobQueue] = None
+_job_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """Get the process-wide job queue"""
+    global _job_queue
+    if _job_queue is None:
+        with _job_queue_lock:
+            if _job_queue is None:
+                _job_queue = JobQueue()
+    return _job_queue
+
+
+def recover_all_tenants():
+    """Re-queue unfinished jobs for every tenant (application startup)"""
+    from config.loader import list_clients
+
+    queue = get_job_queue()
+    for tenant_id in list_clients():
+        queue.recover(tenant_id)
+
+
+def shutdown_job_queue():
+    """Stop the job workers (application shutdown)"""
+    global _job_queue
+    with _job_queue_lock:
+        queue, _job_queue = _job_queue, None
+    if queue:
+        queue.shutdown()
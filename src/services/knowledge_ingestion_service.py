@@ -0,0 +1,464 @@
+"""
+Knowledge Ingestion Service - Parallel, Streaming Document Ingestion
+
+Takes PDF/DOCX text extraction off the request threads:
+- Extraction runs in a process pool, so parsing large PDFs uses every core
+  instead of holding the GIL of the API worker.
+- PDFs are split into page ranges that are parsed in parallel. Batches are
+  consumed in page order and fed through a streaming chunker, so chunks
+  reach the index while later pages are still being parsed.
+- Ingestion jobs run on a small coordinator thread pool and are tracked in
+  memory, so the API can report progress for background uploads.
+
+Knowledge managers plug in through four methods:
+- ingest_source(document_id) -> IngestSource
+- ingest_chunks(source, chunks, start_index)   (start_index 0 replaces old chunks)
+- finish_ingest(source, text, chunks) -> DocumentMetadata
+- fail_ingest(document_id, error)
+
+Both KnowledgeIndexManager (filesystem) and SupabaseKnowledgeManager
+implement them.
+"""
+
+import os
+import uuid
+import logging
+import threading
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+from src.utils.error_handling import log_and_suppress
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_FILE_TYPES = ("txt", "md", "pdf", "docx")
+
+# Extractor processes (0 = one per CPU, capped at 8)
+INGEST_WORKERS = int(os.getenv("KNOWLEDGE_INGEST_WORKERS", "0")) or min(os.cpu_count() or 2, 8)
+
+# Jobs coordinated at once (each fans its pages out to the process pool)
+INGEST_MAX_CONCURRENT_JOBS = int(os.getenv("KNOWLEDGE_INGEST_CONCURRENT_JOBS", "4"))
+
+# PDF pages parsed per process pool task
+PAGES_PER_TASK = int(os.getenv("KNOWLEDGE_INGEST_PAGES_PER_TASK", "8"))
+
+# Finished jobs kept for the status endpoint
+MAX_TRACKED_JOBS = 500
+
+# Characters of extracted text stored alongside the chunks
+CONTENT_PREVIEW_CHARS = 50000
+
+
+class DocumentExtractionError(Exception):
+    """Raised when a document cannot be parsed"""
+
+
+# ==================== Extraction (runs in worker processes) ====================
+
+def count_pages(file_path: str, file_type: str) -> int:
+    """Number of extraction units in a document (PDF pages, otherwise 1)"""
+    if file_type != "pdf":
+        return 1
+
+    try:
+        import pypdf
+        return len(pypdf.PdfReader(file_path).pages)
+    except ImportError:
+        try:
+            import fitz  # PyMuPDF
+            with fitz.open(file_path) as doc:
+                return doc.page_count
+        except ImportError:
+            raise DocumentExtractionError("No PDF library available (install pypdf or pymupdf)")
+
+
+def extract_pages(file_path: str, file_type: str, start: int = 0, end: Optional[int] = None) -> List[str]:
+    """
+    Extract the text of pages [start, end) of a document.
+
+    Non-PDF documents are a single page. Module-level so it can be pickled
+    into the process pool.
+    """
+    if file_type in ("txt", "md"):
+        with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
+            return [f.read()]
+
+    if file_type == "pdf":
+        try:
+            import pypdf
+            reader = pypdf.PdfReader(file_path)
+            end = len(reader.pages) if end is None else min(end, len(reader.pages))
+            return [reader.pages[i].extract_text() or "" for i in range(start, end)]
+        except ImportError:
+            try:
+                import fitz  # PyMuPDF
+                with fitz.open(file_path) as doc:
+                    end = doc.page_count if end is None else min(end, doc.page_count)
+                    return [doc.load_page(i).get_text() for i in range(start, end)]
+            except ImportError:
+                raise DocumentExtractionError("No PDF library available (install pypdf or pymupdf)")
+
+    if file_type == "docx":
+        try:
+            from docx import Document
+            doc = Document(file_path)
+            return ["\n".join(para.text for para in doc.paragraphs)]
+        except ImportError:
+            raise DocumentExtractionError("python-docx not installed")
+
+    raise DocumentExtractionError(f"Unsupported file type: {file_type}")
+
+
+def extract_text(file_path: str, file_type: str) -> str:
+    """Extract a whole document in the current process"""
+    return "\n".join(extract_pages(file_path, file_type))
+
+
+# ==================== Streaming Chunker ====================
+
+class StreamingChunker:
+    """
+    Word-window chunker that accepts text incrementally.
+
+    Produces exactly the chunks of the batch chunker (windows of chunk_size
+    words every chunk_size - overlap words), emitting each window as soon
+    as enough words have arrived.
+    """
+
+    def __init__(self, chunk_size: int = 500, overlap: int = 50):
+        self.chunk_size = chunk_size
+        self.step = chunk_size - overlap
+        self._words: List[str] = []
+
+    def feed(self, text: str) -> List[str]:
+        """Add text, returning the windows that are now complete"""
+        self._words.extend(text.split())
+
+        chunks = []
+        while len(self._words) >= self.chunk_size:
+            chunks.append(" ".join(self._words[:self.chunk_size]))
+            del self._words[:self.step]
+        return chunks
+
+    def finish(self) -> List[str]:
+        """Flush the trailing (shorter) windows"""
+        chunks = []
+        while self._words:
+            chunks.append(" ".join(self._words[:self.chunk_size]))
+            del self._words[:self.step]
+        return chunks
+
+
+# ==================== Jobs ====================
+
+@dataclass
+class IngestSource:
+    """A document ready for extraction, as returned by a manager's ingest_source"""
+    document_id: str
+    file_path: str
+    file_type: str
+    filename: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    cleanup: bool = False  # Delete file_path when the job ends (temp downloads)
+    staged: Dict[str, Any] = field(default_factory=dict)  # Manager-held batches awaiting finish_ingest
+
+
+@dataclass
+class IngestionJob:
+    """Progress of one document's extraction + indexing"""
+    job_id: str
+    tenant_id: str
+    document_id: str
+    filename: Optional[str] = None
+    status: str = "queued"  # queued, running, completed, failed
+    pages_total: int = 0
+    pages_done: int = 0
+    chunks_indexed: int = 0
+    error: Optional[str] = None
+    created_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    future: Optional[Future] = field(default=None, repr=False, compare=False)
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("completed", "failed")
+
+    @property
+    def progress(self) -> float:
+        if self.status == "completed":
+            return 1.0
+        if not self.pages_total:
+            return 0.0
+        return round(self.pages_done / self.pages_total, 3)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "document_id": self.document_id,
+            "filename": self.filename,
+            "status": self.status,
+            "progress": self.progress,
+            "pages_total": self.pages_total,
+            "pages_done": self.pages_done,
+            "chunks_indexed": self.chunks_indexed,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class KnowledgeIngestionService:
+    """
+    Runs document ingestion with a process pool for extraction.
+
+    run() ingests in the calling thread (used by synchronous index/reindex
+    endpoints); submit() queues a background job and returns immediately.
+    """
+
+    def __init__(
+        self,
+        workers: int = INGEST_WORKERS,
+        max_concurrent_jobs: int = INGEST_MAX_CONCURRENT_JOBS,
+        pages_per_task: int = PAGES_PER_TASK
+    ):
+        self.workers = workers
+        self.max_concurrent_jobs = max_concurrent_jobs
+        self.pages_per_task = pages_per_task
+
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._job_pool: Optional[ThreadPoolExecutor] = None
+        self._jobs: "OrderedDict[str, IngestionJob]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    # ==================== Pools ====================
+
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._process_pool is None:
+                # spawn: forking a process that runs threads can deadlock the child
+                self._process_pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+                logger.info(f"Started knowledge extraction pool with {self.workers} processes")
+            return self._process_pool
+
+    def _get_job_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._job_pool is None:
+                self._job_pool = ThreadPoolExecutor(
+                    max_workers=self.max_concurrent_jobs,
+                    thread_name_prefix="kb-ingest"
+                )
+            return self._job_pool
+
+    def shutdown(self):
+        """Stop both pools, cancelling queued work"""
+        with self._lock:
+            job_pool, self._job_pool = self._job_pool, None
+            process_pool, self._process_pool = self._process_pool, None
+
+        if job_pool:
+            job_pool.shutdown(wait=False, cancel_futures=True)
+        if process_pool:
+            process_pool.shutdown(wait=False, cancel_futures=True)
+
+    # ==================== Job Registry ====================
+
+    def _track(self, job: IngestionJob) -> IngestionJob:
+        with self._lock:
+            self._jobs[job.job_id] = job
+
+            # Forget the oldest finished jobs
+            for job_id in list(self._jobs):
+                if len(self._jobs) <= MAX_TRACKED_JOBS:
+                    break
+                if self._jobs[job_id].done:
+                    del self._jobs[job_id]
+        return job
+
+    def _new_job(self, document_id: str, tenant_id: str, filename: Optional[str]) -> IngestionJob:
+        return self._track(IngestionJob(
+            job_id=f"ING-{uuid.uuid4().hex[:12].upper()}",
+            tenant_id=tenant_id,
+            document_id=document_id,
+            filename=filename
+        ))
+
+    def get_job(self, job_id: str, tenant_id: Optional[str] = None) -> Optional[IngestionJob]:
+        """Get a job, only if it belongs to tenant_id (when given)"""
+        job = self._jobs.get(job_id)
+        if job and tenant_id is not None and job.tenant_id != tenant_id:
+            return None
+        return job
+
+    def list_jobs(self, tenant_id: str) -> List[IngestionJob]:
+        """A tenant's tracked jobs, newest first"""
+        with self._lock:
+            jobs = [job for job in self._jobs.values() if job.tenant_id == tenant_id]
+        return list(reversed(jobs))
+
+    # ==================== Ingestion ====================
+
+    def submit(self, manager, document_id: str, tenant_id: str, filename: Optional[str] = None) -> IngestionJob:
+        """Queue a document for background ingestion"""
+        job = self._new_job(document_id, tenant_id, filename)
+        job.future = self._get_job_pool().submit(self._run_background, manager, job)
+        return job
+
+    def wait(self, jobs: List[IngestionJob], timeout: Optional[float] = None):
+        """Block until the given background jobs have finished"""
+        wait([job.future for job in jobs if job.future is not None], timeout=timeout)
+
+    def _run_background(self, manager, job: IngestionJob):
+        try:
+            self.run(manager, job.document_id, job.tenant_id, job=job)
+        except Exception as e:
+            log_and_suppress(e, context="kb_ingest_job", job_id=job.job_id, document_id=job.document_id)
+
+    def run(self, manager, document_id: str, tenant_id: str, job: Optional[IngestionJob] = None):
+        """
+        Extract, chunk and index one document in the calling thread.
+
+        Chunks are handed to manager.ingest_chunks as each page batch
+        completes. Raises on failure after recording it on the job and
+        calling manager.fail_ingest.
+
+        Returns:
+            Whatever manager.finish_ingest returns (DocumentMetadata)
+        """
+        job = job or self._new_job(document_id, tenant_id, None)
+        job.status = "running"
+        job.started_at = datetime.utcnow().isoformat()
+
+        source = None
+        try:
+            source = manager.ingest_source(document_id)
+            job.filename = job.filename or source.filename
+
+            chunker = StreamingChunker()
+            chunks: List[str] = []
+            preview: List[str] = []
+            preview_len = 0
+
+            def emit(new_chunks: List[str]):
+                if new_chunks:
+                    manager.ingest_chunks(source, new_chunks, len(chunks))
+                    chunks.extend(new_chunks)
+                    job.chunks_indexed = len(chunks)
+
+            for pages in self._iter_pages(source, job):
+                batch_text = "\n".join(pages)
+                if preview_len < CONTENT_PREVIEW_CHARS:
+                    preview.append(batch_text)
+                    preview_len += len(batch_text) + 1
+                emit(chunker.feed(batch_text))
+
+            emit(chunker.finish())
+
+            if not chunks:
+                raise ValueError("No content extracted from document")
+
+            text = "\n".join(preview)[:CONTENT_PREVIEW_CHARS].strip()
+            result = manager.finish_ingest(source, text, chunks)
+
+            job.status = "completed"
+            logger.info(
+                f"Ingested {document_id}: {job.pages_done} pages, {len(chunks)} chunks "
+                f"(job {job.job_id})"
+            )
+            return result
+
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+            try:
+                manager.fail_ingest(document_id, str(e))
+            except Exception as fail_error:
+                log_and_suppress(fail_error, context="kb_ingest_mark_failed", document_id=document_id)
+            raise
+
+        finally:
+            job.finished_at = datetime.utcnow().isoformat()
+            if source is not None and source.cleanup:
+                try:
+                    os.unlink(source.file_path)
+                except OSError as e:
+                    log_and_suppress(e, context="kb_ingest_cleanup", path=source.file_path)
+
+    def _iter_pages(self, source: IngestSource, job: IngestionJob) -> Iterator[List[str]]:
+        """
+        Yield page text batches in page order.
+
+        Plain text is read inline. PDF page ranges (and DOCX files) are
+        parsed in the process pool, all ranges in flight at once.
+        """
+        if source.file_type not in SUPPORTED_FILE_TYPES:
+            raise DocumentExtractionError(f"Unsupported file type: {source.file_type}")
+
+        if source.file_type in ("txt", "md"):
+            job.pages_total = 1
+            pages = extract_pages(source.file_path, source.file_type)
+            job.pages_done = 1
+            yield pages
+            return
+
+        pool = self._get_process_pool()
+        futures: List[Future] = []
+        try:
+            page_count = pool.submit(count_pages, source.file_path, source.file_type).result()
+            job.pages_total = page_count
+
+            futures = [
+                pool.submit(extract_pages, source.file_path, source.file_type,
+                            start, min(start + self.pages_per_task, page_count))
+                for start in range(0, page_count, self.pages_per_task)
+            ]
+
+            for future in futures:
+                pages = future.result()
+                job.pages_done += len(pages)
+                yield pages
+
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM on a pathological PDF) - start fresh next time
+            with self._lock:
+                if self._process_pool is pool:
+                    self._process_pool = None
+            raise
+
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+# ==================== Singleton ====================
+
+_ingestion_service: Optional[KnowledgeIngestionService] = None
+_ingestion_service_lock = threading.Lock()
+
+
+def get_ingestion_service() -> KnowledgeIngestionService:
+    """Get the process-wide ingestion service"""
+    global _ingestion_service
+    if _ingestion_service is None:
+        with _ingestion_service_lock:
+            if _ingestion_service is None:
+                _ingestion_service = KnowledgeIngestionService()
+    return _ingestion_service
+
+
+def shutdown_ingestion_service():
+    """Stop the ingestion pools (application shutdown)"""
+    global _ingestion_service
+    with _ingestion_service_lock:
+        service, _ingestion_service = _ingestion_service, None
+    if service:
+        service.shutdown()
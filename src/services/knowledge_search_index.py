@@ -0,0 +1,659 @@
+"""
+Knowledge Search Index - Segmented Inverted Index for the Filesystem Knowledge Base
+
+Keeps a per-tenant inverted index (term -> chunk postings, bigram -> chunk
+postings, document frequencies) in memory so that KnowledgeIndexManager.search
+only scores chunks that share at least one term with the query.
+
+On-disk layout (clients/{tenant}/data/knowledge/index/):
+- segments/{document_id}.jsonl: chunks of one document, one JSON record per
+  line. Indexing a document writes only its own segment (appending page
+  batches as the ingestion pipeline streams them in); deleting it removes
+  only that file.
+- snapshot.json: compacted chunks + postings, written in the background.
+  On startup the snapshot is loaded and reconciled with the segment files,
+  so a restarted worker does not re-tokenize the whole corpus.
+
+Deletes and re-indexes tombstone the old chunk IDs in memory. Tombstoned
+chunks are skipped at query time and dropped by compaction, which runs on a
+background thread once enough tombstones or un-snapshotted segments pile up.
+
+Scoring uses the sparse matrices of knowledge_sparse_scorer.py (heuristic or
+BM25, see KNOWLEDGE_SCORER) when numpy/scipy are installed, otherwise the
+postings scorer below.
+"""
+
+import os
+import json
+import logging
+import threading
+from collections import defaultdict
+from pathlib import Path
+from typing import Optional, List, Dict, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+SEGMENTS_DIRNAME = "segments"
+SEGMENT_SUFFIX = ".jsonl"
+SNAPSHOT_FILENAME = "snapshot.json"
+
+# Older layouts, migrated on first load
+LEGACY_CHUNKS_FILENAME = "chunks.json"
+LEGACY_POSTINGS_FILENAME = "postings.json"
+LEGACY_SEGMENT_SUFFIX = ".json"
+
+# Bumped whenever the on-disk snapshot layout changes
+SNAPSHOT_FORMAT_VERSION = 2
+
+# Default scorer: heuristic | bm25 (bm25 needs numpy/scipy)
+KNOWLEDGE_SCORER = os.getenv("KNOWLEDGE_SCORER", "heuristic").lower()
+
+# Compaction triggers
+COMPACTION_TOMBSTONE_RATIO = 0.25
+COMPACTION_MAX_PENDING_SEGMENTS = 50
+
+# Words ignored when picking "key terms" out of a query
+STOP_WORDS = {
+    'what', 'that', 'this', 'with', 'from', 'have', 'will', 'been', 'were', 'they',
+    'their', 'when', 'which', 'about', 'would', 'there', 'could', 'should', 'does',
+    'need', 'want', 'make', 'like', 'just', 'into', 'over', 'also', 'some', 'more',
+    'only', 'than', 'then', 'most', 'very', 'other', 'these', 'those'
+}
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text for search"""
+    return text.lower().strip()
+
+
+def _bigram_key(first: str, second: str) -> str:
+    """Postings key for a pair of consecutive words"""
+    return f"{first} {second}"
+
+
+def _chunk_terms(chunk: Dict) -> Tuple[List[str], List[str]]:
+    """Unique terms and bigrams of a chunk, in first-occurrence order"""
+    text = chunk.get("content_normalized") or normalize_text(chunk.get("content", ""))
+    words = text.split()
+    terms = list(dict.fromkeys(words))
+    bigrams = list(dict.fromkeys(_bigram_key(a, b) for a, b in zip(words[:-1], words[1:])))
+    return terms, bigrams
+
+
+class KnowledgeSearchIndex:
+    """
+    In-memory inverted index over a tenant's knowledge chunks.
+
+    Chunk IDs are positions in the chunk list. Postings lists are kept in
+    ascending chunk ID order so ties in the ranking resolve in indexing
+    order. Removed chunks stay in the postings as tombstones until the
+    index is compacted.
+    """
+
+    def __init__(self):
+        self.chunks: List[Dict] = []
+        self.postings: Dict[str, List[int]] = defaultdict(list)
+        self.bigram_postings: Dict[str, List[int]] = defaultdict(list)
+        self.doc_freq: Dict[str, int] = defaultdict(int)
+        self.doc_chunks: Dict[str, List[int]] = {}
+        self.segments: Dict[str, int] = {}  # document_id -> segment mtime_ns
+        self.deleted: Set[int] = set()
+        self._matrix = None  # SparseChunkMatrix, built on first search
+
+    @classmethod
+    def from_chunks(cls, chunks: List[Dict]) -> "KnowledgeSearchIndex":
+        """Build an index from a flat chunk list (grouped by document_id)"""
+        index = cls()
+        by_document: Dict[str, List[Dict]] = {}
+        for chunk in chunks:
+            by_document.setdefault(chunk["document_id"], []).append(chunk)
+        for document_id, doc_chunks in by_document.items():
+            index.add_document(document_id, doc_chunks)
+        return index
+
+    def __len__(self) -> int:
+        return len(self.chunks) - len(self.deleted)
+
+    @property
+    def tombstone_count(self) -> int:
+        return len(self.deleted)
+
+    def document_frequency(self, term: str) -> int:
+        """Number of live chunks containing the term"""
+        return self.doc_freq.get(term, 0)
+
+    def add_document(self, document_id: str, chunks: List[Dict], segment_mtime: int = 0):
+        """Append a document's chunks, tombstoning any previous version"""
+        self.remove_document(document_id)
+        self.extend_document(document_id, chunks, segment_mtime)
+
+    def extend_document(self, document_id: str, chunks: List[Dict], segment_mtime: int = 0):
+        """Append more chunks to a document already in the index"""
+        chunk_ids = self.doc_chunks.setdefault(document_id, [])
+        for chunk in chunks:
+            chunk_id = len(self.chunks)
+            self.chunks.append(chunk)
+            chunk_ids.append(chunk_id)
+
+            terms, bigrams = _chunk_terms(chunk)
+            for term in terms:
+                self.postings[term].append(chunk_id)
+                self.doc_freq[term] += 1
+            for bigram in bigrams:
+                self.bigram_postings[bigram].append(chunk_id)
+
+        self.segments[document_id] = segment_mtime
+
+    def remove_document(self, document_id: str) -> int:
+        """Tombstone a document's chunks. Returns the number of chunks removed."""
+        chunk_ids = self.doc_chunks.pop(document_id, [])
+        self.segments.pop(document_id, None)
+
+        for chunk_id in chunk_ids:
+            terms, _ = _chunk_terms(self.chunks[chunk_id])
+            for term in terms:
+                self.doc_freq[term] -= 1
+            self.deleted.add(chunk_id)
+
+        return len(chunk_ids)
+
+    def get_chunk(self, document_id: str, chunk_index: int) -> Optional[Dict]:
+        """Live chunk by document and position, or None"""
+        chunk_ids = self.doc_chunks.get(document_id, [])
+        if 0 <= chunk_index < len(chunk_ids):
+            chunk = self.chunks[chunk_ids[chunk_index]]
+            if chunk["chunk_index"] == chunk_index:
+                return chunk
+        for chunk_id in chunk_ids:
+            if self.chunks[chunk_id]["chunk_index"] == chunk_index:
+                return self.chunks[chunk_id]
+        return None
+
+    def compacted(self) -> "KnowledgeSearchIndex":
+        """
+        Copy of this index without tombstoned chunks.
+
+        Remaps existing postings instead of re-tokenizing chunk content.
+        """
+        new_ids: Dict[int, int] = {}
+        index = KnowledgeSearchIndex()
+
+        for chunk_id, chunk in enumerate(self.chunks):
+            if chunk_id not in self.deleted:
+                new_ids[chunk_id] = len(index.chunks)
+                index.chunks.append(chunk)
+
+        for target, source in ((index.postings, self.postings), (index.bigram_postings, self.bigram_postings)):
+            for key, ids in source.items():
+                live = [new_ids[i] for i in ids if i in new_ids]
+                if live:
+                    target[key] = live
+
+        index.doc_freq.update({term: len(ids) for term, ids in index.postings.items()})
+        index.doc_chunks = {
+            document_id: [new_ids[i] for i in ids]
+            for document_id, ids in self.doc_chunks.items()
+        }
+        index.segments = dict(self.segments)
+
+        if self._matrix is not None:
+            self._matrix.sync(self)
+            index._matrix = self._matrix.compacted(sorted(new_ids))
+
+        return index
+
+    def sparse_matrix(self):
+        """
+        The vectorized scorer for this index.
+
+        Returns:
+            SparseChunkMatrix, or None if numpy/scipy are not installed
+        """
+        if self._matrix is None:
+            from src.services import knowledge_sparse_scorer
+            if not knowledge_sparse_scorer.SPARSE_SCORING_AVAILABLE:
+                return None
+            self._matrix = knowledge_sparse_scorer.SparseChunkMatrix()
+        return self._matrix
+
+    def search(
+        self,
+        query: str,
+        category: Optional[str] = None,
+        visibility: Optional[str] = None,
+        min_score: float = 0.05,
+        scorer: Optional[str] = None,
+        top_k: Optional[int] = None
+    ) -> List[Tuple[Dict, float, Dict[str, int]]]:
+        """
+        Score chunks for a query.
+
+        Args:
+            scorer: heuristic or bm25 (defaults to KNOWLEDGE_SCORER)
+            top_k: Only return the best top_k hits
+
+        Returns:
+            List of (chunk, score, match_details) sorted by score descending
+        """
+        scorer = scorer or KNOWLEDGE_SCORER
+
+        matrix = self.sparse_matrix()
+        if matrix is not None:
+            return matrix.search(self, query, category, visibility, min_score, scorer, top_k)
+
+        if scorer != "heuristic":
+            logger.warning(f"Knowledge scorer '{scorer}' needs numpy/scipy - using heuristic")
+
+        hits = self._search_postings(query, category, visibility, min_score)
+        return hits if top_k is None else hits[:top_k]
+
+    def _search_postings(
+        self,
+        query: str,
+        category: Optional[str],
+        visibility: Optional[str],
+        min_score: float
+    ) -> List[Tuple[Dict, float, Dict[str, int]]]:
+        """
+        Score candidate chunks for a query from the postings lists.
+
+        Uses the same multi-signal score as the original linear scan:
+        1. Keyword overlap (40%)
+        2. Key term presence (30%)
+        3. Bigram phrase matching (20%)
+        4. Exact substring boost (+0.3)
+
+        Only chunks appearing in at least one query term's postings are
+        scored, so the cost grows with the number of matching postings
+        rather than with the size of the corpus.
+
+        Returns:
+            List of (chunk, score, match_details) sorted by score descending
+        """
+        query_normalized = normalize_text(query)
+        query_words = query_normalized.split()
+        query_word_set = set(query_words)
+
+        if not query_word_set:
+            return []
+
+        key_terms = {w for w in query_word_set if len(w) >= 4 and w not in STOP_WORDS}
+        query_bigrams = {_bigram_key(a, b) for a, b in zip(query_words[:-1], query_words[1:])}
+
+        # Accumulate per-chunk signal counts straight from the postings
+        keyword_hits: Dict[int, int] = defaultdict(int)
+        key_term_hits: Dict[int, int] = defaultdict(int)
+        bigram_hits: Dict[int, int] = defaultdict(int)
+
+        for term in query_word_set:
+            is_key_term = term in key_terms
+            for chunk_id in self.postings.get(term, ()):
+                keyword_hits[chunk_id] += 1
+                if is_key_term:
+                    key_term_hits[chunk_id] += 1
+
+        for bigram in query_bigrams:
+            for chunk_id in self.bigram_postings.get(bigram, ()):
+                bigram_hits[chunk_id] += 1
+
+        deleted = self.deleted
+        results = []
+        for chunk_id in sorted(keyword_hits):
+            if chunk_id in deleted:
+                continue
+
+            chunk = self.chunks[chunk_id]
+
+            if category and chunk.get("category") != category:
+                continue
+            if visibility and chunk.get("visibility", "public") != visibility:
+                continue
+
+            content_normalized = chunk.get("content_normalized") or normalize_text(chunk["content"])
+
+            keyword_score = keyword_hits[chunk_id] / len(query_word_set)
+            key_term_score = key_term_hits[chunk_id] / len(key_terms) if key_terms else 0
+            phrase_score = bigram_hits[chunk_id] / len(query_bigrams) if query_bigrams else 0
+            substring_boost = 0.3 if query_normalized in content_normalized else 0
+
+            score = min(
+                keyword_score * 0.4 +
+                key_term_score * 0.3 +
+                phrase_score * 0.2 +
+                substring_boost,
+                1.0
+            )
+
+            if score >= min_score:
+                results.append((chunk, score, {
+                    "keywords": keyword_hits[chunk_id],
+                    "key_terms": key_term_hits[chunk_id],
+                    "phrases": bigram_hits[chunk_id]
+                }))
+
+        results.sort(key=lambda r: r[1], reverse=True)
+        return results
+
+    # ==================== Snapshot Serialization ====================
+
+    def to_snapshot(self) -> Dict:
+        """
+        Serializable snapshot (call on a compacted index).
+
+        Containers are copied so the snapshot can be written to disk while
+        new documents keep being added to this index.
+        """
+        return {
+            "version": SNAPSHOT_FORMAT_VERSION,
+            "segments": dict(self.segments),
+            "doc_chunks": {doc_id: list(ids) for doc_id, ids in self.doc_chunks.items()},
+            "chunks": list(self.chunks),
+            "postings": {term: list(ids) for term, ids in self.postings.items()},
+            "bigrams": {bigram: list(ids) for bigram, ids in self.bigram_postings.items()}
+        }
+
+    @classmethod
+    def from_snapshot(cls, data: Dict) -> "KnowledgeSearchIndex":
+        """Restore an index from a snapshot without re-tokenizing"""
+        index = cls()
+        index.chunks = data["chunks"]
+        index.postings.update(data["postings"])
+        index.bigram_postings.update(data["bigrams"])
+        index.doc_freq.update({term: len(ids) for term, ids in data["postings"].items()})
+        index.doc_chunks = data["doc_chunks"]
+        index.segments = {doc_id: int(mtime) for doc_id, mtime in data["segments"].items()}
+        return index
+
+
+class KnowledgeIndexStore:
+    """
+    Segment files + in-memory index for one tenant's index directory.
+
+    The in-memory index is loaded lazily and kept in sync with the segment
+    files, so writes from other workers are picked up on the next search.
+    """
+
+    def __init__(self, index_path: Path):
+        self.index_path = Path(index_path)
+        self.segments_path = self.index_path / SEGMENTS_DIRNAME
+        self.snapshot_file = self.index_path / SNAPSHOT_FILENAME
+
+        self._index: Optional[KnowledgeSearchIndex] = None
+        self._dir_signature: Optional[int] = None
+        self._pending_segments = 0
+        self._compacting = False
+        self._lock = threading.RLock()
+
+    # ==================== Segment Files ====================
+
+    def _segment_file(self, document_id: str) -> Path:
+        return self.segments_path / f"{document_id}{SEGMENT_SUFFIX}"
+
+    def _list_segments(self) -> Dict[str, int]:
+        """document_id -> mtime_ns for every segment on disk"""
+        if not self.segments_path.exists():
+            return {}
+        return {
+            path.stem: path.stat().st_mtime_ns
+            for path in self.segments_path.glob(f"*{SEGMENT_SUFFIX}")
+        }
+
+    def _read_segment(self, document_id: str) -> List[Dict]:
+        with open(self._segment_file(document_id), 'r') as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def _dir_mtime(self) -> Optional[int]:
+        """Segments directory mtime changes whenever a segment is added or removed"""
+        try:
+            return self.segments_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def write_segment(self, document_id: str, chunks: List[Dict]):
+        """Write (or replace) one document's segment and apply it to the index"""
+        self.append_segment(document_id, chunks, replace=True)
+
+    def append_segment(self, document_id: str, chunks: List[Dict], replace: bool = False):
+        """
+        Append chunks to a document's segment and to the loaded index.
+
+        With replace=True the previous segment is swapped out atomically and
+        the document's old chunks are tombstoned; otherwise the chunks are
+        appended so a document becomes searchable batch by batch.
+        """
+        with self._lock:
+            self.segments_path.mkdir(parents=True, exist_ok=True)
+
+            segment_file = self._segment_file(document_id)
+            lines = "".join(json.dumps(chunk) + "\n" for chunk in chunks)
+
+            if replace:
+                tmp_file = segment_file.with_suffix(".tmp")
+                with open(tmp_file, 'w') as f:
+                    f.write(lines)
+                tmp_file.replace(segment_file)
+            else:
+                with open(segment_file, 'a') as f:
+                    f.write(lines)
+                # Appends don't touch the directory; bump it so other workers re-sync
+                os.utime(self.segments_path)
+
+            if self._index is not None:
+                mtime = segment_file.stat().st_mtime_ns
+                if replace or document_id not in self._index.doc_chunks:
+                    self._index.add_document(document_id, chunks, mtime)
+                    self._pending_segments += 1
+                else:
+                    self._index.extend_document(document_id, chunks, mtime)
+
+        self._maybe_compact()
+
+    def delete_segment(self, document_id: str) -> int:
+        """
+        Remove one document's segment and tombstone its chunks.
+
+        Returns:
+            Number of chunks tombstoned in the loaded index
+        """
+        with self._lock:
+            segment_file = self._segment_file(document_id)
+            if segment_file.exists():
+                segment_file.unlink()
+
+            removed = self._index.remove_document(document_id) if self._index is not None else 0
+
+        self._maybe_compact()
+        return removed
+
+    def document_ids(self) -> Set[str]:
+        """Documents that currently have a segment on disk"""
+        return set(self._list_segments())
+
+    def size_bytes(self) -> int:
+        """Total size of segment files on disk"""
+        if not self.segments_path.exists():
+            return 0
+        return sum(path.stat().st_size for path in self.segments_path.glob(f"*{SEGMENT_SUFFIX}"))
+
+    # ==================== Loading & Sync ====================
+
+    def get_index(self) -> Optional[KnowledgeSearchIndex]:
+        """
+        Get the in-memory index, loading or re-syncing it if needed.
+
+        Returns:
+            KnowledgeSearchIndex, or None if the tenant has no segments yet
+        """
+        self._migrate_legacy_chunks()
+
+        signature = self._dir_mtime()
+        if signature is None:
+            return None
+
+        if self._index is not None and signature == self._dir_signature:
+            return self._index
+
+        with self._lock:
+            if self._index is None:
+                self._migrate_legacy_segments()
+                self._index = self._load_snapshot() or KnowledgeSearchIndex()
+            self._sync(self._index)
+            self._dir_signature = signature
+            index = self._index
+
+        self._maybe_compact()
+        return index
+
+    def _sync(self, index: KnowledgeSearchIndex):
+        """Reconcile the index with the segment files on disk"""
+        on_disk = self._list_segments()
+
+        for document_id in list(index.segments):
+            if document_id not in on_disk:
+                index.remove_document(document_id)
+
+        for document_id, mtime in on_disk.items():
+            if index.segments.get(document_id) == mtime:
+                continue
+            try:
+                index.add_document(document_id, self._read_segment(document_id), mtime)
+                self._pending_segments += 1
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable segment {document_id}: {e}")
+
+    def _load_snapshot(self) -> Optional[KnowledgeSearchIndex]:
+        """Load the last compacted snapshot if present and current"""
+        if not self.snapshot_file.exists():
+            return None
+
+        try:
+            with open(self.snapshot_file, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable index snapshot {self.snapshot_file}: {e}")
+            return None
+
+        if data.get("version") != SNAPSHOT_FORMAT_VERSION:
+            return None
+
+        index = KnowledgeSearchIndex.from_snapshot(data)
+        logger.debug(f"Loaded index snapshot with {len(index)} chunks from {self.snapshot_file}")
+        return index
+
+    def _migrate_legacy_chunks(self):
+        """Split a pre-segment chunks.json into per-document segments"""
+        chunks_file = self.index_path / LEGACY_CHUNKS_FILENAME
+        if not chunks_file.exists():
+            return
+
+        with self._lock:
+            if not chunks_file.exists():
+                return
+
+            with open(chunks_file, 'r') as f:
+                chunks = json.load(f)
+
+            by_document: Dict[str, List[Dict]] = {}
+            for chunk in chunks:
+                by_document.setdefault(chunk["document_id"], []).append(chunk)
+
+            for document_id, doc_chunks in by_document.items():
+                self.write_segment(document_id, doc_chunks)
+
+            chunks_file.unlink()
+            legacy_postings = self.index_path / LEGACY_POSTINGS_FILENAME
+            if legacy_postings.exists():
+                legacy_postings.unlink()
+
+            logger.info(f"Migrated {len(chunks)} chunks from {chunks_file} into {len(by_document)} segments")
+
+    def _migrate_legacy_segments(self):
+        """Rewrite JSON-array segments as JSON Lines"""
+        for path in self.segments_path.glob(f"*{LEGACY_SEGMENT_SUFFIX}"):
+            try:
+                with open(path, 'r') as f:
+                    chunks = json.load(f)
+                self.write_segment(path.stem, chunks)
+                path.unlink()
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable legacy segment {path}: {e}")
+
+    # ==================== Compaction ====================
+
+    def _needs_compaction(self) -> bool:
+        index = self._index
+        if index is None or self._compacting:
+            return False
+        total = len(index.chunks)
+        return (
+            (total and index.tombstone_count / total >= COMPACTION_TOMBSTONE_RATIO)
+            or self._pending_segments >= COMPACTION_MAX_PENDING_SEGMENTS
+        )
+
+    def _maybe_compact(self):
+        """Schedule background compaction when thresholds are crossed"""
+        with self._lock:
+            if not self._needs_compaction():
+                return
+            self._compacting = True
+
+        threading.Thread(
+            target=self.compact,
+            name=f"kb-compact-{self.index_path.parent.parent.name}",
+            daemon=True
+        ).start()
+
+    def compact(self):
+        """Drop tombstoned chunks and persist a fresh snapshot"""
+        try:
+            with self._lock:
+                if self._index is None:
+                    return
+                compacted = self._index.compacted()
+                self._index = compacted
+                self._pending_segments = 0
+                snapshot = compacted.to_snapshot()
+
+            tmp_file = self.snapshot_file.with_suffix(".tmp")
+            with open(tmp_file, 'w') as f:
+                json.dump(snapshot, f)
+            tmp_file.replace(self.snapshot_file)
+
+            logger.info(f"Compacted knowledge index {self.index_path}: {len(compacted)} chunks")
+
+        except Exception as e:
+            logger.error(f"Knowledge index compaction failed for {self.index_path}: {e}", exc_info=True)
+        finally:
+            self._compacting = False
+
+
+# ==================== Store Registry ====================
+
+_index_stores: Dict[str, KnowledgeIndexStore] = {}
+_index_stores_lock = threading.Lock()
+
+
+def get_index_store(index_path: Path) -> KnowledgeIndexStore:
+    """Get or create the index store for a tenant's index directory"""
+    key = str(index_path)
+    store = _index_stores.get(key)
+    if store is None:
+        with _index_stores_lock:
+            store = _index_stores.setdefault(key, KnowledgeIndexStore(index_path))
+    return store
+
+
+def get_search_index(index_path: Path) -> Optional[KnowledgeSearchIndex]:
+    """
+    Get the inverted index for a tenant's index directory.
+
+    Returns:
+        KnowledgeSearchIndex, or None if the tenant has nothing indexed
+    """
+    return get_index_store(index_path).get_index()
+
+
+def clear_search_index_cache():
+    """Clear all cached index stores (for testing)"""
+    with _index_stores_lock:
+        _index_stores.clear()
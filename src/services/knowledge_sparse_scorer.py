@@ -0,0 +1,411 @@
+"""
+Knowledge Sparse Scorer - Vectorized Scoring for the Knowledge Search Index
+
+Keeps a sparse chunk x term matrix (term frequencies) and a chunk x bigram
+presence matrix alongside a KnowledgeSearchIndex. A query is scored as a
+sparse mat-vec over just the query's columns (gathered CSC columns reduced
+with bincount) instead of a Python loop per chunk.
+
+Scorers (KNOWLEDGE_SCORER, or the scorer argument of search):
+- heuristic (default): the keyword / key term / bigram / substring score of
+  the postings scorer, computed column-wise. Results are identical.
+- bm25: Okapi BM25 over term frequencies. Scores are divided by the sum of
+  the query terms' IDFs - what a chunk of average length containing each
+  query term once would get - and capped at 1.0, so min_score thresholds
+  stay on the same 0-1 scale as the heuristic.
+
+Rows are added in blocks as documents are indexed (blocks are merged once
+there are too many), tombstoned chunks are masked out, and category /
+visibility filters are precomputed boolean masks.
+
+Requires numpy and scipy. KnowledgeSearchIndex falls back to its postings
+scorer when they are not installed.
+"""
+
+import math
+import heapq
+import logging
+import threading
+from collections import Counter
+from typing import Optional, List, Dict, Tuple
+
+from src.services.knowledge_search_index import STOP_WORDS, normalize_text, _bigram_key
+
+try:
+    import numpy as np
+    from scipy import sparse
+    SPARSE_SCORING_AVAILABLE = True
+except ImportError:
+    np = None
+    sparse = None
+    SPARSE_SCORING_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Okapi BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Row blocks kept before they are merged into one matrix
+MAX_BLOCKS = 8
+
+# Score boost when the whole query appears verbatim in a chunk
+SUBSTRING_BOOST = 0.3
+
+
+class _Block:
+    """Rows [start, start + n_rows) of the matrix, with the vocabulary width at build time"""
+
+    def __init__(self, start: int, tf, bigrams):
+        self.start = start
+        self.tf = tf            # CSC, chunk x term frequencies
+        self.bigrams = bigrams  # CSC, chunk x bigram presence
+
+    @property
+    def n_rows(self) -> int:
+        return self.tf.shape[0]
+
+
+class SparseChunkMatrix:
+    """
+    Sparse term/bigram matrices over a KnowledgeSearchIndex's chunk list.
+
+    Row i is chunk ID i of the index. The matrix follows the index lazily:
+    sync() appends rows for chunks added since the last search and masks
+    out tombstoned ones.
+    """
+
+    def __init__(self):
+        self.term_ids: Dict[str, int] = {}
+        self.bigram_ids: Dict[str, int] = {}
+        self.blocks: List[_Block] = []
+        self.n_rows = 0
+
+        self.doc_len = np.zeros(0, dtype=np.float64)
+        self.live = np.zeros(0, dtype=bool)
+        self.category_codes = np.zeros(0, dtype=np.int32)
+        self.visibility_codes = np.zeros(0, dtype=np.int32)
+        self.categories: Dict[str, int] = {}
+        self.visibilities: Dict[str, int] = {}
+
+        self._tombstones_applied = 0
+        self._masks: Dict[Tuple[str, str], "np.ndarray"] = {}
+        self._avg_doc_len: Optional[float] = None
+        self._lock = threading.Lock()
+
+    # ==================== Building ====================
+
+    def sync(self, index):
+        """Append rows for new chunks and apply new tombstones"""
+        if self.n_rows == len(index.chunks) and self._tombstones_applied == len(index.deleted):
+            return
+
+        with self._lock:
+            if self.n_rows < len(index.chunks):
+                self._append_block(index.chunks[self.n_rows:])
+                if len(self.blocks) > MAX_BLOCKS:
+                    self._merge_blocks()
+
+            if self._tombstones_applied != len(index.deleted):
+                deleted = np.fromiter(index.deleted, dtype=np.int64, count=len(index.deleted))
+                self.live[deleted[deleted < self.n_rows]] = False
+                self._tombstones_applied = len(index.deleted)
+                self._masks.clear()
+                self._avg_doc_len = None
+
+    def _code(self, codes: Dict[str, int], value: Optional[str]) -> int:
+        return codes.setdefault(value or "", len(codes))
+
+    def _append_block(self, chunks: List[Dict]):
+        tf_rows, tf_cols, tf_data = [], [], []
+        bg_rows, bg_cols = [], []
+        doc_len = np.empty(len(chunks), dtype=np.float64)
+        category_codes = np.empty(len(chunks), dtype=np.int32)
+        visibility_codes = np.empty(len(chunks), dtype=np.int32)
+
+        term_ids, bigram_ids = self.term_ids, self.bigram_ids
+        for row, chunk in enumerate(chunks):
+            text = chunk.get("content_normalized") or normalize_text(chunk.get("content", ""))
+            words = text.split()
+
+            for term, count in Counter(words).items():
+                tf_rows.append(row)
+                tf_cols.append(term_ids.setdefault(term, len(term_ids)))
+                tf_data.append(count)
+
+            for bigram in set(_bigram_key(a, b) for a, b in zip(words[:-1], words[1:])):
+                bg_rows.append(row)
+                bg_cols.append(bigram_ids.setdefault(bigram, len(bigram_ids)))
+
+            doc_len[row] = len(words)
+            category_codes[row] = self._code(self.categories, chunk.get("category"))
+            visibility_codes[row] = self._code(self.visibilities, chunk.get("visibility", "public"))
+
+        n = len(chunks)
+        tf = sparse.csc_matrix(
+            (np.asarray(tf_data, dtype=np.float64), (tf_rows, tf_cols)),
+            shape=(n, len(term_ids))
+        )
+        bigrams = sparse.csc_matrix(
+            (np.ones(len(bg_rows), dtype=np.float64), (bg_rows, bg_cols)),
+            shape=(n, len(bigram_ids))
+        )
+
+        self.blocks.append(_Block(self.n_rows, tf, bigrams))
+        self.n_rows += n
+        self.doc_len = np.concatenate([self.doc_len, doc_len])
+        self.live = np.concatenate([self.live, np.ones(n, dtype=bool)])
+        self.category_codes = np.concatenate([self.category_codes, category_codes])
+        self.visibility_codes = np.concatenate([self.visibility_codes, visibility_codes])
+        self._masks.clear()
+        self._avg_doc_len = None
+
+    def _stacked(self) -> Tuple["sparse.csc_matrix", "sparse.csc_matrix"]:
+        """All blocks as single matrices over the full vocabulary"""
+        tf_parts, bg_parts = [], []
+        for block in self.blocks:
+            tf = block.tf.copy()
+            tf.resize((block.n_rows, len(self.term_ids)))
+            bigrams = block.bigrams.copy()
+            bigrams.resize((block.n_rows, len(self.bigram_ids)))
+            tf_parts.append(tf)
+            bg_parts.append(bigrams)
+        return sparse.vstack(tf_parts, format="csc"), sparse.vstack(bg_parts, format="csc")
+
+    def _merge_blocks(self):
+        tf, bigrams = self._stacked()
+        self.blocks = [_Block(0, tf, bigrams)]
+
+    def compacted(self, live_ids: List[int]) -> "SparseChunkMatrix":
+        """
+        Copy keeping only the given rows (in order), for a compacted index.
+
+        Lets background compaction carry the matrix over instead of the
+        next search rebuilding it from chunk text.
+        """
+        with self._lock:
+            rows = np.asarray(live_ids, dtype=np.int64)
+            matrix = SparseChunkMatrix()
+            matrix.term_ids = dict(self.term_ids)
+            matrix.bigram_ids = dict(self.bigram_ids)
+            matrix.categories = dict(self.categories)
+            matrix.visibilities = dict(self.visibilities)
+
+            if self.blocks:
+                tf, bigrams = self._stacked()
+                matrix.blocks = [_Block(0, tf.tocsr()[rows].tocsc(), bigrams.tocsr()[rows].tocsc())]
+
+            matrix.n_rows = len(rows)
+            matrix.doc_len = self.doc_len[rows]
+            matrix.live = np.ones(len(rows), dtype=bool)
+            matrix.category_codes = self.category_codes[rows]
+            matrix.visibility_codes = self.visibility_codes[rows]
+            return matrix
+
+    # ==================== Masks ====================
+
+    def _filter_mask(self, category: Optional[str], visibility: Optional[str]) -> "np.ndarray":
+        """Live rows matching the filters (cached until rows or tombstones change)"""
+        key = (category or "", visibility or "")
+        mask = self._masks.get(key)
+        if mask is None:
+            mask = self.live.copy()
+            if category:
+                code = self.categories.get(category)
+                mask &= (self.category_codes == code) if code is not None else False
+            if visibility:
+                code = self.visibilities.get(visibility)
+                mask &= (self.visibility_codes == code) if code is not None else False
+            self._masks[key] = mask
+        return mask
+
+    def _average_doc_len(self) -> float:
+        if self._avg_doc_len is None:
+            lengths = self.doc_len[self.live]
+            self._avg_doc_len = float(lengths.mean()) if len(lengths) else 1.0
+        return self._avg_doc_len or 1.0
+
+    # ==================== Scoring ====================
+
+    def _gather(self, attr: str, col_ids: List[int]) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+        """
+        Nonzeros of the given columns across all blocks.
+
+        Returns:
+            (row IDs, position of the column in col_ids, values) - the
+            operands of a sparse mat-vec restricted to the query's columns
+        """
+        rows, positions, values = [], [], []
+        for block in self.blocks:
+            matrix = getattr(block, attr)
+            indptr, indices, data = matrix.indptr, matrix.indices, matrix.data
+            for position, col in enumerate(col_ids):
+                if col >= matrix.shape[1]:
+                    continue  # Term is newer than this block
+                start, end = indptr[col], indptr[col + 1]
+                if start == end:
+                    continue
+                rows.append(indices[start:end] + block.start)
+                positions.append(np.full(end - start, position))
+                values.append(data[start:end])
+
+        if not rows:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty, np.zeros(0)
+        return np.concatenate(rows), np.concatenate(positions), np.concatenate(values)
+
+    def search(
+        self,
+        index,
+        query: str,
+        category: Optional[str] = None,
+        visibility: Optional[str] = None,
+        min_score: float = 0.05,
+        scorer: str = "heuristic",
+        top_k: Optional[int] = None
+    ) -> List[Tuple[Dict, float, Dict]]:
+        """
+        Score the index's chunks for a query.
+
+        Only the nonzeros of the query's columns are touched, so the cost
+        grows with the number of matching chunks, not the corpus size.
+
+        Returns:
+            List of (chunk, score, match_details) sorted by score descending,
+            ties in chunk order - the same shape as KnowledgeSearchIndex.search
+        """
+        self.sync(index)
+
+        query_normalized = normalize_text(query)
+        query_words = query_normalized.split()
+        query_word_set = set(query_words)
+
+        if not query_word_set or not self.n_rows:
+            return []
+
+        terms = [t for t in query_word_set if t in self.term_ids]
+        if not terms:
+            return []
+
+        rows, positions, tf = self._gather("tf", [self.term_ids[t] for t in terms])
+        keep = self._filter_mask(category, visibility)[rows]
+        rows, positions, tf = rows[keep], positions[keep], tf[keep]
+
+        # Candidates (ascending chunk IDs) and each nonzero's candidate slot
+        candidates, slots = np.unique(rows, return_inverse=True)
+        if not len(candidates):
+            return []
+
+        keyword_hits = np.bincount(slots, minlength=len(candidates))
+
+        if scorer == "bm25":
+            scores, details = self._bm25(index, terms, rows, positions, tf, slots, candidates, keyword_hits)
+        else:
+            scores, details = self._heuristic(
+                index, query_normalized, query_words, query_word_set, terms,
+                positions, slots, candidates, keyword_hits, top_k
+            )
+
+        selected = np.flatnonzero(scores >= min_score)
+
+        if top_k is not None and len(selected) > top_k:
+            kept = scores[selected]
+            kth = np.partition(kept, len(kept) - top_k)[len(kept) - top_k]
+            above = selected[kept > kth]
+            ties = selected[kept == kth][:top_k - len(above)]
+            selected = np.sort(np.concatenate([above, ties]))
+
+        order = selected[np.argsort(-scores[selected], kind="stable")]
+        return [
+            (index.chunks[int(candidates[i])], float(scores[i]), details(i))
+            for i in order
+        ]
+
+    def _contains(self, index, chunk_id: int, query_normalized: str) -> bool:
+        chunk = index.chunks[chunk_id]
+        content_normalized = chunk.get("content_normalized") or normalize_text(chunk["content"])
+        return query_normalized in content_normalized
+
+    def _heuristic(
+        self, index, query_normalized, query_words, query_word_set, terms,
+        positions, slots, candidates, keyword_hits, top_k
+    ):
+        """Keyword overlap (40%) + key terms (30%) + bigrams (20%) + substring boost (+0.3)"""
+        key_terms = {w for w in query_word_set if len(w) >= 4 and w not in STOP_WORDS}
+        is_key = np.array([1.0 if t in key_terms else 0.0 for t in terms])
+        key_term_hits = np.bincount(slots, weights=is_key[positions], minlength=len(candidates))
+
+        query_bigrams = {_bigram_key(a, b) for a, b in zip(query_words[:-1], query_words[1:])}
+        bigram_cols = [self.bigram_ids[b] for b in query_bigrams if b in self.bigram_ids]
+        bigram_hits = np.zeros(len(candidates))
+        if bigram_cols:
+            # A chunk containing a query bigram contains its words, so it is a candidate
+            bigram_rows, _, _ = self._gather("bigrams", bigram_cols)
+            slot = np.searchsorted(candidates, bigram_rows)
+            found = slot < len(candidates)
+            found[found] = candidates[slot[found]] == bigram_rows[found]
+            bigram_hits = np.bincount(slot[found], minlength=len(candidates)).astype(np.float64)
+
+        keyword_score = keyword_hits / len(query_word_set)
+        key_term_score = key_term_hits / len(key_terms) if key_terms else 0
+        phrase_score = bigram_hits / len(query_bigrams) if query_bigrams else 0
+        base = keyword_score * 0.4 + key_term_score * 0.3 + phrase_score * 0.2
+
+        boost = np.zeros(len(candidates))
+        if len(query_words) == 1:
+            # A single-word query is a substring of every chunk containing that word
+            boost[:] = SUBSTRING_BOOST
+        elif top_k is None:
+            for i in range(len(candidates)):
+                if self._contains(index, int(candidates[i]), query_normalized):
+                    boost[i] = SUBSTRING_BOOST
+        else:
+            # Visit chunks in the order they would rank if all got the boost
+            # (upper bound desc, chunk ID asc) and stop once that bound can't
+            # beat the k-th best (score, chunk ID) found so far.
+            upper = np.minimum(base + SUBSTRING_BOOST, 1.0)
+            order = np.lexsort((candidates, -upper))
+            best: List[Tuple[float, int]] = []
+            for i, bound, chunk_id in zip(order.tolist(), upper[order].tolist(), candidates[order].tolist()):
+                if len(best) == top_k and (bound, -chunk_id) < best[0]:
+                    break
+                if self._contains(index, chunk_id, query_normalized):
+                    boost[i] = SUBSTRING_BOOST
+                key = (min(base[i] + boost[i], 1.0), -chunk_id)
+                if len(best) < top_k:
+                    heapq.heappush(best, key)
+                elif key > best[0]:
+                    heapq.heapreplace(best, key)
+
+        scores = np.minimum(base + boost, 1.0)
+
+        def details(i: int) -> Dict[str, int]:
+            return {
+                "keywords": int(keyword_hits[i]),
+                "key_terms": int(key_term_hits[i]),
+                "phrases": int(bigram_hits[i])
+            }
+
+        return scores, details
+
+    def _bm25(self, index, terms, rows, positions, tf, slots, candidates, keyword_hits):
+        """Okapi BM25, scaled by the sum of query IDFs and capped at 1.0"""
+        n_live = max(len(index), 1)
+        idf = np.array([
+            math.log(1 + (n_live - index.document_frequency(t) + 0.5) / (index.document_frequency(t) + 0.5))
+            for t in terms
+        ])
+
+        length_norm = 1 - BM25_B + BM25_B * self.doc_len[rows] / self._average_doc_len()
+        weights = idf[positions] * tf * (BM25_K1 + 1) / (tf + BM25_K1 * length_norm)
+        raw = np.bincount(slots, weights=weights, minlength=len(candidates))
+
+        scores = np.minimum(raw / (idf.sum() or 1.0), 1.0)
+
+        def details(i: int) -> Dict:
+            return {
+                "keywords": int(keyword_hits[i]),
+                "bm25": round(float(raw[i]), 3)
+            }
+
+        return scores, details
@@ -6,13 +6,19 @@ Manages tenant knowledge documents using:
 - Supabase Database: Metadata and content chunks
 - PostgreSQL Full-Text Search: Content search
 
+Search modes (KNOWLEDGE_SEARCH_MODE):
+- postgres (default): chunks are ranked inside Postgres by the
+  search_knowledge_chunks RPC (migration 021) and only top-k come back
+- python: legacy scan that downloads every indexed document and scores
+  it in-process. Also used as a fallback when the RPC is unavailable.
+
 Replaces the filesystem-based KnowledgeIndexManager.
 """
 
 import os
 import uuid
 import logging
-from io import BytesIO
+import tempfile
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 from pathlib import Path
@@ -20,12 +26,26 @@ from pathlib import Path
 from fastapi import UploadFile, HTTPException
 from pydantic import BaseModel
 from src.utils.error_handling import log_and_suppress
+from src.services.answer_cache import invalidate_answer_cache
+from src.services.knowledge_ingestion_service import (
+    SUPPORTED_FILE_TYPES,
+    IngestSource,
+    get_ingestion_service
+)
 
 logger = logging.getLogger(__name__)
 
 # Storage bucket name
 KNOWLEDGE_BUCKET = "knowledge-documents"
 
+# Chunk-level full-text search (see database/migrations/021_knowledge_chunks_fts.sql)
+KNOWLEDGE_CHUNKS_TABLE = "knowledge_chunks"
+KNOWLEDGE_SEARCH_RPC = "search_knowledge_chunks"
+KNOWLEDGE_SEARCH_MODE = os.getenv("KNOWLEDGE_SEARCH_MODE", "postgres").lower()
+
+# Rows per insert when writing chunk rows
+CHUNK_INSERT_BATCH_SIZE = 500
+
 
 class DocumentMetadata(BaseModel):
     """Document metadata model"""
@@ -51,7 +71,7 @@ class SupabaseKnowledgeManager:
     Storage:
     - Files stored in Supabase Storage bucket
     - Metadata stored in knowledge_documents table
-    - Content chunks stored as JSONB for search
+    - Content chunks stored as JSONB and as knowledge_chunks rows for search
     """
 
     def __init__(self, config):
@@ -65,6 +85,9 @@ class SupabaseKnowledgeManager:
         self.tenant_id = config.client_id
         self.client = self._get_supabase_client()
 
+        # Flipped off if the search RPC is missing (migration 021 not applied)
+        self._fts_available = KNOWLEDGE_SEARCH_MODE == "postgres"
+
     def _get_supabase_client(self):
         """Get Supabase client from config or environment"""
         try:
@@ -138,7 +161,7 @@ class SupabaseKnowledgeManager:
         filename = file.filename
         file_type = filename.split('.')[-1].lower()
 
-        if file_type not in ['txt', 'md', 'pdf', 'docx']:
+        if file_type not in SUPPORTED_FILE_TYPES:
             raise HTTPException(status_code=400, detail=f"Unsupported file type: {file_type}")
 
         # Read file content
@@ -219,12 +242,25 @@ class SupabaseKnowledgeManager:
         """
         Index a document for search.
 
-        Extracts text content and stores chunks for full-text search.
+        Extracts text in the ingestion process pool and writes chunk rows
+        batch by batch as pages are parsed.
         """
         if not self.client:
             raise HTTPException(status_code=500, detail="Storage not configured")
 
-        # Get document record
+        try:
+            return get_ingestion_service().run(self, document_id, self.tenant_id)
+
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to index document {document_id}: {e}")
+            raise HTTPException(status_code=500, detail=f"Failed to index document: {str(e)}")
+
+    # ==================== Ingestion Hooks ====================
+
+    def ingest_source(self, document_id: str) -> IngestSource:
+        """Download a stored document to a temp file for the ingestion pipeline"""
         result = self.client.table("knowledge_documents")\
             .select("*")\
             .eq("document_id", document_id)\
@@ -236,83 +272,119 @@ class SupabaseKnowledgeManager:
             raise HTTPException(status_code=404, detail="Document not found")
 
         doc = result.data
+        file_data = self.client.storage.from_(KNOWLEDGE_BUCKET).download(doc["storage_path"])
+
+        # Extractor processes read from disk rather than receiving the bytes
+        with tempfile.NamedTemporaryFile(suffix=f".{doc['file_type']}", delete=False) as f:
+            f.write(file_data)
+
+        return IngestSource(
+            document_id=document_id,
+            file_path=f.name,
+            file_type=doc["file_type"],
+            filename=doc["filename"],
+            metadata=doc,
+            cleanup=True
+        )
+
+    def ingest_chunks(self, source: IngestSource, chunks: List[str], start_index: int):
+        """
+        Write a batch of knowledge_chunks rows (the first batch replaces old rows).
 
-        try:
-            # Download file from storage
-            storage_path = doc["storage_path"]
-            file_data = self.client.storage.from_(KNOWLEDGE_BUCKET).download(storage_path)
-
-            # Extract text
-            text = self._extract_text(file_data, doc["file_type"])
-
-            # Chunk text
-            chunks = self._chunk_text(text)
-
-            if not chunks:
-                raise ValueError("No content extracted from document")
+        Best effort: if the table is missing the document is still searchable
+        through the python fallback, so failures are logged, not raised.
+        """
+        document_id = source.document_id
+        doc = source.metadata
 
-            # Prepare chunk data for JSONB storage
-            chunk_data = [
+        try:
+            if start_index == 0:
+                self.client.table(KNOWLEDGE_CHUNKS_TABLE)\
+                    .delete()\
+                    .eq("document_id", document_id)\
+                    .eq("tenant_id", self.tenant_id)\
+                    .execute()
+
+            rows = [
                 {
-                    "index": i,
+                    "tenant_id": self.tenant_id,
+                    "document_id": document_id,
+                    "chunk_index": start_index + i,
                     "content": chunk,
-                    "word_count": len(chunk.split())
+                    "category": doc.get("category") or "general",
+                    "visibility": doc.get("visibility") or "public"
                 }
                 for i, chunk in enumerate(chunks)
             ]
 
-            # Update document with content and chunks
-            now = datetime.utcnow().isoformat()
-            update_result = self.client.table("knowledge_documents")\
-                .update({
-                    "content": text[:50000],  # Store first 50K chars for full-text search
-                    "content_chunks": chunk_data,
-                    "chunk_count": len(chunks),
-                    "status": "indexed",
-                    "indexed_at": now,
-                    "error_message": None
-                })\
-                .eq("document_id", document_id)\
-                .eq("tenant_id", self.tenant_id)\
-                .execute()
-
-            if not update_result.data:
-                raise HTTPException(status_code=500, detail="Failed to update document")
-
-            logger.info(f"Indexed document {document_id}: {len(chunks)} chunks")
+            for start in range(0, len(rows), CHUNK_INSERT_BATCH_SIZE):
+                self.client.table(KNOWLEDGE_CHUNKS_TABLE)\
+                    .insert(rows[start:start + CHUNK_INSERT_BATCH_SIZE])\
+                    .execute()
 
-            updated_doc = update_result.data[0]
-            return DocumentMetadata(
-                document_id=updated_doc["document_id"],
-                filename=updated_doc["filename"],
-                category=updated_doc["category"],
-                tags=updated_doc.get("tags", []),
-                visibility=updated_doc["visibility"],
-                file_type=updated_doc["file_type"],
-                file_size=updated_doc.get("file_size", 0),
-                status="indexed",
-                chunk_count=len(chunks),
-                uploaded_at=updated_doc.get("created_at"),
-                indexed_at=now,
-                storage_path=updated_doc.get("storage_path")
-            )
-
-        except HTTPException:
-            raise
         except Exception as e:
-            logger.error(f"Failed to index document {document_id}: {e}")
+            logger.warning(f"Failed to write search chunks for {document_id}: {e}")
+
+    def finish_ingest(self, source: IngestSource, text: str, chunks: List[str]) -> DocumentMetadata:
+        """Store content + JSONB chunks and mark the document indexed"""
+        document_id = source.document_id
+
+        # Prepare chunk data for JSONB storage
+        chunk_data = [
+            {
+                "index": i,
+                "content": chunk,
+                "word_count": len(chunk.split())
+            }
+            for i, chunk in enumerate(chunks)
+        ]
 
-            # Update error status
-            self.client.table("knowledge_documents")\
-                .update({
-                    "status": "error",
-                    "error_message": str(e)
-                })\
-                .eq("document_id", document_id)\
-                .eq("tenant_id", self.tenant_id)\
-                .execute()
+        now = datetime.utcnow().isoformat()
+        update_result = self.client.table("knowledge_documents")\
+            .update({
+                "content": text[:50000],  # Store first 50K chars for full-text search
+                "content_chunks": chunk_data,
+                "chunk_count": len(chunks),
+                "status": "indexed",
+                "indexed_at": now,
+                "error_message": None
+            })\
+            .eq("document_id", document_id)\
+            .eq("tenant_id", self.tenant_id)\
+            .execute()
 
-            raise HTTPException(status_code=500, detail=f"Failed to index document: {str(e)}")
+        if not update_result.data:
+            raise HTTPException(status_code=500, detail="Failed to update document")
+
+        invalidate_answer_cache(self.tenant_id)
+        logger.info(f"Indexed document {document_id}: {len(chunks)} chunks")
+
+        updated_doc = update_result.data[0]
+        return DocumentMetadata(
+            document_id=updated_doc["document_id"],
+            filename=updated_doc["filename"],
+            category=updated_doc["category"],
+            tags=updated_doc.get("tags", []),
+            visibility=updated_doc["visibility"],
+            file_type=updated_doc["file_type"],
+            file_size=updated_doc.get("file_size", 0),
+            status="indexed",
+            chunk_count=len(chunks),
+            uploaded_at=updated_doc.get("created_at"),
+            indexed_at=now,
+            storage_path=updated_doc.get("storage_path")
+        )
+
+    def fail_ingest(self, document_id: str, error: str):
+        """Record an ingestion failure on the document"""
+        self.client.table("knowledge_documents")\
+            .update({
+                "status": "error",
+                "error_message": error
+            })\
+            .eq("document_id", document_id)\
+            .eq("tenant_id", self.tenant_id)\
+            .execute()
 
     def search(
         self,
@@ -323,7 +395,88 @@ class SupabaseKnowledgeManager:
         min_score: float = 0.1
     ) -> List[Dict]:
         """
-        Search the knowledge base using PostgreSQL full-text search.
+        Search the knowledge base.
+
+        Uses the ranked Postgres RPC when available, otherwise falls back
+        to the in-process scan.
+        """
+        if not self.client:
+            return []
+
+        if self._fts_available:
+            results = self._search_postgres(query, top_k, category, visibility, min_score)
+            if results is not None:
+                return results
+
+        return self._search_python(query, top_k, category, visibility, min_score)
+
+    def _search_postgres(
+        self,
+        query: str,
+        top_k: int,
+        category: Optional[str],
+        visibility: Optional[str],
+        min_score: float
+    ) -> Optional[List[Dict]]:
+        """
+        Rank chunks inside Postgres via the search_knowledge_chunks RPC.
+
+        Returns:
+            Top-k results, or None if the RPC failed and the caller should fall back
+        """
+        try:
+            result = self.client.rpc(KNOWLEDGE_SEARCH_RPC, {
+                "p_tenant_id": self.tenant_id,
+                "p_query": query,
+                "p_top_k": top_k,
+                "p_category": category,
+                "p_visibility": visibility,
+                "p_min_score": min_score
+            }).execute()
+
+        except Exception as e:
+            # PGRST202: function not found in the schema cache
+            if "PGRST202" in str(e):
+                logger.warning(
+                    f"{KNOWLEDGE_SEARCH_RPC} RPC not found - apply migration 021. "
+                    "Falling back to python knowledge search."
+                )
+                self._fts_available = False
+            else:
+                logger.error(f"Postgres knowledge search failed, falling back: {e}")
+            return None
+
+        results = [
+            {
+                "content": row["content"],
+                "source": row.get("filename") or "Unknown",
+                "score": round(float(row.get("score") or 0.0), 3),
+                "document_id": row["document_id"],
+                "chunk_index": row.get("chunk_index", 0),
+                "visibility": row.get("visibility", "public"),
+                "category": row.get("category", "general")
+            }
+            for row in (result.data or [])
+        ]
+
+        if results:
+            logger.info(f"Knowledge search (postgres) found {len(results)} results (top: {results[0]['score']:.3f})")
+
+        return results
+
+    def _search_python(
+        self,
+        query: str,
+        top_k: int,
+        category: Optional[str],
+        visibility: Optional[str],
+        min_score: float
+    ) -> List[Dict]:
+        """
+        Score every indexed document of the tenant in-process.
+
+        Downloads content and content_chunks for all documents, so only used
+        when KNOWLEDGE_SEARCH_MODE=python or the RPC is unavailable.
         """
         if not self.client:
             return []
@@ -525,6 +678,7 @@ class SupabaseKnowledgeManager:
                 .eq("tenant_id", self.tenant_id)\
                 .execute()
 
+            invalidate_answer_cache(self.tenant_id)
             logger.info(f"Deleted document: {document_id}")
             return True
 
@@ -605,50 +759,6 @@ class SupabaseKnowledgeManager:
         }
         return types.get(file_type, "application/octet-stream")
 
-    def _extract_text(self, file_data: bytes, file_type: str) -> str:
-        """Extract text from document"""
-        text = ""
-
-        if file_type in ['txt', 'md']:
-            text = file_data.decode('utf-8', errors='ignore')
-
-        elif file_type == 'pdf':
-            try:
-                import pypdf
-                from io import BytesIO
-                reader = pypdf.PdfReader(BytesIO(file_data))
-                text = "\n".join(page.extract_text() or "" for page in reader.pages)
-            except ImportError:
-                try:
-                    import fitz  # PyMuPDF
-                    doc = fitz.open(stream=file_data, filetype="pdf")
-                    text = "\n".join(page.get_text() for page in doc)
-                except ImportError:
-                    raise HTTPException(status_code=500, detail="No PDF library available")
-
-        elif file_type == 'docx':
-            try:
-                from docx import Document
-                from io import BytesIO
-                doc = Document(BytesIO(file_data))
-                text = "\n".join(para.text for para in doc.paragraphs)
-            except ImportError:
-                raise HTTPException(status_code=500, detail="python-docx not installed")
-
-        return text.strip()
-
-    def _chunk_text(self, text: str, chunk_size: int = 500, overlap: int = 50) -> List[str]:
-        """Split text into chunks"""
-        words = text.split()
-        chunks = []
-
-        for i in range(0, len(words), chunk_size - overlap):
-            chunk = " ".join(words[i:i + chunk_size])
-            if chunk.strip():
-                chunks.append(chunk)
-
-        return chunks
-
 
 # ==================== Manager Cache ====================
 
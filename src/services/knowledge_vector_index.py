@@ -0,0 +1,690 @@
+"""
+Knowledge Vector Index - Local Dense Retrieval for the Filesystem Knowledge Base
+
+Embeds chunks with a local CPU embedding model at index time and keeps a
+per-tenant approximate nearest neighbour index next to the keyword index, so
+UnifiedRAGService can fuse keyword and vector hits without any network calls.
+
+Dense retrieval is opt-in: set KNOWLEDGE_DENSE_BACKEND (e.g.
+"sentence-transformers") to enable it. The model is loaded from the local
+Hugging Face cache only (KNOWLEDGE_EMBEDDING_OFFLINE), so it has to be baked
+into the image or cached beforehand. Other embedders can be plugged in with
+register_embedding_backend() / set_embedder().
+
+On-disk layout (clients/{tenant}/data/knowledge/index/vectors/):
+- CURRENT: JSON pointer to the live generation (model, dimension, IVF state)
+- vectors.{gen}.f32: L2-normalised float32 rows, append-only, memory-mapped
+  for search
+- rows.{gen}.jsonl: one record per vector row (document_id, chunk_index,
+  category, visibility) plus {"delete": document_id} records that tombstone
+  every earlier row of that document
+- ivf.{gen}.npy: IVF coarse centroids, trained once a tenant has
+  KNOWLEDGE_VECTOR_IVF_MIN vectors and retrained as the index grows
+
+Writers append under a file lock, so adds and deletes are incremental and
+other workers pick them up by reading the new tail of the rows file.
+Compaction drops tombstoned rows into a new generation and swaps CURRENT.
+Below the IVF threshold search is exact (one matrix-vector product).
+"""
+
+import os
+import json
+import logging
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional, List, Dict, Tuple, Callable, Any
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    import fcntl
+except ImportError:  # Windows dev machines - single-process locking only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+VECTORS_DIRNAME = "vectors"
+CURRENT_FILENAME = "CURRENT"
+LOCK_FILENAME = ".lock"
+
+# Embedding backend ("" disables dense retrieval)
+KNOWLEDGE_DENSE_BACKEND = os.getenv("KNOWLEDGE_DENSE_BACKEND", "").lower()
+KNOWLEDGE_EMBEDDING_MODEL = os.getenv("KNOWLEDGE_EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+KNOWLEDGE_EMBEDDING_OFFLINE = os.getenv("KNOWLEDGE_EMBEDDING_OFFLINE", "true").lower() == "true"
+KNOWLEDGE_EMBEDDING_BATCH_SIZE = int(os.getenv("KNOWLEDGE_EMBEDDING_BATCH_SIZE", "32"))
+
+# Vector search
+KNOWLEDGE_VECTOR_MIN_SCORE = float(os.getenv("KNOWLEDGE_VECTOR_MIN_SCORE", "0.25"))
+IVF_MIN_VECTORS = int(os.getenv("KNOWLEDGE_VECTOR_IVF_MIN", "4096"))
+IVF_NPROBE = int(os.getenv("KNOWLEDGE_VECTOR_NPROBE", "8"))
+IVF_RETRAIN_GROWTH = 4  # retrain once the index is this many times larger than at training
+IVF_SAMPLE_PER_LIST = 64
+IVF_TRAIN_ITERATIONS = 10
+ASSIGN_BATCH_ROWS = 8192
+
+# Compaction thresholds
+COMPACTION_DEAD_RATIO = 0.25
+COMPACTION_MIN_DEAD = 256
+
+
+# ==================== Embedders ====================
+
+class SentenceTransformerEmbedder:
+    """
+    Local CPU sentence-transformers bi-encoder.
+
+    The model is loaded lazily on first use. With KNOWLEDGE_EMBEDDING_OFFLINE
+    it is only read from the local cache, never downloaded.
+    """
+
+    def __init__(
+        self,
+        model_name: str = KNOWLEDGE_EMBEDDING_MODEL,
+        batch_size: int = KNOWLEDGE_EMBEDDING_BATCH_SIZE,
+        offline: bool = KNOWLEDGE_EMBEDDING_OFFLINE
+    ):
+        self.name = model_name
+        self.batch_size = batch_size
+        self.offline = offline
+        self.model = None
+        self._init_error: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def available(self) -> bool:
+        """Load the model if needed. Returns False if it cannot be loaded."""
+        if self.model is not None:
+            return True
+        if self._init_error:
+            return False
+
+        with self._lock:
+            if self.model is not None:
+                return True
+            try:
+                from sentence_transformers import SentenceTransformer
+
+                logger.info(f"Loading embedding model {self.name} for local dense retrieval...")
+                self.model = SentenceTransformer(self.name, device="cpu", local_files_only=self.offline)
+                logger.info(f"Embedding model loaded ({self.dimension} dimensions)")
+                return True
+
+            except ImportError as e:
+                logger.warning(f"sentence-transformers not available for dense retrieval: {e}")
+                self._init_error = "sentence-transformers not installed"
+            except Exception as e:
+                logger.error(f"Failed to load embedding model {self.name}: {e}")
+                self._init_error = str(e)
+            return False
+
+    @property
+    def dimension(self) -> int:
+        return self.model.get_sentence_embedding_dimension() if self.model is not None else 0
+
+    def embed(self, texts: List[str]) -> "np.ndarray":
+        """Embed texts as L2-normalised float32 rows"""
+        if not self.available():
+            raise RuntimeError(f"Embedding model unavailable: {self._init_error}")
+        vectors = self.model.encode(
+            texts,
+            batch_size=self.batch_size,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+            show_progress_bar=False
+        )
+        return np.asarray(vectors, dtype=np.float32)
+
+
+EMBEDDING_BACKENDS: Dict[str, Callable[[], Any]] = {
+    "sentence-transformers": SentenceTransformerEmbedder,
+}
+
+_embedder = None
+_embedder_resolved = False
+_embedder_lock = threading.Lock()
+
+
+def register_embedding_backend(name: str, factory: Callable[[], Any]):
+    """
+    Register an embedder factory selectable via KNOWLEDGE_DENSE_BACKEND.
+
+    Embedders need a `name` (stored with the vectors), an `available()`
+    method and `embed(texts)` returning L2-normalised float32 rows.
+    """
+    EMBEDDING_BACKENDS[name.lower()] = factory
+
+
+def _create_embedder():
+    if not KNOWLEDGE_DENSE_BACKEND:
+        return None
+    if not NUMPY_AVAILABLE:
+        logger.warning("numpy not installed - local dense retrieval disabled")
+        return None
+
+    factory = EMBEDDING_BACKENDS.get(KNOWLEDGE_DENSE_BACKEND)
+    if factory is None:
+        logger.warning(f"Unknown KNOWLEDGE_DENSE_BACKEND '{KNOWLEDGE_DENSE_BACKEND}' - local dense retrieval disabled")
+        return None
+
+    embedder = factory()
+    return embedder if embedder.available() else None
+
+
+def get_embedder():
+    """
+    Get the configured embedder.
+
+    Returns:
+        Embedder instance, or None if dense retrieval is disabled or the
+        model cannot be loaded
+    """
+    global _embedder, _embedder_resolved
+
+    if not _embedder_resolved:
+        with _embedder_lock:
+            if not _embedder_resolved:
+                _embedder = _create_embedder()
+                _embedder_resolved = True
+    return _embedder
+
+
+def set_embedder(embedder):
+    """Override the embedder (None re-reads KNOWLEDGE_DENSE_BACKEND on next use)"""
+    global _embedder, _embedder_resolved
+
+    with _embedder_lock:
+        _embedder = embedder
+        _embedder_resolved = embedder is not None
+
+
+# ==================== Vector Index ====================
+
+class KnowledgeVectorIndex:
+    """
+    Memory-mapped vector index for one tenant's index directory.
+
+    Row numbers are positions in the current generation's files. State is
+    refreshed from disk before every read or write, so writes from other
+    workers are picked up incrementally.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.RLock()
+        self._reset_state()
+
+    def _reset_state(self):
+        self.generation: Optional[int] = None
+        self.model: Optional[str] = None
+        self.dim = 0
+        self.rows: List[Tuple[str, int, str, str]] = []
+        self._current_mtime: Optional[int] = None
+        self._rows_offset = 0
+        self._doc_rows: Dict[str, List[int]] = {}
+        self._live = bytearray()
+        self._dead = 0
+        self._vectors = None
+        self._centroids = None
+        self._ivf_rows = 0
+        self._assign = None
+        self._lists = None
+        self._arrays = None
+
+    # ==================== Files ====================
+
+    def _vectors_file(self, generation: int) -> Path:
+        return self.path / f"vectors.{generation}.f32"
+
+    def _rows_file(self, generation: int) -> Path:
+        return self.path / f"rows.{generation}.jsonl"
+
+    def _ivf_file(self, generation: int) -> Path:
+        return self.path / f"ivf.{generation}.npy"
+
+    @contextmanager
+    def _file_lock(self):
+        """Serialize writers across worker processes"""
+        self.path.mkdir(parents=True, exist_ok=True)
+        with open(self.path / LOCK_FILENAME, 'a') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _write_current(self, **current):
+        tmp_file = self.path / f"{CURRENT_FILENAME}.tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump(current, f)
+        tmp_file.replace(self.path / CURRENT_FILENAME)
+
+    def _current(self) -> Dict:
+        return {"generation": self.generation, "model": self.model, "dim": self.dim, "ivf_rows": self._ivf_rows}
+
+    # ==================== Sync ====================
+
+    def _refresh(self):
+        """Catch up with the files on disk (new generation, new rows, new centroids)"""
+        try:
+            mtime = (self.path / CURRENT_FILENAME).stat().st_mtime_ns
+        except FileNotFoundError:
+            if self.generation is not None:
+                self._reset_state()
+            return
+
+        if mtime != self._current_mtime:
+            with open(self.path / CURRENT_FILENAME, 'r') as f:
+                current = json.load(f)
+
+            if current["generation"] != self.generation:
+                self._reset_state()
+                self.generation = current["generation"]
+                self.model = current["model"]
+                self.dim = current["dim"]
+            self._current_mtime = mtime
+            self._read_rows()
+
+            if current.get("ivf_rows", 0) != self._ivf_rows:
+                self._load_centroids(current.get("ivf_rows", 0))
+        else:
+            self._read_rows()
+
+    def _read_rows(self):
+        """Apply records appended to the rows file since the last read"""
+        rows_file = self._rows_file(self.generation)
+        try:
+            size = rows_file.stat().st_size
+        except FileNotFoundError:
+            return
+        if size <= self._rows_offset:
+            return
+
+        with open(rows_file, 'rb') as f:
+            f.seek(self._rows_offset)
+            data = f.read(size - self._rows_offset)
+
+        end = data.rfind(b"\n") + 1
+        if not end:
+            return
+
+        first_new = len(self.rows)
+        for line in data[:end].splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if "delete" in record:
+                self._drop(record["delete"])
+                continue
+            row = len(self.rows)
+            self.rows.append((
+                record["document_id"],
+                record["chunk_index"],
+                record.get("category", "general"),
+                record.get("visibility", "public")
+            ))
+            self._doc_rows.setdefault(record["document_id"], []).append(row)
+            self._live.append(1)
+
+        self._rows_offset += end
+        self._arrays = None
+
+        if len(self.rows) > first_new:
+            self._vectors = np.memmap(
+                self._vectors_file(self.generation), dtype=np.float32, mode='r',
+                shape=(len(self.rows), self.dim)
+            )
+            if self._centroids is not None:
+                self._assign_rows(first_new)
+
+    def _drop(self, document_id: str) -> int:
+        rows = self._doc_rows.pop(document_id, [])
+        for row in rows:
+            self._live[row] = 0
+        self._dead += len(rows)
+        self._arrays = None
+        return len(rows)
+
+    # ==================== Writes ====================
+
+    def add_document(
+        self,
+        document_id: str,
+        chunks: List[Dict],
+        vectors: "np.ndarray",
+        model: str,
+        replace: bool = False
+    ):
+        """
+        Append a batch of a document's chunk vectors.
+
+        Args:
+            document_id: Document the chunks belong to
+            chunks: Chunk records (document_id, chunk_index, category, visibility)
+            vectors: L2-normalised embeddings, one row per chunk
+            model: Embedder name; a different model starts a fresh index
+            replace: Tombstone the document's previous vectors first
+        """
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if len(vectors) != len(chunks):
+            raise ValueError(f"Got {len(vectors)} vectors for {len(chunks)} chunks")
+        if not len(chunks):
+            return
+
+        with self._lock, self._file_lock():
+            self._refresh()
+
+            if self.generation is None or self.model != model or self.dim != vectors.shape[1]:
+                if self.generation is not None:
+                    logger.warning(
+                        f"Embedding model changed ({self.model} -> {model}), resetting {self.path}; "
+                        f"rebuild the knowledge index to re-embed existing documents"
+                    )
+                self._start_generation(model, vectors.shape[1])
+
+            records = []
+            if replace and document_id in self._doc_rows:
+                records.append({"delete": document_id})
+            records.extend(
+                {
+                    "document_id": document_id,
+                    "chunk_index": chunk["chunk_index"],
+                    "category": chunk.get("category", "general"),
+                    "visibility": chunk.get("visibility", "public"),
+                }
+                for chunk in chunks
+            )
+
+            # Vectors first: a reader never sees a row without its vector
+            with open(self._vectors_file(self.generation), 'ab') as f:
+                f.write(vectors.tobytes())
+            with open(self._rows_file(self.generation), 'a') as f:
+                f.write("".join(json.dumps(record) + "\n" for record in records))
+
+            self._refresh()
+            self._maybe_compact()
+            self._maybe_train()
+
+    def delete_document(self, document_id: str) -> int:
+        """
+        Tombstone a document's vectors.
+
+        Returns:
+            Number of vectors removed
+        """
+        with self._lock:
+            if not (self.path / CURRENT_FILENAME).exists():
+                return 0
+
+            with self._file_lock():
+                self._refresh()
+                removed = len(self._doc_rows.get(document_id, []))
+                if removed:
+                    with open(self._rows_file(self.generation), 'a') as f:
+                        f.write(json.dumps({"delete": document_id}) + "\n")
+                    self._refresh()
+                    self._maybe_compact()
+                return removed
+
+    def _start_generation(self, model: str, dim: int, ivf_rows: int = 0):
+        """Point CURRENT at a new, empty generation"""
+        old_generation = self.generation
+        generation = (old_generation or 0) + 1
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._vectors_file(generation).write_bytes(b"")
+        self._rows_file(generation).write_text("")
+        self._write_current(generation=generation, model=model, dim=dim, ivf_rows=ivf_rows)
+        self._refresh()
+
+        if old_generation is not None:
+            self._remove_generation(old_generation)
+
+    def _remove_generation(self, generation: int):
+        # Other workers keep reading their open memmaps until they refresh
+        for path in (self._vectors_file(generation), self._rows_file(generation), self._ivf_file(generation)):
+            if path.exists():
+                path.unlink()
+
+    def _maybe_compact(self):
+        """Rewrite live rows into a new generation once enough are tombstoned"""
+        if self._dead < COMPACTION_MIN_DEAD or self._dead < COMPACTION_DEAD_RATIO * len(self.rows):
+            return
+
+        old_generation = self.generation
+        generation = old_generation + 1
+        live_rows = np.flatnonzero(self._live_mask())
+
+        with open(self._vectors_file(generation), 'wb') as f:
+            for start in range(0, len(live_rows), ASSIGN_BATCH_ROWS):
+                f.write(np.ascontiguousarray(self._vectors[live_rows[start:start + ASSIGN_BATCH_ROWS]]).tobytes())
+
+        with open(self._rows_file(generation), 'w') as f:
+            for row in live_rows:
+                document_id, chunk_index, category, visibility = self.rows[row]
+                f.write(json.dumps({
+                    "document_id": document_id,
+                    "chunk_index": chunk_index,
+                    "category": category,
+                    "visibility": visibility,
+                }) + "\n")
+
+        model, dim = self.model, self.dim
+        self._write_current(generation=generation, model=model, dim=dim, ivf_rows=0)
+        self._refresh()
+        self._remove_generation(old_generation)
+
+        logger.info(f"Compacted vector index {self.path}: {len(live_rows)} vectors")
+        self._maybe_train()
+
+    # ==================== IVF ====================
+
+    def _maybe_train(self):
+        """Train (or retrain) the IVF centroids once the index is large enough"""
+        live = len(self.rows) - self._dead
+        if live < IVF_MIN_VECTORS:
+            return
+        if self._centroids is not None and live < IVF_RETRAIN_GROWTH * self._ivf_rows:
+            return
+
+        centroids = self._train()
+
+        tmp_file = self.path / f"ivf.{self.generation}.tmp"
+        with open(tmp_file, 'wb') as f:
+            np.save(f, centroids)
+        tmp_file.replace(self._ivf_file(self.generation))
+
+        self._write_current(**{**self._current(), "ivf_rows": live})
+        self._refresh()
+
+        logger.info(f"Trained vector index {self.path}: {len(centroids)} IVF lists over {live} vectors")
+
+    def _train(self) -> "np.ndarray":
+        """Spherical k-means over a sample of the live vectors"""
+        live_rows = np.flatnonzero(self._live_mask())
+        nlist = max(1, int(np.sqrt(len(live_rows))))
+        rng = np.random.default_rng(0)
+
+        sample = np.sort(rng.choice(live_rows, size=min(len(live_rows), nlist * IVF_SAMPLE_PER_LIST), replace=False))
+        data = np.asarray(self._vectors[sample])
+        centroids = data[rng.choice(len(data), size=nlist, replace=False)].copy()
+
+        for _ in range(IVF_TRAIN_ITERATIONS):
+            assign = np.argmax(data @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, data)
+            empty = np.bincount(assign, minlength=nlist) == 0
+            sums[empty] = centroids[empty]
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            centroids = sums / norms
+
+        return centroids.astype(np.float32)
+
+    def _load_centroids(self, ivf_rows: int):
+        self._centroids = None
+        self._ivf_rows = ivf_rows
+        self._assign = None
+        self._lists = None
+
+        if not ivf_rows:
+            return
+        try:
+            self._centroids = np.load(self._ivf_file(self.generation))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable IVF centroids in {self.path}: {e}")
+            return
+        self._assign_rows(0)
+
+    def _assign_rows(self, start: int):
+        """Assign rows [start:] to their nearest centroid"""
+        assign = np.empty(len(self.rows) - start, dtype=np.int32)
+        for offset in range(0, len(assign), ASSIGN_BATCH_ROWS):
+            block = np.asarray(self._vectors[start + offset:start + offset + ASSIGN_BATCH_ROWS])
+            assign[offset:offset + len(block)] = np.argmax(block @ self._centroids.T, axis=1)
+
+        self._assign = assign if start == 0 or self._assign is None else np.concatenate([self._assign, assign])
+        self._lists = None
+
+    def _inverted_lists(self) -> Tuple["np.ndarray", "np.ndarray"]:
+        """(rows sorted by list, list boundaries)"""
+        if self._lists is None:
+            order = np.argsort(self._assign, kind="stable")
+            bounds = np.searchsorted(self._assign[order], np.arange(len(self._centroids) + 1))
+            self._lists = (order, bounds)
+        return self._lists
+
+    # ==================== Search ====================
+
+    def _live_mask(self) -> "np.ndarray":
+        return np.frombuffer(bytes(self._live), dtype=np.uint8).astype(bool)
+
+    def _filter_mask(self, category: Optional[str], visibility: Optional[str]) -> "np.ndarray":
+        if self._arrays is None:
+            self._arrays = (
+                self._live_mask(),
+                np.array([row[2] for row in self.rows], dtype=object),
+                np.array([row[3] for row in self.rows], dtype=object),
+            )
+        live, categories, visibilities = self._arrays
+
+        mask = live
+        if category:
+            mask = mask & (categories == category)
+        if visibility:
+            mask = mask & (visibilities == visibility)
+        return mask
+
+    def search(
+        self,
+        query_vector: "np.ndarray",
+        top_k: int = 10,
+        category: Optional[str] = None,
+        visibility: Optional[str] = None,
+        min_score: float = 0.0
+    ) -> List[Tuple[Dict, float]]:
+        """
+        Nearest chunks by cosine similarity.
+
+        Returns:
+            List of ({document_id, chunk_index, category, visibility}, score),
+            best first
+        """
+        query_vector = np.asarray(query_vector, dtype=np.float32).ravel()
+
+        with self._lock:
+            self._refresh()
+            if not self.rows or query_vector.shape[0] != self.dim:
+                return []
+
+            mask = self._filter_mask(category, visibility)
+
+            if self._centroids is not None:
+                order, bounds = self._inverted_lists()
+                probes = np.argsort(-(self._centroids @ query_vector), kind="stable")[:IVF_NPROBE]
+                candidates = np.sort(np.concatenate([order[bounds[p]:bounds[p + 1]] for p in probes]))
+                candidates = candidates[mask[candidates]]
+            else:
+                candidates = np.flatnonzero(mask)
+
+            if not len(candidates):
+                return []
+
+            scores = np.asarray(self._vectors[candidates]) @ query_vector
+            keep = scores >= min_score
+            candidates, scores = candidates[keep], scores[keep]
+
+            if top_k and len(scores) > top_k:
+                best = np.argpartition(-scores, top_k - 1)[:top_k]
+                candidates, scores = candidates[best], scores[best]
+
+            ranked = np.lexsort((candidates, -scores))
+            results = []
+            for i in ranked:
+                document_id, chunk_index, category_, visibility_ = self.rows[candidates[i]]
+                results.append(({
+                    "document_id": document_id,
+                    "chunk_index": chunk_index,
+                    "category": category_,
+                    "visibility": visibility_,
+                }, float(scores[i])))
+            return results
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh()
+            return len(self.rows) - self._dead
+
+    def get_status(self) -> Dict[str, Any]:
+        """Vector count, tombstones and IVF state"""
+        with self._lock:
+            self._refresh()
+            return {
+                "model": self.model,
+                "dimension": self.dim,
+                "vectors": len(self.rows) - self._dead,
+                "tombstones": self._dead,
+                "ivf_lists": len(self._centroids) if self._centroids is not None else 0,
+                "size_bytes": len(self.rows) * self.dim * 4,
+            }
+
+
+# ==================== Index Registry ====================
+
+_vector_indexes: Dict[str, KnowledgeVectorIndex] = {}
+_vector_indexes_lock = threading.Lock()
+
+
+def get_vector_index(index_path: Path) -> KnowledgeVectorIndex:
+    """Get or create the vector index for a tenant's index directory"""
+    key = str(index_path)
+    index = _vector_indexes.get(key)
+    if index is None:
+        with _vector_indexes_lock:
+            index = _vector_indexes.setdefault(key, KnowledgeVectorIndex(Path(index_path) / VECTORS_DIRNAME))
+    return index
+
+
+def clear_vector_index_cache():
+    """Clear all cached vector indexes (for testing)"""
+    with _vector_indexes_lock:
+        _vector_indexes.clear()
+
+
+def get_dense_retrieval_status() -> Dict[str, Any]:
+    """Configuration and availability of local dense retrieval"""
+    embedder = get_embedder()
+    return {
+        "enabled": embedder is not None,
+        "backend": KNOWLEDGE_DENSE_BACKEND or None,
+        "model": embedder.name if embedder else KNOWLEDGE_EMBEDDING_MODEL,
+        "offline": KNOWLEDGE_EMBEDDING_OFFLINE,
+        "ivf_min_vectors": IVF_MIN_VECTORS,
+        "nprobe": IVF_NPROBE,
+        "loaded_indexes": len(_vector_indexes),
+    }
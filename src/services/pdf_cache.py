@@ -0,0 +1,224 @@
+"""
+PDF Cache - Content-Addressed Store for Rendered Quote/Invoice PDFs
+
+Quote and invoice PDF downloads (including public links that customers and
+email scanners hit repeatedly) re-rendered the document every time. Rendered
+PDFs are now stored under a key that hashes everything the renderer reads:
+- The document payload (quote/invoice, hotels or items, customer)
+- The tenant branding and company details PDFGenerator takes from config
+- The template version: a fingerprint of the PDF generator code, the
+  templates/pdf files and the available rendering backend
+
+A changed quote, branding update or template deploy therefore produces a new
+key; stale entries are never served and simply age out of the LRU. The key
+doubles as the HTTP ETag, so If-None-Match revalidation is answered with a
+304 before any rendering or disk read.
+
+Storage is local disk (one file per key) with least-recently-used eviction
+once PDF_CACHE_MAX_MB is exceeded.
+
+Configuration via environment variables:
+- PDF_CACHE_ENABLED: Cache rendered PDFs (default: true)
+- PDF_CACHE_DIR: Cache directory (default: <repo>/data/pdf_cache)
+- PDF_CACHE_MAX_MB: Disk budget before LRU eviction (default: 256)
+"""
+
+import os
+import json
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+_REPO_ROOT = Path(__file__).parent.parent.parent
+
+PDF_CACHE_ENABLED = os.getenv("PDF_CACHE_ENABLED", "true").lower() == "true"
+PDF_CACHE_DIR = Path(os.getenv("PDF_CACHE_DIR", str(_REPO_ROOT / "data" / "pdf_cache")))
+PDF_CACHE_MAX_MB = float(os.getenv("PDF_CACHE_MAX_MB", "256"))
+
+# ClientConfig attributes PDFGenerator renders (branding, company and banking details)
+BRANDING_FIELDS = (
+    "client_id", "company_name", "primary_color", "secondary_color", "logo_url", "currency",
+    "company_address", "company_city", "company_country", "vat_number", "vat_rate",
+    "registration_number", "support_phone", "primary_email", "website", "fax_number",
+    "bank_name", "bank_account_number", "bank_branch_code", "bank_swift_code",
+    "bank_usd_account", "bank_usd_branch", "bank_eur_account", "bank_eur_branch",
+    "payment_reference_prefix",
+)
+
+_template_version: Optional[str] = None
+
+
+def template_version() -> str:
+    """Fingerprint of the PDF generator code, PDF templates and rendering backend"""
+    global _template_version
+    if _template_version is None:
+        from src.utils import pdf_generator
+
+        digest = hashlib.sha256()
+        digest.update(f"weasyprint={pdf_generator.WEASYPRINT_AVAILABLE};fpdf={pdf_generator.FPDF_AVAILABLE}".encode())
+        sources = [Path(pdf_generator.__file__)] + sorted((_REPO_ROOT / "templates" / "pdf").glob("**/*"))
+        for path in sources:
+            if path.is_file():
+                digest.update(path.name.encode())
+                digest.update(path.read_bytes())
+        _template_version = digest.hexdigest()[:16]
+    return _template_version
+
+
+def branding_fingerprint(config) -> Dict[str, Any]:
+    """The config values that end up in a rendered PDF"""
+    fingerprint = {}
+    for name in BRANDING_FIELDS:
+        try:
+            fingerprint[name] = getattr(config, name, None)
+        except Exception:
+            fingerprint[name] = None
+    return fingerprint
+
+
+def pdf_cache_key(kind: str, config, payload: Any) -> str:
+    """Content address for a PDF: payload + branding + template version"""
+    document = {
+        "kind": kind,
+        "template": template_version(),
+        "branding": branding_fingerprint(config),
+        "payload": payload,
+    }
+    encoded = json.dumps(document, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def etag_matches(if_none_match: Optional[str], key: str) -> bool:
+    """Whether an If-None-Match header names this key's ETag"""
+    if not if_none_match or not isinstance(if_none_match, str):
+        return False
+    tags = [tag.strip().removeprefix("W/").strip('"') for tag in if_none_match.split(",")]
+    return "*" in tags or key in tags
+
+
+class PDFCache:
+    """Disk store of rendered PDFs with LRU eviction"""
+
+    def __init__(self, directory: Path = PDF_CACHE_DIR, max_bytes: int = int(PDF_CACHE_MAX_MB * 1024 * 1024)):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._index: "OrderedDict[str, int]" = OrderedDict()  # key -> size, least recent first
+        self._size = 0
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.pdf"
+
+    def _load_index(self):
+        """Pick up entries left on disk by a previous process (oldest first)"""
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            files = sorted(self.directory.glob("*.pdf"), key=lambda p: p.stat().st_mtime)
+        except OSError:
+            return
+        for path in files:
+            try:
+                size = path.stat().st_size
+            except OSError:
+                continue
+            self._index[path.stem] = size
+            self._size += size
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            self._load_index()
+            if key not in self._index:
+                self._stats["misses"] += 1
+                return None
+            self._index.move_to_end(key)
+        try:
+            data = self._path(key).read_bytes()
+        except OSError:
+            with self._lock:
+                self._size -= self._index.pop(key, 0)
+                self._stats["misses"] += 1
+            return None
+        with self._lock:
+            self._stats["hits"] += 1
+        return data
+
+    def put(self, key: str, data: bytes):
+        if not data or len(data) > self.max_bytes:
+            return
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp = self._path(key).with_suffix(f".{threading.get_ident()}.tmp")
+            tmp.write_bytes(data)
+            tmp.replace(self._path(key))
+        except OSError as e:
+            logger.warning(f"Could not cache PDF {key[:12]}: {e}")
+            return
+
+        with self._lock:
+            self._load_index()
+            self._size += len(data) - self._index.pop(key, 0)
+            self._index[key] = len(data)
+            evicted = []
+            while self._size > self.max_bytes and self._index:
+                old_key, size = self._index.popitem(last=False)
+                self._size -= size
+                evicted.append(old_key)
+            self._stats["evictions"] += len(evicted)
+
+        for old_key in evicted:
+            try:
+                self._path(old_key).unlink()
+            except OSError:
+                pass
+
+    def get_or_render(self, key: str, render: Callable[[], bytes]) -> bytes:
+        """Cached PDF bytes for a key, rendering (and storing) them on a miss"""
+        data = self.get(key)
+        if data is None:
+            data = render()
+            self.put(key, data)
+        return data
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self._stats,
+                "entries": len(self._index),
+                "size_bytes": self._size,
+                "max_bytes": self.max_bytes,
+            }
+
+
+# ==================== Singleton ====================
+
+_pdf_cache: Optional[PDFCache] = None
+_pdf_cache_lock = threading.Lock()
+
+
+def get_pdf_cache() -> Optional[PDFCache]:
+    """Get the process-wide PDF cache (None when PDF_CACHE_ENABLED is false)"""
+    global _pdf_cache
+    if not PDF_CACHE_ENABLED:
+        return None
+    if _pdf_cache is None:
+        with _pdf_cache_lock:
+            if _pdf_cache is None:
+                _pdf_cache = PDFCache()
+    return _pdf_cache
+
+
+def reset_pdf_cache():
+    """Forget the cache instance (for testing); files on disk are kept"""
+    global _pdf_cache, _template_version
+    with _pdf_cache_lock:
+        _pdf_cache = None
+        _template_version = None
@@ -0,0 +1,321 @@
+"""
+PDF Render Service - Quote/Invoice Rendering in Warm Worker Processes
+
+PDF rendering (WeasyPrint layout or fpdf2 drawing) is CPU-bound and used to
+run on the request thread, holding the API worker's GIL while it ran, and
+PDFGenerator was rebuilt for every request. Rendering now happens in a
+small process pool instead:
+- Worker processes are started once and warmed up: the PDF backends are
+  imported (WeasyPrint loads Pango and fontconfig at import) and the
+  templates/pdf Jinja templates are compiled into the shared environment.
+- Only a picklable branding snapshot of the tenant config is sent to a
+  worker, together with the document payload; PDFGenerator is called with
+  the same arguments the routes used, so output is unchanged.
+- A slow PDF occupies one worker process, not the API process, so
+  unrelated requests keep being served. Renders that exceed
+  PDF_RENDER_TIMEOUT return b"" (the generator's failure value).
+- render_many() / render_invoice_pdfs() submit a whole batch at once for
+  bulk invoice runs and return PDFs in input order.
+
+With PDF_RENDER_WORKERS=0 (or if the pool breaks) PDFs are rendered in the
+calling thread exactly as before.
+
+Usage:
+    from src.services.pdf_render_service import render_quote_pdf, render_pdf
+
+    pdf_bytes = await render_quote_pdf(config, quote, hotels, customer)
+    pdf_bytes = render_pdf("invoice", config, invoice, items, customer)  # sync routes
+
+Configuration via environment variables:
+- PDF_RENDER_WORKERS: Renderer processes (default: 2; 0 = render in-process)
+- PDF_RENDER_TIMEOUT: Seconds before a render is abandoned (default: 60)
+"""
+
+import os
+import asyncio
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Sequence
+
+from src.services.pdf_cache import BRANDING_FIELDS
+
+logger = logging.getLogger(__name__)
+
+PDF_RENDER_WORKERS = int(os.getenv("PDF_RENDER_WORKERS", "2"))
+PDF_RENDER_TIMEOUT = float(os.getenv("PDF_RENDER_TIMEOUT", "60"))
+
+# Document kind -> PDFGenerator method
+RENDER_METHODS = {
+    "quote": "generate_quote_pdf",
+    "invoice": "generate_invoice_pdf",
+}
+
+
+def branding_snapshot(config) -> Dict[str, Any]:
+    """Picklable copy of the config values PDFGenerator reads (missing ones are left out)"""
+    snapshot = {}
+    for name in BRANDING_FIELDS:
+        try:
+            snapshot[name] = getattr(config, name)
+        except Exception:
+            continue
+    return snapshot
+
+
+def _generate(kind: str, config, args: Sequence[Any]) -> bytes:
+    from src.utils.pdf_generator import PDFGenerator
+
+    if kind not in RENDER_METHODS:
+        raise ValueError(f"Unknown PDF kind: {kind}")
+    return getattr(PDFGenerator(config), RENDER_METHODS[kind])(*args)
+
+
+# ==================== Worker Process ====================
+
+def _init_worker():
+    """Warm up a renderer process: import the PDF backends and compile the PDF templates"""
+    from src.utils import pdf_generator  # noqa: F401 - imports WeasyPrint/fpdf2 once
+
+    try:
+        from src.utils.template_renderer import warm_templates
+        warm_templates("pdf/")
+    except Exception as e:
+        logger.warning(f"PDF template warm-up skipped: {e}")
+
+
+def _render_in_worker(kind: str, branding: Dict[str, Any], args: Sequence[Any]) -> bytes:
+    """Render one PDF inside a worker process"""
+    return _generate(kind, SimpleNamespace(**branding), args)
+
+
+# ==================== Service ====================
+
+class PDFRenderService:
+    """
+    Renders quote and invoice PDFs in a pool of warm worker processes.
+
+    render() blocks the calling thread (sync routes, job handlers);
+    render_async() awaits the worker without blocking the event loop.
+    """
+
+    def __init__(self, workers: int = PDF_RENDER_WORKERS, timeout: float = PDF_RENDER_TIMEOUT):
+        self.workers = workers
+        self.timeout = timeout
+
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._stats = {"pooled": 0, "inline": 0, "timeouts": 0, "pool_restarts": 0}
+
+    # ==================== Pool ====================
+
+    def _get_pool(self) -> Optional[ProcessPoolExecutor]:
+        if self.workers <= 0:
+            return None
+        with self._lock:
+            if self._pool is None:
+                # spawn: forking a process that runs threads can deadlock the child
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker
+                )
+                logger.info(f"Started PDF render pool with {self.workers} processes")
+            return self._pool
+
+    def _discard_pool(self, pool: ProcessPoolExecutor):
+        """Drop a broken pool so the next render starts a fresh one"""
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+                self._stats["pool_restarts"] += 1
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def warm_up(self):
+        """Start the worker processes ahead of the first render"""
+        pool = self._get_pool()
+        if pool:
+            for future in [pool.submit(_init_worker) for _ in range(self.workers)]:
+                future.result()
+
+    def shutdown(self):
+        """Stop the worker processes, cancelling queued renders"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    # ==================== Rendering ====================
+
+    def _submit(self, kind: str, config, args: Sequence[Any]) -> Optional[Future]:
+        """Queue a render on the pool (None when rendering in-process)"""
+        pool = self._get_pool()
+        if pool is None:
+            return None
+        try:
+            return pool.submit(_render_in_worker, kind, branding_snapshot(config), tuple(args))
+        except (BrokenProcessPool, RuntimeError) as e:
+            logger.warning(f"PDF render pool unavailable, rendering in-process: {e}")
+            self._discard_pool(pool)
+            return None
+
+    def _collect(self, future: Optional[Future], kind: str, config, args: Sequence[Any]) -> bytes:
+        """Wait for a pooled render, falling back to an in-process render if the pool broke"""
+        if future is None:
+            with self._lock:
+                self._stats["inline"] += 1
+            return _generate(kind, config, args)
+        try:
+            pdf_bytes = future.result(timeout=self.timeout)
+            with self._lock:
+                self._stats["pooled"] += 1
+            return pdf_bytes
+        except FutureTimeoutError:
+            future.cancel()
+            with self._lock:
+                self._stats["timeouts"] += 1
+            logger.error(f"{kind} PDF render timed out after {self.timeout}s")
+            return b""
+        except BrokenProcessPool as e:
+            logger.warning(f"PDF render worker died, rendering in-process: {e}")
+            with self._lock:
+                pool = self._pool
+            if pool:
+                self._discard_pool(pool)
+            return self._collect(None, kind, config, args)
+
+    def render(self, kind: str, config, *args) -> bytes:
+        """
+        Render one PDF, blocking until it is ready.
+
+        Args:
+            kind: "quote" (quote, hotels, customer) or "invoice" (invoice, items, customer)
+            config: ClientConfig of the tenant
+            *args: PDFGenerator arguments for that kind
+
+        Returns:
+            PDF as bytes (b"" if rendering failed or timed out)
+        """
+        return self._collect(self._submit(kind, config, args), kind, config, args)
+
+    async def render_async(self, kind: str, config, *args) -> bytes:
+        """Render one PDF without blocking the event loop"""
+        future = self._submit(kind, config, args)
+        if future is None:
+            return await asyncio.to_thread(self._collect, None, kind, config, args)
+        try:
+            pdf_bytes = await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+            with self._lock:
+                self._stats["pooled"] += 1
+            return pdf_bytes
+        except asyncio.TimeoutError:
+            with self._lock:
+                self._stats["timeouts"] += 1
+            logger.error(f"{kind} PDF render timed out after {self.timeout}s")
+            return b""
+        except BrokenProcessPool:
+            return await asyncio.to_thread(self._collect, future, kind, config, args)
+
+    def render_many(self, kind: str, config, documents: Sequence[Sequence[Any]]) -> List[bytes]:
+        """
+        Render a batch of PDFs for one tenant (e.g. a bulk invoice run).
+
+        Every document is queued before the first result is awaited, so the
+        batch is spread across all worker processes.
+
+        Args:
+            kind: "quote" or "invoice"
+            config: ClientConfig of the tenant
+            documents: One PDFGenerator argument tuple per PDF
+
+        Returns:
+            PDF bytes in the order of documents
+        """
+        futures = [self._submit(kind, config, args) for args in documents]
+        return [
+            self._collect(future, kind, config, args)
+            for future, args in zip(futures, documents)
+        ]
+
+    async def render_many_async(self, kind: str, config, documents: Sequence[Sequence[Any]]) -> List[bytes]:
+        """Render a batch of PDFs without blocking the event loop"""
+        return await asyncio.to_thread(self.render_many, kind, config, documents)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self._stats,
+                "workers": self.workers,
+                "running": self._pool is not None,
+            }
+
+
+class PooledPDFGenerator:
+    """PDFGenerator-compatible facade that renders through the PDF render service"""
+
+    def __init__(self, config, service: Optional[PDFRenderService] = None):
+        self.config = config
+        self.service = service or get_pdf_render_service()
+
+    def generate_quote_pdf(self, quote_data: Dict[str, Any], hotels: list, customer_data: Dict[str, Any]) -> bytes:
+        return self.service.render("quote", self.config, quote_data, hotels, customer_data)
+
+    def generate_invoice_pdf(self, invoice_data: Dict[str, Any], items: list, customer_data: Dict[str, Any]) -> bytes:
+        return self.service.render("invoice", self.config, invoice_data, items, customer_data)
+
+
+# ==================== Singleton ====================
+
+_render_service: Optional[PDFRenderService] = None
+_render_service_lock = threading.Lock()
+
+
+def get_pdf_render_service() -> PDFRenderService:
+    """Get the process-wide PDF render service"""
+    global _render_service
+    if _render_service is None:
+        with _render_service_lock:
+            if _render_service is None:
+                _render_service = PDFRenderService()
+    return _render_service
+
+
+def shutdown_pdf_render_service():
+    """Stop the renderer processes (application shutdown)"""
+    global _render_service
+    with _render_service_lock:
+        service, _render_service = _render_service, None
+    if service:
+        service.shutdown()
+
+
+def warm_up_pdf_render_service():
+    """Start and warm the renderer processes (run at startup, off the event loop)"""
+    try:
+        get_pdf_render_service().warm_up()
+    except Exception as e:
+        logger.warning(f"PDF render pool warm-up failed: {e}")
+
+
+def render_pdf(kind: str, config, *args) -> bytes:
+    """Render a quote or invoice PDF, blocking until it is ready"""
+    return get_pdf_render_service().render(kind, config, *args)
+
+
+async def render_quote_pdf(config, quote_data: Dict[str, Any], hotels: list, customer_data: Dict[str, Any]) -> bytes:
+    """Render a quote PDF in a worker process"""
+    return await get_pdf_render_service().render_async("quote", config, quote_data, hotels, customer_data)
+
+
+async def render_invoice_pdf(config, invoice_data: Dict[str, Any], items: list, customer_data: Dict[str, Any]) -> bytes:
+    """Render an invoice PDF in a worker process"""
+    return await get_pdf_render_service().render_async("invoice", config, invoice_data, items, customer_data)
+
+
+async def render_invoice_pdfs(config, invoices: Sequence[Sequence[Any]]) -> List[bytes]:
+    """Render a batch of (invoice_data, items, customer_data) invoices across the pool"""
+    return await get_pdf_render_service().render_many_async("invoice", config, invoices)
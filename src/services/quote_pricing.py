@@ -0,0 +1,144 @@
+"""
+Quote Pricing - Per-Person Pricing Kernel for Hotel Rates
+
+Pure functions (no BigQuery, no I/O) that turn a hotel_rates row's package
+prices into the pricing breakdown used by quotes and quote PDFs. Shared by
+BigQueryTool.calculate_quote_price (one rate) and calculate_quote_prices
+(many rates, priced from rows already fetched).
+
+Rules:
+- Infants (<2) pay a flat INFANT_RATE
+- Children (2-12) pay the child rate
+- Adults share by default; a lone adult with no children pays the single
+  rate, and single_adults > 0 mixes single and sharing rooms
+- Single rate falls back to the sharing rate when a hotel has none
+"""
+
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+INFANT_RATE = 1000  # Flat rate per infant
+INFANT_MAX_AGE = 2  # Children younger than this are infants
+
+PRICE_COLUMNS = ("total_7nights_pps", "total_7nights_single", "total_7nights_child")
+
+
+def _amount(value: Any) -> int:
+    return int(value) if value else 0
+
+
+def count_children(children_ages: Optional[List[int]]) -> Tuple[int, int]:
+    """(children, infants) for a list of ages"""
+    infants = sum(1 for age in children_ages or [] if age < INFANT_MAX_AGE)
+    return len(children_ages or []) - infants, infants
+
+
+def price_rate(
+    adult_sharing: Any,
+    adult_single: Any,
+    child: Any,
+    adults: int,
+    children_ages: Optional[List[int]] = None,
+    single_adults: int = 0,
+    counts: Optional[Tuple[int, int]] = None
+) -> Dict[str, Any]:
+    """
+    Pricing breakdown for one rate.
+
+    Args:
+        adult_sharing: total_7nights_pps (per adult sharing)
+        adult_single: total_7nights_single (per adult in a single room)
+        child: total_7nights_child (per child)
+        adults: Number of adults
+        children_ages: List of children ages
+        single_adults: Number of adults in single rooms
+        counts: Precomputed count_children(children_ages), when pricing many rates
+
+    Returns:
+        Dictionary with per_person_rates, traveler_counts, totals and breakdown
+    """
+    num_children, num_infants = counts if counts is not None else count_children(children_ages)
+    sharing_rate = _amount(adult_sharing)
+    single_rate = _amount(adult_single) or sharing_rate
+    per_child_rate = _amount(child)
+
+    if single_adults > 0:
+        # MIXED ROOMS: Some single, some sharing
+        num_adults_sharing = adults - single_adults
+        num_adults_single = single_adults
+        per_adult_sharing_rate = sharing_rate
+        per_adult_single_rate = single_rate
+        total_adults_cost = sharing_rate * num_adults_sharing + single_rate * num_adults_single
+
+    elif adults == 1 and not children_ages:
+        # SINGLE TRAVELER: 1 adult, no children
+        num_adults_sharing = 0
+        num_adults_single = 1
+        per_adult_sharing_rate = 0
+        per_adult_single_rate = single_rate
+        total_adults_cost = single_rate
+
+    else:
+        # ALL SHARING: Default scenario
+        num_adults_sharing = adults
+        num_adults_single = 0
+        per_adult_sharing_rate = sharing_rate
+        per_adult_single_rate = 0
+        total_adults_cost = sharing_rate * adults
+
+    total_children_cost = per_child_rate * num_children
+    total_infants_cost = INFANT_RATE * num_infants
+
+    return {
+        'per_person_rates': {
+            'adult_sharing': per_adult_sharing_rate,
+            'adult_single': per_adult_single_rate,
+            'child': per_child_rate,
+            'infant': INFANT_RATE
+        },
+        'traveler_counts': {
+            'adults_sharing': num_adults_sharing,
+            'adults_single': num_adults_single,
+            'children': num_children,
+            'infants': num_infants
+        },
+        'totals': {
+            'adults': total_adults_cost,
+            'children': total_children_cost,
+            'infants': total_infants_cost,
+            'grand_total': total_adults_cost + total_children_cost + total_infants_cost
+        },
+        'breakdown': {
+            'adult_hotel': sharing_rate,
+            'child_hotel': per_child_rate,
+            'adult_transfer': 0,  # Already included in totals
+            'child_transfer': 0,  # Already included in totals
+            'flight_pp': 0  # Already included in totals
+        }
+    }
+
+
+def has_prices(row: Mapping[str, Any]) -> bool:
+    """Whether a hotel_rates row carries the price columns needed for pricing"""
+    return all(column in row for column in PRICE_COLUMNS)
+
+
+def price_rates(
+    rows: Iterable[Mapping[str, Any]],
+    adults: int,
+    children_ages: Optional[List[int]] = None,
+    single_adults: int = 0
+) -> List[Dict[str, Any]]:
+    """Pricing breakdown for each hotel_rates row (dicts with PRICE_COLUMNS)"""
+    counts = count_children(children_ages)
+    return [
+        price_rate(
+            row.get('total_7nights_pps'),
+            row.get('total_7nights_single'),
+            row.get('total_7nights_child'),
+            adults,
+            children_ages,
+            single_adults,
+            counts
+        )
+        for row in rows
+    ]
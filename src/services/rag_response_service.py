@@ -15,10 +15,11 @@ Key improvements:
 
 import os
 import logging
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, List, Dict, Any, Optional
 
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
+from src.services.answer_cache import get_answer_cache
 from src.utils.circuit_breaker import CircuitBreaker
 from src.utils.error_handling import CircuitBreakerState
 
@@ -145,6 +146,7 @@ class RAGResponseService:
     def __init__(self):
         self.openai_api_key = os.getenv('OPENAI_API_KEY')
         self._client = None
+        self._async_client = None
         self._api_status = self._validate_api_key()
 
     def _validate_api_key(self) -> Dict[str, Any]:
@@ -173,6 +175,18 @@ class RAGResponseService:
                 self._client = None
         return self._client
 
+    @property
+    def async_client(self):
+        """Lazy-load async OpenAI client (used for streaming)"""
+        if self._async_client is None and self.openai_api_key:
+            try:
+                import openai
+                self._async_client = openai.AsyncOpenAI(api_key=self.openai_api_key)
+            except Exception as e:
+                logger.error(f"Failed to create async OpenAI client: {e}")
+                self._async_client = None
+        return self._async_client
+
     def get_status(self) -> Dict[str, Any]:
         """Get service status for health checks"""
         return {
@@ -189,7 +203,8 @@ class RAGResponseService:
         question: str,
         search_results: List[Dict[str, Any]],
         query_type: str = "general",
-        max_context_chars: int = 6000
+        max_context_chars: int = 6000,
+        tenant_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Generate a natural response from search results.
@@ -199,10 +214,18 @@ class RAGResponseService:
             search_results: List of dicts with 'content', 'score', 'source'
             query_type: Type of query for optimized prompts
             max_context_chars: Maximum characters of context to include
+            tenant_id: Cache the answer for this tenant's knowledge base
+                (see answer_cache); omit to always call the LLM
 
         Returns:
             Dict with 'answer', 'sources', 'method' ('rag' or 'fallback')
         """
+        answer_cache = get_answer_cache() if tenant_id else None
+        if answer_cache is not None:
+            cached = answer_cache.get(tenant_id, question, query_type=query_type, namespace="rag")
+            if cached:
+                return cached
+
         # No API key - return structured fallback
         if not self.client:
             logger.warning("No OpenAI client available - using fallback response")
@@ -218,12 +241,9 @@ class RAGResponseService:
         # Generate response
         try:
             answer = self._call_llm(question, context, query_type)
-            return {
+            response = {
                 'answer': answer,
-                'sources': [
-                    {'title': self._clean_source_name(r.get('source', ''), r), 'filename': self._clean_source_name(r.get('source', ''), r), 'relevance_score': r.get('score', 0), 'score': r.get('score', 0)}
-                    for r in search_results[:5]  # Top 5 sources
-                ],
+                'sources': self._format_sources(search_results),
                 'method': 'rag',
                 'query_type': query_type
             }
@@ -231,6 +251,32 @@ class RAGResponseService:
             logger.error(f"LLM synthesis failed: {e}", exc_info=True)
             return self._fallback_response(question, search_results)
 
+        if answer_cache is not None:
+            answer_cache.put(tenant_id, question, response, query_type=query_type, namespace="rag")
+        return response
+
+    def stream_response(
+        self,
+        question: str,
+        search_results: List[Dict[str, Any]],
+        query_type: str = "general",
+        max_context_chars: int = 6000
+    ) -> "ResponseStream":
+        """
+        Streaming variant of generate_response.
+
+        Returns:
+            ResponseStream - iterate it (async) for answer text deltas
+        """
+        return ResponseStream(self, question, search_results, query_type, max_context_chars)
+
+    def _format_sources(self, search_results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Top 5 sources with friendly names"""
+        return [
+            {'title': self._clean_source_name(r.get('source', ''), r), 'filename': self._clean_source_name(r.get('source', ''), r), 'relevance_score': r.get('score', 0), 'score': r.get('score', 0)}
+            for r in search_results[:5]
+        ]
+
     def _clean_source_name(self, source: str, result: Optional[Dict] = None) -> str:
         """Clean up source names - convert temp file paths to friendly names"""
         if not source:
@@ -382,24 +428,10 @@ class RAGResponseService:
         """Internal method with retry decorator"""
         import openai
 
-        # Build system prompt with query-specific guidance
-        query_guidance = QUERY_TYPE_PROMPTS.get(query_type, QUERY_TYPE_PROMPTS["general"])
-        full_system_prompt = SYSTEM_PROMPT + "\n" + query_guidance
-
-        user_prompt = f"""Question: {question}
-
-Context from knowledge base:
-{context}
-
-Provide a helpful, natural response using the information above. If the context doesn't contain relevant information, honestly acknowledge that."""
-
         try:
             response = self.client.chat.completions.create(
                 model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": full_system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
+                messages=self._build_messages(question, context, query_type),
                 temperature=0.6,
                 max_tokens=500,
                 timeout=15.0
@@ -418,6 +450,23 @@ Provide a helpful, natural response using the information above. If the context
             logger.error(f"OpenAI API error: {e}")
             raise
 
+    def _build_messages(self, question: str, context: str, query_type: str = "general") -> List[Dict[str, str]]:
+        """System prompt with query-specific guidance plus the question and context"""
+        query_guidance = QUERY_TYPE_PROMPTS.get(query_type, QUERY_TYPE_PROMPTS["general"])
+        full_system_prompt = SYSTEM_PROMPT + "\n" + query_guidance
+
+        user_prompt = f"""Question: {question}
+
+Context from knowledge base:
+{context}
+
+Provide a helpful, natural response using the information above. If the context doesn't contain relevant information, honestly acknowledge that."""
+
+        return [
+            {"role": "system", "content": full_system_prompt},
+            {"role": "user", "content": user_prompt}
+        ]
+
     def _fallback_response(self, question: str, results: List[Dict]) -> Dict[str, Any]:
         """Fallback when LLM unavailable - return improved formatted results"""
         if not results:
@@ -519,6 +568,84 @@ Answer in 2-4 short paragraphs. Be specific and informative — don't be vague.
         }
 
 
+class ResponseStream:
+    """
+    Async iterator over the text deltas of a synthesized answer.
+
+    Runs on the async OpenAI client so a streaming request holds no worker
+    thread. Once iteration finishes, 'answer', 'sources' and 'method'
+    ('rag' or 'fallback') match what generate_response would have returned.
+    If the LLM is unavailable or fails before the first token, the
+    fallback answer is yielded in one piece; a failure mid-answer raises.
+    """
+
+    def __init__(self, service: RAGResponseService, question: str, search_results: List[Dict[str, Any]],
+                 query_type: str, max_context_chars: int):
+        self.service = service
+        self.question = question
+        self.search_results = search_results
+        self.query_type = query_type
+        self.max_context_chars = max_context_chars
+
+        self.answer = ""
+        self.sources = service._format_sources(search_results)
+        self.method: Optional[str] = None
+
+    def __aiter__(self) -> AsyncIterator[str]:
+        return self._generate()
+
+    def _fallback(self, response: Dict[str, Any]) -> str:
+        self.answer = response.get('answer', '')
+        self.sources = response.get('sources', [])
+        self.method = response.get('method', 'fallback')
+        return self.answer
+
+    async def _generate(self) -> AsyncIterator[str]:
+        service = self.service
+
+        if not service.async_client:
+            logger.warning("No OpenAI client available - using fallback response")
+            yield self._fallback(service._fallback_response(self.question, self.search_results))
+            return
+
+        if not self.search_results:
+            yield self._fallback(service._no_results_response(self.question))
+            return
+
+        if not _openai_circuit_breaker.can_execute():
+            logger.warning("Circuit breaker OPEN - returning fallback response")
+            yield self._fallback(service._fallback_response(self.question, self.search_results))
+            return
+
+        context = service._build_context(self.search_results, self.max_context_chars)
+        parts = []
+        try:
+            stream = await service.async_client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=service._build_messages(self.question, context, self.query_type),
+                temperature=0.6,
+                max_tokens=500,
+                timeout=15.0,
+                stream=True
+            )
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    parts.append(delta)
+                    yield delta
+            _openai_circuit_breaker.record_success()
+        except Exception as e:
+            _openai_circuit_breaker.record_failure()
+            if parts:
+                raise
+            logger.error(f"LLM streaming failed: {e}", exc_info=True)
+            yield self._fallback(service._fallback_response(self.question, self.search_results))
+            return
+
+        self.answer = "".join(parts)
+        self.method = 'rag'
+
+
 # Singleton instance
 _rag_service = None
 
@@ -534,11 +661,12 @@ def get_rag_service() -> RAGResponseService:
 def generate_rag_response(
     question: str,
     search_results: List[Dict[str, Any]],
-    query_type: str = "general"
+    query_type: str = "general",
+    tenant_id: Optional[str] = None
 ) -> Dict[str, Any]:
     """Convenience function for generating RAG responses"""
     service = get_rag_service()
-    return service.generate_response(question, search_results, query_type)
+    return service.generate_response(question, search_results, query_type, tenant_id=tenant_id)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,818 @@
+"""
+Rates Replica - Local Columnar Copy of the Shared Pricing Tables
+
+hotel_rates, hotel_media and flight_prices live in the shared pricing
+dataset in BigQuery and change rarely (rate imports, the odd edit in the
+pricing guide), yet every quote, helpdesk hotel question and pricing page
+pays seconds of BigQuery job latency to read them.
+
+With RATES_REPLICA_ENABLED=true, the tables are periodically snapshotted to
+Arrow IPC files on local disk and memory-mapped back in. Columns stay in
+Arrow until a lookup needs them: indexed columns are converted once, other
+values only for the rows returned. Lookups go through in-process indexes:
+- hotel_rates by (destination, nights), each bucket sorted by check_in_date
+  so the validity window is a binary search plus one vectorized compare
+- hotel_rates by nights and by rate_id
+- flight_prices by destination
+
+Each lookup mirrors the SQL it replaces in BigQueryTool, including QUALIFY
+dedup, ORDER BY priorities, LIMITs and NULL ordering (NULLS FIRST on ASC,
+NULLS LAST on DESC), and returns rows with the same Python types BigQuery
+rows have.
+
+BigQuery stays the source of truth:
+- Until the first snapshot is loaded, callers query BigQuery
+- A stale snapshot is served while one background thread refreshes it, but
+  never once it is older than twice the refresh interval
+- Writes through the pricing routes invalidate the replica everywhere:
+  the writing process drops its snapshot, an invalidation marker next to
+  the snapshot files stops the other workers on the host (checked every
+  INVALIDATION_CHECK_SECONDS) and a Redis broadcast reaches the other
+  instances. Each goes back to BigQuery until a fresh snapshot is taken
+
+Configuration via environment variables:
+- RATES_REPLICA_ENABLED: Serve lookups from the local replica (default: false)
+- RATES_REPLICA_DIR: Snapshot directory (default: data/rates_replica)
+- RATES_REPLICA_REFRESH_SECONDS: Snapshot lifetime (default: 14400, 4 hours)
+"""
+
+import os
+import re
+import json
+import time
+import uuid
+import logging
+import tempfile
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = None
+    PYARROW_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+RATES_REPLICA_ENABLED = os.getenv("RATES_REPLICA_ENABLED", "false").lower() == "true"
+RATES_REPLICA_DIR = os.getenv(
+    "RATES_REPLICA_DIR",
+    str(Path(__file__).parent.parent.parent / "data" / "rates_replica")
+)
+RATES_REPLICA_REFRESH_SECONDS = float(os.getenv("RATES_REPLICA_REFRESH_SECONDS", "14400"))
+
+# Minimum gap between refresh attempts after a failure (full table scans)
+REFRESH_RETRY_SECONDS = 300
+
+# hotel_rates is written last; its mtime is the snapshot time
+REPLICA_TABLES = ("hotel_media", "flight_prices", "hotel_rates")
+
+RATE_COLUMNS = (
+    "rate_id", "hotel_name", "hotel_rating", "room_type", "meal_plan",
+    "total_7nights_pps", "total_7nights_single", "total_7nights_child",
+    "check_in_date", "check_out_date", "nights",
+)
+MEDIA_COLUMNS = ("hotel_name", "destination", "description", "image_url", "amenities")
+
+# Touched on invalidation; snapshot files older than it are not served by any worker
+INVALIDATION_MARKER = "invalidated"
+INVALIDATION_CHECK_SECONDS = 5
+INVALIDATION_CHANNEL = "rates_replica:invalidated"
+
+# Identifies this process's own broadcasts, which it has already applied
+INSTANCE_ID = uuid.uuid4().hex
+
+FIND_MATCHING_LIMIT = 50
+FIND_BY_NAMES_LIMIT = 100
+
+_EMPTY = np.empty(0, dtype=np.int64)
+
+
+# ==================== Column Helpers ====================
+
+def _object_column(values: Sequence[Any]) -> np.ndarray:
+    return np.fromiter(values, dtype=object, count=len(values))
+
+
+def _day(value: Any) -> np.datetime64:
+    """DATE parameter or value as datetime64[D] (NaT when missing)"""
+    if value is None or value == "":
+        return np.datetime64("NaT", "D")
+    if isinstance(value, datetime):
+        value = value.date()
+    if isinstance(value, str):
+        value = value[:10]
+    return np.datetime64(value, "D")
+
+
+def _date_column(values: Sequence[Any]) -> np.ndarray:
+    return np.array([_day(value) for value in values], dtype="datetime64[D]").reshape(len(values))
+
+
+def _number_column(values: Sequence[Any]) -> np.ndarray:
+    return np.array([np.nan if value is None else value for value in values], dtype=np.float64).reshape(len(values))
+
+
+def _lower_column(values: Sequence[Any]) -> np.ndarray:
+    return _object_column([value.lower() if isinstance(value, str) else None for value in values])
+
+
+def _month(days: np.ndarray) -> np.ndarray:
+    return days.astype("datetime64[M]").astype(np.int64) % 12 + 1
+
+
+def _day_of_month(days: np.ndarray) -> np.ndarray:
+    return (days - days.astype("datetime64[M]")).astype(np.int64) + 1
+
+
+def _like(pattern: str) -> "re.Pattern":
+    """SQL LIKE pattern (% and _ wildcards) as an anchored regex"""
+    parts = []
+    for char in pattern:
+        if char == "%":
+            parts.append(".*")
+        elif char == "_":
+            parts.append(".")
+        else:
+            parts.append(re.escape(char))
+    return re.compile("".join(parts) + r"\Z", re.DOTALL)
+
+
+def _asc_nulls_first(values: np.ndarray) -> np.ndarray:
+    """Numeric sort key for ORDER BY ... ASC (BigQuery puts NULLs first)"""
+    return np.where(np.isnan(values), -np.inf, values)
+
+
+def _string_key(value: Optional[str]) -> Tuple[bool, str]:
+    """String sort key for ORDER BY ... ASC (NULLs first)"""
+    return (value is not None, value or "")
+
+
+def _distinct_agg(values: Iterable[Any], limit: int) -> Optional[str]:
+    """STRING_AGG(DISTINCT value, ', ' LIMIT n)"""
+    distinct = list(dict.fromkeys(value for value in values if value is not None))[:limit]
+    return ", ".join(distinct) if distinct else None
+
+
+def _min(values: Iterable[Any]) -> Any:
+    present = [value for value in values if value is not None]
+    return min(present) if present else None
+
+
+def _max(values: Iterable[Any]) -> Any:
+    present = [value for value in values if value is not None]
+    return max(present) if present else None
+
+
+# ==================== Tables ====================
+
+class ReplicaTable:
+    """One replicated table: Arrow columns, converted to Python values on first use"""
+
+    def __init__(self, columns: Union["pa.Table", Dict[str, Sequence[Any]]]):
+        """
+        Args:
+            columns: Memory-mapped Arrow table, or column name -> values
+        """
+        if PYARROW_AVAILABLE and isinstance(columns, pa.Table):
+            self._table = columns
+            self.names = columns.column_names
+            self.num_rows = columns.num_rows
+            self.values: Dict[str, np.ndarray] = {}
+        else:
+            self._table = None
+            self.names = list(columns)
+            self.num_rows = len(next(iter(columns.values()), []))
+            self.values = {name: _object_column(list(values)) for name, values in columns.items()}
+
+    def column(self, name: str) -> np.ndarray:
+        """Raw values (None where the table has no such column)"""
+        values = self.values.get(name)
+        if values is None:
+            if self._table is None or name not in self.names:
+                return np.full(self.num_rows, None, dtype=object)
+            values = self.values[name] = _object_column(self._table.column(name).to_pylist())
+        return values
+
+    def rows(self, indices: Iterable[int], columns: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        names = [name for name in columns if name in self.names] if columns else self.names
+        if self._table is not None:
+            # Only the returned rows leave Arrow
+            return self._table.select(names).take(pa.array(list(indices), type=pa.int64())).to_pylist()
+        return [{name: self.values[name][i] for name in names} for i in indices]
+
+
+class ReplicaSnapshot:
+    """Indexed, read-only snapshot of the shared pricing tables"""
+
+    def __init__(self, tables: Dict[str, Union["pa.Table", Dict[str, Sequence[Any]]]], taken_at: Optional[float] = None):
+        self.taken_at = taken_at if taken_at is not None else time.time()
+        self.rates = ReplicaTable(tables.get("hotel_rates", {}))
+        self.media = ReplicaTable(tables.get("hotel_media", {}))
+        self.flights = ReplicaTable(tables.get("flight_prices", {}))
+        self._index_rates()
+        self._index_flights()
+
+    def _index_rates(self):
+        rates = self.rates
+        self.rate_id = rates.column("rate_id")
+        self.hotel_name = rates.column("hotel_name")
+        self.hotel_name_lower = _lower_column(self.hotel_name)
+        self.destination_lower = _lower_column(rates.column("destination"))
+        self.room_type = rates.column("room_type")
+        self.meal_plan = rates.column("meal_plan")
+        self.check_in = _date_column(rates.column("check_in_date"))
+        self.check_out = _date_column(rates.column("check_out_date"))
+        self.nights = rates.column("nights")
+        self.pps = _number_column(rates.column("total_7nights_pps"))
+        active = np.array([value is True for value in rates.column("is_active")], dtype=bool).reshape(rates.num_rows)
+        self.active_rows = np.flatnonzero(active)
+
+        destination = rates.column("destination")
+        by_destination_nights: Dict[Tuple[str, int], List[int]] = {}
+        by_nights: Dict[int, List[int]] = {}
+        for i in self.active_rows.tolist():
+            nights = self.nights[i]
+            if nights is None:
+                continue
+            by_nights.setdefault(nights, []).append(i)
+            if isinstance(destination[i], str):
+                by_destination_nights.setdefault((destination[i].upper(), nights), []).append(i)
+
+        # Buckets sorted by check_in_date: rows valid from on or before a date are a prefix
+        self._by_destination_nights = {}
+        for key, rows in by_destination_nights.items():
+            rows = np.asarray(rows, dtype=np.int64)
+            self._by_destination_nights[key] = rows[np.argsort(self.check_in[rows], kind="stable")]
+        self._by_nights = {key: np.asarray(rows, dtype=np.int64) for key, rows in by_nights.items()}
+
+        self._by_rate_id: Dict[str, int] = {}
+        for i, rate_id in enumerate(self.rate_id.tolist()):
+            if rate_id is not None:
+                self._by_rate_id.setdefault(rate_id, i)
+
+    def _index_flights(self):
+        flights = self.flights
+        self.departure = _date_column(flights.column("departure_date"))
+        by_destination: Dict[str, List[int]] = {}
+        for i, destination in enumerate(flights.column("destination").tolist()):
+            if destination is not None:
+                by_destination.setdefault(destination.upper(), []).append(i)
+        self._flights_by_destination = {key: np.asarray(rows, dtype=np.int64) for key, rows in by_destination.items()}
+
+    def _rate_id_desc(self, rows: Iterable[int]) -> List[int]:
+        """Rows ordered by rate_id DESC (NULLs last), otherwise stable"""
+        rows = list(rows)
+        with_id = sorted((i for i in rows if self.rate_id[i] is not None), key=lambda i: self.rate_id[i], reverse=True)
+        return with_id + [i for i in rows if self.rate_id[i] is None]
+
+    def _matching_names(self, patterns: Sequence[str], rows: np.ndarray, *columns: np.ndarray) -> np.ndarray:
+        """Rows where any lower-cased column matches any LIKE pattern"""
+        regexes = [_like(pattern.lower()) for pattern in patterns]
+        mask = np.zeros(len(rows), dtype=bool)
+        for column in columns:
+            values = column[rows]
+            matched = {value for value in set(values.tolist()) if value is not None and any(r.match(value) for r in regexes)}
+            if matched:
+                mask |= np.fromiter((value in matched for value in values), dtype=bool, count=len(values))
+        return rows[mask]
+
+    # ==================== hotel_rates ====================
+
+    def find_matching_hotels(
+        self,
+        destinations: Sequence[str],
+        check_in: Any,
+        check_out: Any,
+        nights: int,
+        meal_plan: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """BigQueryTool.find_matching_hotels over the replica (destinations upper-cased)"""
+        ci, co = _day(check_in), _day(check_out)
+
+        buckets = []
+        for destination in dict.fromkeys(destinations):
+            rows = self._by_destination_nights.get((destination, nights))
+            if rows is None:
+                continue
+            rows = rows[:np.searchsorted(self.check_in[rows], ci, side="right")]
+            buckets.append(rows[self.check_out[rows] >= ci])
+        rows = np.sort(np.concatenate(buckets)) if buckets else _EMPTY
+        if meal_plan:
+            rows = rows[self.meal_plan[rows] == meal_plan]
+
+        # QUALIFY ROW_NUMBER() OVER (PARTITION BY hotel, dates, room, meal ORDER BY rate_id DESC) = 1
+        seen = set()
+        kept = []
+        for i in self._rate_id_desc(rows.tolist()):
+            key = (self.hotel_name[i], self.check_in[i], self.check_out[i], self.room_type[i], self.meal_plan[i])
+            if key not in seen:
+                seen.add(key)
+                kept.append(i)
+        rows = np.asarray(sorted(kept), dtype=np.int64)
+
+        rate_in, rate_out = self.check_in[rows], self.check_out[rows]
+        exact = (rate_in == ci) & (rate_out == co)
+        within = (ci >= rate_in) & (co <= rate_out)
+        same_day = (_month(rate_in) == _month(np.array([ci]))) & (_day_of_month(rate_in) == _day_of_month(np.array([ci])))
+        month_gap = 4 + np.abs(_month(np.array([ci])) - _month(rate_in))
+        priority = np.select([exact, within, same_day], [1, 2, 3], default=month_gap)
+
+        order = np.lexsort((_asc_nulls_first(self.pps[rows]), priority))
+        return self.rates.rows(rows[order][:FIND_MATCHING_LIMIT].tolist(), RATE_COLUMNS)
+
+    def find_rates_by_hotel_names(
+        self,
+        patterns: Sequence[str],
+        nights: int,
+        check_in: Any,
+        check_out: Any
+    ) -> List[Dict[str, Any]]:
+        """BigQueryTool.find_rates_by_hotel_names over the replica (LIKE patterns)"""
+        ci, co = _day(check_in), _day(check_out)
+        rows = self._matching_names(patterns, self._by_nights.get(nights, _EMPTY), self.hotel_name_lower)
+
+        rate_in, rate_out = self.check_in[rows], self.check_out[rows]
+        exact = (rate_in == ci) & (rate_out == co)
+        within = (ci >= rate_in) & (co <= rate_out)
+        same_month = ~np.isnat(rate_in) & (_month(rate_in) == _month(np.array([ci])))
+        priority = dict(zip(rows.tolist(), np.select([exact, within, same_month], [1, 2, 3], default=4).tolist()))
+
+        # QUALIFY ROW_NUMBER() OVER (PARTITION BY hotel, room, meal ORDER BY priority, rate_id DESC) = 1
+        seen = set()
+        kept = []
+        for i in sorted(self._rate_id_desc(rows.tolist()), key=priority.get):
+            key = (self.hotel_name[i], self.room_type[i], self.meal_plan[i])
+            if key not in seen:
+                seen.add(key)
+                kept.append(i)
+
+        pps = _asc_nulls_first(self.pps)
+        kept.sort(key=lambda i: (_string_key(self.hotel_name[i]), pps[i]))
+        return self.rates.rows(kept[:FIND_BY_NAMES_LIMIT], RATE_COLUMNS)
+
+    def _hotel_groups(self, rows: np.ndarray) -> List[List[int]]:
+        """Rows grouped by (hotel_name, hotel_rating, destination), ordered by hotel_name"""
+        rating = self.rates.column("hotel_rating")
+        destination = self.rates.column("destination")
+        groups: Dict[Tuple[Any, Any, Any], List[int]] = {}
+        for i in rows.tolist():
+            groups.setdefault((self.hotel_name[i], rating[i], destination[i]), []).append(i)
+        return [groups[key] for key in sorted(groups, key=lambda key: _string_key(key[0]))]
+
+    def search_hotels_by_name(self, search_term: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """BigQueryTool.search_hotels_by_name over the replica"""
+        rows = self._matching_names([f"%{search_term}%"], self.active_rows, self.hotel_name_lower, self.destination_lower)
+        column = self.rates.column
+        pps = column("total_7nights_pps")
+        results = []
+        for group in self._hotel_groups(rows)[:limit]:
+            first = group[0]
+            results.append({
+                "hotel_name": self.hotel_name[first],
+                "hotel_rating": column("hotel_rating")[first],
+                "destination": column("destination")[first],
+                "min_price_pps": _min(pps[group]),
+                "max_price_pps": _max(pps[group]),
+                "meal_plans": _distinct_agg(self.meal_plan[group], 5),
+                "room_types": _distinct_agg(self.room_type[group], 5),
+            })
+        return results
+
+    def get_hotel_info(self, hotel_name: str) -> Optional[Dict[str, Any]]:
+        """
+        BigQueryTool.get_hotel_info over the replica. The SQL has no ORDER BY
+        before LIMIT 1; the replica returns the first group by hotel name.
+        """
+        rows = self._matching_names([f"%{hotel_name}%"], self.active_rows, self.hotel_name_lower)
+        groups = self._hotel_groups(rows)
+        if not groups:
+            return None
+
+        group = groups[0]
+        first = group[0]
+        column = self.rates.column
+        return {
+            "hotel_name": self.hotel_name[first],
+            "hotel_rating": column("hotel_rating")[first],
+            "destination": column("destination")[first],
+            "min_price_pps": _min(column("total_7nights_pps")[group]),
+            "max_price_pps": _max(column("total_7nights_pps")[group]),
+            "min_single_price": _min(column("total_7nights_single")[group]),
+            "min_child_price": _min(column("total_7nights_child")[group]),
+            "available_meal_plans": _distinct_agg(self.meal_plan[group], 10),
+            "available_room_types": _distinct_agg(self.room_type[group], 10),
+            "min_nights": _min(self.nights[group]),
+            "max_nights": _max(self.nights[group]),
+            "rate_count": len({self.rate_id[i] for i in group if self.rate_id[i] is not None}),
+        }
+
+    def rate_prices(self, rate_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Price columns by rate_id (active or not, like the rate_id queries)"""
+        columns = ("rate_id", "total_7nights_pps", "total_7nights_single", "total_7nights_child")
+        prices = {}
+        for rate_id in rate_ids:
+            i = self._by_rate_id.get(rate_id)
+            if i is not None:
+                prices[rate_id] = self.rates.rows([i], columns)[0]
+        return prices
+
+    def get_rate(self, rate_id: str) -> Optional[Dict[str, Any]]:
+        """All columns of one rate"""
+        i = self._by_rate_id.get(rate_id)
+        return self.rates.rows([i])[0] if i is not None else None
+
+    def hotel_rates(self, hotel_name: str) -> List[Dict[str, Any]]:
+        """Active rates for an exact (case-insensitive) hotel name, by check-in, room and meal plan"""
+        name = hotel_name.lower()
+        rows = [i for i in self.active_rows.tolist() if self.hotel_name_lower[i] == name]
+        check_in = self.check_in.astype(np.int64)
+        rows.sort(key=lambda i: (
+            (not np.isnat(self.check_in[i]), check_in[i]),
+            _string_key(self.room_type[i]),
+            _string_key(self.meal_plan[i]),
+        ))
+        return self.rates.rows(rows)
+
+    # ==================== hotel_media / flight_prices ====================
+
+    def hotel_media(self, hotel_name: str) -> Optional[Dict[str, Any]]:
+        """Description, image and amenities for an exact (case-insensitive) hotel name"""
+        name = hotel_name.lower()
+        for i, value in enumerate(self.media.column("hotel_name").tolist()):
+            if isinstance(value, str) and value.lower() == name:
+                return self.media.rows([i], MEDIA_COLUMNS)[0]
+        return None
+
+    def flight_price(self, destination: str, check_in_date: Any) -> Optional[Any]:
+        """price_per_person of the departure closest to check_in_date (None when no flights)"""
+        rows = self._flights_by_destination.get(destination.upper())
+        if rows is None:
+            return None
+        gap = np.abs(self.departure[rows] - _day(check_in_date)).astype(np.float64)
+        gap[np.isnat(self.departure[rows])] = np.inf
+        return self.flights.column("price_per_person")[rows[np.argmin(gap)]]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "taken_at": self.taken_at,
+            "age_seconds": round(time.time() - self.taken_at, 1),
+            "hotel_rates": self.rates.num_rows,
+            "hotel_media": self.media.num_rows,
+            "flight_prices": self.flights.num_rows,
+        }
+
+
+# ==================== Snapshot Lifecycle ====================
+
+class RatesReplica:
+    """Refreshes, persists and serves the snapshot for one shared pricing dataset"""
+
+    def __init__(
+        self,
+        key: str,
+        tables: Dict[str, str],
+        directory: Path,
+        refresh_seconds: float = RATES_REPLICA_REFRESH_SECONDS
+    ):
+        """
+        Args:
+            key: project.dataset of the shared pricing dataset
+            tables: Replicated table name -> fully qualified BigQuery table
+            directory: Where this dataset's snapshot files live
+            refresh_seconds: Snapshot lifetime
+        """
+        self.key = key
+        self.tables = tables
+        self.directory = Path(directory)
+        self.refresh_seconds = refresh_seconds
+
+        self._snapshot: Optional[ReplicaSnapshot] = None
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._next_attempt = 0.0
+        self._disk_checked = False
+        self._invalidated_at = 0.0
+        self._next_invalidation_check = 0.0
+        self._stats = {"served": 0, "bypassed": 0, "refreshes": 0, "refresh_errors": 0, "invalidations": 0}
+
+    def _path(self, table: str) -> Path:
+        return self.directory / f"{table}.arrow"
+
+    def snapshot(self, client) -> Optional[ReplicaSnapshot]:
+        """
+        Snapshot to serve lookups from, or None (query BigQuery).
+
+        Starts a background refresh when there is no snapshot or it is stale.
+        """
+        self._check_invalidated()
+        snapshot = self._snapshot
+        if snapshot is None and not self._disk_checked:
+            snapshot = self._load_from_disk()
+
+        age = time.time() - snapshot.taken_at if snapshot is not None else None
+        if age is None or age >= self.refresh_seconds:
+            self._start_refresh(client)
+
+        if age is None or age >= 2 * self.refresh_seconds:
+            self._count("bypassed")
+            return None
+        self._count("served")
+        return snapshot
+
+    def invalidate(self, invalidated_at: Optional[float] = None):
+        """
+        Stop serving the current snapshot (after a write to the source tables).
+
+        Also marks the snapshot files stale for the other workers sharing them.
+        """
+        invalidated_at = invalidated_at or time.time()
+        with self._lock:
+            self._snapshot = None
+            self._disk_checked = True
+            self._invalidated_at = max(self._invalidated_at, invalidated_at)
+            self._stats["invalidations"] += 1
+        _mark_invalidated(self.directory, invalidated_at)
+        logger.info(f"Rates replica for {self.key} invalidated")
+
+    def _check_invalidated(self):
+        """Drop a snapshot another worker on this host has invalidated since it was taken"""
+        now = time.time()
+        if now < self._next_invalidation_check:
+            return
+        self._next_invalidation_check = now + INVALIDATION_CHECK_SECONDS
+
+        invalidated_at = _marked_invalidated_at(self.directory)
+        with self._lock:
+            if invalidated_at <= self._invalidated_at:
+                return
+            self._invalidated_at = invalidated_at
+            if self._snapshot is not None and self._snapshot.taken_at < invalidated_at:
+                self._snapshot = None
+                # Another worker may already have written a fresh snapshot
+                self._disk_checked = False
+                self._stats["invalidations"] += 1
+                logger.info(f"Rates replica for {self.key} invalidated by another worker")
+
+    def _count(self, field: str):
+        with self._lock:
+            self._stats[field] += 1
+
+    def _start_refresh(self, client):
+        with self._lock:
+            if self._refreshing or client is None or time.time() < self._next_attempt:
+                return
+            self._refreshing = True
+            self._next_attempt = time.time() + min(REFRESH_RETRY_SECONDS, self.refresh_seconds)
+        threading.Thread(target=self.refresh, args=(client,), name=f"rates-replica-{self.key}", daemon=True).start()
+
+    def refresh(self, client):
+        """Snapshot the source tables from BigQuery, persist and load them"""
+        started = time.time()
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            for name in REPLICA_TABLES:
+                try:
+                    table = client.query(f"SELECT * FROM {self.tables[name]}").to_arrow()
+                except Exception as e:
+                    if name == "hotel_rates":
+                        raise
+                    # hotel_media / flight_prices may not exist for every dataset
+                    logger.warning(f"Rates replica skipping {name} for {self.key}: {e}")
+                    table = pa.table({})
+                self._write(name, table)
+
+            snapshot = self._read(taken_at=started)
+            marked_at = _marked_invalidated_at(self.directory)
+            with self._lock:
+                # A write during the refresh may not be in this snapshot
+                if started >= max(self._invalidated_at, marked_at):
+                    self._snapshot = snapshot
+                self._stats["refreshes"] += 1
+            logger.info(
+                f"Rates replica for {self.key} refreshed in {time.time() - started:.1f}s: "
+                f"{snapshot.rates.num_rows} rates, {snapshot.flights.num_rows} flights"
+            )
+        except Exception as e:
+            self._count("refresh_errors")
+            logger.error(f"Rates replica refresh failed for {self.key}: {e}")
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def _write(self, name: str, table: "pa.Table"):
+        """Uncompressed Arrow IPC file so it can be memory-mapped back without decoding"""
+        path = self._path(name)
+        # Unique per writer: workers refreshing at the same time must not share a temp file
+        fd, tmp_name = tempfile.mkstemp(dir=self.directory, prefix=f".{name}.", suffix=".tmp")
+        os.close(fd)
+        try:
+            with pa.OSFile(tmp_name, "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            os.replace(tmp_name, path)
+        except Exception:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+    def _read(self, taken_at: float) -> ReplicaSnapshot:
+        tables = {}
+        for name in REPLICA_TABLES:
+            path = self._path(name)
+            if path.exists():
+                # Zero-copy: the table's buffers keep the mapping open
+                tables[name] = pa.ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+        return ReplicaSnapshot(tables, taken_at=taken_at)
+
+    def _load_from_disk(self) -> Optional[ReplicaSnapshot]:
+        """Pick up a snapshot written earlier (by this or another worker process)"""
+        with self._lock:
+            if self._disk_checked:
+                return self._snapshot
+            self._disk_checked = True
+
+        path = self._path("hotel_rates")
+        try:
+            if not path.exists():
+                return None
+            taken_at = path.stat().st_mtime
+            if taken_at < max(self._invalidated_at, _marked_invalidated_at(self.directory)):
+                return None
+            snapshot = self._read(taken_at=taken_at)
+            with self._lock:
+                self._snapshot = snapshot
+            logger.info(f"Rates replica for {self.key} loaded from {self.directory}")
+            return snapshot
+        except Exception as e:
+            logger.warning(f"Could not load rates replica from {self.directory}: {e}")
+            return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["refreshing"] = self._refreshing
+        snapshot = self._snapshot
+        stats["snapshot"] = snapshot.get_stats() if snapshot is not None else None
+        return stats
+
+
+def _marked_invalidated_at(directory: Path) -> float:
+    """When the snapshot files in directory were last invalidated (0 if never)"""
+    try:
+        return (directory / INVALIDATION_MARKER).stat().st_mtime
+    except OSError:
+        return 0.0
+
+
+def _mark_invalidated(directory: Path, invalidated_at: float):
+    """Record an invalidation for every worker process sharing directory"""
+    if invalidated_at <= _marked_invalidated_at(directory):
+        return
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        marker = directory / INVALIDATION_MARKER
+        marker.touch()
+        os.utime(marker, (invalidated_at, invalidated_at))
+    except OSError as e:
+        logger.warning(f"Could not mark rates replica in {directory} invalidated: {e}")
+
+
+# ==================== Registry ====================
+
+_replicas: Dict[str, RatesReplica] = {}
+_replicas_lock = threading.Lock()
+
+
+def get_rates_replica(db) -> Optional[RatesReplica]:
+    """
+    Replica of a DatabaseTables' shared pricing dataset (None when disabled).
+
+    Replicas are shared by every tenant using the same pricing dataset.
+    """
+    if not RATES_REPLICA_ENABLED:
+        return None
+    if not PYARROW_AVAILABLE:
+        logger.warning("RATES_REPLICA_ENABLED is set but pyarrow is not installed; querying BigQuery")
+        return None
+
+    key = f"{db.project}.{db.pricing_dataset}"
+    replica = _replicas.get(key)
+    if replica is None:
+        with _replicas_lock:
+            replica = _replicas.get(key)
+            if replica is None:
+                replica = RatesReplica(
+                    key,
+                    {name: db.get_shared_table(name) for name in REPLICA_TABLES},
+                    Path(RATES_REPLICA_DIR) / key
+                )
+                _replicas[key] = replica
+    return replica
+
+
+def _invalidate(key: str, invalidated_at: float):
+    replica = _replicas.get(key)
+    if replica is not None:
+        replica.invalidate(invalidated_at)
+    else:
+        # Not used in this process yet, but other workers may be serving the files
+        _mark_invalidated(Path(RATES_REPLICA_DIR) / key, invalidated_at)
+
+
+def invalidate_rates_replica(db):
+    """
+    Stop serving the snapshot after a write to the shared pricing tables.
+
+    Applies to this process and the other workers sharing its snapshot
+    files at once, and to other instances through Redis.
+    """
+    if not RATES_REPLICA_ENABLED:
+        return
+
+    key = f"{db.project}.{db.pricing_dataset}"
+    invalidated_at = time.time()
+    _invalidate(key, invalidated_at)
+
+    redis_client = _get_redis_client()
+    if redis_client:
+        try:
+            redis_client.publish(INVALIDATION_CHANNEL, json.dumps({
+                "key": key, "invalidated_at": invalidated_at, "origin": INSTANCE_ID
+            }))
+        except Exception as e:
+            logger.warning(f"Rates replica invalidation broadcast failed: {e}")
+
+
+def get_rates_replica_stats() -> Dict[str, Dict[str, Any]]:
+    return {key: replica.get_stats() for key, replica in list(_replicas.items())}
+
+
+# ==================== Invalidation Broadcast ====================
+
+_redis = None
+_redis_available: Optional[bool] = None
+_listener_thread: Optional[threading.Thread] = None
+
+
+def _get_redis_client():
+    """Redis client for invalidation broadcasts (None when REDIS_URL is unset or unreachable)"""
+    global _redis, _redis_available
+    if _redis_available is False:
+        return None
+    if _redis is None:
+        redis_url = os.getenv("REDIS_URL")
+        if not redis_url:
+            _redis_available = False
+            return None
+        try:
+            import redis
+            _redis = redis.from_url(redis_url)
+            _redis.ping()
+            _redis_available = True
+        except Exception as e:
+            logger.warning(f"Rates replica invalidation broadcast unavailable: {e}")
+            _redis_available = False
+            _redis = None
+    return _redis
+
+
+def _listen():
+    while True:
+        redis_client = _get_redis_client()
+        if not redis_client:
+            return
+        try:
+            pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(INVALIDATION_CHANNEL)
+            for item in pubsub.listen():
+                try:
+                    message = json.loads(item["data"])
+                    if message.get("origin") == INSTANCE_ID:
+                        continue
+                    _invalidate(message["key"], float(message["invalidated_at"]))
+                except Exception as e:
+                    logger.warning(f"Ignoring malformed rates replica invalidation: {e}")
+        except Exception as e:
+            logger.warning(f"Rates replica invalidation listener reconnecting: {e}")
+            time.sleep(5)
+
+
+def start_rates_replica_sync() -> bool:
+    """Apply invalidations broadcast by other instances (no-op when disabled or without REDIS_URL)"""
+    global _listener_thread
+    if not RATES_REPLICA_ENABLED or _listener_thread is not None or not _get_redis_client():
+        return False
+    _listener_thread = threading.Thread(target=_listen, name="rates-replica-invalidation", daemon=True)
+    _listener_thread.start()
+    return True
+
+
+def reset_rates_replicas():
+    """Forget all replicas (for testing)"""
+    with _replicas_lock:
+        _replicas.clear()
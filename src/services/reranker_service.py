@@ -6,14 +6,39 @@ Cross-encoders are more accurate than bi-encoders for ranking because they
 process the query and document together.
 
 Research shows re-ranking can improve retrieval quality by 15-48%.
+
+Scores are cached per (query, chunk) in an LRU cache, and concurrent rerank
+calls are coalesced by a single worker thread into shared model batches.
+CPU inference can optionally run on ONNX Runtime or an int8-quantized model
+(RERANKER_BACKEND / RERANKER_QUANTIZE), and warm_up() loads the model at
+startup so the first helpdesk query does not pay for it.
 """
 
+import os
+import queue
+import hashlib
 import logging
-from typing import List, Dict, Any, Optional
-from functools import lru_cache
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import List, Dict, Any, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+RERANKER_MODEL = os.getenv("RERANKER_MODEL", "cross-encoder/ms-marco-MiniLM-L-6-v2")
+RERANKER_BACKEND = os.getenv("RERANKER_BACKEND", "torch").lower()  # torch | onnx
+RERANKER_ONNX_FILE = os.getenv("RERANKER_ONNX_FILE", "onnx/model_qint8_avx512_vnni.onnx")
+RERANKER_QUANTIZE = os.getenv("RERANKER_QUANTIZE", "").lower()  # int8 = dynamic quantization (torch backend)
+RERANKER_BATCH_SIZE = int(os.getenv("RERANKER_BATCH_SIZE", "32"))
+RERANKER_MAX_CHARS = int(os.getenv("RERANKER_MAX_CHARS", "1000"))  # cheap pre-cut; the tokenizer truncates at 512 tokens
+RERANKER_CACHE_SIZE = int(os.getenv("RERANKER_CACHE_SIZE", "10000"))
+RERANKER_WARMUP = os.getenv("RERANKER_WARMUP", "true").lower() == "true"
+
+# Coalescing: how long the worker waits for more requests, and the most pairs it merges
+COALESCE_WAIT_SECONDS = 0.002
+MAX_COALESCED_PAIRS = 256
+SCORE_TIMEOUT_SECONDS = 30
+
 
 class ReRankerService:
     """
@@ -38,6 +63,19 @@ class ReRankerService:
 
         self.model = None
         self._init_error = None
+        self._init_lock = threading.Lock()
+
+        # (query hash, chunk key) -> score, least recently used first
+        self._cache: "OrderedDict[Tuple[str, str], float]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._cache_hits = 0
+        self._cache_misses = 0
+
+        self._requests: "queue.Queue[Tuple[List[Tuple[str, str]], Future]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._batches = 0
+        self._coalesced_requests = 0
+
         self._initialized = True
 
     def _lazy_init(self) -> bool:
@@ -48,33 +86,155 @@ class ReRankerService:
         if self._init_error:
             return False
 
-        try:
-            from sentence_transformers import CrossEncoder
-
-            logger.info("Loading cross-encoder model for re-ranking...")
-
-            # ms-marco-MiniLM-L-6-v2 is optimized for passage ranking
-            # It's lightweight (~80MB) and fast (~20ms per batch)
-            self.model = CrossEncoder(
-                'cross-encoder/ms-marco-MiniLM-L-6-v2',
-                max_length=512,
-                device='cpu'
-            )
-
-            # Warm up the model
-            _ = self.model.predict([("test query", "test document")])
-
-            logger.info("Cross-encoder model loaded successfully")
-            return True
-
-        except ImportError as e:
-            logger.warning(f"sentence-transformers not available for re-ranking: {e}")
-            self._init_error = "sentence-transformers not installed"
-            return False
-        except Exception as e:
-            logger.error(f"Failed to initialize re-ranker: {e}")
-            self._init_error = str(e)
+        with self._init_lock:
+            if self.model is not None:
+                return True
+
+            try:
+                from sentence_transformers import CrossEncoder
+
+                logger.info("Loading cross-encoder model for re-ranking...")
+
+                # ms-marco-MiniLM-L-6-v2 is optimized for passage ranking
+                # It's lightweight (~80MB) and fast (~20ms per batch)
+                model = self._load_model(CrossEncoder)
+
+                # Warm up the model
+                _ = model.predict([("test query", "test document")])
+
+                self.model = model
+                logger.info("Cross-encoder model loaded successfully")
+                return True
+
+            except ImportError as e:
+                logger.warning(f"sentence-transformers not available for re-ranking: {e}")
+                self._init_error = "sentence-transformers not installed"
+                return False
+            except Exception as e:
+                logger.error(f"Failed to initialize re-ranker: {e}")
+                self._init_error = str(e)
+                return False
+
+    def _load_model(self, cross_encoder_cls):
+        """Load the cross-encoder on CPU, optionally via ONNX Runtime or int8-quantized"""
+        if RERANKER_BACKEND == "onnx":
+            try:
+                return cross_encoder_cls(
+                    RERANKER_MODEL,
+                    max_length=512,
+                    device='cpu',
+                    backend='onnx',
+                    model_kwargs={"file_name": RERANKER_ONNX_FILE}
+                )
+            except Exception as e:
+                # Older sentence-transformers or no exported ONNX file for this model
+                logger.warning(f"ONNX re-ranker unavailable, using PyTorch: {e}")
+
+        model = cross_encoder_cls(RERANKER_MODEL, max_length=512, device='cpu')
+
+        if RERANKER_QUANTIZE == "int8":
+            try:
+                import torch
+                model.model = torch.quantization.quantize_dynamic(
+                    model.model, {torch.nn.Linear}, dtype=torch.qint8
+                )
+                logger.info("Re-ranker quantized to int8")
+            except Exception as e:
+                logger.warning(f"int8 quantization skipped: {e}")
+
+        return model
+
+    def warm_up(self) -> bool:
+        """Load the model and start the batching worker ahead of the first query"""
+        if not self._lazy_init():
             return False
+        self._ensure_worker()
+        return True
+
+    # ==================== Cache ====================
+
+    @staticmethod
+    def _query_hash(query: str) -> str:
+        return hashlib.sha1(" ".join(query.split()).encode()).hexdigest()
+
+    @staticmethod
+    def _chunk_key(doc: Dict[str, Any], content: str) -> str:
+        """Chunk id (when the document has one) plus a digest of the scored text"""
+        chunk_id = doc.get('chunk_id') or doc.get('id')
+        if chunk_id is None and doc.get('document_id') is not None:
+            chunk_id = f"{doc['document_id']}:{doc.get('chunk_index', '')}"
+        digest = hashlib.blake2b(content.encode(), digest_size=8).hexdigest()
+        return f"{chunk_id}:{digest}" if chunk_id is not None else digest
+
+    def _cache_get(self, key: Tuple[str, str]) -> Optional[float]:
+        with self._cache_lock:
+            score = self._cache.get(key)
+            if score is None:
+                self._cache_misses += 1
+                return None
+            self._cache.move_to_end(key)
+            self._cache_hits += 1
+            return score
+
+    def _cache_put(self, key: Tuple[str, str], score: float):
+        with self._cache_lock:
+            self._cache[key] = score
+            self._cache.move_to_end(key)
+            while len(self._cache) > RERANKER_CACHE_SIZE:
+                self._cache.popitem(last=False)
+
+    def clear_cache(self):
+        """Drop all cached scores"""
+        with self._cache_lock:
+            self._cache.clear()
+
+    # ==================== Batching Worker ====================
+
+    def _ensure_worker(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._init_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run_worker, name="reranker-batcher", daemon=True)
+                self._worker.start()
+
+    def _score(self, pairs: List[Tuple[str, str]]) -> List[float]:
+        """Score pairs on the worker thread, sharing a batch with concurrent callers"""
+        self._ensure_worker()
+        future: Future = Future()
+        self._requests.put((pairs, future))
+        return future.result(timeout=SCORE_TIMEOUT_SECONDS)
+
+    def _run_worker(self):
+        while True:
+            batch = [self._requests.get()]
+            pair_count = len(batch[0][0])
+
+            # Pick up requests that arrived while the previous batch ran
+            while pair_count < MAX_COALESCED_PAIRS:
+                try:
+                    request = self._requests.get(timeout=COALESCE_WAIT_SECONDS)
+                except queue.Empty:
+                    break
+                batch.append(request)
+                pair_count += len(request[0])
+
+            pairs = [pair for request_pairs, _ in batch for pair in request_pairs]
+            try:
+                scores = self.model.predict(pairs, batch_size=RERANKER_BATCH_SIZE, show_progress_bar=False)
+                self._batches += 1
+                self._coalesced_requests += len(batch)
+
+                offset = 0
+                for request_pairs, future in batch:
+                    future.set_result([float(s) for s in scores[offset:offset + len(request_pairs)]])
+                    offset += len(request_pairs)
+
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+
+    # ==================== Re-ranking ====================
 
     def rerank(
         self,
@@ -104,19 +264,30 @@ class ReRankerService:
             return documents[:top_k]
 
         try:
-            # Create query-document pairs
-            pairs = []
-            for doc in documents:
-                content = doc.get(content_key, '')
-                if isinstance(content, str):
-                    # Truncate long content to stay within model limits
-                    content = content[:1000] if len(content) > 1000 else content
-                    pairs.append((query, content))
-                else:
-                    pairs.append((query, str(content)[:1000]))
+            query_hash = self._query_hash(query)
+            scores: List[Optional[float]] = []
+            missing_pairs = []
+            missing = []
 
-            # Get cross-encoder scores
-            scores = self.model.predict(pairs)
+            for i, doc in enumerate(documents):
+                content = doc.get(content_key, '')
+                if not isinstance(content, str):
+                    content = str(content)
+                # Truncate long content to stay within model limits
+                content = content[:RERANKER_MAX_CHARS]
+
+                key = (query_hash, self._chunk_key(doc, content))
+                score = self._cache_get(key)
+                scores.append(score)
+                if score is None:
+                    missing.append((i, key))
+                    missing_pairs.append((query, content))
+
+            # Get cross-encoder scores for pairs not in the cache
+            if missing_pairs:
+                for (i, key), score in zip(missing, self._score(missing_pairs)):
+                    scores[i] = score
+                    self._cache_put(key, score)
 
             # Add scores to documents
             for doc, score in zip(documents, scores):
@@ -125,7 +296,10 @@ class ReRankerService:
             # Sort by rerank score (higher is better)
             reranked = sorted(documents, key=lambda x: x.get('rerank_score', 0), reverse=True)
 
-            logger.debug(f"Re-ranked {len(documents)} documents, returning top {top_k}")
+            logger.debug(
+                f"Re-ranked {len(documents)} documents ({len(documents) - len(missing)} cached), "
+                f"returning top {top_k}"
+            )
             return reranked[:top_k]
 
         except Exception as e:
@@ -138,11 +312,19 @@ class ReRankerService:
 
     def get_status(self) -> Dict[str, Any]:
         """Get service status"""
+        lookups = self._cache_hits + self._cache_misses
         return {
             'initialized': self.model is not None,
             'available': self._init_error is None,
             'error': self._init_error,
-            'model': 'cross-encoder/ms-marco-MiniLM-L-6-v2' if self.model else None
+            'model': RERANKER_MODEL if self.model else None,
+            'backend': RERANKER_BACKEND,
+            'quantize': RERANKER_QUANTIZE or None,
+            'batch_size': RERANKER_BATCH_SIZE,
+            'cache_size': len(self._cache),
+            'cache_hit_rate': round(self._cache_hits / lookups, 3) if lookups else 0.0,
+            'batches': self._batches,
+            'requests_per_batch': round(self._coalesced_requests / self._batches, 2) if self._batches else 0.0
         }
 
 
@@ -158,6 +340,13 @@ def get_reranker() -> ReRankerService:
     return _reranker
 
 
+def warm_up_reranker() -> bool:
+    """Load the re-ranker at startup (no-op when RERANKER_WARMUP=false)"""
+    if not RERANKER_WARMUP:
+        return False
+    return get_reranker().warm_up()
+
+
 def rerank_results(
     query: str,
     documents: List[Dict[str, Any]],
@@ -0,0 +1,200 @@
+"""
+Retrieval Orchestrator - Concurrent Knowledge Retrieval with Deadlines
+
+Fans a query out to several knowledge sources at once (tenant KB, Travel
+Platform RAG, ...) so retrieval latency is the slowest source rather than
+the sum of all of them.
+
+- Blocking sources (KnowledgeIndexManager.search, the requests-based RAG
+  client) run on a shared worker pool instead of the event loop.
+- Every source has a deadline. A source that misses it is reported as
+  timed out and the others are returned as partial results; its worker
+  finishes in the background and the late result is discarded.
+
+Used by the helpdesk (sync: run) and by UnifiedRAGService / the unified
+RAG routes (async: gather, offload).
+"""
+
+import os
+import time
+import asyncio
+import logging
+import inspect
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+RETRIEVAL_WORKERS = int(os.getenv("RETRIEVAL_WORKERS", "16"))
+
+# Per-source deadlines in seconds
+RETRIEVAL_LOCAL_DEADLINE = float(os.getenv("RETRIEVAL_LOCAL_DEADLINE", "3"))
+RETRIEVAL_GLOBAL_DEADLINE = float(os.getenv("RETRIEVAL_GLOBAL_DEADLINE", "25"))
+RETRIEVAL_DEFAULT_DEADLINE = float(os.getenv("RETRIEVAL_DEFAULT_DEADLINE", "10"))
+
+DEFAULT_DEADLINES = {
+    "local": RETRIEVAL_LOCAL_DEADLINE,
+    "private": RETRIEVAL_LOCAL_DEADLINE,
+    "global": RETRIEVAL_GLOBAL_DEADLINE,
+}
+
+Source = Union[Callable[[], Any], Awaitable[Any]]
+
+
+@dataclass
+class SourceOutcome:
+    """Result of one retrieval source"""
+    name: str
+    status: str = "ok"  # ok | timeout | error
+    result: Any = None
+    error: Optional[str] = None
+    latency_ms: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "ok"
+
+    def value(self, default: Any = None) -> Any:
+        """The source's result, or default if it timed out or failed"""
+        return self.result if self.ok else default
+
+
+class RetrievalOrchestrator:
+    """
+    Runs retrieval sources concurrently with per-source deadlines.
+
+    Sources are zero-argument callables (run on the worker pool) or, for
+    gather(), coroutines (awaited on the event loop). Callables run in a
+    copy of the caller's context so request/tenant log fields carry over.
+    """
+
+    def __init__(self, max_workers: int = RETRIEVAL_WORKERS):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="retrieval")
+
+    def _deadline(self, name: str, deadlines: Optional[Dict[str, float]]) -> float:
+        if deadlines and name in deadlines:
+            return deadlines[name]
+        return DEFAULT_DEADLINES.get(name, RETRIEVAL_DEFAULT_DEADLINE)
+
+    def _submit(self, fn: Callable[[], Any]):
+        return self._pool.submit(contextvars.copy_context().run, fn)
+
+    def run(
+        self,
+        sources: Dict[str, Callable[[], Any]],
+        deadlines: Optional[Dict[str, float]] = None
+    ) -> Dict[str, SourceOutcome]:
+        """
+        Run blocking sources concurrently from synchronous code.
+
+        Args:
+            sources: name -> zero-argument callable
+            deadlines: name -> seconds (defaults from RETRIEVAL_*_DEADLINE)
+
+        Returns:
+            name -> SourceOutcome, for every source
+        """
+        start = time.monotonic()
+        futures = {name: self._submit(fn) for name, fn in sources.items()}
+        outcomes = {}
+
+        # All sources are already running, so waiting on each in turn
+        # against its absolute deadline never adds their latencies up
+        for name, future in futures.items():
+            remaining = start + self._deadline(name, deadlines) - time.monotonic()
+            try:
+                result = future.result(timeout=max(remaining, 0))
+                outcomes[name] = SourceOutcome(name, result=result)
+            except FutureTimeoutError:
+                future.cancel()
+                outcomes[name] = SourceOutcome(name, status="timeout")
+            except Exception as e:
+                outcomes[name] = SourceOutcome(name, status="error", error=str(e))
+            outcomes[name].latency_ms = int((time.monotonic() - start) * 1000)
+
+        self._log(outcomes)
+        return outcomes
+
+    async def gather(
+        self,
+        sources: Dict[str, Source],
+        deadlines: Optional[Dict[str, float]] = None
+    ) -> Dict[str, SourceOutcome]:
+        """
+        Run sources concurrently from async code.
+
+        Args:
+            sources: name -> coroutine, or zero-argument callable for
+                blocking work (offloaded to the worker pool)
+            deadlines: name -> seconds (defaults from RETRIEVAL_*_DEADLINE)
+
+        Returns:
+            name -> SourceOutcome, for every source
+        """
+        start = time.monotonic()
+
+        async def run_source(name: str, source: Source) -> SourceOutcome:
+            awaitable = source if inspect.isawaitable(source) else self.offload(source)
+            try:
+                result = await asyncio.wait_for(awaitable, timeout=self._deadline(name, deadlines))
+                outcome = SourceOutcome(name, result=result)
+            except asyncio.TimeoutError:
+                outcome = SourceOutcome(name, status="timeout")
+            except Exception as e:
+                outcome = SourceOutcome(name, status="error", error=str(e))
+            outcome.latency_ms = int((time.monotonic() - start) * 1000)
+            return outcome
+
+        results = await asyncio.gather(*(run_source(name, source) for name, source in sources.items()))
+        outcomes = {outcome.name: outcome for outcome in results}
+
+        self._log(outcomes)
+        return outcomes
+
+    async def offload(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run a blocking call on the worker pool and await its result"""
+        loop = asyncio.get_running_loop()
+        call = functools.partial(fn, *args, **kwargs)
+        return await loop.run_in_executor(self._pool, contextvars.copy_context().run, call)
+
+    def _log(self, outcomes: Dict[str, SourceOutcome]):
+        summary = ", ".join(f"{o.name}={o.status}/{o.latency_ms}ms" for o in outcomes.values())
+        if all(o.ok for o in outcomes.values()):
+            logger.debug(f"Retrieval: {summary}")
+        else:
+            for o in outcomes.values():
+                if o.status == "error":
+                    logger.warning(f"Retrieval source {o.name} failed: {o.error}")
+            logger.warning(f"Retrieval returned partial results: {summary}")
+
+    def shutdown(self):
+        """Stop the worker pool without waiting for abandoned sources"""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+# Singleton instance
+_orchestrator: Optional[RetrievalOrchestrator] = None
+_orchestrator_lock = threading.Lock()
+
+
+def get_retrieval_orchestrator() -> RetrievalOrchestrator:
+    """Get the shared retrieval orchestrator"""
+    global _orchestrator
+    if _orchestrator is None:
+        with _orchestrator_lock:
+            if _orchestrator is None:
+                _orchestrator = RetrievalOrchestrator()
+    return _orchestrator
+
+
+def shutdown_retrieval_orchestrator():
+    """Stop the shared worker pool (app shutdown)"""
+    global _orchestrator
+    with _orchestrator_lock:
+        if _orchestrator is not None:
+            _orchestrator.shutdown()
+            _orchestrator = None
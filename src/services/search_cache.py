@@ -0,0 +1,340 @@
+"""
+Search Cache - Single-flight TTL cache for live supplier searches
+
+Live searches (hotels, transfers, activities, car rentals, buses, flights)
+take seconds upstream and are repeated constantly: ten consultants looking
+at "Zanzibar, same week, 2 adults" within a minute should cost one Rates
+Engine call, not ten.
+
+Layers:
+- Single-flight: concurrent callers for the same key await one fetch
+- L1: in-process LRU, per namespace
+- L2: Redis (optional, shared across instances)
+- Stale-while-revalidate: an expired entry is still served for
+  SEARCH_CACHE_STALE_TTL seconds while one background fetch refreshes it
+
+Keys are normalized (strings trimmed and lower-cased, dates as ISO strings)
+so "Zanzibar " on 2025-03-01 and "zanzibar" on date(2025, 3, 1) share an
+entry. Only successful results are cached. Values are stored as JSON and
+decoded per hit, so callers may mutate what they get back (currency
+conversion does).
+
+Configuration via environment variables:
+- SEARCH_CACHE_ENABLED: Enable caching (default: true)
+- SEARCH_CACHE_TTL: Fresh lifetime in seconds (default: 300)
+- SEARCH_CACHE_TTL_<NAMESPACE>: Per-namespace override, e.g. SEARCH_CACHE_TTL_HOTELS
+- SEARCH_CACHE_STALE_TTL: Extra seconds a stale entry may be served (default: 300)
+- SEARCH_CACHE_L1_SIZE: Entries kept in process per namespace (default: 500)
+"""
+
+import os
+import json
+import time
+import asyncio
+import hashlib
+import inspect
+import logging
+import functools
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SEARCH_CACHE_ENABLED = os.getenv("SEARCH_CACHE_ENABLED", "true").lower() == "true"
+SEARCH_CACHE_TTL = float(os.getenv("SEARCH_CACHE_TTL", "300"))
+SEARCH_CACHE_STALE_TTL = float(os.getenv("SEARCH_CACHE_STALE_TTL", "300"))
+SEARCH_CACHE_L1_SIZE = int(os.getenv("SEARCH_CACHE_L1_SIZE", "500"))
+
+REDIS_PREFIX = "search_cache:"
+
+
+def _normalize_value(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, str):
+        return " ".join(value.split()).lower()
+    if isinstance(value, (list, tuple)):
+        return ",".join(_normalize_value(v) for v in value)
+    return str(value)
+
+
+def search_key(namespace: str, **params: Any) -> str:
+    """Normalized cache key for a search; parameter order does not matter"""
+    normalized = "|".join(f"{name}={_normalize_value(params[name])}" for name in sorted(params))
+    digest = hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+    return f"{namespace}:{digest}"
+
+
+class SearchCache:
+    """Single-flight, stale-while-revalidate cache for one search namespace"""
+
+    def __init__(
+        self,
+        namespace: str,
+        ttl: float = SEARCH_CACHE_TTL,
+        stale_ttl: float = SEARCH_CACHE_STALE_TTL,
+        l1_size: int = SEARCH_CACHE_L1_SIZE
+    ):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.l1_size = l1_size
+
+        self._lock = threading.Lock()
+        # key -> (stored_at, JSON payload)
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        # key -> in-flight fetch; tasks belong to the loop that started them
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._stats = {"hits": 0, "stale_hits": 0, "l2_hits": 0, "misses": 0, "coalesced": 0,
+                       "refreshes": 0, "errors": 0}
+
+        self._redis = None
+        self._redis_available = None
+        self._redis_lock = threading.Lock()
+
+    # ==================== Redis ====================
+
+    def _get_redis_client(self):
+        """Get Redis client (lazy initialization with fallback; connects on first use)"""
+        if self._redis_available is not None:
+            return self._redis
+
+        with self._redis_lock:
+            if self._redis_available is None:
+                redis_url = os.getenv("REDIS_URL")
+                if redis_url:
+                    try:
+                        import redis
+                        self._redis = redis.from_url(redis_url)
+                        self._redis.ping()
+                        self._redis_available = True
+                        logger.info(f"Redis connected for {self.namespace} search cache")
+                    except Exception as e:
+                        logger.warning(f"Redis not available for search cache, using in-process cache only: {e}")
+                        self._redis_available = False
+                        self._redis = None
+                else:
+                    self._redis_available = False
+
+        return self._redis
+
+    async def _redis_client(self):
+        """Redis client for the event loop: the first call connects and pings in a worker thread"""
+        if self._redis_available is None and os.getenv("REDIS_URL"):
+            return await asyncio.to_thread(self._get_redis_client)
+        return self._get_redis_client()
+
+    async def _l2_get(self, key: str) -> Optional[Tuple[float, str]]:
+        redis_client = await self._redis_client()
+        if not redis_client:
+            return None
+        try:
+            raw = await asyncio.to_thread(redis_client.get, REDIS_PREFIX + key)
+            if raw:
+                stored_at, payload = json.loads(raw)
+                return stored_at, payload
+        except Exception as e:
+            logger.debug(f"Search cache L2 read failed for {key}: {e}")
+        return None
+
+    async def _l2_set(self, key: str, stored_at: float, payload: str):
+        redis_client = await self._redis_client()
+        if not redis_client:
+            return
+        try:
+            await asyncio.to_thread(
+                redis_client.setex,
+                REDIS_PREFIX + key,
+                int(self.ttl + self.stale_ttl) + 1,
+                json.dumps([stored_at, payload])
+            )
+        except Exception as e:
+            logger.debug(f"Search cache L2 write failed for {key}: {e}")
+
+    # ==================== L1 ====================
+
+    def _l1_get(self, key: str) -> Optional[Tuple[float, str]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def _l1_set(self, key: str, stored_at: float, payload: str):
+        with self._lock:
+            self._entries[key] = (stored_at, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.l1_size:
+                self._entries.popitem(last=False)
+
+    def _count(self, field: str):
+        with self._lock:
+            self._stats[field] += 1
+
+    # ==================== Lookup ====================
+
+    async def get_or_fetch(
+        self,
+        key: str,
+        fetcher: Callable[[], Awaitable[Dict[str, Any]]],
+        cacheable: Callable[[Dict[str, Any]], bool] = lambda result: bool(result.get("success"))
+    ) -> Dict[str, Any]:
+        """
+        Return the cached result for key, fetching it at most once at a time.
+
+        Args:
+            key: Cache key (see search_key)
+            fetcher: Coroutine factory performing the live search
+            cacheable: Whether a fetched result may be stored (default: success only)
+        """
+        entry = self._l1_get(key)
+        if entry is None:
+            entry = await self._l2_get(key)
+            if entry is not None:
+                self._l1_set(key, *entry)
+                self._count("l2_hits")
+
+        if entry is not None:
+            stored_at, payload = entry
+            age = time.time() - stored_at
+            if age < self.ttl:
+                self._count("hits")
+                return json.loads(payload)
+            if age < self.ttl + self.stale_ttl:
+                self._count("stale_hits")
+                self._start_fetch(key, fetcher, cacheable, refresh=True)
+                return json.loads(payload)
+
+        task = self._inflight.get(key)
+        if task is not None and task.get_loop() is asyncio.get_running_loop():
+            self._count("coalesced")
+        else:
+            self._count("misses")
+            task = self._start_fetch(key, fetcher, cacheable)
+
+        # Shielded so one caller going away does not cancel the others' fetch
+        payload = await asyncio.shield(task)
+        return json.loads(payload)
+
+    def _start_fetch(self, key, fetcher, cacheable, refresh: bool = False) -> asyncio.Task:
+        task = self._inflight.get(key)
+        loop = asyncio.get_running_loop()
+        if task is not None and task.get_loop() is loop:
+            return task
+
+        task = loop.create_task(self._fetch(key, fetcher, cacheable, refresh))
+        if refresh:
+            task.add_done_callback(self._log_refresh_failure)
+        self._inflight[key] = task
+        return task
+
+    def _log_refresh_failure(self, task: asyncio.Task):
+        # The stale entry keeps being served until a refresh succeeds
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Background refresh failed for {self.namespace} search: {task.exception()}")
+
+    async def _fetch(self, key, fetcher, cacheable, refresh: bool) -> str:
+        try:
+            result = await fetcher()
+            payload = json.dumps(result, default=str)
+            if cacheable(result):
+                stored_at = time.time()
+                self._l1_set(key, stored_at, payload)
+                await self._l2_set(key, stored_at, payload)
+                if refresh:
+                    self._count("refreshes")
+            return payload
+        except Exception:
+            self._count("errors")
+            raise
+        finally:
+            if self._inflight.get(key) is asyncio.current_task():
+                del self._inflight[key]
+
+    # ==================== Maintenance ====================
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["l1_entries"] = len(self._entries)
+        lookups = stats["hits"] + stats["stale_hits"] + stats["misses"] + stats["coalesced"]
+        served = stats["hits"] + stats["stale_hits"] + stats["coalesced"]
+        stats["hit_rate"] = round(served / lookups, 4) if lookups else 0.0
+        stats["in_flight"] = len(self._inflight)
+        stats["ttl"] = self.ttl
+        stats["stale_ttl"] = self.stale_ttl
+        stats["redis"] = bool(self._redis_available)
+        return stats
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        self._inflight.clear()
+
+
+# ==================== Registry ====================
+
+_caches: Dict[str, SearchCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_search_cache(namespace: str) -> Optional[SearchCache]:
+    """Get the cache for a search namespace (None when caching is disabled)"""
+    if not SEARCH_CACHE_ENABLED:
+        return None
+
+    cache = _caches.get(namespace)
+    if cache is None:
+        with _caches_lock:
+            cache = _caches.get(namespace)
+            if cache is None:
+                ttl = float(os.getenv(f"SEARCH_CACHE_TTL_{namespace.upper()}", SEARCH_CACHE_TTL))
+                cache = SearchCache(namespace, ttl=ttl)
+                _caches[namespace] = cache
+    return cache
+
+
+def cached_search(namespace: str):
+    """
+    Decorator for async search methods: calls with the same normalized
+    arguments share one in-flight request and a cached result.
+
+    All arguments except self make up the key, with defaults applied.
+    """
+    def decorator(method):
+        signature = inspect.signature(method)
+
+        @functools.wraps(method)
+        async def wrapper(self, *args, **kwargs):
+            cache = get_search_cache(namespace)
+            if cache is None:
+                return await method(self, *args, **kwargs)
+
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            params = {name: value for name, value in bound.arguments.items() if name != "self"}
+            return await cache.get_or_fetch(
+                search_key(namespace, **params),
+                lambda: method(self, *args, **kwargs)
+            )
+
+        return wrapper
+
+    return decorator
+
+
+def get_search_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Stats for every namespace used so far"""
+    return {namespace: cache.get_stats() for namespace, cache in list(_caches.items())}
+
+
+def clear_search_caches():
+    """Drop all cached searches (for testing)"""
+    with _caches_lock:
+        for cache in _caches.values():
+            cache.clear()
+        _caches.clear()
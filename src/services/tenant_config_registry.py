@@ -0,0 +1,528 @@
+"""
+Tenant Config Registry - One In-Process Snapshot per Tenant
+
+Tenant config used to be cached independently by config.loader.get_config,
+the get_client_config dependency, TenantConfigService (Redis, 5-min TTL,
+read with the sync client on the request path) and the inbound email
+webhook, and a change only reached whichever cache was cleared by hand.
+The registry is now the one place tenant config is cached:
+- Each tenant has one snapshot (its ClientConfig) in a plain dict, so a
+  config read on the hot path is a dict lookup. Snapshots are replaced
+  as a whole, never mutated, and carry the version they were loaded at.
+- publish_tenant_config_change(tenant_id) after a config, branding or
+  settings write drops the local snapshot, clears TenantConfigService's
+  Redis copy and broadcasts the new version. Other instances reload the
+  tenant in the background and swap the snapshot in, so a change reaches
+  every worker within the time of one config load; older or repeated
+  versions are ignored.
+- Snapshots older than TENANT_CONFIG_TTL are reloaded in the background
+  as a safety net for missed broadcasts; readers never wait for that.
+- Derived caches (e.g. the email webhook's address index) register with
+  add_config_listener() and are told whenever a tenant's snapshot changes.
+
+At startup start_tenant_config_warm_up() loads every active tenant with a
+single query (TenantConfigService.load_all_configs), fills the snapshots
+and the Redis copy, and opens each tenant's cached Supabase client;
+/health/ready reports not ready until it finishes, so a new deploy takes
+traffic with warm tenants instead of loading them one by one. The same
+bulk load backs list_clients(), so loops over all tenants read snapshots.
+
+Tenants that cannot be loaded can be served a fallback config, which is
+retried after TENANT_CONFIG_MISS_TTL seconds.
+
+Usage:
+    from src.services.tenant_config_registry import (
+        get_tenant_config_registry, publish_tenant_config_change
+    )
+
+    config = get_tenant_config_registry().get(tenant_id)
+    publish_tenant_config_change(tenant_id)  # after writing tenant config
+
+Configuration via environment variables:
+- TENANT_CONFIG_TTL: Seconds before a snapshot is reloaded in the background (default: 300)
+- TENANT_CONFIG_MISS_TTL: Seconds a fallback config is served before retrying (default: 30)
+- REDIS_URL: Broadcast changes to all instances
+"""
+
+import os
+import json
+import time
+import uuid
+import queue
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+TENANT_CONFIG_TTL = float(os.getenv("TENANT_CONFIG_TTL", "300"))
+TENANT_CONFIG_MISS_TTL = float(os.getenv("TENANT_CONFIG_MISS_TTL", "30"))
+
+CHANGE_CHANNEL = "tenant_config:changed"
+VERSION_KEY_PREFIX = "tenant_config_version:"  # outside TenantConfigService.CACHE_PREFIX
+
+# Identifies this process's own broadcasts, which it has already applied
+INSTANCE_ID = uuid.uuid4().hex
+
+# Callbacks told about snapshot changes (tenant_id, or None for every tenant)
+_listeners: List[Callable[[Optional[str]], None]] = []
+
+
+def _load_client_config(tenant_id: str):
+    from config.loader import ClientConfig
+    return ClientConfig(tenant_id)
+
+
+def _build_client_config(tenant_id: str, config: Dict[str, Any]):
+    from config.loader import ClientConfig
+    return ClientConfig(tenant_id, config=config)
+
+
+def add_config_listener(callback: Callable[[Optional[str]], None]):
+    """Call callback(tenant_id) whenever a tenant's snapshot changes (None = all tenants)"""
+    if callback not in _listeners:
+        _listeners.append(callback)
+
+
+def _notify(tenant_id: Optional[str]):
+    for callback in list(_listeners):
+        try:
+            callback(tenant_id)
+        except Exception as e:
+            logger.warning(f"Tenant config listener failed: {e}")
+
+
+class TenantConfigRegistry:
+    """
+    Versioned tenant config snapshots.
+
+    configs is shared with config.loader (_config_cache) and the
+    get_client_config dependency (_client_configs), so every consumer reads
+    the same snapshot.
+    """
+
+    def __init__(self, configs: Optional[Dict[str, Any]] = None,
+                 loader: Callable[[str], Any] = _load_client_config,
+                 builder: Callable[[str, Dict[str, Any]], Any] = _build_client_config,
+                 ttl: float = TENANT_CONFIG_TTL, miss_ttl: float = TENANT_CONFIG_MISS_TTL):
+        self.configs: Dict[str, Any] = configs if configs is not None else {}
+        self.loader = loader
+        self.builder = builder
+        self.ttl = ttl
+        self.miss_ttl = miss_ttl
+
+        self._versions: Dict[str, int] = {}  # latest known version per tenant
+        self._snapshot_versions: Dict[str, int] = {}
+        self._loaded_at: Dict[str, float] = {}
+        self._fallbacks: Dict[str, Tuple[Any, float]] = {}
+        self._lock = threading.Lock()
+        self._load_locks: Dict[str, threading.Lock] = {}
+
+        # Active tenant ids from the last bulk load (None = load again)
+        self._tenant_ids: Optional[List[str]] = None
+        self._tenant_ids_loaded_at = 0.0
+        self._bulk_lock = threading.Lock()
+        # Startup warm-up: not_started, warming, ready or failed
+        self.warm_state = "not_started"
+
+        self._refresh_queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._pending: set = set()
+        self._refresher: Optional[threading.Thread] = None
+        self._stats = {"loads": 0, "bulk_loads": 0, "refreshes": 0, "refresh_errors": 0, "fallbacks": 0}
+
+    # ==================== Reads ====================
+
+    def get(self, tenant_id: str, factory: Optional[Callable[[str], Any]] = None,
+            fallback: Optional[Callable[[str], Any]] = None):
+        """
+        Get a tenant's config snapshot, loading it on first use.
+
+        Args:
+            tenant_id: Tenant identifier
+            factory: Builds the config (default: ClientConfig)
+            fallback: Builds a stand-in config if loading fails; without
+                one the load error is raised
+
+        Returns:
+            The cached config object
+        """
+        config = self.configs.get(tenant_id)
+        if config is not None:
+            return config
+
+        if fallback is not None:
+            cached = self._fallbacks.get(tenant_id)
+            if cached and cached[1] > time.monotonic():
+                return cached[0]
+
+        with self._lock:
+            load_lock = self._load_locks.setdefault(tenant_id, threading.Lock())
+        with load_lock:
+            # Another thread may have loaded it meanwhile
+            config = self.configs.get(tenant_id)
+            if config is not None:
+                return config
+            version = self._versions.get(tenant_id, 0)
+            try:
+                config = (factory or self.loader)(tenant_id)
+            except Exception:
+                if fallback is None:
+                    raise
+                config = fallback(tenant_id)
+                self._fallbacks[tenant_id] = (config, time.monotonic() + self.miss_ttl)
+                self._stats["fallbacks"] += 1
+                return config
+            self._store(tenant_id, config, version)
+            self._stats["loads"] += 1
+            return config
+
+    def _store(self, tenant_id: str, config, version: int):
+        self._snapshot_versions[tenant_id] = version
+        self._loaded_at[tenant_id] = time.monotonic()
+        self._fallbacks.pop(tenant_id, None)
+        self.configs[tenant_id] = config
+
+    # ==================== Bulk Load ====================
+
+    def load_all(self) -> Optional[List[str]]:
+        """
+        Load every active tenant with one query and cache their snapshots.
+
+        Returns:
+            The active tenant ids, or None if the query failed
+        """
+        from config.loader import get_config_service
+
+        with self._bulk_lock:
+            versions = dict(self._versions)
+            configs = get_config_service().load_all_configs(active_only=True)
+            if configs is None:
+                return None
+            for tenant_id, config in configs.items():
+                # Skip tenants changed while the query ran; they reload on their next read
+                if self._versions.get(tenant_id, 0) != versions.get(tenant_id, 0):
+                    continue
+                try:
+                    self._store(tenant_id, self.builder(tenant_id, config), versions.get(tenant_id, 0))
+                except Exception as e:
+                    logger.warning(f"Could not build config for {tenant_id}: {e}")
+            self._tenant_ids = list(configs)
+            self._tenant_ids_loaded_at = time.monotonic()
+            self._stats["bulk_loads"] += 1
+            return list(self._tenant_ids)
+
+    def list_tenants(self) -> List[str]:
+        """Active tenant ids, bulk loading every tenant's config when the list is missing or stale"""
+        tenant_ids = self._tenant_ids
+        if tenant_ids is None or time.monotonic() - self._tenant_ids_loaded_at > self.ttl:
+            tenant_ids = self.load_all()
+        return list(tenant_ids or [])
+
+    # ==================== Changes ====================
+
+    def drop(self, tenant_id: Optional[str] = None, version: Optional[int] = None):
+        """Forget a tenant's snapshot (or all of them) so the next read reloads it"""
+        self._tenant_ids = None
+        if tenant_id is None:
+            self.configs.clear()
+            self._fallbacks.clear()
+        else:
+            if version is not None:
+                self._versions[tenant_id] = max(version, self._versions.get(tenant_id, 0))
+            self.configs.pop(tenant_id, None)
+            self._fallbacks.pop(tenant_id, None)
+        _notify(tenant_id)
+
+    def apply_change(self, tenant_id: Optional[str], version: int = 0):
+        """
+        Apply a change broadcast by another instance.
+
+        The current snapshot keeps being served while the new version is
+        loaded in the background; versions not newer than the snapshot are
+        ignored.
+        """
+        self._tenant_ids = None
+        if tenant_id is None:
+            for cached_id in list(self.configs):
+                self._schedule_refresh(cached_id)
+            self._fallbacks.clear()
+            return
+
+        if version <= self._versions.get(tenant_id, 0):
+            return
+        self._versions[tenant_id] = version
+        self._fallbacks.pop(tenant_id, None)
+        if tenant_id in self.configs:
+            self._schedule_refresh(tenant_id)
+        else:
+            _notify(tenant_id)
+
+    def refresh(self, tenant_id: str) -> bool:
+        """Reload a tenant's snapshot and swap it in (the old one is kept if loading fails)"""
+        version = self._versions.get(tenant_id, 0)
+        try:
+            config = self.loader(tenant_id)
+        except Exception as e:
+            self._stats["refresh_errors"] += 1
+            logger.warning(f"Tenant config refresh failed for {tenant_id}, keeping current snapshot: {e}")
+            # Try again after another TTL rather than on every sweep
+            self._loaded_at[tenant_id] = time.monotonic()
+            return False
+        if version < self._snapshot_versions.get(tenant_id, 0):
+            return False
+        self._store(tenant_id, config, version)
+        self._stats["refreshes"] += 1
+        _notify(tenant_id)
+        return True
+
+    # ==================== Background Refresh ====================
+
+    def _schedule_refresh(self, tenant_id: str):
+        if self._refresher is None or not self._refresher.is_alive():
+            # No refresh thread (scripts, tests): reload on next read instead
+            self.drop(tenant_id)
+            return
+        with self._lock:
+            if tenant_id in self._pending:
+                return
+            self._pending.add(tenant_id)
+        self._refresh_queue.put(tenant_id)
+
+    def stale_tenants(self) -> List[str]:
+        cutoff = time.monotonic() - self.ttl
+        return [t for t, loaded_at in list(self._loaded_at.items()) if loaded_at < cutoff and t in self.configs]
+
+    def _run_refresher(self):
+        while True:
+            try:
+                tenant_id = self._refresh_queue.get(timeout=min(self.ttl, 60))
+            except queue.Empty:
+                for stale_id in self.stale_tenants():
+                    self._schedule_refresh(stale_id)
+                continue
+            if tenant_id is None:
+                return
+            with self._lock:
+                self._pending.discard(tenant_id)
+            self.refresh(tenant_id)
+
+    def start_refresher(self) -> bool:
+        """Start the background refresh thread"""
+        if self._refresher is not None and self._refresher.is_alive():
+            return False
+        self._refresher = threading.Thread(target=self._run_refresher, name="tenant-config-refresh", daemon=True)
+        self._refresher.start()
+        return True
+
+    def stop_refresher(self):
+        if self._refresher is not None:
+            self._refresh_queue.put(None)
+            self._refresher = None
+
+    # ==================== Maintenance ====================
+
+    def clear(self):
+        self._tenant_ids = None
+        self.configs.clear()
+        self._versions.clear()
+        self._snapshot_versions.clear()
+        self._loaded_at.clear()
+        self._fallbacks.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "tenants": len(self.configs),
+            "fallback_tenants": len(self._fallbacks),
+            "pending_refreshes": len(self._pending),
+            "warm_state": self.warm_state,
+        }
+
+
+# ==================== Singleton ====================
+
+_registry: Optional[TenantConfigRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_tenant_config_registry() -> TenantConfigRegistry:
+    """Get the process-wide tenant config registry"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                from config.loader import _config_cache
+                _registry = TenantConfigRegistry(configs=_config_cache)
+    return _registry
+
+
+def reset_tenant_config_registry():
+    """Forget every snapshot and version (for testing)"""
+    global _registry
+    with _registry_lock:
+        registry, _registry = _registry, None
+    if registry:
+        registry.stop_refresher()
+        registry.clear()
+
+
+# ==================== Startup Warm-Up ====================
+
+def _open_supabase_clients(configs: List[Any]) -> int:
+    """Create the cached Supabase client SupabaseTool will use for each tenant"""
+    from src.tools.supabase_tool import get_cached_supabase_client
+
+    opened = 0
+    for config in configs:
+        try:
+            key = config.supabase_service_key or config.supabase_anon_key
+            if config.supabase_url and key and get_cached_supabase_client(config.supabase_url, key, config.client_id):
+                opened += 1
+        except Exception as e:
+            logger.warning(f"Supabase client warm-up failed for {getattr(config, 'client_id', '?')}: {e}")
+    return opened
+
+
+def warm_up_tenant_configs() -> bool:
+    """
+    Load every tenant's config in one query and open their Supabase clients.
+
+    Runs at startup, off the event loop. If it fails, tenants are loaded
+    on their first request as before.
+    """
+    registry = get_tenant_config_registry()
+    registry.warm_state = "warming"
+    started = time.monotonic()
+    try:
+        tenant_ids = registry.load_all()
+        if tenant_ids is None:
+            raise RuntimeError("bulk tenant query failed")
+        clients = _open_supabase_clients([registry.configs[t] for t in tenant_ids if t in registry.configs])
+    except Exception as e:
+        registry.warm_state = "failed"
+        logger.warning(f"Tenant config warm-up failed, tenants will load on first request: {e}")
+        return False
+    registry.warm_state = "ready"
+    logger.info(
+        f"Warmed {len(tenant_ids)} tenant configs and {clients} Supabase clients "
+        f"in {time.monotonic() - started:.2f}s"
+    )
+    return True
+
+
+def start_tenant_config_warm_up():
+    """Warm tenant configs in a background thread; readiness reports not ready until it finishes"""
+    get_tenant_config_registry().warm_state = "warming"
+    threading.Thread(target=warm_up_tenant_configs, name="tenant-config-warmup", daemon=True).start()
+
+
+def is_tenant_config_warming() -> bool:
+    """True while the startup warm-up is still running (readiness gate)"""
+    return get_tenant_config_registry().warm_state == "warming"
+
+
+# ==================== Change Broadcast ====================
+
+_redis = None
+_redis_available: Optional[bool] = None
+_listener_thread: Optional[threading.Thread] = None
+_local_version = 0
+
+
+def _get_redis_client():
+    """Redis client for change broadcasts (None when REDIS_URL is unset or unreachable)"""
+    global _redis, _redis_available
+    if _redis_available is False:
+        return None
+    if _redis is None:
+        redis_url = os.getenv("REDIS_URL")
+        if not redis_url:
+            _redis_available = False
+            return None
+        try:
+            import redis
+            _redis = redis.from_url(redis_url)
+            _redis.ping()
+            _redis_available = True
+        except Exception as e:
+            logger.warning(f"Tenant config broadcast unavailable: {e}")
+            _redis_available = False
+            _redis = None
+    return _redis
+
+
+def _next_version(redis_client, tenant_id: Optional[str]) -> int:
+    """Cluster-wide version from Redis, or a process-local counter without it"""
+    global _local_version
+    if redis_client:
+        try:
+            return int(redis_client.incr(f"{VERSION_KEY_PREFIX}{tenant_id or '*'}"))
+        except Exception as e:
+            logger.warning(f"Tenant config version bump failed: {e}")
+    _local_version += 1
+    return _local_version
+
+
+def _clear_service_cache(tenant_id: Optional[str]):
+    """Drop TenantConfigService's Redis copy so reloads read the database"""
+    try:
+        from config.loader import get_config_service
+        service = get_config_service()
+        if tenant_id is None:
+            service.invalidate_all_cache()
+        else:
+            service._invalidate_cache(tenant_id)
+    except Exception as e:
+        logger.warning(f"Tenant config Redis cache not cleared: {e}")
+
+
+def publish_tenant_config_change(tenant_id: Optional[str] = None):
+    """
+    Record that a tenant's config changed (None = every tenant).
+
+    The local snapshot is dropped immediately, so this instance serves the
+    new config on its next read; other instances reload in the background.
+    """
+    _clear_service_cache(tenant_id)
+    redis_client = _get_redis_client()
+    version = _next_version(redis_client, tenant_id)
+    get_tenant_config_registry().drop(tenant_id, version)
+    if redis_client:
+        try:
+            redis_client.publish(CHANGE_CHANNEL, json.dumps({
+                "tenant_id": tenant_id, "version": version, "origin": INSTANCE_ID
+            }))
+        except Exception as e:
+            logger.warning(f"Tenant config broadcast failed: {e}")
+
+
+def _listen():
+    while True:
+        redis_client = _get_redis_client()
+        if not redis_client:
+            return
+        try:
+            pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(CHANGE_CHANNEL)
+            for item in pubsub.listen():
+                try:
+                    message = json.loads(item["data"])
+                    if message.get("origin") == INSTANCE_ID:
+                        continue
+                    get_tenant_config_registry().apply_change(message.get("tenant_id"), int(message.get("version", 0)))
+                except Exception as e:
+                    logger.warning(f"Ignoring malformed tenant config change: {e}")
+        except Exception as e:
+            logger.warning(f"Tenant config listener reconnecting: {e}")
+            time.sleep(5)
+
+
+def start_tenant_config_sync() -> bool:
+    """Start background refresh and apply changes broadcast by other instances"""
+    global _listener_thread
+    started = get_tenant_config_registry().start_refresher()
+    if _listener_thread is None and _get_redis_client():
+        _listener_thread = threading.Thread(target=_listen, name="tenant-config-changes", daemon=True)
+        _listener_thread.start()
+        started = True
+    return started
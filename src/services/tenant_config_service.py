@@ -13,7 +13,9 @@ Usage:
 Features:
     - Database-first configuration (Supabase tenants table)
     - Uses shared infrastructure from environment variables
-    - Redis caching with configurable TTL (5 minutes default)
+    - Redis caching with configurable TTL (5 minutes default), read only when
+      a tenant is (re)loaded; requests are served from the in-process
+      snapshots in src.services.tenant_config_registry
     - Graceful fallback when Redis unavailable
     - Secret handling (resolved from env vars, not stored in DB)
 """
@@ -151,6 +153,20 @@ class TenantConfigService:
         except Exception as e:
             logger.warning(f"Redis cache write error: {e}")
 
+    def _set_cache_many(self, configs: Dict[str, Dict[str, Any]]):
+        """Store several tenant configs in Redis in one round trip"""
+        redis_client = self._get_redis_client()
+        if not redis_client or not configs:
+            return
+
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            for tenant_id, config in configs.items():
+                pipe.setex(self._cache_key(tenant_id), self.CACHE_TTL, json.dumps(config))
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"Redis cache write error: {e}")
+
     def _invalidate_cache(self, tenant_id: str):
         """Remove tenant config from cache"""
         redis_client = self._get_redis_client()
@@ -263,41 +279,7 @@ class TenantConfigService:
             if not result.data:
                 return None
 
-            row = result.data
-
-            # Get tenant_config JSONB (may be empty {} for new tenants)
-            tenant_config = row.get('tenant_config', {}) or {}
-
-            # Build complete configuration
-            config = {
-                'client': self._build_client_info(row, tenant_config),
-                'branding': self._build_branding(row, tenant_config),
-                'destinations': tenant_config.get('destinations', []),
-                'infrastructure': self._build_infrastructure(row, tenant_config),
-                'email': self._build_email_config(row, tenant_config),
-                'banking': tenant_config.get('banking', {}),
-                'consultants': tenant_config.get('consultants', []),
-                'agents': tenant_config.get('agents', {}),
-                'outbound': tenant_config.get('outbound', {}),
-                'quotes': tenant_config.get('quotes', {}),
-                'knowledge_base': tenant_config.get('knowledge_base', {}),
-            }
-
-            # Add metadata
-            config['_meta'] = {
-                'source': 'database',
-                'status': row.get('status', 'active'),
-                'plan': row.get('plan', 'lite'),
-                'features_enabled': row.get('features_enabled', {}),
-                'has_full_config': bool(tenant_config),  # True if tenant_config is not empty
-            }
-
-            logger.debug(f"Loaded tenant {tenant_id} from database (has_full_config: {config['_meta']['has_full_config']})")
-
-            # Substitute any ${VAR} or ${VAR:-default} patterns in config values
-            config = _substitute_env_vars(config)
-
-            return config
+            return self._build_config(result.data)
 
         except Exception as e:
             # Don't log as error for "not found" cases (single() throws when no rows)
@@ -307,6 +289,81 @@ class TenantConfigService:
                 logger.error(f"Error loading tenant {tenant_id} from database: {e}")
             return None
 
+    def _build_config(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the complete configuration for one tenants row"""
+        # Get tenant_config JSONB (may be empty {} for new tenants)
+        tenant_config = row.get('tenant_config', {}) or {}
+
+        # Build complete configuration
+        config = {
+            'client': self._build_client_info(row, tenant_config),
+            'branding': self._build_branding(row, tenant_config),
+            'destinations': tenant_config.get('destinations', []),
+            'infrastructure': self._build_infrastructure(row, tenant_config),
+            'email': self._build_email_config(row, tenant_config),
+            'banking': tenant_config.get('banking', {}),
+            'consultants': tenant_config.get('consultants', []),
+            'agents': tenant_config.get('agents', {}),
+            'outbound': tenant_config.get('outbound', {}),
+            'quotes': tenant_config.get('quotes', {}),
+            'knowledge_base': tenant_config.get('knowledge_base', {}),
+        }
+
+        # Add metadata
+        config['_meta'] = {
+            'source': 'database',
+            'status': row.get('status', 'active'),
+            'plan': row.get('plan', 'lite'),
+            'features_enabled': row.get('features_enabled', {}),
+            'has_full_config': bool(tenant_config),  # True if tenant_config is not empty
+        }
+
+        logger.debug(f"Loaded tenant {row['id']} from database (has_full_config: {config['_meta']['has_full_config']})")
+
+        # Substitute any ${VAR} or ${VAR:-default} patterns in config values
+        config = _substitute_env_vars(config)
+
+        return config
+
+    def load_all_configs(self, active_only: bool = True) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        Load every tenant's configuration with a single query.
+
+        Used to warm caches at startup instead of loading tenants one by
+        one on their first request. The configs are also written to the
+        Redis cache in one round trip.
+
+        Args:
+            active_only: Only load active tenants
+
+        Returns:
+            Dict of tenant_id -> configuration, or None if the query failed
+        """
+        client = self._get_supabase_client()
+        if not client:
+            logger.error("Supabase client not available - check SUPABASE_URL and SUPABASE_SERVICE_KEY")
+            return None
+
+        try:
+            query = client.table("tenants").select("*")
+            if active_only:
+                query = query.eq("status", "active")
+            rows = query.execute().data or []
+        except Exception as e:
+            logger.error(f"Error bulk loading tenants from database: {e}")
+            return None
+
+        configs = {}
+        for row in rows:
+            try:
+                configs[row['id']] = self._build_config(row)
+            except Exception as e:
+                logger.warning(f"Skipping tenant {row.get('id')} in bulk load: {e}")
+
+        self._set_cache_many(configs)
+        logger.info(f"Bulk loaded {len(configs)} tenant configs from database")
+        return configs
+
     def _build_client_info(self, row: Dict, tenant_config: Dict) -> Dict[str, Any]:
         """Build client info section"""
         # Use row columns first, fall back to tenant_config, then defaults
@@ -4,34 +4,62 @@ Travel Platform Rates Client
 Connects to the Zorah Travel Platform Rates Engine for live hotel availability.
 Uses the full search endpoint which works with live Juniper data.
 
+All calls share one pooled httpx.AsyncClient (keep-alive, optional HTTP/2)
+per event loop instead of opening a connection per search: one for the app
+loop and one for sync callers on the async bridge loop
+(src/utils/async_bridge.py). Both are closed in the app lifespan.
+Connection reuse is reported in get_status()["pool"].
+
+Hotel, transfer, activity, car rental and bus searches go through the
+single-flight search cache (src/services/search_cache.py), so identical
+searches share one upstream call.
+
 Configuration via environment variables:
 - RATES_ENGINE_URL: Base URL (default: https://zorah-travel-platform-...)
 - RATES_ENGINE_TIMEOUT: Request timeout in seconds (default: 120)
+- RATES_ENGINE_TIMEOUT_<ENDPOINT>: Per-endpoint read timeout, e.g.
+  RATES_ENGINE_TIMEOUT_FLIGHTS=60 (see DEFAULT_ENDPOINT_TIMEOUTS)
+- RATES_ENGINE_CONNECT_TIMEOUT: Connect timeout in seconds (default: 5)
+- RATES_ENGINE_MAX_CONNECTIONS / RATES_ENGINE_MAX_KEEPALIVE: Pool limits
+- RATES_ENGINE_KEEPALIVE_EXPIRY: Idle seconds before a connection is dropped
+- RATES_ENGINE_HTTP2: Use HTTP/2 (needs the h2 package, default: false)
 """
 
 import os
-import re
-import html
+import asyncio
 import logging
-from typing import List, Dict, Optional, Any
+import weakref
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Dict, Optional, Any, Tuple
 from datetime import date
 
 import httpx
 
+from src.services.hotel_frame import HotelFrame
+from src.services.search_cache import cached_search, clear_search_caches, get_search_cache_stats
 from src.utils.circuit_breaker import rates_circuit
 from src.utils.retry_utils import retry_on_async_network_error
 
 logger = logging.getLogger(__name__)
 
-
-def _is_quality_hotel(hotel: dict) -> bool:
-    """Filter out Juniper placeholder hotels with internal code names."""
-    name = hotel.get("hotel_name") or hotel.get("name") or ""
-    if re.match(r'^Hotel\s+JP[A-Z0-9]+', name):
-        return False
-    if not name or len(name) < 3:
-        return False
-    return True
+RATES_ENGINE_CONNECT_TIMEOUT = float(os.getenv("RATES_ENGINE_CONNECT_TIMEOUT", "5"))
+RATES_ENGINE_MAX_CONNECTIONS = int(os.getenv("RATES_ENGINE_MAX_CONNECTIONS", "100"))
+RATES_ENGINE_MAX_KEEPALIVE = int(os.getenv("RATES_ENGINE_MAX_KEEPALIVE", "20"))
+RATES_ENGINE_KEEPALIVE_EXPIRY = float(os.getenv("RATES_ENGINE_KEEPALIVE_EXPIRY", "60"))
+RATES_ENGINE_HTTP2 = os.getenv("RATES_ENGINE_HTTP2", "false").lower() == "true"
+
+# Read timeouts in seconds per endpoint group ("hotels" defaults to
+# RATES_ENGINE_TIMEOUT - aggregated searches fan out to every supplier)
+DEFAULT_ENDPOINT_TIMEOUTS = {
+    "health": 10.0,
+    "flights": 60.0,
+    "flight_lookup": 15.0,
+    "transfers": 60.0,
+    "activities": 60.0,
+    "car_rentals": 60.0,
+    "buses": 60.0,
+    "bus_points": 15.0,
+}
 
 
 class TravelPlatformRatesClient:
@@ -39,7 +67,8 @@ class TravelPlatformRatesClient:
     Client for Zorah Travel Platform Rates Engine.
 
     Provides live hotel availability search via Juniper integration.
-    Singleton pattern for connection reuse.
+    Singleton pattern for connection reuse: every method goes through
+    _session(), which hands out the shared pooled HTTP client.
     """
 
     _instance = None
@@ -60,20 +89,120 @@ class TravelPlatformRatesClient:
             "http://localhost:8080"
         )
         self.timeout = float(os.getenv("RATES_ENGINE_TIMEOUT", "120"))
+        self.endpoint_timeouts = {
+            name: float(os.getenv(f"RATES_ENGINE_TIMEOUT_{name.upper()}", default))
+            for name, default in {**DEFAULT_ENDPOINT_TIMEOUTS, "hotels": self.timeout}.items()
+        }
         self._initialized = True
         self._last_error: Optional[str] = None
 
+        # Shared HTTP clients, one per event loop (connections are loop-bound);
+        # _http is the most recently used one
+        self._http: Optional[httpx.AsyncClient] = None
+        self._http_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._http_by_loop: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = \
+            weakref.WeakKeyDictionary()
+        self._http2 = False
+        self._pool_stats = {"requests": 0, "connections_opened": 0, "errors": 0, "clients_created": 0}
+
         logger.info(
             f"Rates Engine client initialized: url={self.base_url}, timeout={self.timeout}s"
         )
 
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """Get or create the shared pooled HTTP client for the running loop"""
+        loop = asyncio.get_running_loop()
+        http = self._http_by_loop.get(loop)
+        if http is not None and not http.is_closed:
+            self._http, self._http_loop = http, loop
+            return http
+
+        http2 = RATES_ENGINE_HTTP2
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logger.warning("RATES_ENGINE_HTTP2 set but the h2 package is missing, using HTTP/1.1")
+                http2 = False
+
+        self._http = httpx.AsyncClient(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=RATES_ENGINE_MAX_CONNECTIONS,
+                max_keepalive_connections=RATES_ENGINE_MAX_KEEPALIVE,
+                keepalive_expiry=RATES_ENGINE_KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(self.timeout, connect=RATES_ENGINE_CONNECT_TIMEOUT),
+            event_hooks={"request": [self._on_request]},
+        )
+        self._http_loop = loop
+        self._http_by_loop[loop] = self._http
+        self._http2 = http2
+        self._pool_stats["clients_created"] += 1
+        return self._http
+
+    async def _on_request(self, request: httpx.Request):
+        self._pool_stats["requests"] += 1
+        request.extensions["trace"] = self._on_trace
+
+    async def _on_trace(self, event_name: str, info: dict):
+        # Only fires when the pool has no idle connection to reuse
+        if event_name == "connection.connect_tcp.complete":
+            self._pool_stats["connections_opened"] += 1
+        elif event_name.endswith(".failed"):
+            self._pool_stats["errors"] += 1
+
+    @asynccontextmanager
+    async def _session(self) -> AsyncIterator[httpx.AsyncClient]:
+        """The shared HTTP client; unlike httpx.AsyncClient() it stays open on exit"""
+        yield self._get_http_client()
+
+    def _timeout(self, endpoint: str) -> httpx.Timeout:
+        """Per-endpoint read timeout with the shared connect timeout"""
+        return httpx.Timeout(self.endpoint_timeouts[endpoint], connect=RATES_ENGINE_CONNECT_TIMEOUT)
+
+    async def close(self):
+        """Close the running loop's shared HTTP client (app / bridge shutdown)"""
+        http = self._http_by_loop.pop(asyncio.get_running_loop(), None)
+        if http is not None and not http.is_closed:
+            try:
+                await http.aclose()
+            except RuntimeError as e:
+                # Opened on a loop that has since closed
+                logger.debug(f"Rates Engine HTTP client not closed cleanly: {e}")
+        if self._http is http or self._http_loop is not None and self._http_loop.is_closed():
+            self._http = None
+            self._http_loop = None
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Connection pool metrics for the shared HTTP client"""
+        stats = dict(self._pool_stats)
+        requests = stats["requests"]
+        stats["connection_reuse_rate"] = (
+            round(1 - stats["connections_opened"] / requests, 4) if requests else 0.0
+        )
+        stats["http2"] = self._http2
+        pool = getattr(getattr(self._http, "_transport", None), "_pool", None)
+        connections = getattr(pool, "connections", None)
+        if isinstance(connections, list):
+            idle = sum(1 for c in connections if c.is_idle())
+            stats["open_connections"] = len(connections)
+            stats["idle_connections"] = idle
+            stats["active_connections"] = len(connections) - idle
+        stats["limits"] = {
+            "max_connections": RATES_ENGINE_MAX_CONNECTIONS,
+            "max_keepalive_connections": RATES_ENGINE_MAX_KEEPALIVE,
+            "keepalive_expiry": RATES_ENGINE_KEEPALIVE_EXPIRY,
+        }
+        return stats
+
     async def is_available(self) -> bool:
         """Check if rates engine is available."""
         try:
-            async with httpx.AsyncClient() as client:
+            async with self._session() as client:
                 r = await client.get(
                     f"{self.base_url}/api/v1/travel-services/health",
-                    timeout=10.0
+                    timeout=self._timeout("health")
                 )
                 if r.status_code == 200:
                     data = r.json()
@@ -159,9 +288,9 @@ class TravelPlatformRatesClient:
             params["cabin_class"] = cabin_class
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with self._session() as client:
                 logger.info(f"RTTC flight search: route={route}, date={flight_date}")
-                r = await client.get(url, params=params, timeout=60.0)
+                r = await client.get(url, params=params, timeout=self._timeout("flights"))
                 r.raise_for_status()
                 data = r.json()
                 rates_circuit.record_success()
@@ -177,7 +306,7 @@ class TravelPlatformRatesClient:
                     "source": "rttc",
                 }
         except httpx.TimeoutException:
-            self._last_error = "RTTC flight search timed out after 60s"
+            self._last_error = f"RTTC flight search timed out after {self.endpoint_timeouts['flights']:g}s"
             logger.error(self._last_error)
             rates_circuit.record_failure()
             return {"success": False, "flights": [], "error": self._last_error}
@@ -240,12 +369,12 @@ class TravelPlatformRatesClient:
             params["cabin_class"] = cabin_class
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with self._session() as client:
                 logger.info(
                     f"RTTC direct flight search: {origin}->{destination}, "
                     f"depart={departure_date}, return={return_date}"
                 )
-                r = await client.get(url, params=params, timeout=60.0)
+                r = await client.get(url, params=params, timeout=self._timeout("flights"))
                 r.raise_for_status()
                 data = r.json()
                 rates_circuit.record_success()
@@ -267,7 +396,7 @@ class TravelPlatformRatesClient:
                     "source": "rttc_direct",
                 }
         except httpx.TimeoutException:
-            self._last_error = "RTTC direct flight search timed out after 60s"
+            self._last_error = f"RTTC direct flight search timed out after {self.endpoint_timeouts['flights']:g}s"
             logger.error(self._last_error)
             rates_circuit.record_failure()
             return {
@@ -305,8 +434,8 @@ class TravelPlatformRatesClient:
 
         url = f"{self.base_url}/api/v1/flights/destinations"
         try:
-            async with httpx.AsyncClient() as client:
-                r = await client.get(url, timeout=15.0)
+            async with self._session() as client:
+                r = await client.get(url, timeout=self._timeout("flight_lookup"))
                 r.raise_for_status()
                 rates_circuit.record_success()
                 return {"success": True, **r.json()}
@@ -331,8 +460,8 @@ class TravelPlatformRatesClient:
             "return_date": return_date,
         }
         try:
-            async with httpx.AsyncClient() as client:
-                r = await client.get(url, params=params, timeout=15.0)
+            async with self._session() as client:
+                r = await client.get(url, params=params, timeout=self._timeout("flight_lookup"))
                 r.raise_for_status()
                 rates_circuit.record_success()
                 return {"success": True, **r.json()}
@@ -355,8 +484,8 @@ class TravelPlatformRatesClient:
         if destination:
             params["destination"] = destination
         try:
-            async with httpx.AsyncClient() as client:
-                r = await client.get(url, params=params, timeout=15.0)
+            async with self._session() as client:
+                r = await client.get(url, params=params, timeout=self._timeout("flight_lookup"))
                 r.raise_for_status()
                 rates_circuit.record_success()
                 return {"success": True, **r.json()}
@@ -380,6 +509,72 @@ class TravelPlatformRatesClient:
         Returns hotels from multiple providers (HotelBeds, Juniper, Hummingbird, RTTC)
         as merged profiles with all_rates[], best_rate, sources, merge_method, etc.
         """
+        result, frame = await self.search_hotels_aggregated_frame(
+            destination, check_in, check_out, adults=adults, children=children
+        )
+        if frame is not None:
+            result["hotels"] = frame.to_hotels()
+        return result
+
+    async def search_hotels_aggregated_frame(
+        self,
+        destination: str,
+        check_in: date,
+        check_out: date,
+        adults: int = 2,
+        children: int = 0,
+    ) -> Tuple[Dict[str, Any], Optional[HotelFrame]]:
+        """
+        Aggregated hotel search as (response metadata, HotelFrame).
+
+        Hotels without a price and Juniper placeholders are already filtered
+        out. The metadata has no "hotels" yet - callers convert, sort and
+        materialize only the page they return. On failure the frame is None
+        and the metadata is the usual error response.
+        """
+        result = await self._fetch_hotels_aggregated(
+            destination, check_in, check_out, adults=adults, children=children
+        )
+        if not result.get("success"):
+            return result, None
+
+        data = result["data"]
+        try:
+            frame = HotelFrame.from_profiles(data.get("hotels") or []).filter_priced()
+        except Exception as e:
+            self._last_error = f"Invalid aggregated search response: {e}"
+            logger.error(self._last_error)
+            return self._error_response(self._last_error), None
+
+        logger.info(
+            f"Aggregated search complete: {len(frame)} hotels (after price filter), "
+            f"aggregation={data.get('aggregation')}"
+        )
+
+        return {
+            "success": True,
+            "destination": data.get("destination", destination),
+            "check_in": data.get("check_in", check_in.isoformat()),
+            "check_out": data.get("check_out", check_out.isoformat()),
+            "nights": data.get("nights") or (check_out - check_in).days,
+            "total_hotels": len(frame),
+            "aggregation": data.get("aggregation"),
+            "response_format": data.get("response_format", "merged_profiles"),
+            "merge_stats": data.get("merge_stats"),
+            "provider_status": data.get("provider_status"),
+            "search_time_seconds": data.get("search_time_seconds", 0),
+        }, frame
+
+    @cached_search("hotels")
+    async def _fetch_hotels_aggregated(
+        self,
+        destination: str,
+        check_in: date,
+        check_out: date,
+        adults: int = 2,
+        children: int = 0,
+    ) -> Dict[str, Any]:
+        """Raw aggregated search response from the Rates Engine, as {"success", "data"}"""
         if not rates_circuit.can_execute():
             logger.warning("Rates Engine circuit breaker OPEN — skipping aggregated search")
             return self._error_response("Circuit breaker open")
@@ -394,126 +589,19 @@ class TravelPlatformRatesClient:
         }
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with self._session() as client:
                 logger.info(
                     f"Aggregated hotel search: destination={destination}, "
                     f"dates={check_in} to {check_out}"
                 )
-                r = await client.get(url, params=params, timeout=self.timeout)
+                r = await client.get(url, params=params, timeout=self._timeout("hotels"))
                 r.raise_for_status()
                 data = r.json()
                 rates_circuit.record_success()
-
-                # Pass through merged profiles from upstream
-                hotels = []
-                for h in data.get("hotels", []):
-                    # Parse star_rating (may be string like "5" or "4*")
-                    raw_stars = h.get("star_rating")
-                    try:
-                        star_rating = int(str(raw_stars).replace("*", "")) if raw_stars else None
-                    except (ValueError, TypeError):
-                        star_rating = None
-
-                    # Unescape hotel name
-                    name = h.get("name") or h.get("hotel_name") or ""
-                    hotel_name = html.unescape(name)
-
-                    # Pass through merged profile fields
-                    best_rate = h.get("best_rate") or {}
-                    all_rates = h.get("all_rates") or []
-                    sources = h.get("sources") or ([h.get("source")] if h.get("source") else [])
-
-                    # Determine cheapest price from best_rate or fallback
-                    cheapest_price = (
-                        best_rate.get("rate_per_night_zar")
-                        or best_rate.get("rate_per_night")
-                        or h.get("total_price")
-                        or h.get("cheapest_price")
-                        or 0
-                    )
-
-                    # Build backward-compatible options[] from all_rates[]
-                    options = []
-                    for rate in all_rates:
-                        options.append({
-                            "room_type": rate.get("room_type", "Standard Room"),
-                            "meal_plan": rate.get("meal_plan", ""),
-                            "price_total": rate.get("total_price") or rate.get("rate_per_night", 0),
-                            "price_per_night": rate.get("rate_per_night", 0),
-                            "price_per_night_zar": rate.get("rate_per_night_zar"),
-                            "currency": rate.get("currency", "EUR"),
-                            "source": rate.get("source"),
-                            "provider": rate.get("source"),
-                        })
-
-                    # If no all_rates, build a single option from flat fields
-                    if not options:
-                        options.append({
-                            "room_type": h.get("room_type", "Standard Room"),
-                            "meal_plan": h.get("meal_plan", ""),
-                            "price_total": h.get("total_price", 0),
-                            "price_per_night": h.get("rate_per_night", 0),
-                            "price_per_night_zar": h.get("rate_per_night_zar"),
-                            "currency": h.get("currency", "EUR"),
-                            "source": h.get("source"),
-                            "provider": h.get("source"),
-                        })
-
-                    hotel = {
-                        "hotel_id": h.get("hotel_id"),
-                        "hotel_name": hotel_name,
-                        "star_rating": star_rating,
-                        "stars": star_rating,  # backward compat
-                        "destination": h.get("destination"),
-                        "zone": h.get("zone_name"),
-                        "image_url": (h.get("image_url") or "").replace("http://photos.hotelbeds.com", "https://photos.hotelbeds.com") or None,
-                        "latitude": float(h["latitude"]) if h.get("latitude") else None,
-                        "longitude": float(h["longitude"]) if h.get("longitude") else None,
-                        "cheapest_price": cheapest_price,
-                        "cheapest_meal_plan": best_rate.get("meal_plan") or h.get("meal_plan"),
-                        "best_rate": best_rate,
-                        "all_rates": all_rates,
-                        "sources": sources,
-                        "source": sources[0] if sources else h.get("source"),
-                        "merge_method": h.get("merge_method"),
-                        "provider_codes": h.get("provider_codes"),
-                        "options": options,
-                        # Content enrichment fields (pass through from upstream when available)
-                        "description": h.get("description"),
-                        "amenities": h.get("amenities") or h.get("facilities"),
-                        "address": h.get("address"),
-                        "images": [img.replace("http://", "https://") if isinstance(img, str) else img for img in (h.get("images") or [])],
-                    }
-                    hotels.append(hotel)
-
-                # Filter out hotels with zero or missing pricing
-                hotels = [h for h in hotels if h.get("cheapest_price") and h["cheapest_price"] > 0]
-
-                # Filter out Juniper placeholder hotels
-                hotels = [h for h in hotels if _is_quality_hotel(h)]
-
-                logger.info(
-                    f"Aggregated search complete: {len(hotels)} hotels (after price filter), "
-                    f"aggregation={data.get('aggregation')}"
-                )
-
-                return {
-                    "success": True,
-                    "destination": data.get("destination", destination),
-                    "check_in": data.get("check_in", check_in.isoformat()),
-                    "check_out": data.get("check_out", check_out.isoformat()),
-                    "nights": data.get("nights") or (check_out - check_in).days,
-                    "total_hotels": len(hotels),
-                    "hotels": hotels,
-                    "aggregation": data.get("aggregation"),
-                    "response_format": data.get("response_format", "merged_profiles"),
-                    "merge_stats": data.get("merge_stats"),
-                    "provider_status": data.get("provider_status"),
-                    "search_time_seconds": data.get("search_time_seconds", 0),
-                }
+                return {"success": True, "data": data}
 
         except httpx.TimeoutException:
-            self._last_error = f"Aggregated search timed out after {self.timeout}s"
+            self._last_error = f"Aggregated search timed out after {self.endpoint_timeouts['hotels']:g}s"
             logger.error(self._last_error)
             rates_circuit.record_failure()
             return self._error_response(self._last_error)
@@ -530,6 +618,7 @@ class TravelPlatformRatesClient:
             rates_circuit.record_failure()
             return self._error_response(self._last_error)
 
+    @cached_search("transfers")
     async def search_transfers(
         self,
         from_code: str,
@@ -564,9 +653,9 @@ class TravelPlatformRatesClient:
         }
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with self._session() as client:
                 logger.info(f"Transfer search: {from_code}->{to_code}, date={transfer_date}")
-                r = await client.get(url, params=params, timeout=60.0)
+                r = await client.get(url, params=params, timeout=self._timeout("transfers"))
                 r.raise_for_status()
                 data = r.json()
                 rates_circuit.record_success()
@@ -580,7 +669,7 @@ class TravelPlatformRatesClient:
                     **{k: v for k, v in data.items() if k not in ("transfers",)},
                 }
         except httpx.TimeoutException:
-            self._last_error = "Transfer search timed out after 60s"
+            self._last_error = f"Transfer search timed out after {self.endpoint_timeouts['transfers']:g}s"
             logger.error(self._last_error)
             rates_circuit.record_failure()
             return {"success": False, "transfers": [], "error": self._last_error}
@@ -590,6 +679,7 @@ class TravelPlatformRatesClient:
             rates_circuit.record_failure()
             return {"success": False, "transfers": [], "error": self._last_error}
 
+    @cached_search("activities")
     async def search_activities(
         self,
         destination: str,
@@ -616,9 +706,9 @@ class TravelPlatformRatesClient:
             params["activity_date"] = activity_date
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with self._session() as client:
                 logger.info(f"Activity search: destination={destination}, participants={participants}")
-                r = await client.get(url, params=params, timeout=60.0)
+                r = await client.get(url, params=params, timeout=self._timeout("activities"))
                 r.raise_for_status()
                 data = r.json()
                 rates_circuit.record_success()
@@ -632,7 +722,7 @@ class TravelPlatformRatesClient:
                     **{k: v for k, v in data.items() if k not in ("activities",)},
                 }
         except httpx.TimeoutException:
-            self._last_error = "Activity search timed out after 60s"
+            self._last_error = f"Activity search timed out after {self.endpoint_timeouts['activities']:g}s"
             logger.error(self._last_error)
             rates_circuit.record_failure()
             return {"success": False, "activities": [], "error": self._last_error}
@@ -642,6 +732,7 @@ class TravelPlatformRatesClient:
             rates_circuit.record_failure()
             return {"success": False, "activities": [], "error": self._last_error}
 
+    @cached_search("car_rentals")
     async def search_car_rentals(
         self,
         city: str,
@@ -673,9 +764,9 @@ class TravelPlatformRatesClient:
         }
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with self._session() as client:
                 logger.info(f"Car rental search: city={city}, {pickup_date} to {dropoff_date}")
-                r = await client.get(url, params=params, timeout=60.0)
+                r = await client.get(url, params=params, timeout=self._timeout("car_rentals"))
                 r.raise_for_status()
                 data = r.json()
                 rates_circuit.record_success()
@@ -689,7 +780,7 @@ class TravelPlatformRatesClient:
                     **{k: v for k, v in data.items() if k not in ("car_rentals", "rentals")},
                 }
         except httpx.TimeoutException:
-            self._last_error = "Car rental search timed out after 60s"
+            self._last_error = f"Car rental search timed out after {self.endpoint_timeouts['car_rentals']:g}s"
             logger.error(self._last_error)
             rates_circuit.record_failure()
             return {"success": False, "car_rentals": [], "error": self._last_error}
@@ -699,6 +790,7 @@ class TravelPlatformRatesClient:
             rates_circuit.record_failure()
             return {"success": False, "car_rentals": [], "error": self._last_error}
 
+    @cached_search("buses")
     async def search_buses(
         self,
         from_city: str,
@@ -730,9 +822,9 @@ class TravelPlatformRatesClient:
         }
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with self._session() as client:
                 logger.info(f"Bus search: {from_city}->{to_city}, date={travel_date}")
-                r = await client.get(url, params=params, timeout=60.0)
+                r = await client.get(url, params=params, timeout=self._timeout("buses"))
                 r.raise_for_status()
                 data = r.json()
                 rates_circuit.record_success()
@@ -746,7 +838,7 @@ class TravelPlatformRatesClient:
                     **{k: v for k, v in data.items() if k not in ("buses",)},
                 }
         except httpx.TimeoutException:
-            self._last_error = "Bus search timed out after 60s"
+            self._last_error = f"Bus search timed out after {self.endpoint_timeouts['buses']:g}s"
             logger.error(self._last_error)
             rates_circuit.record_failure()
             return {"success": False, "buses": [], "error": self._last_error}
@@ -763,8 +855,8 @@ class TravelPlatformRatesClient:
 
         url = f"{self.base_url}/api/v1/travel-services/rttc/buses/departure-points"
         try:
-            async with httpx.AsyncClient() as client:
-                r = await client.get(url, timeout=15.0)
+            async with self._session() as client:
+                r = await client.get(url, timeout=self._timeout("bus_points"))
                 r.raise_for_status()
                 data = r.json()
                 rates_circuit.record_success()
@@ -813,13 +905,13 @@ class TravelPlatformRatesClient:
         }
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with self._session() as client:
                 logger.info(
                     f"Rates Engine search-by-names: destination={destination}, "
                     f"hotels={len(hotel_names)}"
                 )
 
-                r = await client.post(url, json=payload, timeout=self.timeout)
+                r = await client.post(url, json=payload, timeout=self._timeout("hotels"))
                 r.raise_for_status()
                 data = r.json()
 
@@ -829,7 +921,7 @@ class TravelPlatformRatesClient:
                 }
 
         except httpx.TimeoutException:
-            self._last_error = f"Request timed out after {self.timeout}s"
+            self._last_error = f"Request timed out after {self.endpoint_timeouts['hotels']:g}s"
             logger.error(f"Rates Engine timeout: {self._last_error}")
             return self._error_response(self._last_error)
 
@@ -841,12 +933,12 @@ class TravelPlatformRatesClient:
     @retry_on_async_network_error(max_attempts=2, min_wait=3, max_wait=15)
     async def _post_with_retry(self, url: str, payload: dict) -> dict:
         """POST with retry on transient network errors. Returns parsed JSON."""
-        async with httpx.AsyncClient() as client:
+        async with self._session() as client:
             logger.info(
                 f"Rates Engine search: destination={payload.get('destination')}, "
                 f"dates={payload.get('check_in')} to {payload.get('check_out')}"
             )
-            r = await client.post(url, json=payload, timeout=self.timeout)
+            r = await client.post(url, json=payload, timeout=self._timeout("hotels"))
             r.raise_for_status()
             return r.json()
 
@@ -865,7 +957,10 @@ class TravelPlatformRatesClient:
             "initialized": self._initialized,
             "base_url": self.base_url,
             "timeout": self.timeout,
-            "last_error": self._last_error
+            "endpoint_timeouts": self.endpoint_timeouts,
+            "last_error": self._last_error,
+            "pool": self.get_pool_stats(),
+            "search_cache": get_search_cache_stats()
         }
 
 
@@ -881,8 +976,15 @@ def get_travel_platform_rates_client() -> TravelPlatformRatesClient:
     return _client
 
 
+async def close_travel_platform_rates_client():
+    """Close the shared HTTP connection pool (app shutdown)."""
+    if TravelPlatformRatesClient._instance is not None:
+        await TravelPlatformRatesClient._instance.close()
+
+
 def reset_travel_platform_rates_client():
     """Reset the singleton client (for testing)."""
     global _client
     TravelPlatformRatesClient._instance = None
     _client = None
+    clear_search_caches()
@@ -2,7 +2,8 @@
 Unified RAG Service for ITC Platform
 
 Combines:
-1. LOCAL KNOWLEDGE: Tenant-specific documents (pricing, policies, internal docs)
+1. LOCAL KNOWLEDGE: Tenant-specific documents (pricing, policies, internal docs),
+   keyword search fused with optional local dense retrieval
 2. GLOBAL KNOWLEDGE: Travel Platform RAG (destinations, hotels, visa info)
 
 Architecture follows best practices from research:
@@ -23,6 +24,8 @@ from dataclasses import dataclass
 from datetime import datetime
 import httpx
 
+from src.services.retrieval_orchestrator import get_retrieval_orchestrator
+
 logger = logging.getLogger(__name__)
 
 # Configuration
@@ -38,6 +41,9 @@ TRAVEL_PLATFORM_TIMEOUT = int(os.getenv("TRAVEL_PLATFORM_TIMEOUT", "30"))
 RAG_MIN_RELEVANCE_SCORE = float(os.getenv("RAG_MIN_RELEVANCE_SCORE", "0.3"))
 RAG_QUALITY_THRESHOLD = float(os.getenv("RAG_QUALITY_THRESHOLD", "0.35"))
 
+# Local hybrid retrieval: weight of the vector score in fused local scores
+KNOWLEDGE_HYBRID_VECTOR_WEIGHT = float(os.getenv("KNOWLEDGE_HYBRID_VECTOR_WEIGHT", "0.5"))
+
 
 @dataclass
 class RetrievalResult:
@@ -65,6 +71,11 @@ class RAGResponse:
     sources: Dict[str, int]  # {"local": N, "global": M}
     latency_ms: int
     query_id: str
+    timed_out: List[str] = None  # sources that missed their deadline (partial results)
+
+    def __post_init__(self):
+        if self.timed_out is None:
+            self.timed_out = []
 
 
 class TravelPlatformRAGClient:
@@ -244,33 +255,131 @@ class LocalKnowledgeService:
         """
         Search tenant's local knowledge base.
 
-        Uses the existing multi-signal keyword search.
+        Uses the existing multi-signal keyword search, run on the retrieval
+        worker pool so it doesn't block the event loop.
         """
         try:
             # Use existing search from knowledge_routes.py
-            results = self.manager.search(
+            results = await get_retrieval_orchestrator().offload(
+                self.manager.search,
                 query=query,
                 top_k=top_k,
                 min_score=min_score
             )
-
-            return [
-                RetrievalResult(
-                    content=r.get("content", ""),
-                    score=r.get("score", 0.0),
-                    source="local",
-                    doc_id=r.get("document_id", ""),
-                    chunk_id=str(r.get("chunk_index", 0)),
-                    source_title=r.get("source", "Local Document"),
-                    metadata=r.get("match_details", {})
-                )
-                for r in results
-            ]
+            return self._to_results(results)
 
         except Exception as e:
             logger.error(f"Local knowledge search error: {e}")
             return []
 
+    async def search_dense(
+        self,
+        query: str,
+        top_k: int = 10
+    ) -> List[RetrievalResult]:
+        """
+        Search tenant's local chunk embeddings.
+
+        Empty unless the manager supports vector search and a local
+        embedder is configured (see knowledge_vector_index.py).
+        """
+        vector_search = getattr(self.manager, "vector_search", None)
+        if vector_search is None:
+            return []
+
+        try:
+            results = await get_retrieval_orchestrator().offload(vector_search, query=query, top_k=top_k)
+            return self._to_results(results)
+        except Exception as e:
+            logger.error(f"Local vector search error: {e}")
+            return []
+
+    def _to_results(self, results: List[Dict]) -> List[RetrievalResult]:
+        return [
+            RetrievalResult(
+                content=r.get("content", ""),
+                score=r.get("score", 0.0),
+                source="local",
+                doc_id=r.get("document_id", ""),
+                chunk_id=str(r.get("chunk_index", 0)),
+                source_title=r.get("source", "Local Document"),
+                metadata=r.get("match_details", {})
+            )
+            for r in results
+        ]
+
+
+def _max_normalized(
+    scores: Dict[Tuple[str, Optional[str]], float],
+    full: bool
+) -> Tuple[Dict[Tuple[str, Optional[str]], float], float]:
+    """
+    Scores divided by the best one, and the normalized score of a chunk
+    the side did not return: its lowest hit when it returned a full top_k
+    (the chunk ranked below the cut-off), otherwise 0 (below its minimum).
+    """
+    best = max(scores.values(), default=0.0)
+    if best <= 0:
+        return {key: 0.0 for key in scores}, 0.0
+    normalized = {key: score / best for key, score in scores.items()}
+    return normalized, min(normalized.values()) if full else 0.0
+
+
+def fuse_hybrid_results(
+    keyword_results: List[RetrievalResult],
+    vector_results: List[RetrievalResult],
+    top_k: int,
+    vector_weight: float = KNOWLEDGE_HYBRID_VECTOR_WEIGHT
+) -> List[RetrievalResult]:
+    """
+    Fuse keyword and vector hits on the same local chunks.
+
+    Keyword scores and cosine similarities are on different scales, so each
+    side is max-normalized before the weighted sum (see _max_normalized for
+    chunks only one side returned). The sum is scaled by the best raw local
+    score, so the top local chunk keeps its relevance when merged with
+    global results. Without vector hits the keyword results are returned
+    unchanged.
+    """
+    if not vector_results:
+        return keyword_results[:top_k]
+
+    chunks: Dict[Tuple[str, Optional[str]], RetrievalResult] = {}
+    keyword_scores: Dict[Tuple[str, Optional[str]], float] = {}
+    vector_scores: Dict[Tuple[str, Optional[str]], float] = {}
+
+    for r in keyword_results:
+        chunks.setdefault((r.doc_id, r.chunk_id), r)
+        keyword_scores[(r.doc_id, r.chunk_id)] = r.score
+    for r in vector_results:
+        chunks.setdefault((r.doc_id, r.chunk_id), r)
+        vector_scores[(r.doc_id, r.chunk_id)] = r.score
+
+    keyword_normalized, keyword_missing = _max_normalized(keyword_scores, len(keyword_results) >= top_k)
+    vector_normalized, vector_missing = _max_normalized(vector_scores, len(vector_results) >= top_k)
+    scale = max([*keyword_scores.values(), *vector_scores.values()])
+
+    fused = []
+    for key, r in chunks.items():
+        keyword_score = keyword_scores.get(key, 0.0)
+        vector_score = vector_scores.get(key, 0.0)
+        relevance = (
+            (1 - vector_weight) * keyword_normalized.get(key, keyword_missing)
+            + vector_weight * vector_normalized.get(key, vector_missing)
+        )
+        fused.append(RetrievalResult(
+            content=r.content,
+            score=round(relevance * scale, 3),
+            source=r.source,
+            doc_id=r.doc_id,
+            chunk_id=r.chunk_id,
+            source_title=r.source_title,
+            metadata={**r.metadata, "keyword_score": keyword_score, "vector_score": vector_score}
+        ))
+
+    fused.sort(key=lambda r: r.score, reverse=True)
+    return fused[:top_k]
+
 
 class UnifiedRAGService:
     """
@@ -281,7 +390,7 @@ class UnifiedRAGService:
     - Global travel knowledge (destinations, visas, hotels)
 
     Pipeline:
-    1. Search local KB (tenant docs)
+    1. Search local KB (tenant docs, keyword + local vector hits fused)
     2. Search global KB (Travel Platform)
     3. Merge and sort by relevance
     4. Return unified answer with citations from both sources
@@ -333,30 +442,28 @@ class UnifiedRAGService:
         ).hexdigest()[:16]
 
         all_results: List[RetrievalResult] = []
-        tasks = []
 
-        # 1. Search local knowledge (tenant-specific)
+        # 1-2. Search local (tenant docs) and global (Travel Platform) knowledge
+        # concurrently, each with its own deadline
+        sources = {}
         if include_local and self.local_service:
-            tasks.append(self._search_local(query, local_top_k))
-        else:
-            tasks.append(asyncio.coroutine(lambda: [])())
-
-        # 2. Search global knowledge (Travel Platform)
+            sources["local"] = self._search_local(query, local_top_k)
         if include_global:
-            tasks.append(self._search_global(query, global_top_k))
-        else:
-            tasks.append(asyncio.coroutine(lambda: ("", 0.0, [], 0.0))())
+            sources["global"] = self._search_global(query, global_top_k)
 
-        # Run searches in parallel
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        outcomes = await get_retrieval_orchestrator().gather(sources)
+        timed_out = [name for name, outcome in outcomes.items() if outcome.status == "timeout"]
 
         # Process local results
-        local_results = results[0] if not isinstance(results[0], Exception) else []
-        if isinstance(local_results, list):
-            all_results.extend(local_results)
+        local_results = outcomes["local"].value([]) if "local" in outcomes else []
+        all_results.extend(local_results)
+
+        # Process global results (a missed deadline leaves no global answer)
+        if "global" in outcomes:
+            global_result = outcomes["global"].value()
+        else:
+            global_result = ("", 0.0, [], 0.0)
 
-        # Process global results
-        global_result = results[1]
         if isinstance(global_result, tuple) and len(global_result) == 4:
             global_answer, global_confidence, global_citations, global_quality = global_result
 
@@ -370,7 +477,8 @@ class UnifiedRAGService:
                     citations=global_citations,
                     sources={"local": 0, "global": len(global_citations)},
                     latency_ms=latency_ms,
-                    query_id=query_id
+                    query_id=query_id,
+                    timed_out=timed_out
                 )
 
             # Convert global citations to results for merging
@@ -425,7 +533,8 @@ class UnifiedRAGService:
                 "global": len([r for r in top_results if r.source == "global"])
             },
             latency_ms=latency_ms,
-            query_id=query_id
+            query_id=query_id,
+            timed_out=timed_out
         )
 
     async def _search_local(
@@ -433,10 +542,15 @@ class UnifiedRAGService:
         query: str,
         top_k: int
     ) -> List[RetrievalResult]:
-        """Search local tenant knowledge"""
+        """Search local tenant knowledge (hybrid keyword + vector)"""
         if not self.local_service:
             return []
-        return await self.local_service.search(query, top_k)
+
+        keyword_results, vector_results = await asyncio.gather(
+            self.local_service.search(query, top_k),
+            self.local_service.search_dense(query, top_k)
+        )
+        return fuse_hybrid_results(keyword_results, vector_results, top_k)
 
     async def _search_global(
         self,
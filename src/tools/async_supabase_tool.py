@@ -0,0 +1,314 @@
+"""
+Async Supabase Tool
+
+Async counterpart of SupabaseTool for request handlers that run on the
+event loop. PostgREST calls are awaited on supabase's AsyncClient, whose
+pooled httpx.AsyncClient keeps connections open per tenant, instead of
+holding a worker of SupabaseTool's shared 16-thread executor (or of
+Starlette's thread pool, for `def` endpoints) for each round trip.
+
+Calls keep the semantics of SupabaseTool.execute_with_timeout:
+- supabase_circuit is checked first and updated with every outcome
+- each call times out after DEFAULT_QUERY_TIMEOUT seconds (TimeoutError)
+- an HTTP/2 connection drop is retried once on a fresh connection
+
+Clients are cached per tenant and per event loop (connections are
+loop-bound) and closed in the app lifespan.
+
+Every call's latency is recorded in the supabase_operation_duration_seconds
+histogram (labels: operation, outcome) exported on /metrics.
+
+Usage:
+    from src.tools.async_supabase_tool import AsyncSupabaseTool
+
+    supabase = await AsyncSupabaseTool.create(config)
+    invoices = await supabase.list_invoices(status="paid")
+
+    query = supabase.client.table("notifications").select("*").eq("tenant_id", tenant_id)
+    result = await supabase.execute(query, operation="list_notifications")
+"""
+
+import asyncio
+import logging
+import time
+import weakref
+from typing import Dict, Any, List, Optional
+
+from config.loader import ClientConfig
+from src.tools.supabase_tool import DEFAULT_QUERY_TIMEOUT, SupabaseTool
+from src.utils.circuit_breaker import supabase_circuit
+
+logger = logging.getLogger(__name__)
+
+try:
+    from supabase import acreate_client, AsyncClient
+except ImportError:
+    acreate_client = None
+    AsyncClient = None
+
+# ==================== Client Cache ====================
+# One AsyncClient per tenant per event loop
+_async_client_cache: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, Any]]" = \
+    weakref.WeakKeyDictionary()
+
+
+def _cache_key(supabase_url: str, client_id: str) -> str:
+    return f"{client_id}:{supabase_url[:20]}"
+
+
+async def get_cached_async_supabase_client(supabase_url: str, supabase_key: str, client_id: str) -> Optional[Any]:
+    """Get or create the cached async Supabase client for the running loop"""
+    clients = _async_client_cache.setdefault(asyncio.get_running_loop(), {})
+    cache_key = _cache_key(supabase_url or "", client_id)
+    if cache_key in clients:
+        return clients[cache_key]
+
+    if acreate_client is None or not supabase_url or not supabase_key:
+        return None
+    try:
+        client = await acreate_client(supabase_url, supabase_key)
+    except Exception as e:
+        logger.error(f"Failed to create async Supabase client: {e}")
+        return None
+
+    # Another request may have created one while this one was awaiting
+    if cache_key not in clients:
+        clients[cache_key] = client
+        logger.info(f"Async Supabase client created and cached for {client_id}")
+    return clients[cache_key]
+
+
+async def close_async_supabase_clients():
+    """Close the running loop's async Supabase clients (app shutdown)"""
+    clients = _async_client_cache.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        postgrest = getattr(client, "_postgrest", None)
+        if postgrest is None:
+            continue
+        try:
+            await postgrest.aclose()
+        except Exception as e:
+            logger.debug(f"Async Supabase client not closed cleanly: {e}")
+
+
+def reset_async_supabase_clients():
+    """Forget every cached async client (for testing)"""
+    _async_client_cache.clear()
+
+
+# ==================== Latency Histogram ====================
+# Imported lazily, like the request metrics in timing_middleware
+_operation_duration = None
+_prometheus_init_attempted = False
+
+
+def _observe(operation: str, outcome: str, seconds: float):
+    """Record one call in the per-operation latency histogram"""
+    global _operation_duration, _prometheus_init_attempted
+
+    if not _prometheus_init_attempted:
+        _prometheus_init_attempted = True
+        try:
+            from src.api.metrics_routes import SUPABASE_OPERATION_DURATION
+            _operation_duration = SUPABASE_OPERATION_DURATION
+        except Exception as e:
+            logger.debug(f"Prometheus metrics not available: {e}")
+
+    if _operation_duration is not None:
+        _operation_duration.labels(operation=operation, outcome=outcome).observe(seconds)
+
+
+def _is_connection_drop(error: Exception) -> bool:
+    return "RemoteProtocolError" in type(error).__name__ or "Server disconnected" in str(error)
+
+
+class AsyncSupabaseTool:
+    """Async Supabase operations for request handlers"""
+
+    TABLE_INVOICES = SupabaseTool.TABLE_INVOICES
+    TABLE_QUOTES = SupabaseTool.TABLE_QUOTES
+
+    def __init__(self, config: ClientConfig, client: Optional[Any] = None):
+        """
+        Use AsyncSupabaseTool.create(config) to get a tool with its cached client.
+
+        Args:
+            config: ClientConfig instance
+            client: Async Supabase client (None if Supabase is not available)
+        """
+        self.config = config
+        self.tenant_id = config.client_id  # For row-level filtering
+        self.client = client
+        self._default_timeout = DEFAULT_QUERY_TIMEOUT
+
+    @classmethod
+    async def create(cls, config: ClientConfig) -> "AsyncSupabaseTool":
+        """Create a tool for the tenant, reusing its cached async client"""
+        client = await get_cached_async_supabase_client(
+            config.supabase_url,
+            config.supabase_service_key or config.supabase_anon_key,
+            config.client_id
+        )
+        if client is None and acreate_client is None:
+            logger.warning("Supabase library not available")
+        return cls(config, client)
+
+    async def execute(self, query: Any, operation: str = "query", timeout: float = None) -> Any:
+        """
+        Execute a PostgREST query with timeout and circuit breaker protection.
+
+        Args:
+            query: Query builder (anything with an async execute())
+            operation: Operation name, used for logging and as the histogram label
+            timeout: Timeout in seconds (default: 10s)
+
+        Returns:
+            Query result
+
+        Raises:
+            ConnectionError: If the Supabase circuit breaker is open
+            TimeoutError: If the query exceeds the timeout
+            Exception: If the query fails
+        """
+        timeout = timeout or self._default_timeout
+
+        if not supabase_circuit.can_execute():
+            raise ConnectionError(f"Supabase circuit breaker OPEN — skipping {operation}")
+
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            try:
+                result = await asyncio.wait_for(query.execute(), timeout)
+            except Exception as e:
+                if not _is_connection_drop(e):
+                    raise
+                # The pool discards the dropped connection; the retry opens a new one
+                logger.warning(f"HTTP/2 connection drop during {operation}, retrying")
+                result = await asyncio.wait_for(query.execute(), timeout)
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            elapsed = time.perf_counter() - start
+            supabase_circuit.record_failure()
+            logger.error(f"Query timeout ({operation}): exceeded {timeout}s after {elapsed:.2f}s")
+            raise TimeoutError(f"Query '{operation}' timed out after {timeout}s")
+        except Exception as e:
+            supabase_circuit.record_failure()
+            logger.error(f"Query failed ({operation}): {e}")
+            raise
+        else:
+            outcome = "ok"
+            supabase_circuit.record_success()
+            elapsed = time.perf_counter() - start
+            if elapsed > 3:  # Log slow queries
+                logger.warning(f"Slow query ({operation}): {elapsed:.2f}s")
+            return result
+        finally:
+            _observe(operation, outcome, time.perf_counter() - start)
+
+    async def query_with_timeout(self, table: str, select: str = "*", filters: dict = None, timeout: float = 10) -> list:
+        """
+        Execute a select query with timeout.
+
+        Args:
+            table: Table name
+            select: Columns to select
+            filters: Dict of column -> value filters
+            timeout: Timeout in seconds
+
+        Returns:
+            List of records
+        """
+        query = self.client.table(table).select(select).eq('tenant_id', self.tenant_id)
+        if filters:
+            for col, val in filters.items():
+                query = query.eq(col, val)
+
+        result = await self.execute(query, operation=f"select from {table}", timeout=timeout)
+        return result.data or []
+
+    # ==================== Invoice Operations ====================
+
+    async def get_invoice(self, invoice_id: str) -> Optional[Dict[str, Any]]:
+        """Get invoice by ID"""
+        if not self.client:
+            return None
+
+        try:
+            query = self.client.table(self.TABLE_INVOICES)\
+                .select("*")\
+                .eq('invoice_id', invoice_id)\
+                .eq('tenant_id', self.tenant_id)\
+                .single()
+
+            result = await self.execute(query, operation="get_invoice")
+            return result.data
+
+        except Exception as e:
+            logger.error(f"Failed to get invoice: {e}")
+            return None
+
+    async def list_invoices(
+        self,
+        status: Optional[str] = None,
+        search: Optional[str] = None,
+        limit: int = 50,
+        offset: int = 0
+    ) -> List[Dict[str, Any]]:
+        """List invoices with optional filtering, enriched with destination"""
+        if not self.client:
+            logger.warning(f"[LIST_INVOICES] No Supabase client available for tenant {self.tenant_id}")
+            return []
+
+        try:
+            query = self.client.table(self.TABLE_INVOICES)\
+                .select("*")\
+                .eq('tenant_id', self.tenant_id)
+
+            if status:
+                query = query.eq('status', status)
+
+            if search:
+                query = query.or_(f"customer_name.ilike.%{search}%,invoice_id.ilike.%{search}%")
+
+            query = query\
+                .order('created_at', desc=True)\
+                .range(offset, offset + limit - 1)
+
+            result = await self.execute(query, operation="list_invoices")
+            invoices = result.data or []
+
+            # First pass: try to get destination from items
+            quote_ids_needed = []
+            for invoice in invoices:
+                if not invoice.get('destination'):
+                    items = invoice.get('items', [])
+                    if items and isinstance(items, list) and len(items) > 0:
+                        invoice['destination'] = items[0].get('destination')
+
+                    # Still no destination? Need to fetch from quote
+                    if not invoice.get('destination') and invoice.get('quote_id'):
+                        quote_ids_needed.append(invoice['quote_id'])
+
+            # Batch fetch all missing destinations in ONE query (avoid N+1)
+            if quote_ids_needed:
+                try:
+                    quote_query = self.client.table(self.TABLE_QUOTES)\
+                        .select("quote_id, destination")\
+                        .eq('tenant_id', self.tenant_id)\
+                        .in_('quote_id', quote_ids_needed)
+
+                    quote_result = await self.execute(quote_query, operation="list_invoice_destinations")
+                    dest_map = {q['quote_id']: q.get('destination') for q in (quote_result.data or [])}
+
+                    for invoice in invoices:
+                        if not invoice.get('destination') and invoice.get('quote_id'):
+                            invoice['destination'] = dest_map.get(invoice['quote_id'])
+                except Exception as e:
+                    logger.debug(f"Could not batch fetch quote destinations: {e}")
+
+            return invoices
+
+        except Exception as e:
+            logger.error(f"Failed to list invoices: {e}")
+            return []
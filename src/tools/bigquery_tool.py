@@ -19,9 +19,14 @@ import logging
 
 from config.loader import ClientConfig
 from config.database import DatabaseTables
+from src.services.quote_pricing import has_prices, price_rate, price_rates
+from src.services.rates_replica import get_rates_replica
 
 logger = logging.getLogger(__name__)
 
+# Returned by _from_replica when the lookup must go to BigQuery
+_NOT_REPLICATED = object()
+
 
 class BigQueryTool:
     """BigQuery operations for customer data and analytics"""
@@ -44,6 +49,23 @@ class BigQueryTool:
             logger.error(f"BigQuery init error: {e}")
             self.client = None
 
+    def _from_replica(self, lookup: str, *args, **kwargs) -> Any:
+        """
+        Answer a lookup from the local rates replica (RATES_REPLICA_ENABLED).
+
+        Returns _NOT_REPLICATED when there is no usable snapshot or the
+        lookup fails, so the caller runs its BigQuery query instead.
+        """
+        replica = get_rates_replica(self.db)
+        snapshot = replica.snapshot(self.client) if replica else None
+        if snapshot is None:
+            return _NOT_REPLICATED
+        try:
+            return getattr(snapshot, lookup)(*args, **kwargs)
+        except Exception as e:
+            logger.warning(f"Rates replica {lookup} failed, querying BigQuery: {e}")
+            return _NOT_REPLICATED
+
     def find_matching_hotels(
         self,
         destination: str,
@@ -80,6 +102,13 @@ class BigQueryTool:
         search_terms = self.config.get_destination_search_terms(destination)
         logger.info(f"Searching hotels for destinations: {search_terms}")
 
+        hotels = self._from_replica(
+            "find_matching_hotels", [d.upper() for d in search_terms], check_in, check_out, nights, meal_plan_pref
+        )
+        if hotels is not _NOT_REPLICATED:
+            logger.info(f"Found {len(hotels)} hotels for {destination} (replica)")
+            return hotels
+
         # Query only the hotel_rates table - simplified to avoid missing columns
         query = f"""
         SELECT
@@ -236,6 +265,16 @@ class BigQueryTool:
 
         like_clause = " OR ".join(like_conditions)
 
+        if like_conditions:
+            hotels = self._from_replica(
+                "find_rates_by_hotel_names",
+                [f"%{keywords[0]}%" for keywords in hotel_keywords if keywords],
+                nights, check_in, check_out
+            )
+            if hotels is not _NOT_REPLICATED:
+                logger.info(f"Found {len(hotels)} rate records for selected hotels (replica)")
+                return hotels
+
         query = f"""
         SELECT
             r.rate_id,
@@ -324,6 +363,10 @@ class BigQueryTool:
         if not self.client:
             return []
 
+        hotels = self._from_replica("search_hotels_by_name", search_term, limit)
+        if hotels is not _NOT_REPLICATED:
+            return hotels
+
         query = f"""
         SELECT DISTINCT
             hotel_name,
@@ -374,6 +417,10 @@ class BigQueryTool:
         if not self.client:
             return None
 
+        info = self._from_replica("get_hotel_info", hotel_name)
+        if info is not _NOT_REPLICATED:
+            return info
+
         query = f"""
         SELECT
             hotel_name,
@@ -408,6 +455,45 @@ class BigQueryTool:
             logger.error(f"Error getting hotel info: {e}")
             return None
 
+    def get_hotel_media(
+        self,
+        hotel_name: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get description, image and amenities for a hotel
+
+        Args:
+            hotel_name: Exact hotel name (case-insensitive)
+
+        Returns:
+            Hotel media record or None
+        """
+        if not self.client:
+            return None
+
+        media = self._from_replica("hotel_media", hotel_name)
+        if media is not _NOT_REPLICATED:
+            return media
+
+        query = f"""
+        SELECT hotel_name, destination, description, image_url, amenities
+        FROM {self.db.hotel_media}
+        WHERE LOWER(hotel_name) = LOWER(@hotel_name)
+        LIMIT 1
+        """
+
+        try:
+            job_config = bigquery.QueryJobConfig(
+                query_parameters=[
+                    bigquery.ScalarQueryParameter("hotel_name", "STRING", hotel_name)
+                ]
+            )
+            results = list(self.client.query(query, job_config=job_config).result())
+            return dict(results[0]) if results else None
+        except Exception as e:
+            logger.warning(f"Hotel media lookup failed (table may not exist): {e}")
+            return None
+
     def calculate_quote_price(
         self,
         rate_id: str,
@@ -437,6 +523,20 @@ class BigQueryTool:
         if not self.client:
             return None
 
+        prices = self._from_replica("rate_prices", [rate_id])
+        if prices is not _NOT_REPLICATED:
+            rate = prices.get(rate_id)
+            if not rate:
+                return None
+            return price_rate(
+                rate['total_7nights_pps'],
+                rate['total_7nights_single'],
+                rate['total_7nights_child'],
+                adults,
+                children_ages,
+                single_adults
+            )
+
         query = f"""
         SELECT
             total_7nights_pps,
@@ -459,130 +559,133 @@ class BigQueryTool:
             if not rate:
                 return None
 
-            # MIXED ROOM CONFIGURATION LOGIC
-            per_child_rate = int(rate.total_7nights_child) if rate.total_7nights_child else 0
-            per_infant_rate = 1000  # Flat rate
-
-            # Count travelers by type
-            num_adults_sharing = adults
-            num_adults_single = single_adults
-            num_children = 0
-            num_infants = 0
-
-            if children_ages:
-                for age in children_ages:
-                    if age < 2:
-                        num_infants += 1
-                    else:
-                        num_children += 1
-
-            # PRICING LOGIC
-            if single_adults > 0:
-                # MIXED ROOMS: Some single, some sharing
-                num_adults_sharing = adults - single_adults
-                num_adults_single = single_adults
-
-                per_adult_sharing_rate = int(rate.total_7nights_pps) if rate.total_7nights_pps else 0
-                per_adult_single_rate = int(rate.total_7nights_single) if rate.total_7nights_single else (int(rate.total_7nights_pps) if rate.total_7nights_pps else 0)
-
-                total_sharing_adults_cost = per_adult_sharing_rate * num_adults_sharing
-                total_single_adults_cost = per_adult_single_rate * num_adults_single
-                total_adults_cost = total_sharing_adults_cost + total_single_adults_cost
-
-            elif adults == 1 and (not children_ages or len(children_ages) == 0):
-                # SINGLE TRAVELER: 1 adult, no children
-                num_adults_single = 1
-                num_adults_sharing = 0
-                per_adult_single_rate = int(rate.total_7nights_single) if rate.total_7nights_single else (int(rate.total_7nights_pps) if rate.total_7nights_pps else 0)
-                per_adult_sharing_rate = 0
-                total_adults_cost = per_adult_single_rate
-
-            else:
-                # ALL SHARING: Default scenario
-                num_adults_sharing = adults
-                num_adults_single = 0
-                per_adult_sharing_rate = int(rate.total_7nights_pps) if rate.total_7nights_pps else 0
-                per_adult_single_rate = 0
-                total_adults_cost = per_adult_sharing_rate * num_adults_sharing
-
-            # Calculate child/infant costs
-            total_children_cost = per_child_rate * num_children
-            total_infants_cost = per_infant_rate * num_infants
-            grand_total = total_adults_cost + total_children_cost + total_infants_cost
-
-            return {
-                'per_person_rates': {
-                    'adult_sharing': per_adult_sharing_rate if 'per_adult_sharing_rate' in locals() else (int(rate.total_7nights_pps) if rate.total_7nights_pps else 0),
-                    'adult_single': per_adult_single_rate if 'per_adult_single_rate' in locals() else (int(rate.total_7nights_single) if rate.total_7nights_single else 0),
-                    'child': per_child_rate,
-                    'infant': per_infant_rate
-                },
-                'traveler_counts': {
-                    'adults_sharing': num_adults_sharing,
-                    'adults_single': num_adults_single,
-                    'children': num_children,
-                    'infants': num_infants
-                },
-                'totals': {
-                    'adults': total_adults_cost,
-                    'children': total_children_cost,
-                    'infants': total_infants_cost,
-                    'grand_total': grand_total
-                },
-                'breakdown': {
-                    'adult_hotel': int(rate.total_7nights_pps) if rate.total_7nights_pps else 0,
-                    'child_hotel': int(rate.total_7nights_child) if rate.total_7nights_child else 0,
-                    'adult_transfer': 0,  # Already included in totals
-                    'child_transfer': 0,  # Already included in totals
-                    'flight_pp': 0  # Already included in totals
-                }
-            }
+            return price_rate(
+                rate.total_7nights_pps,
+                rate.total_7nights_single,
+                rate.total_7nights_child,
+                adults,
+                children_ages,
+                single_adults
+            )
         except Exception as e:
             logger.error(f"Error calculating quote price: {e}")
             return None
 
-    def get_next_consultant_round_robin(self) -> Optional[Dict[str, Any]]:
+    def calculate_quote_prices(
+        self,
+        rates: List[Dict[str, Any]],
+        adults: int,
+        children_ages: Optional[List[int]] = None,
+        single_adults: int = 0
+    ) -> List[Optional[Dict[str, Any]]]:
         """
-        Get next consultant using round-robin assignment
+        Batched calculate_quote_price for many rates
+
+        Rows that already carry the price columns (find_matching_hotels,
+        find_rates_by_hotel_names) are priced without touching BigQuery;
+        the rest are looked up by rate_id in a single query.
+
+        Args:
+            rates: hotel_rates rows (at least rate_id)
+            adults: Number of adults
+            children_ages: List of children ages
+            single_adults: Number of adults in single rooms
 
         Returns:
-            Consultant dictionary or None
+            Pricing breakdown per input row (None where the rate was not found)
         """
+        missing = [r.get('rate_id') for r in rates if r.get('rate_id') and not has_prices(r)]
+        fetched = self._fetch_rate_prices(missing) if missing else {}
+
+        rows = []
+        for rate in rates:
+            if has_prices(rate):
+                rows.append(rate)
+            else:
+                rows.append(fetched.get(rate.get('rate_id')))
+
+        priced = price_rates([row for row in rows if row is not None], adults, children_ages, single_adults)
+        results = iter(priced)
+        return [next(results) if row is not None else None for row in rows]
+
+    def _fetch_rate_prices(self, rate_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Price columns for many rate_ids in one query"""
         if not self.client:
-            return None
+            return {}
+
+        prices = self._from_replica("rate_prices", rate_ids)
+        if prices is not _NOT_REPLICATED:
+            return prices
+
+        query = f"""
+        SELECT
+            rate_id,
+            total_7nights_pps,
+            total_7nights_single,
+            total_7nights_child
+        FROM {self.db.hotel_rates}
+        WHERE rate_id IN UNNEST(@rate_ids)
+        """
+
+        try:
+            job_config = bigquery.QueryJobConfig(
+                query_parameters=[
+                    bigquery.ArrayQueryParameter("rate_ids", "STRING", sorted(set(rate_ids)))
+                ]
+            )
+            prices = {}
+            for row in self.client.query(query, job_config=job_config).result():
+                prices.setdefault(row['rate_id'], dict(row))
+            return prices
+        except Exception as e:
+            logger.error(f"Error fetching rate prices: {e}")
+            return {}
 
-        # Return None if consultants table doesn't exist - we'll handle this gracefully
+    def get_active_consultants(self) -> List[Dict[str, Any]]:
+        """
+        Active consultants (the round-robin roster)
+
+        Returns:
+            List of consultant dictionaries (consultant_id, name, email)
+        """
+        if not self.client:
+            return []
+
+        # Return an empty roster if the consultants table doesn't exist
         try:
             query = f"""
             SELECT consultant_id, name, email
             FROM {self.db.consultants}
             WHERE is_active = TRUE
-            ORDER BY COALESCE(last_assigned, TIMESTAMP('2000-01-01')) ASC
-            LIMIT 1
+            ORDER BY consultant_id
             """
 
             results = self.client.query(query).result()
-            consultant = next(results, None)
-
-            if consultant:
-                # Update last_assigned timestamp
-                try:
-                    update_query = f"""
-                    UPDATE {self.db.consultants}
-                    SET last_assigned = CURRENT_TIMESTAMP()
-                    WHERE consultant_id = '{consultant.consultant_id}'
-                    """
-                    self.client.query(update_query).result()
-                except Exception:
-                    pass  # Silent fail on update
-
-                return dict(consultant)
-            return None
+            return [
+                {'consultant_id': row.consultant_id, 'name': row.name, 'email': row.email}
+                for row in results
+            ]
 
         except Exception as e:
             logger.warning(f"Consultant lookup failed (table may not exist): {e}")
+            return []
+
+    def get_next_consultant_round_robin(self) -> Optional[Dict[str, Any]]:
+        """
+        Get next consultant using round-robin assignment
+
+        Rotation is handled by src/services/consultant_assignment.py (cached
+        roster, atomic counter); no BigQuery job runs per assignment.
+
+        Returns:
+            Consultant dictionary or None
+        """
+        if not self.client:
             return None
 
+        from src.services.consultant_assignment import assign_consultant
+        return assign_consultant(self.config, self)
+
     def get_flight_price(self, destination: str, check_in_date: str) -> int:
         """
         Get flight price for destination and date
@@ -597,6 +700,10 @@ class BigQueryTool:
         if not self.client:
             return 0
 
+        price = self._from_replica("flight_price", destination, check_in_date)
+        if price is not _NOT_REPLICATED:
+            return int(price) if price else 0
+
         try:
             query = f"""
             SELECT price_per_person
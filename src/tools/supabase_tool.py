@@ -20,6 +20,10 @@ Usage:
 
     # Create ticket
     sb.create_ticket({...})
+
+Async request handlers should use AsyncSupabaseTool
+(src/tools/async_supabase_tool.py), which awaits PostgREST calls instead
+of running them on the shared thread pool.
 """
 
 import logging
@@ -1097,6 +1101,7 @@ class SupabaseTool:
 
             if result.data:
                 logger.info(f"Branding created for {self.tenant_id}")
+                self._publish_config_change()
                 return result.data[0]
             return None
 
@@ -1198,6 +1203,7 @@ class SupabaseTool:
 
             if result.data:
                 logger.info(f"Branding updated for {self.tenant_id}")
+                self._publish_config_change()
                 return result.data[0]
             return None
 
@@ -1436,6 +1442,7 @@ class SupabaseTool:
                     .execute()
 
             if result.data:
+                self._publish_config_change()
                 return result.data[0]
             return None
 
@@ -1443,6 +1450,14 @@ class SupabaseTool:
             logger.error(f"Failed to update tenant settings: {e}")
             return None
 
+    def _publish_config_change(self):
+        """Have every instance reload this tenant's config and caches derived from it"""
+        try:
+            from src.services.tenant_config_registry import publish_tenant_config_change
+            publish_tenant_config_change(self.tenant_id)
+        except Exception as e:
+            logger.warning(f"Tenant config change not published for {self.tenant_id}: {e}")
+
     # ==================== User Management Methods ====================
 
     TABLE_ORGANIZATION_USERS = "organization_users"
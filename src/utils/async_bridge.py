@@ -0,0 +1,118 @@
+"""
+Sync-to-async bridge for calling async clients from sync code.
+
+Sync code paths (QuoteAgent, background jobs, threadpool routes) that need
+an async supplier client run the coroutine on one long-lived event loop in
+a background thread, instead of spinning up a thread and a fresh loop per
+call. Because the loop persists, loop-bound resources such as the Rates
+Engine's pooled httpx client keep their connections between calls.
+
+Async code should await the client directly rather than use the bridge.
+"""
+
+import asyncio
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Coroutine, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class AsyncBridge:
+    """Event loop running forever in a daemon thread"""
+
+    def __init__(self, name: str = "async-bridge"):
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The bridge loop, started on first use"""
+        if self._loop is None:
+            with self._lock:
+                if self._loop is None:
+                    loop = asyncio.new_event_loop()
+                    ready = threading.Event()
+                    thread = threading.Thread(
+                        target=self._run_loop, args=(loop, ready), name=self.name, daemon=True
+                    )
+                    thread.start()
+                    ready.wait()
+                    self._thread = thread
+                    self._loop = loop
+                    logger.info(f"Async bridge loop started ({self.name})")
+        return self._loop
+
+    @staticmethod
+    def _run_loop(loop: asyncio.AbstractEventLoop, ready: threading.Event):
+        asyncio.set_event_loop(loop)
+        loop.call_soon(ready.set)
+        loop.run_forever()
+
+    def run(self, coro: Coroutine[Any, Any, T], timeout: Optional[float] = None) -> T:
+        """Run a coroutine on the bridge loop and block until it finishes"""
+        loop = self.loop
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("AsyncBridge.run() called from the bridge loop; await the coroutine instead")
+
+        future = asyncio.run_coroutine_threadsafe(coro, loop)
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+    def shutdown(self, cleanup: Optional[Callable[[], Awaitable[Any]]] = None, timeout: float = 5.0):
+        """Run an optional async cleanup on the loop, then stop it"""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = None
+            self._thread = None
+        if loop is None:
+            return
+
+        if cleanup is not None:
+            try:
+                asyncio.run_coroutine_threadsafe(cleanup(), loop).result(timeout)
+            except Exception as e:
+                logger.warning(f"Async bridge cleanup failed: {e}")
+
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+        if not loop.is_running():
+            loop.close()
+
+
+# ==================== Singleton ====================
+
+_bridge: Optional[AsyncBridge] = None
+_bridge_lock = threading.Lock()
+
+
+def get_async_bridge() -> AsyncBridge:
+    """Get the process-wide bridge"""
+    global _bridge
+    if _bridge is None:
+        with _bridge_lock:
+            if _bridge is None:
+                _bridge = AsyncBridge()
+    return _bridge
+
+
+def run_sync(coro: Coroutine[Any, Any, T], timeout: Optional[float] = None) -> T:
+    """Run a coroutine from sync code on the shared bridge loop"""
+    return get_async_bridge().run(coro, timeout)
+
+
+def shutdown_async_bridge(cleanup: Optional[Callable[[], Awaitable[Any]]] = None):
+    """Stop the bridge loop (application shutdown); cleanup runs on it first"""
+    global _bridge
+    with _bridge_lock:
+        bridge, _bridge = _bridge, None
+    if bridge:
+        bridge.shutdown(cleanup)
@@ -0,0 +1,45 @@
+"""
+Server-sent events helpers for streaming API responses.
+
+Streaming endpoints produce an async iterator of (event, data) pairs;
+sse_response() frames them as text/event-stream. An exception raised by the
+iterator is reported to the client as a final 'error' event instead of a
+truncated stream.
+"""
+
+import json
+import logging
+from typing import Any, AsyncIterator, Tuple
+
+from fastapi.responses import StreamingResponse
+
+logger = logging.getLogger(__name__)
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    # Stop nginx / Cloud Run proxies buffering the stream
+    "X-Accel-Buffering": "no",
+}
+
+
+def format_sse(event: str, data: Any) -> str:
+    """Frame one event; data is JSON-encoded"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def _frame(events: AsyncIterator[Tuple[str, Any]], error_message: str) -> AsyncIterator[str]:
+    try:
+        async for event, data in events:
+            yield format_sse(event, data)
+    except Exception as e:
+        logger.error(f"Stream failed: {e}", exc_info=True)
+        yield format_sse("error", {"message": error_message})
+
+
+def sse_response(
+    events: AsyncIterator[Tuple[str, Any]],
+    error_message: str = "Something went wrong. Please try again."
+) -> StreamingResponse:
+    """StreamingResponse that sends (event, data) pairs as server-sent events"""
+    return StreamingResponse(_frame(events, error_message), media_type="text/event-stream", headers=SSE_HEADERS)
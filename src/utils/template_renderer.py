@@ -18,13 +18,50 @@ Usage:
 
 from jinja2 import Environment, FileSystemLoader, Template
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import logging
+import threading
 
 from config.loader import ClientConfig
 
 logger = logging.getLogger(__name__)
 
+TEMPLATE_DIR = Path(__file__).parent.parent.parent / "templates"
+
+_environment: Optional[Environment] = None
+_environment_lock = threading.Lock()
+
+
+def get_template_environment() -> Environment:
+    """
+    Process-wide Jinja2 environment.
+
+    Shared by every TemplateRenderer so compiled templates stay in the
+    environment's cache instead of being re-parsed per renderer.
+    """
+    global _environment
+    if _environment is None:
+        with _environment_lock:
+            if _environment is None:
+                _environment = Environment(loader=FileSystemLoader(str(TEMPLATE_DIR)))
+    return _environment
+
+
+def reset_template_environment():
+    """Forget the shared environment and its compiled templates (for testing)"""
+    global _environment
+    with _environment_lock:
+        _environment = None
+
+
+def warm_templates(prefix: str = "") -> int:
+    """Compile every template under a prefix (e.g. 'pdf/'); returns the count"""
+    env = get_template_environment()
+    names = env.list_templates(filter_func=lambda name: name.startswith(prefix))
+    for name in names:
+        env.get_template(name)
+    return len(names)
+
 
 class TemplateRenderer:
     """Render Jinja2 templates with client-specific context"""
@@ -38,9 +75,9 @@ class TemplateRenderer:
         """
         self.config = config
         
-        # Set up Jinja2 environment
-        template_dir = Path(__file__).parent.parent.parent / "templates"
-        self.env = Environment(loader=FileSystemLoader(str(template_dir)))
+        # The shared environment: compiled templates are cached across renderers.
+        # Client context is passed at render time, never set on the environment.
+        self.env = get_template_environment()
         
         # Build base context with client info
         self.base_context = {
@@ -36,6 +36,7 @@ from fastapi import APIRouter, Request, HTTPException, BackgroundTasks
 from pydantic import BaseModel
 
 from config.loader import ClientConfig, get_config, list_clients
+from src.services.tenant_config_registry import add_config_listener
 from src.utils.error_handler import log_and_raise
 
 logger = logging.getLogger(__name__)
@@ -145,6 +146,14 @@ def _get_cached_tenant_lookup(email: str) -> Optional[Dict[str, str]]:
     return _tenant_email_cache.get('data', {}).get(email_lower)
 
 
+def _on_tenant_config_change(tenant_id: Optional[str]):
+    """Rebuild the email mapping on the next lookup after a tenant's config or settings changed"""
+    _tenant_email_cache.pop('timestamp', None)
+
+
+add_config_listener(_on_tenant_config_change)
+
+
 # ==================== Diagnostic Logging Helpers ====================
 
 def diagnostic_log(diagnostic_id: str, step: int, message: str, data: Dict[str, Any] = None):
@@ -24,6 +24,9 @@ from types import SimpleNamespace
 # Ensure src is in path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# Render PDFs in-process so tests can patch PDFGenerator (no renderer worker processes)
+os.environ.setdefault("PDF_RENDER_WORKERS", "0")
+
 
 # ==================== ASGI Middleware Test Helper ====================
 
@@ -606,6 +609,34 @@ def reset_caches():
     except ImportError:
         pass
 
+    # Clear cached principals, tenant statuses and AuthService instances
+    try:
+        from src.services.auth_context_cache import reset_auth_context_cache
+        reset_auth_context_cache()
+    except ImportError:
+        pass
+
+    # Forget rate limit counters, leases and route templates
+    try:
+        from src.middleware.rate_limiter import reset_async_rate_limiter
+        reset_async_rate_limiter()
+    except ImportError:
+        pass
+
+    # Forget tenant config snapshots and versions
+    try:
+        from src.services.tenant_config_registry import reset_tenant_config_registry
+        reset_tenant_config_registry()
+    except ImportError:
+        pass
+
+    # Forget async Supabase clients (they are bound to the test's event loop)
+    try:
+        from src.tools.async_supabase_tool import reset_async_supabase_clients
+        reset_async_supabase_clients()
+    except ImportError:
+        pass
+
     # Clear tenant config cache
     try:
         from src.services.tenant_config_service import TenantConfigService
@@ -614,6 +645,62 @@ def reset_caches():
     except ImportError:
         pass
 
+    # Clear semantic answer cache
+    try:
+        from src.services.answer_cache import clear_answer_cache
+        clear_answer_cache()
+    except ImportError:
+        pass
+
+    # Clear live search caches
+    try:
+        from src.services.search_cache import clear_search_caches
+        clear_search_caches()
+    except ImportError:
+        pass
+
+    # Forget local rates replicas
+    try:
+        from src.services.rates_replica import reset_rates_replicas
+        reset_rates_replicas()
+    except ImportError:
+        pass
+
+    # Forget consultant rosters and rotation counters
+    try:
+        from src.services.consultant_assignment import reset_consultant_assigner
+        reset_consultant_assigner()
+    except ImportError:
+        pass
+
+    # Forget the shared Jinja2 environment (tests replace its get_template)
+    try:
+        from src.utils.template_renderer import reset_template_environment
+        reset_template_environment()
+    except ImportError:
+        pass
+
+    # Forget the PDF cache instance and template fingerprint
+    try:
+        from src.services.pdf_cache import reset_pdf_cache
+        reset_pdf_cache()
+    except ImportError:
+        pass
+
+    # Stop PDF renderer processes
+    try:
+        from src.services.pdf_render_service import shutdown_pdf_render_service
+        shutdown_pdf_render_service()
+    except ImportError:
+        pass
+
+    # Stop background job workers
+    try:
+        from src.services.job_queue import shutdown_job_queue
+        shutdown_job_queue()
+    except ImportError:
+        pass
+
 
 # ==================== Fast Test Client Fixture ====================
 
@@ -562,7 +562,7 @@ class TestListTenantsHandlerDirect:
         mock_cfg.currency = "ZAR"
 
         with patch('src.api.admin_tenants_routes.list_clients', return_value=["alpha"]):
-            with patch('src.api.admin_tenants_routes.ClientConfig', return_value=mock_cfg):
+            with patch('src.api.admin_tenants_routes.get_config', return_value=mock_cfg):
                 with patch('src.api.admin_tenants_routes.get_tenant_stats_from_db', new_callable=AsyncMock, return_value={}):
                     result = await list_tenants(
                         status=None, search=None, limit=20, offset=0,
@@ -586,7 +586,7 @@ class TestListTenantsHandlerDirect:
         }
 
         with patch('src.api.admin_tenants_routes.list_clients', return_value=["alpha", "beta", "gamma"]):
-            with patch('src.api.admin_tenants_routes.ClientConfig', side_effect=lambda cid: configs[cid]):
+            with patch('src.api.admin_tenants_routes.get_config', side_effect=lambda cid: configs[cid]):
                 with patch('src.api.admin_tenants_routes.get_tenant_stats_from_db', new_callable=AsyncMock, return_value={}):
                     result = await list_tenants(
                         status=None, search="beta", limit=20, offset=0,
@@ -607,7 +607,7 @@ class TestListTenantsHandlerDirect:
         }
 
         with patch('src.api.admin_tenants_routes.list_clients', return_value=["alpha-resort", "beta-lodge"]):
-            with patch('src.api.admin_tenants_routes.ClientConfig', side_effect=lambda cid: configs[cid]):
+            with patch('src.api.admin_tenants_routes.get_config', side_effect=lambda cid: configs[cid]):
                 with patch('src.api.admin_tenants_routes.get_tenant_stats_from_db', new_callable=AsyncMock, return_value={}):
                     result = await list_tenants(
                         status=None, search="alpha", limit=20, offset=0,
@@ -625,7 +625,7 @@ class TestListTenantsHandlerDirect:
         mock_cfg = MagicMock(company_name="Test Co", support_email="t@t.com", currency="ZAR")
 
         with patch('src.api.admin_tenants_routes.list_clients', return_value=["t1"]):
-            with patch('src.api.admin_tenants_routes.ClientConfig', return_value=mock_cfg):
+            with patch('src.api.admin_tenants_routes.get_config', return_value=mock_cfg):
                 with patch('src.api.admin_tenants_routes.get_tenant_stats_from_db', new_callable=AsyncMock, return_value={}):
                     result = await list_tenants(
                         status="active", search=None, limit=20, offset=0,
@@ -642,7 +642,7 @@ class TestListTenantsHandlerDirect:
         mock_cfg = MagicMock(company_name="Test Co", support_email="t@t.com", currency="ZAR")
 
         with patch('src.api.admin_tenants_routes.list_clients', return_value=["t1"]):
-            with patch('src.api.admin_tenants_routes.ClientConfig', return_value=mock_cfg):
+            with patch('src.api.admin_tenants_routes.get_config', return_value=mock_cfg):
                 with patch('src.api.admin_tenants_routes.get_tenant_stats_from_db', new_callable=AsyncMock, return_value={}):
                     result = await list_tenants(
                         status="suspended", search=None, limit=20, offset=0,
@@ -663,7 +663,7 @@ class TestListTenantsHandlerDirect:
         }
 
         with patch('src.api.admin_tenants_routes.list_clients', return_value=["alpha", "beta", "gamma"]):
-            with patch('src.api.admin_tenants_routes.ClientConfig', side_effect=lambda cid: configs[cid]):
+            with patch('src.api.admin_tenants_routes.get_config', side_effect=lambda cid: configs[cid]):
                 with patch('src.api.admin_tenants_routes.get_tenant_stats_from_db', new_callable=AsyncMock, return_value={}):
                     result = await list_tenants(
                         status=None, search=None, limit=20, offset=0,
@@ -685,7 +685,7 @@ class TestListTenantsHandlerDirect:
         }
 
         with patch('src.api.admin_tenants_routes.list_clients', return_value=["charlie", "alice", "bob"]):
-            with patch('src.api.admin_tenants_routes.ClientConfig', side_effect=lambda cid: configs[cid]):
+            with patch('src.api.admin_tenants_routes.get_config', side_effect=lambda cid: configs[cid]):
                 with patch('src.api.admin_tenants_routes.get_tenant_stats_from_db', new_callable=AsyncMock, return_value={}):
                     result = await list_tenants(
                         status=None, search=None, limit=20, offset=0,
@@ -715,7 +715,7 @@ class TestListTenantsHandlerDirect:
             return stats_map.get(tid, {})
 
         with patch('src.api.admin_tenants_routes.list_clients', return_value=["low", "high", "mid"]):
-            with patch('src.api.admin_tenants_routes.ClientConfig', side_effect=lambda cid: configs[cid]):
+            with patch('src.api.admin_tenants_routes.get_config', side_effect=lambda cid: configs[cid]):
                 with patch('src.api.admin_tenants_routes.get_tenant_stats_from_db', side_effect=mock_stats):
                     result = await list_tenants(
                         status=None, search=None, limit=20, offset=0,
@@ -736,7 +736,7 @@ class TestListTenantsHandlerDirect:
             configs[cid] = MagicMock(company_name=f"Company {i}", support_email=f"{i}@t.com", currency="ZAR")
 
         with patch('src.api.admin_tenants_routes.list_clients', return_value=list(configs.keys())):
-            with patch('src.api.admin_tenants_routes.ClientConfig', side_effect=lambda cid: configs[cid]):
+            with patch('src.api.admin_tenants_routes.get_config', side_effect=lambda cid: configs[cid]):
                 with patch('src.api.admin_tenants_routes.get_tenant_stats_from_db', new_callable=AsyncMock, return_value={}):
                     result = await list_tenants(
                         status=None, search=None, limit=2, offset=1,
@@ -761,7 +761,7 @@ class TestListTenantsHandlerDirect:
             return m
 
         with patch('src.api.admin_tenants_routes.list_clients', return_value=["good", "broken"]):
-            with patch('src.api.admin_tenants_routes.ClientConfig', side_effect=config_side_effect):
+            with patch('src.api.admin_tenants_routes.get_config', side_effect=config_side_effect):
                 with patch('src.api.admin_tenants_routes.get_tenant_stats_from_db', new_callable=AsyncMock, return_value={}):
                     result = await list_tenants(
                         status=None, search=None, limit=20, offset=0,
@@ -0,0 +1,222 @@
+"""
+Answer Cache Unit Tests
+
+Tests for the tenant-scoped semantic answer cache and its use in the
+helpdesk and RAGResponseService.
+"""
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    from src.services.answer_cache import AnswerCache
+
+    monkeypatch.delenv("REDIS_URL", raising=False)
+    return AnswerCache(ttl=60, l1_ttl=60, l1_size=100)
+
+
+ANSWER = {"success": True, "answer": "Visas are issued on arrival.", "method": "dual_kb"}
+
+
+class TestNormalization:
+    """Tests for question normalization."""
+
+    def test_case_punctuation_stopwords_and_plurals(self):
+        """Surface variations should normalize to the same tokens."""
+        from src.services.answer_cache import normalize_question
+
+        assert normalize_question("What are the BEST hotels in Zanzibar?") == ["what", "best", "hotel", "zanzibar"]
+        assert normalize_question("what's the best hotel in zanzibar") == ["what", "best", "hotel", "zanzibar"]
+
+    def test_question_of_stopwords_keeps_words(self):
+        """A question made only of stopwords should still have a key."""
+        from src.services.answer_cache import normalize_question
+
+        assert normalize_question("Can you?") == ["can", "you"]
+
+
+class TestAnswerCache:
+    """Tests for exact and near-duplicate lookups."""
+
+    def test_exact_hit(self, cache):
+        """A rephrasing that normalizes identically should be an exact hit."""
+        cache.put("t1", "What are the visa requirements for Zanzibar?", ANSWER, query_type="travel_info")
+
+        hit = cache.get("t1", "what's the visa requirement for zanzibar", query_type="travel_info")
+
+        assert hit["answer"] == ANSWER["answer"]
+        assert hit["cache"] == {"match": "exact", "similarity": 1.0}
+
+    def test_near_duplicate_hit(self, cache):
+        """A question differing by one word should be a near-duplicate hit."""
+        cache.put("t1", "visa requirements zanzibar tanzania travellers", ANSWER)
+
+        hit = cache.get("t1", "visa requirements zanzibar tanzania travellers needed")
+
+        assert hit["cache"]["match"] == "near"
+        assert hit["cache"]["similarity"] >= 0.8
+
+    def test_different_month_misses(self, cache):
+        """Questions differing only in the month must not share an answer."""
+        cache.put("t1", "What is the price for the Zanzibar deluxe beach resort family holiday package in December?", ANSWER,
+                  query_type="pricing")
+
+        assert cache.get("t1", "What is the price for the Zanzibar deluxe beach resort family holiday package in January?",
+                         query_type="pricing") is None
+
+    def test_different_number_or_name_misses(self, cache):
+        """Numbers and capitalized names must match for a near hit."""
+        cache.put("t1", "visa entry requirements zanzibar tanzania south african passport holders travelling 2025", ANSWER)
+        cache.put("t1", "Is the sunset dhow cruise on the north coast booked tomorrow evening for Mr Smith", ANSWER)
+
+        assert cache.get("t1", "visa entry requirements zanzibar tanzania south african passport holders travelling 2026") is None
+        assert cache.get("t1", "Is the sunset dhow cruise on the north coast booked tomorrow evening for Mr Jones") is None
+        # Same name in lower case, one extra word: still a near match
+        hit = cache.get("t1", "is the sunset dhow cruise on the north coast booked tomorrow evening for mr smith today")
+        assert hit["cache"]["match"] == "near"
+
+    def test_different_question_misses(self, cache):
+        """A question about something else should not match."""
+        cache.put("t1", "best hotels in Mauritius", ANSWER)
+
+        assert cache.get("t1", "best hotels in Maldives") is None
+
+    def test_scoped_by_tenant_and_query_type(self, cache):
+        """Answers should not leak across tenants or query types."""
+        cache.put("t1", "visa requirements zanzibar", ANSWER, query_type="travel_info")
+
+        assert cache.get("t2", "visa requirements zanzibar", query_type="travel_info") is None
+        assert cache.get("t1", "visa requirements zanzibar", query_type="pricing") is None
+
+    def test_kb_change_invalidates_tenant_only(self, cache):
+        """Bumping a tenant's KB version should drop only that tenant's answers."""
+        cache.put("t1", "visa requirements zanzibar", ANSWER)
+        cache.put("t2", "visa requirements zanzibar", ANSWER)
+
+        cache.bump_kb_version("t1")
+
+        assert cache.get("t1", "visa requirements zanzibar") is None
+        assert cache.get("t2", "visa requirements zanzibar") is not None
+
+    def test_global_kb_change_invalidates_all_tenants(self, cache):
+        """A shared KB change should drop every tenant's answers."""
+        from src.services.answer_cache import GLOBAL_KB
+
+        cache.put("t1", "visa requirements zanzibar", ANSWER)
+        cache.put("t2", "visa requirements zanzibar", ANSWER)
+
+        cache.bump_kb_version(GLOBAL_KB)
+
+        assert cache.get("t1", "visa requirements zanzibar") is None
+        assert cache.get("t2", "visa requirements zanzibar") is None
+        assert cache.get_stats()["l1_entries"] == 0
+
+    def test_lru_eviction(self, monkeypatch):
+        """The in-process cache should stay within its size."""
+        from src.services.answer_cache import AnswerCache
+
+        monkeypatch.delenv("REDIS_URL", raising=False)
+        cache = AnswerCache(l1_size=2)
+        for city in ("zanzibar", "mauritius", "maldives"):
+            cache.put("t1", f"visa requirements {city}", ANSWER)
+
+        assert cache.get("t1", "visa requirements zanzibar") is None
+        assert cache.get("t1", "visa requirements maldives") is not None
+        assert cache.get_stats()["l1_entries"] == 2
+
+    def test_hit_rate_metrics(self, cache):
+        """Stats should count hits, misses and LLM calls saved."""
+        cache.put("t1", "visa requirements zanzibar", ANSWER, llm_calls=2)
+        cache.get("t1", "visa requirements zanzibar")
+        cache.get("t1", "airport transfers")
+
+        process = cache.get_stats()["process"]
+
+        assert process["hits_exact"] == 1
+        assert process["misses"] == 1
+        assert process["hit_rate"] == 0.5
+        assert process["llm_calls_saved"] == 2
+
+
+class TestHelpdeskAnswerCache:
+    """Tests for ask_helpdesk with the answer cache."""
+
+    def test_repeated_question_skips_search(self, mock_config, monkeypatch):
+        """The second, rephrased question should be answered from the cache."""
+        from src.api.helpdesk_routes import AskQuestion, ask_helpdesk
+
+        monkeypatch.delenv("REDIS_URL", raising=False)
+        dual = {"success": True, "answer": "Our best Zanzibar resort is Zuri.", "confidence": 0.9,
+                "citations": [{"source": "zanzibar.pdf", "score": 0.9, "source_type": "global_kb"}],
+                "sources_breakdown": {"global": 1, "private": 0}}
+
+        with patch('src.api.helpdesk_routes.search_dual_knowledge_base', return_value=dual) as search:
+            first = ask_helpdesk(AskQuestion(question="Which hotels in Zanzibar do you recommend?"), None, mock_config)
+            second = ask_helpdesk(AskQuestion(question="which hotels in zanzibar would you recommend"), None, mock_config)
+
+        assert search.call_count == 1
+        assert first["method"] == "dual_kb" and "cached" not in first
+        assert second["cached"] is True
+        assert second["answer"] == first["answer"]
+
+    def test_document_upload_invalidates(self, mock_config, monkeypatch):
+        """Indexing a tenant document should force a fresh answer."""
+        from src.api.helpdesk_routes import AskQuestion, ask_helpdesk
+        from src.services.answer_cache import invalidate_answer_cache
+
+        monkeypatch.delenv("REDIS_URL", raising=False)
+        dual = {"success": True, "answer": "Zuri.", "confidence": 0.9, "citations": [], "sources_breakdown": {}}
+
+        with patch('src.api.helpdesk_routes.search_dual_knowledge_base', return_value=dual) as search:
+            ask_helpdesk(AskQuestion(question="Zanzibar hotel recommendations"), None, mock_config)
+            invalidate_answer_cache(mock_config.client_id)
+            ask_helpdesk(AskQuestion(question="Zanzibar hotel recommendations"), None, mock_config)
+
+        assert search.call_count == 2
+
+    def test_private_kb_synthesis_cached_for_tenant(self, mock_config, monkeypatch):
+        """ask_helpdesk should pass the tenant to generate_response so its synthesis is cached."""
+        from src.api.helpdesk_routes import AskQuestion, ask_helpdesk
+        from src.services.answer_cache import get_answer_cache
+        from src.services.rag_response_service import RAGResponseService
+
+        monkeypatch.delenv("REDIS_URL", raising=False)
+        service = RAGResponseService()
+        service._client = MagicMock()
+        dual = {"success": True, "answer": "", "citations": [
+            {"content": "Zuri has 55 rooms", "score": 0.8, "source": "zuri.pdf", "source_type": "private_kb"}
+        ]}
+        question = "How many rooms does the Zuri have?"
+
+        with patch('src.api.helpdesk_routes.search_dual_knowledge_base', return_value=dual), \
+                patch('src.api.helpdesk_routes.get_rag_service', return_value=service), \
+                patch.object(service, '_call_llm', return_value="Zuri has 55 rooms."):
+            response = ask_helpdesk(AskQuestion(question=question), None, mock_config)
+
+        assert response["method"] == "private_kb_synthesis"
+        cached = get_answer_cache().get(mock_config.client_id, question, query_type=response["query_type"], namespace="rag")
+        assert cached["answer"] == "Zuri has 55 rooms."
+
+
+class TestRAGResponseServiceCache:
+    """Tests for generate_response with a tenant_id."""
+
+    def test_tenant_answers_are_cached(self, monkeypatch):
+        """A repeated question for a tenant should not call the LLM again."""
+        from src.services.rag_response_service import RAGResponseService
+
+        monkeypatch.delenv("REDIS_URL", raising=False)
+        service = RAGResponseService()
+        service._client = MagicMock()
+        results = [{"content": "Zuri has 55 rooms", "score": 0.9, "source": "zuri.pdf"}]
+
+        with patch.object(service, '_call_llm', return_value="Zuri has 55 rooms.") as llm:
+            service.generate_response("How many rooms at Zuri?", results, tenant_id="t1")
+            cached = service.generate_response("how many rooms at zuri", results, tenant_id="t1")
+            service.generate_response("How many rooms at Zuri?", results)
+
+        assert llm.call_count == 2
+        assert cached["answer"] == "Zuri has 55 rooms."
+        assert cached["cache"]["match"] == "exact"
@@ -0,0 +1,70 @@
+"""
+Async Bridge Unit Tests
+
+Tests for the persistent event-loop thread used by sync code to call
+async clients.
+"""
+
+import asyncio
+
+import pytest
+
+
+class TestAsyncBridge:
+    """Tests for AsyncBridge."""
+
+    def test_runs_on_one_persistent_loop(self):
+        """Every call should run on the same loop, so loop-bound pools survive."""
+        from src.utils.async_bridge import AsyncBridge
+
+        bridge = AsyncBridge()
+        try:
+            first = bridge.run(self._running_loop())
+            second = bridge.run(self._running_loop())
+        finally:
+            bridge.shutdown()
+
+        assert first is second
+
+    def test_timeout_cancels_coroutine(self):
+        """A call that exceeds its timeout should raise and cancel the coroutine."""
+        from src.utils.async_bridge import AsyncBridge
+
+        bridge = AsyncBridge()
+        cancelled = []
+
+        async def slow():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        try:
+            with pytest.raises(TimeoutError):
+                bridge.run(slow(), timeout=0.05)
+            bridge.run(asyncio.sleep(0.05))
+        finally:
+            bridge.shutdown()
+
+        assert cancelled == [True]
+
+    def test_shutdown_runs_cleanup_on_bridge_loop(self):
+        """Cleanup should run on the bridge loop before it stops."""
+        from src.utils.async_bridge import AsyncBridge
+
+        bridge = AsyncBridge()
+        loop = bridge.loop
+        seen = []
+
+        async def cleanup():
+            seen.append(asyncio.get_running_loop())
+
+        bridge.shutdown(cleanup)
+
+        assert seen == [loop]
+        assert loop.is_closed()
+
+    @staticmethod
+    async def _running_loop():
+        return asyncio.get_running_loop()
@@ -0,0 +1,159 @@
+"""
+Async Supabase Tool Unit Tests
+
+Tests for awaited PostgREST calls: timeout, circuit breaker, retry on
+connection drops, latency histogram and the mirrored invoice reads.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.utils.circuit_breaker import supabase_circuit
+
+
+@pytest.fixture(autouse=True)
+def closed_circuit():
+    """Start and finish every test with the shared Supabase breaker closed."""
+    supabase_circuit.record_success()
+    yield
+    supabase_circuit.record_success()
+
+
+@pytest.fixture
+def mock_config():
+    config = MagicMock()
+    config.client_id = "test-tenant"
+    return config
+
+
+def make_tool(config, client=None):
+    from src.tools.async_supabase_tool import AsyncSupabaseTool
+
+    return AsyncSupabaseTool(config, client or MagicMock())
+
+
+def make_query(*results):
+    query = MagicMock()
+    query.execute = AsyncMock(side_effect=list(results))
+    return query
+
+
+class TestExecute:
+    """Tests for AsyncSupabaseTool.execute."""
+
+    async def test_result_returned_and_latency_recorded(self, mock_config):
+        """A successful call returns its result and is observed under its operation."""
+        tool = make_tool(mock_config)
+        result = MagicMock(data=[{"id": 1}])
+
+        with patch("src.tools.async_supabase_tool._observe") as observe:
+            assert await tool.execute(make_query(result), operation="list_things") is result
+
+        operation, outcome, seconds = observe.call_args[0]
+        assert (operation, outcome) == ("list_things", "ok")
+        assert seconds >= 0
+
+    async def test_timeout_raises_and_counts_as_failure(self, mock_config):
+        """A call over the timeout raises TimeoutError and records a breaker failure."""
+        tool = make_tool(mock_config)
+        query = MagicMock()
+        query.execute = lambda: asyncio.sleep(1)
+
+        with patch("src.tools.async_supabase_tool._observe") as observe, \
+                patch.object(supabase_circuit, "record_failure") as record_failure:
+            with pytest.raises(TimeoutError):
+                await tool.execute(query, operation="slow", timeout=0.01)
+
+        record_failure.assert_called_once()
+        assert observe.call_args[0][1] == "timeout"
+
+    async def test_open_circuit_skips_query(self, mock_config):
+        """With the breaker open the query is not sent."""
+        tool = make_tool(mock_config)
+        query = make_query(MagicMock())
+
+        with patch.object(supabase_circuit, "can_execute", return_value=False):
+            with pytest.raises(ConnectionError):
+                await tool.execute(query)
+
+        query.execute.assert_not_called()
+
+    async def test_connection_drop_retried_once(self, mock_config):
+        """An HTTP/2 connection drop is retried once before failing."""
+        tool = make_tool(mock_config)
+        result = MagicMock()
+        query = make_query(Exception("Server disconnected without sending a response."), result)
+
+        assert await tool.execute(query) is result
+        assert query.execute.await_count == 2
+
+    async def test_other_errors_not_retried(self, mock_config):
+        """Other errors are raised after one attempt."""
+        tool = make_tool(mock_config)
+        query = make_query(ValueError("bad filter"))
+
+        with pytest.raises(ValueError):
+            await tool.execute(query)
+        assert query.execute.await_count == 1
+
+
+class TestInvoices:
+    """Tests for the mirrored invoice reads."""
+
+    async def test_list_invoices_fetches_missing_destinations_in_one_query(self, mock_config):
+        """Destinations missing from invoices are filled from their quotes with one query."""
+        client = MagicMock()
+        invoices = MagicMock()
+        invoices.select.return_value.eq.return_value.order.return_value.range.return_value = make_query(
+            MagicMock(data=[{"invoice_id": "inv-1", "quote_id": "q1"}, {"invoice_id": "inv-2", "destination": "Zanzibar"}])
+        )
+        quotes = MagicMock()
+        quotes.select.return_value.eq.return_value.in_.return_value = make_query(
+            MagicMock(data=[{"quote_id": "q1", "destination": "Mauritius"}])
+        )
+        client.table.side_effect = lambda name: invoices if name == "invoices" else quotes
+
+        result = await make_tool(mock_config, client).list_invoices()
+
+        assert [i["destination"] for i in result] == ["Mauritius", "Zanzibar"]
+        quotes.select.return_value.eq.return_value.in_.assert_called_once_with("quote_id", ["q1"])
+
+    async def test_get_invoice_returns_none_on_error(self, mock_config):
+        """Like SupabaseTool.get_invoice, a failed lookup returns None."""
+        client = MagicMock()
+        client.table.return_value.select.return_value.eq.return_value.eq.return_value.single.return_value = make_query(
+            Exception("no rows")
+        )
+
+        assert await make_tool(mock_config, client).get_invoice("missing") is None
+
+
+class TestClientCache:
+    """Tests for the per-loop async client cache."""
+
+    async def test_client_reused_within_loop(self):
+        """The async client is created once per tenant on a loop."""
+        from src.tools import async_supabase_tool
+
+        create = AsyncMock(side_effect=lambda url, key: MagicMock())
+        with patch.object(async_supabase_tool, "acreate_client", create):
+            first = await async_supabase_tool.get_cached_async_supabase_client("https://x.supabase.co", "k", "t1")
+            second = await async_supabase_tool.get_cached_async_supabase_client("https://x.supabase.co", "k", "t1")
+
+        assert first is second
+        create.assert_awaited_once()
+
+    async def test_close_closes_postgrest_sessions(self):
+        """Shutdown closes the connection pool of every client used on the loop."""
+        from src.tools import async_supabase_tool
+
+        client = MagicMock()
+        client._postgrest.aclose = AsyncMock()
+        with patch.object(async_supabase_tool, "acreate_client", AsyncMock(return_value=client)):
+            await async_supabase_tool.get_cached_async_supabase_client("https://x.supabase.co", "k", "t1")
+
+        await async_supabase_tool.close_async_supabase_clients()
+
+        client._postgrest.aclose.assert_awaited_once()
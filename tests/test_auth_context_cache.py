@@ -0,0 +1,178 @@
+"""
+Auth Context Cache Unit Tests
+
+Tests for the principal LRU/TTL cache, the background-refreshed tenant
+status cache and push invalidation.
+"""
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+
+USER = {"id": "u1", "email": "a@t1.com", "tenant_id": "t1", "is_active": True}
+
+
+class TestPrincipalCache:
+    """Tests for cached principals."""
+
+    def test_hit_until_ttl(self):
+        """A principal is served until its TTL passes."""
+        from src.services.auth_context_cache import AuthContextCache
+
+        cache = AuthContextCache(principal_ttl=60)
+        cache.put_principal(("t1", "au1", 1), USER)
+
+        assert cache.get_principal(("t1", "au1", 1)) == USER
+        with patch("src.services.auth_context_cache.time.monotonic", return_value=10 ** 9):
+            assert cache.get_principal(("t1", "au1", 1)) is None
+
+    def test_new_token_misses(self):
+        """A different token iat (new login) is a separate principal."""
+        from src.services.auth_context_cache import AuthContextCache
+
+        cache = AuthContextCache()
+        cache.put_principal(("t1", "au1", 1), USER)
+
+        assert cache.get_principal(("t1", "au1", 2)) is None
+
+    def test_lru_bound(self):
+        """Beyond max_principals the least recently used principal is evicted."""
+        from src.services.auth_context_cache import AuthContextCache
+
+        cache = AuthContextCache(max_principals=2)
+        cache.put_principal(("t1", "a", 1), USER)
+        cache.put_principal(("t1", "b", 1), USER)
+        cache.get_principal(("t1", "a", 1))
+        cache.put_principal(("t1", "c", 1), USER)
+
+        assert cache.get_principal(("t1", "b", 1)) is None
+        assert cache.get_principal(("t1", "a", 1)) == USER
+
+    def test_drop_user_by_user_id(self):
+        """drop_user removes every token of the user, and only that user."""
+        from src.services.auth_context_cache import AuthContextCache
+
+        cache = AuthContextCache()
+        cache.put_principal(("t1", "au1", 1), USER)
+        cache.put_principal(("t1", "au1", 2), USER)
+        cache.put_principal(("t1", "au2", 1), {**USER, "id": "u2"})
+
+        assert cache.drop_user("t1", user_id="u1") == 2
+        assert cache.get_principal(("t1", "au2", 1)) is not None
+
+
+class TestTenantStatus:
+    """Tests for the tenant status cache."""
+
+    async def test_unknown_status_fails_open(self):
+        """If the status cannot be loaded, the tenant is treated as active."""
+        from src.services.auth_context_cache import AuthContextCache
+
+        cache = AuthContextCache()
+        with patch("src.services.auth_context_cache.fetch_tenant_statuses", return_value=None):
+            assert await cache.is_tenant_suspended("t1") is False
+
+    async def test_stale_status_served_while_refreshing(self):
+        """A stale status is returned immediately and refreshed in one background query."""
+        from src.services.auth_context_cache import AuthContextCache
+
+        cache = AuthContextCache(tenant_status_ttl=0)
+        cache.set_status("t1", "active")
+        cache.set_status("t2", "active")
+
+        with patch("src.services.auth_context_cache.fetch_tenant_statuses",
+                   return_value={"t1": "suspended", "t2": "active"}) as fetch:
+            assert await cache.is_tenant_suspended("t1") is False
+            await cache._refresh_task
+
+        assert sorted(fetch.call_args[0][0]) == ["t1", "t2"]
+        assert cache.get_status("t1") == "suspended"
+
+    def test_tenant_lru_bound(self):
+        """Beyond max_tenants the least recently used status is evicted."""
+        from src.services.auth_context_cache import AuthContextCache
+
+        cache = AuthContextCache(max_tenants=2)
+        for tenant_id in ("t1", "t2", "t3"):
+            cache.set_status(tenant_id, "active")
+
+        assert cache.get_status("t1") is None
+        assert cache.get_stats()["tenants"] == 2
+
+    def test_fetch_uses_cached_client_and_one_query(self):
+        """Statuses for several tenants are read with a single IN query on the shared client."""
+        from src.services.auth_context_cache import fetch_tenant_statuses
+
+        client = MagicMock()
+        client.table.return_value.select.return_value.in_.return_value.execute.return_value = MagicMock(
+            data=[{"tenant_id": "t1", "status": "suspended"}]
+        )
+        with patch.dict("os.environ", {"SUPABASE_URL": "https://x.supabase.co", "SUPABASE_SERVICE_KEY": "k"}), \
+                patch("src.services.auth_service.get_cached_auth_client", return_value=client):
+            assert fetch_tenant_statuses(["t1", "t2"]) == {"t1": "suspended"}
+
+        client.table.return_value.select.return_value.in_.assert_called_once_with("tenant_id", ["t1", "t2"])
+
+
+class TestAuthServices:
+    """Tests for per-tenant AuthService reuse."""
+
+    def test_reused_and_lru_bound(self):
+        """A tenant's AuthService is built once; unknown X-Client-IDs can't grow the cache unbounded."""
+        from src.services.auth_context_cache import AuthContextCache
+
+        cache = AuthContextCache(max_tenants=2)
+        factory = MagicMock(side_effect=lambda: object())
+
+        first = cache.get_auth_service("t1", factory)
+        assert cache.get_auth_service("t1", factory) is first
+        cache.get_auth_service("t2", factory)
+        cache.get_auth_service("t3", factory)
+
+        assert factory.call_count == 3
+        assert cache.get_stats()["auth_services"] == 2
+        assert cache.get_auth_service("t1", factory) is not first
+
+    def test_config_change_drops_auth_service(self):
+        """A tenant config change rebuilds only that tenant's AuthService."""
+        from src.services.auth_context_cache import get_auth_context_cache
+        from src.services.tenant_config_registry import _notify
+
+        cache = get_auth_context_cache()
+        t1 = cache.get_auth_service("t1", object)
+        t2 = cache.get_auth_service("t2", object)
+
+        _notify("t1")
+
+        assert cache.get_auth_service("t1", object) is not t1
+        assert cache.get_auth_service("t2", object) is t2
+
+
+class TestPushInvalidation:
+    """Tests for invalidate_user / set_tenant_status."""
+
+    def test_suspension_applies_locally_and_drops_users(self):
+        """Suspending a tenant updates its status and forgets its principals."""
+        from src.services.auth_context_cache import get_auth_context_cache, set_tenant_status
+
+        cache = get_auth_context_cache()
+        cache.put_principal(("t1", "au1", 1), USER)
+
+        set_tenant_status("t1", "suspended")
+
+        assert cache.get_status("t1") == "suspended"
+        assert cache.get_principal(("t1", "au1", 1)) is None
+
+    def test_broadcast_when_redis_configured(self):
+        """With Redis available the invalidation is published for other instances."""
+        from src.services import auth_context_cache
+
+        redis_client = MagicMock()
+        with patch.object(auth_context_cache, "_get_redis_client", return_value=redis_client):
+            auth_context_cache.invalidate_user("t1", user_id="u1")
+
+        channel, message = redis_client.publish.call_args[0]
+        assert channel == auth_context_cache.INVALIDATION_CHANNEL
+        assert '"user_id": "u1"' in message
@@ -1609,73 +1609,93 @@ class TestSpoofingHelperFunctions:
 
 
 class TestTenantSuspensionCheck:
-    """Tests for _is_tenant_suspended cached lookup."""
+    """Tests for the cached tenant suspension check and principal reuse."""
 
-    @pytest.fixture(autouse=True)
-    def reset_cache(self):
-        """Reset tenant status cache between tests."""
-        from src.middleware import auth_middleware
-        auth_middleware._tenant_status_cache.clear()
-        yield
-        auth_middleware._tenant_status_cache.clear()
-
-    @patch('supabase.create_client')
-    def test_suspended_tenant_returns_true(self, mock_create_client):
-        """_is_tenant_suspended returns True for suspended tenants."""
-        from src.middleware.auth_middleware import _is_tenant_suspended
-        mock_client = MagicMock()
-        mock_client.table.return_value.select.return_value.eq.return_value.execute.return_value = MagicMock(
-            data=[{"status": "suspended"}]
-        )
-        mock_create_client.return_value = mock_client
-
-        with patch.dict('os.environ', {'SUPABASE_URL': 'https://test.supabase.co', 'SUPABASE_SERVICE_KEY': 'test-key'}):
-            assert _is_tenant_suspended('suspended_tenant') is True
-
-    @patch('supabase.create_client')
-    def test_active_tenant_returns_false(self, mock_create_client):
-        """_is_tenant_suspended returns False for active tenants."""
-        from src.middleware.auth_middleware import _is_tenant_suspended
-        mock_client = MagicMock()
-        mock_client.table.return_value.select.return_value.eq.return_value.execute.return_value = MagicMock(
-            data=[{"status": "active"}]
-        )
-        mock_create_client.return_value = mock_client
-
-        with patch.dict('os.environ', {'SUPABASE_URL': 'https://test.supabase.co', 'SUPABASE_SERVICE_KEY': 'test-key'}):
-            assert _is_tenant_suspended('active_tenant') is False
-
-    @patch('supabase.create_client')
-    def test_unknown_tenant_returns_false(self, mock_create_client):
-        """_is_tenant_suspended returns False when tenant not in DB (fail-open)."""
-        from src.middleware.auth_middleware import _is_tenant_suspended
-        mock_client = MagicMock()
-        mock_client.table.return_value.select.return_value.eq.return_value.execute.return_value = MagicMock(
-            data=[]
-        )
-        mock_create_client.return_value = mock_client
+    @staticmethod
+    def _auth_service(tenant_id='tenant_a'):
+        inst = MagicMock()
+        inst.verify_jwt.return_value = (True, {'sub': 'au1', 'iat': 1700000000})
+        inst.get_user_by_auth_id = AsyncMock(return_value=MockUser(tenant_id).data)
+        return inst
 
-        with patch.dict('os.environ', {'SUPABASE_URL': 'https://test.supabase.co', 'SUPABASE_SERVICE_KEY': 'test-key'}):
-            assert _is_tenant_suspended('unknown_tenant') is False
+    @pytest.mark.asyncio
+    async def test_suspended_tenant_returns_403(self):
+        """A tenant marked suspended is rejected without a database lookup."""
+        from src.services.auth_context_cache import get_auth_context_cache
 
-    def test_cache_is_used(self):
-        """_is_tenant_suspended uses cached value on subsequent calls."""
-        import time
-        from src.middleware import auth_middleware
-        from src.middleware.auth_middleware import _is_tenant_suspended
+        get_auth_context_cache().set_status('tenant_a', 'suspended')
+
+        with patch('src.middleware.auth_middleware.get_config', return_value=MockConfig('tenant_a')), \
+             patch('src.middleware.auth_middleware.AuthService', return_value=self._auth_service()), \
+             patch('src.services.auth_context_cache.fetch_tenant_statuses') as fetch:
+            scope = create_mock_scope('/api/v1/quotes', headers={
+                'authorization': 'Bearer valid', 'x-client-id': 'tenant_a',
+            })
+            status, body, _, app_called, *_ = await _run_middleware(scope)
+
+        assert status == 403
+        assert b'suspended' in body
+        assert app_called is False
+        fetch.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_first_request_loads_tenant_status(self):
+        """An unseen tenant's status is loaded once, then served from memory."""
+        with patch('src.middleware.auth_middleware.get_config', return_value=MockConfig('tenant_a')), \
+             patch('src.middleware.auth_middleware.AuthService', return_value=self._auth_service()), \
+             patch('src.services.auth_context_cache.fetch_tenant_statuses',
+                   return_value={'tenant_a': 'active'}) as fetch:
+            for _ in range(3):
+                scope = create_mock_scope('/api/v1/quotes', headers={
+                    'authorization': 'Bearer valid', 'x-client-id': 'tenant_a',
+                })
+                status, *_ = await _run_middleware(scope)
+                assert status == 200
+
+        fetch.assert_called_once_with(['tenant_a'])
 
-        # Pre-populate cache
-        auth_middleware._tenant_status_cache['cached_tenant'] = ('suspended', time.time())
+    @pytest.mark.asyncio
+    async def test_steady_state_requests_do_no_lookups(self):
+        """Repeat requests with the same token reuse the AuthService and the cached user."""
+        inst = self._auth_service()
+
+        with patch('src.middleware.auth_middleware.get_config', return_value=MockConfig('tenant_a')), \
+             patch('src.middleware.auth_middleware.AuthService', return_value=inst) as MockAS:
+            for _ in range(3):
+                scope = create_mock_scope('/api/v1/quotes', headers={
+                    'authorization': 'Bearer valid', 'x-client-id': 'tenant_a',
+                })
+                status, *_ = await _run_middleware(scope)
+                assert status == 200
+
+        MockAS.assert_called_once()
+        inst.get_user_by_auth_id.assert_awaited_once_with('au1', 'tenant_a')
 
-        # Should return True from cache without any DB call
-        assert _is_tenant_suspended('cached_tenant') is True
+    @pytest.mark.asyncio
+    async def test_invalidated_user_is_looked_up_again(self):
+        """invalidate_user makes the next request re-read the user (e.g. after deactivation)."""
+        from src.services.auth_context_cache import invalidate_user
 
-    def test_fails_open_on_error(self):
-        """_is_tenant_suspended returns False when DB check fails."""
-        from src.middleware.auth_middleware import _is_tenant_suspended
+        inst = self._auth_service()
 
-        with patch.dict('os.environ', {'SUPABASE_URL': '', 'SUPABASE_SERVICE_KEY': ''}):
-            assert _is_tenant_suspended('any_tenant') is False
+        with patch('src.middleware.auth_middleware.get_config', return_value=MockConfig('tenant_a')), \
+             patch('src.middleware.auth_middleware.AuthService', return_value=inst):
+            scope = create_mock_scope('/api/v1/quotes', headers={
+                'authorization': 'Bearer valid', 'x-client-id': 'tenant_a',
+            })
+            status, *_ = await _run_middleware(scope)
+            assert status == 200
+
+            invalidate_user('tenant_a', user_id='user_123')
+            inst.get_user_by_auth_id = AsyncMock(return_value=None)
+
+            scope = create_mock_scope('/api/v1/quotes', headers={
+                'authorization': 'Bearer valid', 'x-client-id': 'tenant_a',
+            })
+            status, body, *_ = await _run_middleware(scope)
+
+        assert status == 401
+        assert b'User not found' in body
 
 
 if __name__ == '__main__':
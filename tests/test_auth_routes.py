@@ -855,7 +855,8 @@ class TestProfileUpdateTenantIsolation:
         }
 
         with patch('src.api.auth_routes.get_config') as mock_gc, \
-             patch('src.tools.supabase_tool.SupabaseTool', return_value=mock_db) as mock_st:
+             patch('src.tools.supabase_tool.SupabaseTool', return_value=mock_db) as mock_st, \
+             patch('src.api.auth_routes.invalidate_user') as mock_invalidate:
             mock_gc.return_value = MagicMock()
 
             result = await update_profile(
@@ -871,3 +872,5 @@ class TestProfileUpdateTenantIsolation:
         mock_gc.assert_called_once_with("real-tenant")
         assert result["success"] is True
         assert result["user"]["tenant_id"] == "real-tenant"
+        # The updated name must not be served from the auth context cache
+        mock_invalidate.assert_called_once_with("real-tenant", user_id="user-456")
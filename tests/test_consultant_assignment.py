@@ -0,0 +1,105 @@
+"""
+Consultant Assignment Unit Tests
+
+Tests for weighted round-robin consultant assignment: schedule shape,
+load weighting, concurrency and roster caching.
+"""
+
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+
+def _consultants(*ids):
+    return [{'consultant_id': cid, 'name': cid.title(), 'email': f'{cid}@example.com'} for cid in ids]
+
+
+@pytest.fixture
+def config():
+    config = MagicMock()
+    config.client_id = 'tenant_a'
+    return config
+
+
+class TestWeighting:
+    """Tests for load weights and the smooth schedule."""
+
+    def test_schedule_spreads_turns(self):
+        """Each consultant appears weight times, not in runs."""
+        from src.services.consultant_assignment import weighted_schedule
+
+        assert weighted_schedule([1, 1, 1]) == [0, 1, 2]
+        assert weighted_schedule([3, 1]) == [0, 0, 1, 0]
+
+    def test_least_loaded_gets_most_turns(self):
+        """Weights should fall from CONSULTANT_MAX_WEIGHT (idle) to 1 (busiest)."""
+        from src.services.consultant_assignment import load_weights, CONSULTANT_MAX_WEIGHT
+
+        weights = load_weights(['a', 'b', 'c'], {'a': 10, 'b': 5})
+
+        assert weights['c'] == CONSULTANT_MAX_WEIGHT
+        assert weights['a'] == 1
+        assert weights['a'] < weights['b'] < weights['c']
+        assert load_weights(['a', 'b'], {}) == {'a': 1, 'b': 1}
+
+
+class TestConsultantAssigner:
+    """Tests for ConsultantAssigner."""
+
+    def test_concurrent_assignments_are_balanced(self, config):
+        """Concurrent quotes should each get their own slot in the rotation."""
+        from src.services.consultant_assignment import ConsultantAssigner
+
+        bq_tool = MagicMock()
+        bq_tool.get_active_consultants.return_value = _consultants('ann', 'ben', 'cat', 'dan')
+        assigner = ConsultantAssigner()
+        picks = []
+
+        def assign():
+            for _ in range(25):
+                picks.append(assigner.next_consultant(config, bq_tool)['consultant_id'])
+
+        with patch.object(ConsultantAssigner, '_open_quotes', return_value={}):
+            threads = [threading.Thread(target=assign) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert {cid: picks.count(cid) for cid in set(picks)} == {'ann': 50, 'ben': 50, 'cat': 50, 'dan': 50}
+        bq_tool.get_active_consultants.assert_called_once()
+
+    def test_roster_reloaded_after_invalidate(self, config):
+        """invalidate() should make the next assignment re-read the roster."""
+        from src.services.consultant_assignment import ConsultantAssigner
+
+        bq_tool = MagicMock()
+        bq_tool.get_active_consultants.side_effect = [_consultants('ann'), _consultants('ben')]
+        assigner = ConsultantAssigner()
+
+        with patch.object(ConsultantAssigner, '_open_quotes', return_value={}):
+            assert assigner.next_consultant(config, bq_tool)['consultant_id'] == 'ann'
+            assigner.invalidate('tenant_a')
+            assert assigner.next_consultant(config, bq_tool)['consultant_id'] == 'ben'
+
+    def test_no_consultants_returns_none(self, config):
+        """A tenant without active consultants gets no assignment."""
+        from src.services.consultant_assignment import ConsultantAssigner
+
+        bq_tool = MagicMock()
+        bq_tool.get_active_consultants.return_value = []
+
+        assert ConsultantAssigner().next_consultant(config, bq_tool) is None
+
+    def test_redis_counter_uses_incr(self):
+        """The Redis counter should use one INCR per assignment, per tenant key."""
+        from src.services.consultant_assignment import RedisRotationCounter
+
+        redis_client = MagicMock()
+        redis_client.incr.return_value = 7
+        with patch('redis.from_url', return_value=redis_client):
+            counter = RedisRotationCounter('redis://localhost:6379')
+
+        assert counter.next('tenant_a') == 6
+        redis_client.incr.assert_called_once_with('consultant_rr:tenant_a')
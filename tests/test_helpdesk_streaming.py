@@ -0,0 +1,205 @@
+"""
+Helpdesk Streaming Unit Tests
+
+Tests for the server-sent-events streaming mode of /helpdesk/ask and
+/helpdesk/agent/chat, RAGResponseService.stream_response and
+HelpdeskAgent.chat_stream.
+"""
+
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+
+class _FakeStream:
+    """Async iterator standing in for an OpenAI streaming response"""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    def __aiter__(self):
+        return self._generate()
+
+    async def _generate(self):
+        for chunk in self.chunks:
+            yield chunk
+
+
+def _chunk(content=None, tool_calls=None):
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=content, tool_calls=tool_calls))])
+
+
+def _tool_fragment(index, name=None, arguments=None):
+    return SimpleNamespace(index=index, function=SimpleNamespace(name=name, arguments=arguments))
+
+
+def _async_client(*streams):
+    client = MagicMock()
+    client.chat.completions.create = AsyncMock(side_effect=[_FakeStream(s) for s in streams])
+    return client
+
+
+def _parse_sse(body):
+    events = []
+    for frame in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in frame.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+class TestSSE:
+    """Tests for the SSE helpers."""
+
+    def test_format_sse(self):
+        """Events should be framed with a JSON data line."""
+        from src.utils.sse import format_sse
+
+        assert format_sse("token", {"delta": "Hi"}) == 'event: token\ndata: {"delta": "Hi"}\n\n'
+
+    async def test_failure_becomes_error_event(self):
+        """An exception mid-stream should end with an error event."""
+        from src.utils.sse import sse_response
+
+        async def events():
+            yield "token", {"delta": "Hi"}
+            raise RuntimeError("boom")
+
+        response = sse_response(events(), error_message="try again")
+        frames = [frame async for frame in response.body_iterator]
+
+        assert response.media_type == "text/event-stream"
+        assert frames[-1] == 'event: error\ndata: {"message": "try again"}\n\n'
+
+
+class TestResponseStream:
+    """Tests for RAGResponseService.stream_response."""
+
+    async def test_streams_tokens(self):
+        """Deltas should be yielded as they arrive and the answer assembled."""
+        from src.services.rag_response_service import RAGResponseService
+
+        service = RAGResponseService()
+        service._async_client = _async_client([_chunk("Zuri "), _chunk(None), _chunk("has 55 rooms.")])
+        stream = service.stream_response("Rooms at Zuri?", [{"content": "55 rooms", "score": 0.9, "source": "zuri.pdf"}])
+
+        deltas = [delta async for delta in stream]
+
+        assert deltas == ["Zuri ", "has 55 rooms."]
+        assert stream.answer == "Zuri has 55 rooms."
+        assert stream.method == "rag"
+        assert stream.sources[0]["filename"]
+
+    async def test_error_before_first_token_falls_back(self):
+        """A failed request should yield the fallback answer in one piece."""
+        from src.services.rag_response_service import RAGResponseService
+
+        service = RAGResponseService()
+        service._async_client = MagicMock()
+        service._async_client.chat.completions.create = AsyncMock(side_effect=RuntimeError("down"))
+        stream = service.stream_response("Rooms at Zuri?", [{"content": "55 rooms", "score": 0.9, "source": "zuri.pdf"}])
+
+        deltas = [delta async for delta in stream]
+
+        assert len(deltas) == 1
+        assert stream.method == "fallback"
+
+
+class TestAgentChatStream:
+    """Tests for HelpdeskAgent.chat_stream."""
+
+    async def test_direct_answer(self):
+        """A direct answer should stream and be added to the history."""
+        from src.agents.helpdesk_agent import HelpdeskAgent
+
+        agent = HelpdeskAgent()
+        agent._async_client = _async_client([_chunk("Hello "), _chunk("there!")])
+
+        events = [e async for e in agent.chat_stream("Hi")]
+
+        assert [name for name, _ in events] == ["citations", "token", "token", "done"]
+        assert events[-1][1]["response"] == "Hello there!"
+        assert agent.conversation_history[-1] == {"role": "assistant", "content": "Hello there!"}
+
+    async def test_tool_call_then_synthesis(self):
+        """Tool call fragments should be assembled and run before the answer streams."""
+        from src.agents.helpdesk_agent import HelpdeskAgent
+
+        agent = HelpdeskAgent()
+        agent._async_client = _async_client(
+            [
+                _chunk(tool_calls=[_tool_fragment(0, name="platform_help", arguments='{"top')]),
+                _chunk(tool_calls=[_tool_fragment(0, arguments='ic": "quotes"}')]),
+            ],
+            [_chunk("Go to "), _chunk("Quotes.")]
+        )
+
+        events = [e async for e in agent.chat_stream("How do I create a quote?")]
+
+        assert [name for name, _ in events] == ["citations", "token", "token", "done"]
+        assert events[0][1]["tool_used"] == "platform_help"
+        assert events[-1][1]["response"] == "Go to Quotes."
+        assert agent.tool_calls[-1]["args"] == {"topic": "quotes"}
+
+
+class TestStreamingEndpoints:
+    """Tests for the /ask/stream and /agent/chat/stream endpoints."""
+
+    def test_ask_stream_sends_citations_before_tokens(self, mock_config):
+        """Private KB synthesis should stream citations, tokens, then the full answer."""
+        from fastapi.testclient import TestClient
+        from main import app
+        from src.api.dependencies import get_client_config
+        from src.services.rag_response_service import RAGResponseService
+
+        service = RAGResponseService()
+        service._async_client = _async_client([_chunk("Our "), _chunk("rates.")])
+        dual = {"success": True, "answer": "", "citations": [
+            {"content": "Rates", "score": 0.8, "source": "rates.pdf", "source_type": "private_kb"}
+        ]}
+
+        app.dependency_overrides[get_client_config] = lambda: mock_config
+        try:
+            with patch('src.api.helpdesk_routes.search_dual_knowledge_base', return_value=dual), \
+                    patch('src.api.helpdesk_routes.get_rag_service', return_value=service):
+                response = TestClient(app).post("/api/v1/helpdesk/ask/stream", json={"question": "Lodge rates 2025"})
+        finally:
+            app.dependency_overrides.pop(get_client_config, None)
+
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = _parse_sse(response.text)
+        assert [name for name, _ in events] == ["citations", "token", "token", "done"]
+        assert events[0][1]["method"] == "private_kb_synthesis"
+        assert events[-1][1]["answer"] == "Our rates."
+        assert "first_token_ms" in events[-1][1]["timing"]
+
+
+class TestStreamAnswerCache:
+    """Tests for the semantic answer cache in the streaming answer."""
+
+    async def test_cache_lookup_and_store_run_off_the_event_loop(self, mock_config):
+        """Answer cache get and put should run in a worker thread, not on the event loop."""
+        import threading
+        from src.api.helpdesk_routes import _stream_helpdesk_answer
+
+        threads = {}
+
+        def record(name):
+            def call(*args, **kwargs):
+                threads[name] = threading.get_ident()  # returns None: a cache miss
+            return call
+
+        cache = MagicMock()
+        cache.get.side_effect = record("get")
+        cache.put.side_effect = record("put")
+        dual = {"success": True, "answer": "Zuri has 55 rooms.", "confidence": 0.9, "citations": [
+            {"content": "55 rooms", "score": 0.9, "source": "zuri.pdf", "source_type": "global_kb"}
+        ]}
+
+        with patch('src.api.helpdesk_routes.get_answer_cache', return_value=cache), \
+                patch('src.api.helpdesk_routes.search_dual_knowledge_base', return_value=dual):
+            events = [event async for event in _stream_helpdesk_answer(mock_config, "How many rooms does Zuri have?")]
+
+        assert events[-1][1]["method"] == "dual_kb"
+        cache.put.assert_called_once()
+        assert threads["get"] != threading.get_ident()
+        assert threads["put"] != threading.get_ident()
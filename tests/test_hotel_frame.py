@@ -0,0 +1,119 @@
+"""
+Hotel Frame Unit Tests
+
+Tests for the columnar aggregated hotel search representation, vectorized
+currency conversion and the paged /hotels/search/aggregated route.
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+
+def _rate(price, currency="EUR", **extra):
+    return {"room_type": "Double", "meal_plan": "BB", "rate_per_night": price, "currency": currency, "source": "hotelbeds", **extra}
+
+
+PROFILES = [
+    {"hotel_id": "1", "name": "Zuri &amp; Spa", "star_rating": "5", "best_rate": _rate(300), "all_rates": [_rate(300), _rate(450)]},
+    {"hotel_id": "2", "name": "Hotel JP046300", "star_rating": "3", "best_rate": _rate(90), "all_rates": [_rate(90)]},
+    {"hotel_id": "3", "name": "Budget Inn", "star_rating": "3*", "total_price": 1200, "currency": "ZAR"},
+    {"hotel_id": "4", "name": "Sold Out Lodge", "star_rating": "4", "all_rates": []},
+    {"hotel_id": "5", "name": "Ocean View", "star_rating": "4", "best_rate": _rate(100, "USD"), "all_rates": [_rate(100, "USD")]},
+]
+
+
+@pytest.fixture
+def fixed_rates():
+    async def get_rate(self, from_currency, to_currency):
+        return {"EUR": 20.0, "USD": 18.0}[from_currency]
+
+    with patch('src.services.currency_service.CurrencyService.get_rate', get_rate):
+        yield
+
+
+class TestHotelFrame:
+    """Tests for parsing, filtering, conversion and materialization."""
+
+    def test_filters_unpriced_and_placeholder_hotels(self):
+        """Hotels without a price and Juniper placeholders should be dropped."""
+        from src.services.hotel_frame import HotelFrame
+
+        frame = HotelFrame.from_profiles(PROFILES).filter_priced()
+
+        assert [h["hotel_id"] for h in frame.to_hotels()] == ["1", "3", "5"]
+        assert frame.rate_offsets.tolist() == [0, 2, 3, 4]
+
+    def test_materialized_shape(self):
+        """Materialized hotels should carry options[] mirroring all_rates[]."""
+        from src.services.hotel_frame import HotelFrame
+
+        zuri, budget, _ = HotelFrame.from_profiles(PROFILES).filter_priced().to_hotels()
+
+        assert zuri["hotel_name"] == "Zuri & Spa"
+        assert zuri["stars"] == 5
+        assert zuri["cheapest_price"] == 300
+        assert [o["price_per_night"] for o in zuri["options"]] == [300, 450]
+        assert budget["all_rates"] == []
+        assert budget["options"][0]["price_total"] == 1200
+
+    async def test_convert_currency(self, fixed_rates):
+        """Foreign prices should get ZAR amounts with margin; ZAR prices stay as they are."""
+        from src.services.hotel_frame import HotelFrame
+
+        frame = HotelFrame.from_profiles(PROFILES).filter_priced()
+        await frame.convert_currency("ZAR", margin_pct=5.0)
+        zuri, budget, ocean = frame.to_hotels()
+
+        assert zuri["display_price_zar"] == 6300.0
+        assert zuri["exchange_rate"] == 20.0
+        assert zuri["best_rate"]["rate_per_night_zar"] == 6300.0
+        assert [r["rate_per_night_zar"] for r in zuri["all_rates"]] == [6300.0, 9450.0]
+        assert ocean["options"][0]["price_per_night_zar"] == 1890.0
+        assert "display_price_zar" not in budget
+
+    async def test_matches_per_hotel_conversion(self, fixed_rates):
+        """Vectorized conversion should give the same hotels as _apply_currency_conversion."""
+        from src.api.rates_routes import _apply_currency_conversion
+        from src.services.hotel_frame import HotelFrame
+
+        expected = await _apply_currency_conversion(HotelFrame.from_profiles(PROFILES).filter_priced().to_hotels())
+
+        frame = HotelFrame.from_profiles(PROFILES).filter_priced()
+        await frame.convert_currency()
+
+        assert frame.to_hotels() == expected
+
+    async def test_order(self, fixed_rates):
+        """Sorting by price should compare converted prices."""
+        from src.services.hotel_frame import HotelFrame
+
+        frame = HotelFrame.from_profiles(PROFILES).filter_priced()
+        await frame.convert_currency()
+
+        assert frame.order(None).tolist() == [0, 1, 2]
+        assert frame.order("price").tolist() == [1, 2, 0]
+        assert frame.order("stars").tolist() == [0, 2, 1]
+
+
+class TestAggregatedSearchRoute:
+    """Tests for paging on /hotels/search/aggregated."""
+
+    async def test_returns_requested_page(self, mock_config, fixed_rates):
+        """Only the requested page should be materialized, with the full count."""
+        from datetime import date
+        from src.api.rates_routes import search_hotels_aggregated
+        from src.services.hotel_frame import HotelFrame
+
+        frame = HotelFrame.from_profiles(PROFILES).filter_priced()
+        client = AsyncMock()
+        client.search_hotels_aggregated_frame.return_value = ({"success": True, "total_hotels": len(frame)}, frame)
+
+        with patch('src.api.rates_routes.get_travel_platform_rates_client', return_value=client):
+            result = await search_hotels_aggregated(
+                destination="zanzibar", check_in=date(2026, 3, 1), check_out=date(2026, 3, 5),
+                adults=2, children=0, sort_by="price", offset=0, limit=2, config=mock_config
+            )
+
+        assert result["total_hotels"] == 3
+        assert [h["hotel_id"] for h in result["hotels"]] == ["3", "5"]
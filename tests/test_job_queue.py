@@ -0,0 +1,211 @@
+"""
+Job Queue Unit Tests
+
+Tests for the durable background job queue: retries with backoff,
+checkpoints that survive retries, and recovery of unfinished jobs.
+"""
+
+import pytest
+
+
+@pytest.fixture
+def queue():
+    from src.services.job_queue import JobQueue, InMemoryJobStore
+
+    queue = JobQueue(store=InMemoryJobStore(), workers=2, retry_delay=0.01)
+    yield queue
+    queue.shutdown()
+
+
+def _wait_until_done(queue, job, timeout=5):
+    import time
+
+    deadline = time.monotonic() + timeout
+    while not job.done and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert job.done, f"Job still {job.status}"
+
+
+class TestJobQueue:
+    """Tests for running and retrying jobs."""
+
+    def test_job_completes_and_is_persisted(self, queue):
+        """A successful job should be completed with its result, in memory and in the store."""
+        from src.services.job_queue import job_handler
+
+        @job_handler("test.ok")
+        def run(job):
+            return {"echo": job.payload["value"]}
+
+        job = queue.enqueue("tenant_a", "test.ok", {"value": 42}, reference_id="QT-1")
+        _wait_until_done(queue, job)
+
+        assert job.status == "completed"
+        assert job.attempts == 1
+        assert job.state["result"] == {"echo": 42}
+        stored = queue.store.get("tenant_a", job.job_id)
+        assert stored.status == "completed"
+        assert [j.job_id for j in queue.list_jobs("tenant_a", "QT-1")] == [job.job_id]
+        assert queue.list_jobs("tenant_b", "QT-1") == []
+
+    def test_retry_until_success_keeps_checkpoints(self, queue):
+        """Failed attempts should be retried, and checkpointed steps not repeated."""
+        from src.services.job_queue import job_handler
+
+        calls = {"send": 0, "attempt": 0}
+
+        @job_handler("test.flaky")
+        def run(job):
+            calls["attempt"] += 1
+            if not job.state.get("sent"):
+                calls["send"] += 1
+                job.checkpoint(sent=True)
+            if calls["attempt"] < 3:
+                raise RuntimeError("downstream unavailable")
+
+        job = queue.enqueue("tenant_a", "test.flaky")
+        _wait_until_done(queue, job)
+
+        assert job.status == "completed"
+        assert job.attempts == 3
+        assert calls["send"] == 1
+        assert job.error is None
+
+    def test_failed_after_max_attempts(self, queue):
+        """A job that keeps failing should stop at max_attempts with its last error."""
+        from src.services.job_queue import job_handler
+
+        @job_handler("test.broken")
+        def run(job):
+            raise ValueError("bad payload")
+
+        job = queue.enqueue("tenant_a", "test.broken", max_attempts=2)
+        _wait_until_done(queue, job)
+
+        assert job.status == "failed"
+        assert job.attempts == 2
+        assert job.error == "bad payload"
+
+    def test_recover_requeues_pending_jobs(self, queue):
+        """Jobs left queued by a previous process should run after recover()."""
+        from src.services.job_queue import Job, JobQueue, job_handler
+
+        @job_handler("test.recovered")
+        def run(job):
+            return {"ok": True}
+
+        queue.store.save(Job(job_id="JOB-OLD", tenant_id="tenant_a", kind="test.recovered", status="running"))
+        queue.store.save(Job(job_id="JOB-DONE", tenant_id="tenant_a", kind="test.recovered", status="completed"))
+
+        fresh = JobQueue(store=queue.store, retry_delay=0.01)
+        try:
+            assert fresh.recover("tenant_a") == 1
+            assert fresh.recover("tenant_a") == 0  # once per process
+            job = fresh.get_job("JOB-OLD", "tenant_a")
+            _wait_until_done(fresh, job)
+            assert job.status == "completed"
+        finally:
+            fresh.shutdown()
+
+    def test_two_workers_recovering_run_job_once(self, queue):
+        """Workers recovering the same tenant should run each job only once."""
+        import threading
+        from src.services.job_queue import Job, JobQueue, job_handler
+
+        runs = []
+        release = threading.Event()
+
+        @job_handler("test.once")
+        def run(job):
+            runs.append(job.owner)
+            release.wait(1)
+
+        queue.store.save(Job(job_id="JOB-SHARED", tenant_id="tenant_a", kind="test.once", status="queued"))
+
+        workers = [JobQueue(store=queue.store, retry_delay=0.01) for _ in range(2)]
+        try:
+            for worker in workers:
+                worker.recover("tenant_a")
+            release.set()
+            for worker in workers:
+                job = worker._jobs.get("JOB-SHARED")
+                if job is not None:
+                    worker.wait([job], timeout=5)
+            assert len(runs) == 1
+            assert queue.store.get("tenant_a", "JOB-SHARED").status == "completed"
+        finally:
+            for worker in workers:
+                worker.shutdown()
+
+    def test_running_job_recovered_only_after_lease_expires(self, queue):
+        """A job running in another worker should be left alone until its lease runs out."""
+        import time
+        from datetime import datetime, timedelta
+        from src.services.job_queue import Job, JobQueue, job_handler
+
+        @job_handler("test.leased")
+        def run(job):
+            return {"ok": True}
+
+        lease_until = (datetime.utcnow() + timedelta(seconds=0.3)).isoformat()
+        queue.store.save(Job(job_id="JOB-LEASED", tenant_id="tenant_a", kind="test.leased",
+                             status="running", attempts=1, owner="other-worker", lease_until=lease_until))
+
+        fresh = JobQueue(store=queue.store, retry_delay=0.01)
+        try:
+            assert fresh.recover("tenant_a") == 1
+            time.sleep(0.1)
+            assert queue.store.get("tenant_a", "JOB-LEASED").owner == "other-worker"
+
+            job = fresh.get_job("JOB-LEASED", "tenant_a")
+            _wait_until_done(fresh, job)
+            assert job.status == "completed"
+            assert job.attempts == 2
+        finally:
+            fresh.shutdown()
+
+    def test_store_failure_does_not_stop_jobs(self):
+        """If the store is down, jobs should still run from memory."""
+        from unittest.mock import MagicMock
+        from src.services.job_queue import JobQueue, job_handler
+
+        @job_handler("test.no_store")
+        def run(job):
+            return {"ok": True}
+
+        store = MagicMock()
+        store.save.side_effect = ConnectionError("Supabase down")
+        queue = JobQueue(store=store, retry_delay=0.01)
+        try:
+            job = queue.enqueue("tenant_a", "test.no_store")
+            _wait_until_done(queue, job)
+            assert job.status == "completed"
+            assert queue.get_job(job.job_id, "tenant_a") is job
+            assert queue.get_job(job.job_id, "tenant_b") is None
+        finally:
+            queue.shutdown()
+
+
+class TestSupabaseJobStore:
+    """Tests for claiming jobs in Supabase."""
+
+    def test_claim_is_one_conditional_update(self):
+        """A claim should only update the row if the attempt count and status still allow it."""
+        from unittest.mock import MagicMock, patch
+        from src.services.job_queue import Job, SupabaseJobStore
+
+        client = MagicMock()
+        update = client.table.return_value.update.return_value
+        conditional = update.eq.return_value.eq.return_value.eq.return_value.or_.return_value
+        conditional.execute.return_value = MagicMock(data=[])
+        store = SupabaseJobStore()
+        job = Job(job_id="JOB-1", tenant_id="tenant_a", kind="test", status="running", attempts=2)
+
+        with patch.object(store, "_client", return_value=client), \
+                patch.object(store, "get", return_value=Job(job_id="JOB-1", tenant_id="tenant_a", kind="test")):
+            assert store.claim(job, expected_attempts=1) is False
+
+        update.eq.return_value.eq.return_value.eq.assert_called_once_with("attempts", 1)
+        condition = update.eq.return_value.eq.return_value.eq.return_value.or_.call_args[0][0]
+        assert "status.in.(queued,retrying)" in condition and "lease_until.lt." in condition
+        client.table.return_value.upsert.assert_not_called()
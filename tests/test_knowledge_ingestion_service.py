@@ -0,0 +1,238 @@
+"""
+Knowledge Ingestion Service Unit Tests
+
+Tests for the streaming chunker, the ingestion pipeline and job tracking.
+"""
+
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+
+class _RecordingManager:
+    """Minimal manager implementing the ingestion hooks"""
+
+    def __init__(self, source):
+        self.source = source
+        self.batches = []
+        self.finished = None
+        self.failed = None
+
+    def ingest_source(self, document_id):
+        return self.source
+
+    def ingest_chunks(self, source, chunks, start_index):
+        self.batches.append((start_index, list(chunks)))
+
+    def finish_ingest(self, source, text, chunks):
+        self.finished = (text, list(chunks))
+        return "DONE"
+
+    def fail_ingest(self, document_id, error):
+        self.failed = error
+
+
+@pytest.fixture
+def service():
+    """Ingestion service whose 'process pool' is a thread pool."""
+    from src.services.knowledge_ingestion_service import KnowledgeIngestionService
+
+    svc = KnowledgeIngestionService(workers=2, max_concurrent_jobs=2, pages_per_task=2)
+    pool = ThreadPoolExecutor(max_workers=2)
+    with patch.object(svc, "_get_process_pool", return_value=pool):
+        yield svc
+    svc.shutdown()
+    pool.shutdown()
+
+
+def _source(tmp_path, file_type="txt", text="hello world"):
+    from src.services.knowledge_ingestion_service import IngestSource
+
+    path = tmp_path / f"doc.{file_type}"
+    path.write_text(text)
+    return IngestSource(document_id="DOC-1", file_path=str(path), file_type=file_type, filename=path.name)
+
+
+class TestStreamingChunker:
+    """Tests for incremental chunking."""
+
+    @pytest.mark.parametrize("word_count", [0, 10, 500, 501, 950, 1400, 2345])
+    def test_matches_batch_chunker(self, word_count):
+        """Feeding text in pieces should give the same chunks as chunking it whole."""
+        from src.api.knowledge_routes import KnowledgeIndexManager
+        from src.services.knowledge_ingestion_service import StreamingChunker
+
+        words = [f"w{i}" for i in range(word_count)]
+        expected = KnowledgeIndexManager._chunk_text(None, " ".join(words))
+
+        chunker = StreamingChunker()
+        chunks = []
+        for start in range(0, word_count, 137):
+            chunks.extend(chunker.feed(" ".join(words[start:start + 137])))
+        chunks.extend(chunker.finish())
+
+        assert chunks == expected
+
+
+class TestIngestionPipeline:
+    """Tests for KnowledgeIngestionService.run / submit."""
+
+    def test_text_document_is_chunked_and_finished(self, service, tmp_path):
+        """A text document should stream chunks and then finish."""
+        manager = _RecordingManager(_source(tmp_path, text="zanzibar beach hotel"))
+
+        result = service.run(manager, "DOC-1", "tenant_a")
+
+        assert result == "DONE"
+        assert manager.batches == [(0, ["zanzibar beach hotel"])]
+        assert manager.finished == ("zanzibar beach hotel", ["zanzibar beach hotel"])
+
+    def test_pdf_pages_stream_in_order(self, service, tmp_path):
+        """Page ranges should be extracted in parallel but consumed in page order."""
+        manager = _RecordingManager(_source(tmp_path, file_type="pdf"))
+        pages = [" ".join(f"p{page}w{i}" for i in range(300)) for page in range(5)]
+
+        def fake_extract(file_path, file_type, start, end):
+            return pages[start:end]
+
+        with patch("src.services.knowledge_ingestion_service.count_pages", return_value=5), \
+                patch("src.services.knowledge_ingestion_service.extract_pages", side_effect=fake_extract):
+            job = service._new_job("DOC-1", "tenant_a", None)
+            service.run(manager, "DOC-1", "tenant_a", job=job)
+
+        chunks = manager.finished[1]
+        assert chunks[0].startswith("p0w0 ")
+        assert [start for start, _ in manager.batches] == sorted(start for start, _ in manager.batches)
+        assert sum(len(batch) for _, batch in manager.batches) == len(chunks)
+        assert job.status == "completed"
+        assert (job.pages_done, job.pages_total) == (5, 5)
+        assert job.chunks_indexed == len(chunks)
+
+    def test_empty_document_fails(self, service, tmp_path):
+        """A document without text should fail and be marked as such."""
+        manager = _RecordingManager(_source(tmp_path, text="   "))
+
+        with pytest.raises(ValueError):
+            service.run(manager, "DOC-1", "tenant_a")
+
+        assert manager.failed == "No content extracted from document"
+        assert manager.finished is None
+
+    def test_temp_source_is_removed(self, service, tmp_path):
+        """Sources flagged for cleanup should be deleted after the job."""
+        source = _source(tmp_path)
+        source.cleanup = True
+
+        service.run(_RecordingManager(source), "DOC-1", "tenant_a")
+
+        assert not (tmp_path / "doc.txt").exists()
+
+    def test_submit_runs_in_background(self, service, tmp_path):
+        """submit should return a job that completes in the background."""
+        manager = _RecordingManager(_source(tmp_path))
+
+        job = service.submit(manager, "DOC-1", "tenant_a", "doc.txt")
+        service.wait([job], timeout=5)
+
+        assert job.status == "completed"
+        assert job.to_dict()["progress"] == 1.0
+
+    def test_background_failure_is_recorded(self, service, tmp_path):
+        """A failing background job should be marked failed, not raise."""
+        manager = _RecordingManager(_source(tmp_path))
+        manager.ingest_source = MagicMock(side_effect=RuntimeError("download failed"))
+
+        job = service.submit(manager, "DOC-1", "tenant_a")
+        service.wait([job], timeout=5)
+
+        assert job.status == "failed"
+        assert job.error == "download failed"
+        assert manager.failed == "download failed"
+
+
+class TestJobRegistry:
+    """Tests for job lookup and retention."""
+
+    def test_jobs_are_tenant_scoped(self, service):
+        """Jobs should only be visible to their own tenant."""
+        job = service._new_job("DOC-1", "tenant_a", "a.pdf")
+
+        assert service.get_job(job.job_id, tenant_id="tenant_a") is job
+        assert service.get_job(job.job_id, tenant_id="tenant_b") is None
+        assert service.list_jobs("tenant_b") == []
+
+    def test_finished_jobs_are_evicted(self, service):
+        """Only MAX_TRACKED_JOBS jobs should be kept, dropping finished ones first."""
+        with patch("src.services.knowledge_ingestion_service.MAX_TRACKED_JOBS", 2):
+            first = service._new_job("DOC-1", "tenant_a", None)
+            first.status = "completed"
+            running = service._new_job("DOC-2", "tenant_a", None)
+            service._new_job("DOC-3", "tenant_a", None)
+
+        assert service.get_job(first.job_id) is None
+        assert service.get_job(running.job_id) is running
+
+
+def _filesystem_manager(tmp_path, doc_path):
+    from src.api.knowledge_routes import KnowledgeIndexManager
+
+    with patch.object(KnowledgeIndexManager, '__init__', return_value=None):
+        manager = KnowledgeIndexManager.__new__(KnowledgeIndexManager)
+    manager.client_id = "tenant_a"
+    manager.index_path = tmp_path / "index"
+    manager.metadata_file = tmp_path / "metadata.json"
+    manager.metadata = {"documents": {"DOC-1": {
+        "document_id": "DOC-1", "filename": "rates.txt", "category": "pricing", "tags": [],
+        "visibility": "private", "file_type": "txt", "file_size": 26, "file_path": str(doc_path),
+        "status": "pending", "chunk_count": 0, "uploaded_at": "2025-01-01T00:00:00",
+    }}}
+    return manager
+
+
+class TestFilesystemManagerIngestion:
+    """Tests for KnowledgeIndexManager's ingestion hooks."""
+
+    def test_index_document_streams_into_segment(self, service, tmp_path):
+        """index_document should write the segment and mark the document indexed."""
+        from src.services.knowledge_search_index import clear_search_index_cache
+
+        clear_search_index_cache()
+        doc_path = tmp_path / "rates.txt"
+        doc_path.write_text("zanzibar beach hotel rates")
+        manager = _filesystem_manager(tmp_path, doc_path)
+
+        with patch("src.api.knowledge_routes.get_ingestion_service", return_value=service):
+            doc = manager.index_document("DOC-1")
+
+        assert doc.status == "indexed"
+        assert doc.chunk_count == 1
+        results = manager.search("zanzibar", visibility="private", min_score=0.0)
+        assert [r["document_id"] for r in results] == ["DOC-1"]
+        clear_search_index_cache()
+
+    def test_failed_reindex_keeps_previous_version(self, service, tmp_path):
+        """A re-index failing after its first batch should leave the indexed version searchable."""
+        from fastapi import HTTPException
+        from src.services.knowledge_search_index import clear_search_index_cache
+
+        clear_search_index_cache()
+        doc_path = tmp_path / "rates.txt"
+        doc_path.write_text("zanzibar beach hotel rates")
+        manager = _filesystem_manager(tmp_path, doc_path)
+
+        def failing_pages(source, job):
+            yield [" ".join(f"mauritius{i}" for i in range(1200))]
+            raise RuntimeError("extractor crashed")
+
+        with patch("src.api.knowledge_routes.get_ingestion_service", return_value=service):
+            manager.index_document("DOC-1")
+            with patch.object(service, "_iter_pages", side_effect=failing_pages), \
+                    patch.object(manager, "ingest_chunks", wraps=manager.ingest_chunks) as ingest_chunks, \
+                    pytest.raises(HTTPException):
+                manager.index_document("DOC-1")
+
+        ingest_chunks.assert_called()
+        assert manager.metadata["documents"]["DOC-1"]["status"] == "error"
+        assert [r["document_id"] for r in manager.search("zanzibar", visibility="private", min_score=0.0)] == ["DOC-1"]
+        assert manager.search("mauritius5", visibility="private", min_score=0.0) == []
+        clear_search_index_cache()
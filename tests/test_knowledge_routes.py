@@ -377,7 +377,7 @@ class TestKnowledgeIndexManager:
             metadata = manager._load_metadata()
 
             assert "documents" in metadata
-            assert "chunks" in metadata
+            assert "chunks" not in metadata
             assert metadata["documents"] == {}
 
     def test_load_metadata_migrates_visibility(self, mock_config, tmp_path):
@@ -438,11 +438,10 @@ class TestKnowledgeIndexManager:
             manager.index_path.mkdir(parents=True, exist_ok=True)
             manager.metadata = {
                 "documents": {
-                    "DOC-001": {"status": "indexed", "visibility": "public"},
-                    "DOC-002": {"status": "pending", "visibility": "private"},
+                    "DOC-001": {"status": "indexed", "visibility": "public", "chunk_count": 2},
+                    "DOC-002": {"status": "pending", "visibility": "private", "chunk_count": 0},
                     "DOC-003": {"status": "error", "visibility": "public"},
                 },
-                "chunks": [{"id": 1}, {"id": 2}]
             }
 
             status = manager.get_status()
@@ -455,6 +454,36 @@ class TestKnowledgeIndexManager:
             assert status["private_documents"] == 1
             assert status["total_chunks"] == 2
 
+    def test_delete_document_does_not_reextract(self, mock_config, tmp_path):
+        """delete_document should drop one segment instead of rebuilding from files."""
+        from src.api.knowledge_routes import KnowledgeIndexManager
+        from src.services.knowledge_search_index import get_index_store, clear_search_index_cache
+
+        clear_search_index_cache()
+        with patch.object(KnowledgeIndexManager, '__init__', return_value=None):
+            manager = KnowledgeIndexManager.__new__(KnowledgeIndexManager)
+            manager.client_id = mock_config.client_id
+            manager.index_path = tmp_path / "index"
+            manager.metadata_file = tmp_path / "metadata.json"
+            manager.metadata = {
+                "documents": {
+                    "DOC-001": {"filename": "a.txt", "status": "indexed", "file_path": str(tmp_path / "a.txt")},
+                    "DOC-002": {"filename": "b.txt", "status": "indexed", "file_path": str(tmp_path / "b.txt")},
+                },
+            }
+            store = get_index_store(manager.index_path)
+            for doc_id, text in (("DOC-001", "hotel rates"), ("DOC-002", "hotel policy")):
+                store.write_segment(doc_id, [{"document_id": doc_id, "chunk_index": 0, "content": text,
+                                              "category": "general", "visibility": "public"}])
+
+            with patch.object(manager, '_extract_text') as mock_extract:
+                assert manager.delete_document("DOC-001") is True
+
+            mock_extract.assert_not_called()
+            results = manager.search("hotel", min_score=0.0)
+            assert [r["document_id"] for r in results] == ["DOC-002"]
+        clear_search_index_cache()
+
 
 # ==================== Dependency Tests ====================
 
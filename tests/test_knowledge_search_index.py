@@ -0,0 +1,290 @@
+"""
+Knowledge Search Index Unit Tests
+
+Tests for the inverted index behind KnowledgeIndexManager.search.
+"""
+
+import json
+import pytest
+
+
+def _chunk(doc_id, index, content, category="general", visibility="public"):
+    return {
+        "document_id": doc_id,
+        "chunk_index": index,
+        "content": content,
+        "content_normalized": content.lower(),
+        "category": category,
+        "visibility": visibility,
+    }
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    from src.services.knowledge_search_index import clear_search_index_cache
+    clear_search_index_cache()
+    yield
+    clear_search_index_cache()
+
+
+class TestKnowledgeSearchIndex:
+    """Tests for postings construction and scoring."""
+
+    def test_builds_term_and_bigram_postings(self):
+        """Postings should map terms and bigrams to chunk IDs."""
+        from src.services.knowledge_search_index import KnowledgeSearchIndex
+
+        index = KnowledgeSearchIndex.from_chunks([
+            _chunk("DOC-1", 0, "zanzibar beach hotel"),
+            _chunk("DOC-1", 1, "beach hotel beach"),
+        ])
+
+        assert index.postings["beach"] == [0, 1]
+        assert index.postings["zanzibar"] == [0]
+        assert index.bigram_postings["beach hotel"] == [0, 1]
+        assert index.document_frequency("beach") == 2
+        assert index.document_frequency("missing") == 0
+
+    def test_only_scores_chunks_sharing_a_term(self):
+        """Chunks with no query term should never be returned."""
+        from src.services.knowledge_search_index import KnowledgeSearchIndex
+
+        index = KnowledgeSearchIndex.from_chunks([
+            _chunk("DOC-1", 0, "apple banana cherry"),
+            _chunk("DOC-1", 1, "hotel booking policy"),
+        ])
+
+        hits = index.search("hotel booking", min_score=0.0)
+
+        assert [chunk["chunk_index"] for chunk, _, _ in hits] == [1]
+
+    def test_score_matches_linear_scan_formula(self):
+        """Scores should match the keyword/key-term/bigram/substring formula."""
+        from src.services.knowledge_search_index import KnowledgeSearchIndex
+
+        index = KnowledgeSearchIndex.from_chunks([_chunk("DOC-1", 0, "our hotel booking system is fast")])
+
+        chunk, score, details = index.search("hotel booking", min_score=0.0)[0]
+
+        # keyword 2/2 * 0.4 + key terms 2/2 * 0.3 + bigram 1/1 * 0.2 + 0.3 -> capped
+        assert score == 1.0
+        assert details == {"keywords": 2, "key_terms": 2, "phrases": 1}
+
+    def test_filters_category_and_visibility(self):
+        """Category and visibility filters should apply to candidates."""
+        from src.services.knowledge_search_index import KnowledgeSearchIndex
+
+        index = KnowledgeSearchIndex.from_chunks([
+            _chunk("DOC-1", 0, "hotel rates", category="hotels", visibility="public"),
+            _chunk("DOC-2", 0, "hotel margins", category="hotels", visibility="private"),
+            _chunk("DOC-3", 0, "hotel policy", category="policies", visibility="private"),
+        ])
+
+        hits = index.search("hotel", category="hotels", visibility="private", min_score=0.0)
+
+        assert [chunk["document_id"] for chunk, _, _ in hits] == ["DOC-2"]
+
+    def test_ties_keep_chunk_order(self):
+        """Equal scores should keep chunk order like the linear scan did."""
+        from src.services.knowledge_search_index import KnowledgeSearchIndex
+
+        index = KnowledgeSearchIndex.from_chunks([
+            _chunk("DOC-1", 0, "safari lodge"),
+            _chunk("DOC-2", 0, "safari lodge"),
+        ])
+
+        hits = index.search("safari", min_score=0.0)
+
+        assert [chunk["document_id"] for chunk, _, _ in hits] == ["DOC-1", "DOC-2"]
+
+    def test_empty_query_returns_nothing(self):
+        """A blank query should not match anything."""
+        from src.services.knowledge_search_index import KnowledgeSearchIndex
+
+        index = KnowledgeSearchIndex.from_chunks([_chunk("DOC-1", 0, "hotel")])
+
+        assert index.search("   ") == []
+
+    def test_remove_document_tombstones_chunks(self):
+        """Removed documents should disappear from results and document frequencies."""
+        from src.services.knowledge_search_index import KnowledgeSearchIndex
+
+        index = KnowledgeSearchIndex.from_chunks([
+            _chunk("DOC-1", 0, "safari lodge"),
+            _chunk("DOC-2", 0, "safari camp"),
+        ])
+
+        assert index.remove_document("DOC-1") == 1
+
+        hits = index.search("safari", min_score=0.0)
+        assert [chunk["document_id"] for chunk, _, _ in hits] == ["DOC-2"]
+        assert index.document_frequency("safari") == 1
+        assert index.tombstone_count == 1
+        assert len(index) == 1
+
+    def test_add_document_replaces_previous_version(self):
+        """Re-adding a document should tombstone its old chunks."""
+        from src.services.knowledge_search_index import KnowledgeSearchIndex
+
+        index = KnowledgeSearchIndex.from_chunks([_chunk("DOC-1", 0, "old rates")])
+        index.add_document("DOC-1", [_chunk("DOC-1", 0, "new rates")])
+
+        hits = index.search("rates", min_score=0.0)
+        assert [chunk["content"] for chunk, _, _ in hits] == ["new rates"]
+        assert index.search("old", min_score=0.0) == []
+
+    def test_compacted_drops_tombstones_and_keeps_results(self):
+        """Compaction should remove tombstoned chunks without changing results."""
+        from src.services.knowledge_search_index import KnowledgeSearchIndex
+
+        index = KnowledgeSearchIndex.from_chunks([
+            _chunk("DOC-1", 0, "beach hotel"),
+            _chunk("DOC-2", 0, "beach villa"),
+            _chunk("DOC-3", 0, "beach lodge"),
+        ])
+        index.remove_document("DOC-2")
+
+        compacted = index.compacted()
+
+        assert compacted.tombstone_count == 0
+        assert len(compacted.chunks) == 2
+        assert compacted.postings["beach"] == [0, 1]
+        assert compacted.doc_chunks == {"DOC-1": [0], "DOC-3": [1]}
+        assert [c["document_id"] for c, _, _ in compacted.search("beach", min_score=0.0)] == ["DOC-1", "DOC-3"]
+
+
+class TestKnowledgeIndexStore:
+    """Tests for segment files, lazy loading and compaction."""
+
+    def test_returns_none_without_segments(self, tmp_path):
+        """Nothing indexed means no index."""
+        from src.services.knowledge_search_index import get_search_index
+
+        assert get_search_index(tmp_path) is None
+
+    def test_write_segment_is_searchable(self, tmp_path):
+        """A written segment should be searchable and reuse the loaded index."""
+        from src.services.knowledge_search_index import get_index_store, get_search_index
+
+        get_index_store(tmp_path).write_segment("DOC-1", [_chunk("DOC-1", 0, "hotel")])
+
+        first = get_search_index(tmp_path)
+        second = get_search_index(tmp_path)
+
+        assert first is second
+        assert (tmp_path / "segments" / "DOC-1.jsonl").exists()
+        assert len(first.search("hotel")) == 1
+
+    def test_incremental_write_and_delete_on_loaded_index(self, tmp_path):
+        """Writes and deletes should apply to the loaded index without a rebuild."""
+        from unittest.mock import patch
+        from src.services.knowledge_search_index import KnowledgeSearchIndex, get_index_store
+
+        store = get_index_store(tmp_path)
+        store.write_segment("DOC-1", [_chunk("DOC-1", 0, "hotel rates")])
+        store.get_index()
+
+        with patch.object(KnowledgeSearchIndex, "__init__", side_effect=AssertionError("rebuilt")):
+            store.write_segment("DOC-2", [_chunk("DOC-2", 0, "hotel policy")])
+            assert store.delete_segment("DOC-1") == 1
+
+        index = store.get_index()
+        assert [c["document_id"] for c, _, _ in index.search("hotel", min_score=0.0)] == ["DOC-2"]
+        assert not (tmp_path / "segments" / "DOC-1.jsonl").exists()
+
+    def test_picks_up_segments_written_by_another_worker(self, tmp_path):
+        """A second store on the same directory should sync on the next search."""
+        from src.services.knowledge_search_index import KnowledgeIndexStore
+
+        reader = KnowledgeIndexStore(tmp_path)
+        writer = KnowledgeIndexStore(tmp_path)
+
+        writer.write_segment("DOC-1", [_chunk("DOC-1", 0, "hotel")])
+        assert len(reader.get_index()) == 1
+
+        writer.write_segment("DOC-2", [_chunk("DOC-2", 0, "lodge")])
+        writer.delete_segment("DOC-1")
+        index = reader.get_index()
+
+        assert index.search("hotel") == []
+        assert len(index.search("lodge")) == 1
+
+    def test_compact_writes_snapshot_used_after_restart(self, tmp_path):
+        """A restarted worker should load the snapshot instead of re-tokenizing."""
+        from unittest.mock import patch
+        from src.services.knowledge_search_index import KnowledgeIndexStore
+
+        store = KnowledgeIndexStore(tmp_path)
+        store.write_segment("DOC-1", [_chunk("DOC-1", 0, "hotel booking")])
+        store.write_segment("DOC-2", [_chunk("DOC-2", 0, "lodge")])
+        store.get_index()
+        store.delete_segment("DOC-2")
+        store.compact()
+
+        assert (tmp_path / "snapshot.json").exists()
+
+        with patch("src.services.knowledge_search_index._chunk_terms") as mock_terms:
+            index = KnowledgeIndexStore(tmp_path).get_index()
+
+        mock_terms.assert_not_called()
+        assert index.postings["hotel"] == [0]
+        assert "lodge" not in index.postings
+
+    def test_tombstones_trigger_background_compaction(self, tmp_path):
+        """Crossing the tombstone ratio should compact on a background thread."""
+        from unittest.mock import patch
+        from src.services.knowledge_search_index import KnowledgeIndexStore
+
+        store = KnowledgeIndexStore(tmp_path)
+        store.write_segment("DOC-1", [_chunk("DOC-1", 0, "hotel")])
+        store.write_segment("DOC-2", [_chunk("DOC-2", 0, "lodge")])
+        store.get_index()
+
+        with patch("src.services.knowledge_search_index.threading.Thread") as mock_thread:
+            store.delete_segment("DOC-1")
+
+        assert mock_thread.call_args.kwargs["target"] == store.compact
+        mock_thread.return_value.start.assert_called_once()
+
+    def test_migrates_legacy_chunks_file(self, tmp_path):
+        """A pre-segment chunks.json should be split into per-document segments."""
+        from src.services.knowledge_search_index import get_search_index
+
+        (tmp_path / "chunks.json").write_text(json.dumps([
+            _chunk("DOC-1", 0, "hotel"),
+            _chunk("DOC-1", 1, "rates"),
+            _chunk("DOC-2", 0, "lodge"),
+        ]))
+
+        index = get_search_index(tmp_path)
+
+        assert not (tmp_path / "chunks.json").exists()
+        assert sorted(p.name for p in (tmp_path / "segments").iterdir()) == ["DOC-1.jsonl", "DOC-2.jsonl"]
+        assert len(index) == 3
+
+    def test_append_segment_extends_document(self, tmp_path):
+        """Appended batches should be searchable without tombstoning earlier ones."""
+        from src.services.knowledge_search_index import KnowledgeIndexStore
+
+        store = KnowledgeIndexStore(tmp_path)
+        store.append_segment("DOC-1", [_chunk("DOC-1", 0, "hotel rates")], replace=True)
+        store.get_index()
+        store.append_segment("DOC-1", [_chunk("DOC-1", 1, "hotel policy")])
+
+        index = store.get_index()
+        assert [c["chunk_index"] for c, _, _ in index.search("hotel", min_score=0.0)] == [0, 1]
+        assert index.tombstone_count == 0
+        assert len(KnowledgeIndexStore(tmp_path).get_index()) == 2
+
+    def test_migrates_json_array_segments(self, tmp_path):
+        """Segments written as JSON arrays should be rewritten as JSON Lines."""
+        from src.services.knowledge_search_index import get_search_index
+
+        segments = tmp_path / "segments"
+        segments.mkdir()
+        (segments / "DOC-1.json").write_text(json.dumps([_chunk("DOC-1", 0, "hotel")]))
+
+        index = get_search_index(tmp_path)
+
+        assert [p.name for p in segments.iterdir()] == ["DOC-1.jsonl"]
+        assert len(index.search("hotel")) == 1
@@ -0,0 +1,170 @@
+"""
+Knowledge Sparse Scorer Unit Tests
+
+Tests for the vectorized heuristic and BM25 scorers behind KnowledgeSearchIndex.
+"""
+
+import random
+import pytest
+from unittest.mock import patch
+
+pytest.importorskip("scipy")
+
+
+def _chunk(doc_id, index, content, category="general", visibility="public"):
+    return {
+        "document_id": doc_id,
+        "chunk_index": index,
+        "content": content,
+        "content_normalized": content.lower(),
+        "category": category,
+        "visibility": visibility,
+    }
+
+
+def _corpus(seed=7, size=300):
+    rng = random.Random(seed)
+    vocab = ["hotel", "beach", "safari", "lodge", "rates", "zanzibar", "policy", "booking",
+             "transfer", "villa", "the", "with", "from", "cancellation", "deposit", "hotels"]
+    chunks = []
+    for i in range(size):
+        words = [rng.choice(vocab) for _ in range(rng.randint(3, 40))]
+        chunks.append(_chunk(f"DOC-{i // 3}", i % 3, " ".join(words),
+                             category=rng.choice(["pricing", "policies"]),
+                             visibility=rng.choice(["public", "private"])))
+    return chunks
+
+
+class TestHeuristicScorer:
+    """The vectorized heuristic must match the postings scorer."""
+
+    @pytest.mark.parametrize("query", [
+        "hotel", "beach hotel", "zanzibar beach hotel rates", "the with from",
+        "cancellation policy deposit", "hotels", "unknownword", "safari lodge safari",
+    ])
+    def test_matches_postings_scorer(self, query):
+        """Scores, order and match details should equal the postings scorer."""
+        from src.services.knowledge_search_index import KnowledgeSearchIndex
+
+        index = KnowledgeSearchIndex.from_chunks(_corpus())
+        index.remove_document("DOC-4")
+
+        expected = index._search_postings(query, None, None, 0.05)
+        actual = index.search(query, scorer="heuristic")
+
+        assert [(c["document_id"], c["chunk_index"]) for c, _, _ in actual] == \
+            [(c["document_id"], c["chunk_index"]) for c, _, _ in expected]
+        assert [s for _, s, _ in actual] == [s for _, s, _ in expected]
+        assert [d for _, _, d in actual] == [d for _, _, d in expected]
+
+    def test_top_k_matches_prefix_of_full_ranking(self):
+        """top_k should return exactly the first k of the full ranking."""
+        from src.services.knowledge_search_index import KnowledgeSearchIndex
+
+        index = KnowledgeSearchIndex.from_chunks(_corpus())
+
+        full = index.search("beach hotel rates", min_score=0.0)
+        top = index.search("beach hotel rates", min_score=0.0, top_k=5)
+
+        assert [c for c, _, _ in top] == [c for c, _, _ in full[:5]]
+
+    def test_filters_use_masks(self):
+        """Category and visibility filters should match the postings scorer."""
+        from src.services.knowledge_search_index import KnowledgeSearchIndex
+
+        index = KnowledgeSearchIndex.from_chunks(_corpus())
+
+        actual = index.search("hotel", category="pricing", visibility="private", min_score=0.0)
+        expected = index._search_postings("hotel", "pricing", "private", 0.0)
+
+        assert [c for c, _, _ in actual] == [c for c, _, _ in expected]
+        assert all(c["category"] == "pricing" and c["visibility"] == "private" for c, _, _ in actual)
+        assert index.search("hotel", category="missing") == []
+
+    def test_follows_adds_and_removes(self):
+        """Chunks added or removed after the first search should be reflected."""
+        from src.services.knowledge_search_index import KnowledgeSearchIndex
+
+        index = KnowledgeSearchIndex.from_chunks([_chunk("DOC-1", 0, "safari lodge")])
+        assert len(index.search("safari")) == 1
+
+        index.add_document("DOC-2", [_chunk("DOC-2", 0, "safari camp")])
+        index.remove_document("DOC-1")
+
+        assert [c["document_id"] for c, _, _ in index.search("safari")] == ["DOC-2"]
+
+    def test_many_appends_merge_blocks(self):
+        """Blocks should be merged once there are too many of them."""
+        from src.services.knowledge_search_index import KnowledgeSearchIndex
+        from src.services.knowledge_sparse_scorer import MAX_BLOCKS
+
+        index = KnowledgeSearchIndex()
+        for i in range(MAX_BLOCKS + 2):
+            index.add_document(f"DOC-{i}", [_chunk(f"DOC-{i}", 0, f"lodge term{i}")])
+            index.search("lodge")
+
+        assert len(index.sparse_matrix().blocks) <= MAX_BLOCKS
+        assert len(index.search("lodge")) == MAX_BLOCKS + 2
+        assert len(index.search("term3")) == 1
+
+    def test_compaction_carries_matrix(self):
+        """A compacted index should reuse the matrix rows instead of re-tokenizing."""
+        from src.services.knowledge_search_index import KnowledgeSearchIndex
+
+        index = KnowledgeSearchIndex.from_chunks(_corpus(size=30))
+        before = index.search("beach hotel")
+        index.remove_document("DOC-0")
+
+        with patch("src.services.knowledge_sparse_scorer.Counter", side_effect=AssertionError("rebuilt")):
+            compacted = index.compacted()
+            after = compacted.search("beach hotel")
+
+        assert [c for c, _, _ in after] == [c for c, _, _ in before if c["document_id"] != "DOC-0"]
+
+
+class TestBM25Scorer:
+    """Tests for BM25 ranking."""
+
+    def test_rare_terms_outrank_common_terms(self):
+        """A chunk matching the rarer query term should rank first."""
+        from src.services.knowledge_search_index import KnowledgeSearchIndex
+
+        chunks = [_chunk(f"DOC-{i}", 0, "hotel booking") for i in range(10)]
+        chunks.append(_chunk("DOC-Z", 0, "zanzibar villa"))
+        index = KnowledgeSearchIndex.from_chunks(chunks)
+
+        hits = index.search("zanzibar hotel", scorer="bm25", min_score=0.0)
+
+        assert hits[0][0]["document_id"] == "DOC-Z"
+        assert all(0.0 < score <= 1.0 for _, score, _ in hits)
+        assert "bm25" in hits[0][2]
+
+    def test_term_frequency_saturates(self):
+        """Repeating a term should help, with diminishing returns."""
+        from src.services.knowledge_search_index import KnowledgeSearchIndex
+
+        index = KnowledgeSearchIndex.from_chunks([
+            _chunk("DOC-1", 0, "safari lodge camp"),
+            _chunk("DOC-2", 0, "safari safari lodge"),
+            _chunk("DOC-3", 0, "beach villa pool"),
+        ])
+
+        hits = {c["document_id"]: d["bm25"] for c, _, d in index.search("safari", scorer="bm25", min_score=0.0)}
+
+        assert hits["DOC-2"] > hits["DOC-1"]
+        assert hits["DOC-2"] < 2 * hits["DOC-1"]
+
+
+class TestFallback:
+    """Tests for running without numpy/scipy."""
+
+    def test_postings_scorer_used_without_scipy(self):
+        """Without scipy the index should score from postings and ignore bm25."""
+        from src.services.knowledge_search_index import KnowledgeSearchIndex
+
+        index = KnowledgeSearchIndex.from_chunks([_chunk("DOC-1", 0, "hotel rates")])
+
+        with patch("src.services.knowledge_sparse_scorer.SPARSE_SCORING_AVAILABLE", False):
+            hits = index.search("hotel", scorer="bm25", top_k=1)
+
+        assert hits[0][2] == {"keywords": 1, "key_terms": 1, "phrases": 0}
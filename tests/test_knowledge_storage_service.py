@@ -0,0 +1,134 @@
+"""
+Knowledge Storage Service Unit Tests
+
+Tests for SupabaseKnowledgeManager search modes and chunk row indexing.
+"""
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+
+@pytest.fixture
+def manager():
+    """SupabaseKnowledgeManager with a mocked Supabase client."""
+    from src.services.knowledge_storage_service import SupabaseKnowledgeManager
+
+    config = MagicMock()
+    config.client_id = "test_tenant"
+
+    with patch.object(SupabaseKnowledgeManager, "_get_supabase_client", return_value=MagicMock()):
+        mgr = SupabaseKnowledgeManager(config)
+    mgr._fts_available = True
+    return mgr
+
+
+class TestPostgresSearch:
+    """Tests for the search_knowledge_chunks RPC path."""
+
+    def test_search_calls_rpc_with_filters(self, manager):
+        """search should pass tenant, query and filters to the RPC."""
+        manager.client.rpc.return_value.execute.return_value = MagicMock(data=[
+            {"document_id": "DOC-1", "chunk_index": 2, "content": "Zanzibar rates",
+             "filename": "rates.pdf", "category": "pricing", "visibility": "private",
+             "score": 0.8333, "rank": 0.12},
+        ])
+
+        results = manager.search("zanzibar rates", top_k=3, visibility="private", min_score=0.05)
+
+        manager.client.rpc.assert_called_once_with("search_knowledge_chunks", {
+            "p_tenant_id": "test_tenant",
+            "p_query": "zanzibar rates",
+            "p_top_k": 3,
+            "p_category": None,
+            "p_visibility": "private",
+            "p_min_score": 0.05,
+        })
+        assert results == [{
+            "content": "Zanzibar rates",
+            "source": "rates.pdf",
+            "score": 0.833,
+            "document_id": "DOC-1",
+            "chunk_index": 2,
+            "visibility": "private",
+            "category": "pricing",
+        }]
+        manager.client.table.assert_not_called()
+
+    def test_missing_rpc_disables_postgres_mode(self, manager):
+        """PGRST202 should switch the manager to the python fallback for good."""
+        manager.client.rpc.return_value.execute.side_effect = Exception(
+            "{'code': 'PGRST202', 'message': 'Could not find the function'}"
+        )
+
+        with patch.object(manager, "_search_python", return_value=[]) as mock_python:
+            manager.search("hotel")
+            manager.search("hotel")
+
+        assert manager._fts_available is False
+        assert manager.client.rpc.call_count == 1
+        assert mock_python.call_count == 2
+
+    def test_transient_rpc_error_falls_back_once(self, manager):
+        """Other RPC errors should fall back without disabling postgres mode."""
+        manager.client.rpc.return_value.execute.side_effect = Exception("timeout")
+
+        with patch.object(manager, "_search_python", return_value=[]) as mock_python:
+            manager.search("hotel")
+
+        assert manager._fts_available is True
+        mock_python.assert_called_once()
+
+    def test_python_mode_skips_rpc(self, manager):
+        """With postgres mode off, search should only use the python scan."""
+        manager._fts_available = False
+
+        with patch.object(manager, "_search_python", return_value=[]) as mock_python:
+            manager.search("hotel")
+
+        manager.client.rpc.assert_not_called()
+        mock_python.assert_called_once()
+
+
+class TestChunkRows:
+    """Tests for writing knowledge_chunks rows at index time."""
+
+    def _source(self, **metadata):
+        from src.services.knowledge_ingestion_service import IngestSource
+        return IngestSource(document_id="DOC-1", file_path="/tmp/doc.txt", file_type="txt",
+                            filename="doc.txt", metadata=metadata)
+
+    def test_first_batch_deletes_then_inserts(self, manager):
+        """Existing rows should be deleted before the first batch is inserted."""
+        manager.ingest_chunks(self._source(category="pricing", visibility="private"),
+                              ["first chunk", "second chunk"], 0)
+
+        table = manager.client.table.return_value
+        table.delete.return_value.eq.assert_called_with("document_id", "DOC-1")
+        inserted = table.insert.call_args[0][0]
+        assert [r["chunk_index"] for r in inserted] == [0, 1]
+        assert all(r["tenant_id"] == "test_tenant" for r in inserted)
+        assert all(r["visibility"] == "private" for r in inserted)
+
+    def test_later_batches_append_with_offset(self, manager):
+        """Later batches should keep existing rows and continue the chunk numbering."""
+        manager.ingest_chunks(self._source(), ["third chunk"], 2)
+
+        table = manager.client.table.return_value
+        table.delete.assert_not_called()
+        assert [r["chunk_index"] for r in table.insert.call_args[0][0]] == [2]
+
+    def test_large_batches_are_split(self, manager):
+        """Large batches should be inserted in CHUNK_INSERT_BATCH_SIZE pieces."""
+        from src.services.knowledge_storage_service import CHUNK_INSERT_BATCH_SIZE
+
+        chunks = [f"chunk {i}" for i in range(CHUNK_INSERT_BATCH_SIZE + 1)]
+
+        manager.ingest_chunks(self._source(), chunks, 0)
+
+        assert manager.client.table.return_value.insert.call_count == 2
+
+    def test_chunk_row_errors_are_swallowed(self, manager):
+        """A missing knowledge_chunks table must not fail indexing."""
+        manager.client.table.side_effect = Exception("relation does not exist")
+
+        manager.ingest_chunks(self._source(), ["chunk"], 0)
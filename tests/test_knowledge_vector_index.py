@@ -0,0 +1,298 @@
+"""
+Knowledge Vector Index Unit Tests
+
+Tests for the memory-mapped vector index, the manager's dense search hooks
+and hybrid fusion in UnifiedRAGService.
+"""
+
+import zlib
+import pytest
+from unittest.mock import patch
+
+np = pytest.importorskip("numpy")
+
+
+class _HashingEmbedder:
+    """Deterministic bag-of-words embedder standing in for a local model"""
+
+    name = "test-hashing"
+
+    def __init__(self, dim=64):
+        self.dim = dim
+
+    def available(self):
+        return True
+
+    def embed(self, texts):
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                vectors[row, zlib.crc32(word.encode()) % self.dim] += 1.0
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+
+def _records(doc_id, texts, category="general", visibility="public", start=0):
+    return [
+        {"document_id": doc_id, "chunk_index": start + i, "content": text,
+         "category": category, "visibility": visibility}
+        for i, text in enumerate(texts)
+    ]
+
+
+def _add(index, doc_id, texts, replace=False, embedder=None, **kwargs):
+    embedder = embedder or _HashingEmbedder()
+    records = _records(doc_id, texts, **kwargs)
+    index.add_document(doc_id, records, embedder.embed(texts), embedder.name, replace=replace)
+
+
+def _query(index, text, **kwargs):
+    return [(row["document_id"], row["chunk_index"])
+            for row, _ in index.search(_HashingEmbedder().embed([text])[0], **kwargs)]
+
+
+class TestKnowledgeVectorIndex:
+    """Tests for adds, deletes, filters and persistence."""
+
+    def test_nearest_chunk_ranks_first(self, tmp_path):
+        """The chunk sharing the query's words should be the top hit."""
+        from src.services.knowledge_vector_index import KnowledgeVectorIndex
+
+        index = KnowledgeVectorIndex(tmp_path)
+        _add(index, "DOC-1", ["zanzibar beach villa", "safari lodge rates"])
+        _add(index, "DOC-2", ["cancellation policy deposit"])
+
+        assert _query(index, "safari lodge", top_k=1) == [("DOC-1", 1)]
+        assert len(index) == 3
+
+    def test_replace_and_delete_are_incremental(self, tmp_path):
+        """Re-indexing should replace a document's vectors and deletes should drop them."""
+        from src.services.knowledge_vector_index import KnowledgeVectorIndex
+
+        index = KnowledgeVectorIndex(tmp_path)
+        _add(index, "DOC-1", ["safari lodge"])
+        _add(index, "DOC-1", ["beach villa"], replace=True)
+
+        assert _query(index, "safari lodge", min_score=0.5) == []
+        assert _query(index, "beach villa", top_k=1) == [("DOC-1", 0)]
+
+        assert index.delete_document("DOC-1") == 1
+        assert _query(index, "beach villa") == []
+        assert index.delete_document("DOC-1") == 0
+
+    def test_filters(self, tmp_path):
+        """Category and visibility filters should restrict the candidates."""
+        from src.services.knowledge_vector_index import KnowledgeVectorIndex
+
+        index = KnowledgeVectorIndex(tmp_path)
+        _add(index, "DOC-1", ["hotel rates"], category="pricing", visibility="private")
+        _add(index, "DOC-2", ["hotel rates"], category="policies", visibility="public")
+
+        assert _query(index, "hotel rates", category="pricing") == [("DOC-1", 0)]
+        assert _query(index, "hotel rates", visibility="public") == [("DOC-2", 0)]
+
+    def test_other_workers_see_appends(self, tmp_path):
+        """A second index on the same directory should pick up new rows and deletes."""
+        from src.services.knowledge_vector_index import KnowledgeVectorIndex
+
+        writer = KnowledgeVectorIndex(tmp_path)
+        reader = KnowledgeVectorIndex(tmp_path)
+        _add(writer, "DOC-1", ["safari lodge"])
+        assert _query(reader, "safari lodge") == [("DOC-1", 0)]
+
+        _add(writer, "DOC-2", ["beach villa"])
+        writer.delete_document("DOC-1")
+
+        assert _query(reader, "beach villa", top_k=1) == [("DOC-2", 0)]
+        assert len(reader) == 1
+
+    def test_compaction_starts_new_generation(self, tmp_path):
+        """Enough tombstones should rewrite the live rows into a new generation."""
+        from src.services.knowledge_vector_index import KnowledgeVectorIndex
+
+        index = KnowledgeVectorIndex(tmp_path)
+        with patch("src.services.knowledge_vector_index.COMPACTION_MIN_DEAD", 2):
+            _add(index, "DOC-1", ["safari lodge", "safari camp"])
+            _add(index, "DOC-2", ["beach villa"])
+            index.delete_document("DOC-1")
+
+        assert index.generation == 2
+        assert not (tmp_path / "vectors.1.f32").exists()
+        assert index.get_status()["tombstones"] == 0
+        assert _query(index, "beach villa") == [("DOC-2", 0)]
+
+    def test_model_change_resets_index(self, tmp_path):
+        """Vectors from a different embedding model should not be mixed."""
+        from src.services.knowledge_vector_index import KnowledgeVectorIndex
+
+        index = KnowledgeVectorIndex(tmp_path)
+        _add(index, "DOC-1", ["safari lodge"])
+
+        other = _HashingEmbedder(dim=32)
+        other.name = "other-model"
+        _add(index, "DOC-2", ["beach villa"], embedder=other)
+
+        assert index.get_status()["model"] == "other-model"
+        assert len(index) == 1
+
+
+class TestIVF:
+    """Tests for the IVF coarse quantizer."""
+
+    def test_ivf_search_matches_exact_search(self, tmp_path):
+        """Once trained, IVF search should still find near-duplicate chunks."""
+        from src.services.knowledge_vector_index import KnowledgeVectorIndex
+
+        rng = np.random.default_rng(3)
+        vectors = rng.normal(size=(600, 16)).astype(np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        records = _records("DOC-1", [""] * 600)
+
+        with patch("src.services.knowledge_vector_index.IVF_MIN_VECTORS", 400), \
+                patch("src.services.knowledge_vector_index.IVF_NPROBE", 6):
+            index = KnowledgeVectorIndex(tmp_path)
+            index.add_document("DOC-1", records, vectors, "random")
+
+            assert index.get_status()["ivf_lists"] == 24
+            hits = [index.search(vectors[i] + 0.01, top_k=1)[0][0]["chunk_index"] for i in range(0, 600, 37)]
+
+            reader = KnowledgeVectorIndex(tmp_path)
+            assert reader.get_status()["ivf_lists"] == 24
+
+        assert hits == list(range(0, 600, 37))
+
+
+class TestDenseSearchHooks:
+    """Tests for KnowledgeIndexManager.vector_search and hybrid fusion."""
+
+    @pytest.fixture
+    def manager(self, tmp_path):
+        from src.api.knowledge_routes import KnowledgeIndexManager
+        from src.services.knowledge_ingestion_service import IngestSource
+        from src.services.knowledge_search_index import clear_search_index_cache
+        from src.services.knowledge_vector_index import clear_vector_index_cache, set_embedder
+
+        clear_search_index_cache()
+        clear_vector_index_cache()
+        set_embedder(_HashingEmbedder())
+
+        with patch.object(KnowledgeIndexManager, '__init__', return_value=None):
+            manager = KnowledgeIndexManager.__new__(KnowledgeIndexManager)
+        manager.client_id = "tenant_a"
+        manager.index_path = tmp_path / "index"
+        manager.metadata_file = tmp_path / "metadata.json"
+        manager.metadata = {"documents": {"DOC-1": {
+            "document_id": "DOC-1", "filename": "rates.txt", "category": "pricing", "tags": [],
+            "visibility": "public", "file_type": "txt", "file_size": 48, "file_path": "",
+            "status": "pending", "chunk_count": 0, "uploaded_at": "2025-01-01T00:00:00",
+        }}}
+
+        source = IngestSource(document_id="DOC-1", file_path="", file_type="txt",
+                              filename="rates.txt", metadata=manager.metadata["documents"]["DOC-1"])
+        chunks = ["zanzibar beach villa rates", "safari lodge transfers"]
+        manager.ingest_chunks(source, chunks, 0)
+        manager.finish_ingest(source, "", chunks)
+
+        yield manager
+
+        set_embedder(None)
+        clear_search_index_cache()
+        clear_vector_index_cache()
+
+    def test_ingested_chunks_are_embedded(self, manager):
+        """Chunks streamed in by the ingestion pipeline should be vector-searchable."""
+        results = manager.vector_search("safari lodge", top_k=1)
+
+        assert [(r["document_id"], r["chunk_index"]) for r in results] == [("DOC-1", 1)]
+        assert results[0]["content"] == "safari lodge transfers"
+        assert "vector" in results[0]["match_details"]
+
+    def test_deleted_document_is_not_returned(self, manager, tmp_path):
+        """Deleting a document should remove it from vector search."""
+        manager.metadata["documents"]["DOC-1"]["file_path"] = str(tmp_path / "missing.txt")
+        manager.metadata_file = tmp_path / "metadata.json"
+
+        manager.delete_document("DOC-1")
+
+        assert manager.vector_search("safari lodge") == []
+
+    def test_disabled_without_embedder(self, manager):
+        """Without an embedder vector search should return nothing."""
+        with patch("src.api.knowledge_routes.get_embedder", return_value=None):
+            assert manager.vector_search("safari lodge") == []
+
+    @pytest.mark.asyncio
+    async def test_unified_search_fuses_keyword_and_vector_hits(self, manager):
+        """A chunk found by both searches should outrank one found by a single search."""
+        from src.services.unified_rag_service import LocalKnowledgeService, UnifiedRAGService
+
+        service = UnifiedRAGService(local_service=LocalKnowledgeService(manager), global_client=object())
+        results = await service._search_local("safari lodge", top_k=5)
+
+        assert results[0].chunk_id == "1"
+        assert results[0].metadata["keyword_score"] > 0
+        assert results[0].metadata["vector_score"] > 0
+
+
+class TestFuseHybridResults:
+    """Tests for fuse_hybrid_results."""
+
+    def _result(self, chunk_id, score):
+        from src.services.unified_rag_service import RetrievalResult
+        return RetrievalResult(content=chunk_id, score=score, source="local", doc_id="DOC-1", chunk_id=chunk_id)
+
+    def test_weighted_sum_of_max_normalized_scores(self):
+        """Each side should be max-normalized, weighted and scaled by the best raw score."""
+        from src.services.unified_rag_service import fuse_hybrid_results
+
+        fused = fuse_hybrid_results(
+            [self._result("0", 0.8), self._result("1", 0.4)],
+            [self._result("1", 0.9), self._result("2", 0.6)],
+            top_k=3,
+            vector_weight=0.5
+        )
+
+        # Neither side returned a full top_k, so a missing side counts 0
+        assert [(r.chunk_id, r.score) for r in fused] == [("1", 0.675), ("0", 0.45), ("2", 0.3)]
+
+    def test_side_cut_off_at_top_k_counts_its_lowest_hit(self):
+        """A chunk below a full side's cut-off should score as that side's lowest hit, not 0."""
+        from src.services.unified_rag_service import fuse_hybrid_results
+
+        fused = fuse_hybrid_results(
+            [self._result("0", 0.9), self._result("1", 0.5)],
+            [self._result("2", 0.7), self._result("1", 0.6)],
+            top_k=2,
+            vector_weight=0.5
+        )
+
+        assert fused[0].chunk_id == "0"
+        assert fused[0].score == round((1 + 0.6 / 0.7) / 2 * 0.9, 3)
+
+    async def test_keyword_only_local_hit_outranks_weak_global_hit(self):
+        """A strong keyword-only local chunk should rank above a low-scoring global citation."""
+        from unittest.mock import AsyncMock, MagicMock
+        from src.services.unified_rag_service import UnifiedRAGService
+
+        local = MagicMock()
+        local.search = AsyncMock(return_value=[self._result("0", 0.9), self._result("1", 0.5)])
+        local.search_dense = AsyncMock(return_value=[self._result("2", 0.7), self._result("1", 0.6)])
+        global_client = MagicMock()
+        global_client.search = AsyncMock(return_value=(
+            "Answer", 0.5, [{"content": "Global", "relevance_score": 0.5, "doc_id": "G-1", "chunk_id": "0"}], 0.5
+        ))
+
+        service = UnifiedRAGService(local_service=local, global_client=global_client)
+        response = await service.search("Zuri family rooms", tenant_id="t1", local_top_k=2)
+
+        ranked = [(c["source_type"], c["chunk_id"]) for c in response.citations]
+        assert ranked.index(("local", "0")) < ranked.index(("global", "0"))
+
+    def test_keyword_only_without_vectors(self):
+        """Without vector hits keyword results should pass through unchanged."""
+        from src.services.unified_rag_service import fuse_hybrid_results
+
+        keyword = [self._result("0", 0.8), self._result("1", 0.4)]
+
+        assert fuse_hybrid_results(keyword, [], top_k=1) == keyword[:1]
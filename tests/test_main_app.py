@@ -261,6 +261,22 @@ class TestAppLifecycle:
 
         assert all(r.status_code == 200 for r in results)
 
+    async def test_failed_close_does_not_skip_later_hooks(self):
+        """A shutdown hook that raises should be logged and the later hooks still run."""
+        from unittest.mock import AsyncMock
+        from main import app, lifespan
+
+        with patch("src.middleware.rate_limiter.close_async_rate_limiter",
+                   AsyncMock(side_effect=RuntimeError("Redis gone"))), \
+                patch("src.tools.async_supabase_tool.close_async_supabase_clients", AsyncMock()) as close_supabase, \
+                patch("src.services.travel_platform_rates_client.close_travel_platform_rates_client",
+                      AsyncMock()) as close_rates:
+            async with lifespan(app):
+                pass
+
+        close_supabase.assert_awaited_once()
+        close_rates.assert_awaited()
+
 
 # ==================== Response Format Tests ====================
 
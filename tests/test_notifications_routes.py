@@ -19,7 +19,7 @@ These tests verify:
 """
 
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, AsyncMock, MagicMock
 from fastapi.testclient import TestClient
 import os
 
@@ -466,6 +466,12 @@ class TestPydanticModels:
 
 # ==================== Unit Tests for Endpoint Handlers ====================
 
+def patch_async_tool(mock_supabase):
+    """Patch AsyncSupabaseTool.create to return mock_supabase; queries run on its mocked client."""
+    mock_supabase.execute = AsyncMock(side_effect=lambda query, **kwargs: query.execute())
+    return patch("src.api.notifications_routes.AsyncSupabaseTool.create", new=AsyncMock(return_value=mock_supabase))
+
+
 class TestListNotificationsUnit:
     """Unit tests for list_notifications endpoint handler."""
 
@@ -498,12 +504,12 @@ class TestListNotificationsUnit:
         )
         mock.client.table.return_value = mock_query
         return mock
-    def test_list_notifications_success(self, mock_config, mock_supabase):
+    async def test_list_notifications_success(self, mock_config, mock_supabase):
         """list_notifications should return formatted notifications."""
         from src.api.notifications_routes import list_notifications
 
-        with patch("src.api.notifications_routes.SupabaseTool", return_value=mock_supabase):
-            result = list_notifications(
+        with patch_async_tool(mock_supabase):
+            result = await list_notifications(
                 config=mock_config,
                 user_id="user-123",
                 limit=20,
@@ -516,12 +522,12 @@ class TestListNotificationsUnit:
         assert len(result['data']) == 1
         assert result['data'][0]['id'] == 'notif-1'
         assert 'time_ago' in result['data'][0]
-    def test_list_notifications_with_pagination(self, mock_config, mock_supabase):
+    async def test_list_notifications_with_pagination(self, mock_config, mock_supabase):
         """list_notifications should respect pagination params."""
         from src.api.notifications_routes import list_notifications
 
-        with patch("src.api.notifications_routes.SupabaseTool", return_value=mock_supabase):
-            result = list_notifications(
+        with patch_async_tool(mock_supabase):
+            result = await list_notifications(
                 config=mock_config,
                 user_id="user-123",
                 limit=10,
@@ -531,12 +537,12 @@ class TestListNotificationsUnit:
 
         assert result['limit'] == 10
         assert result['offset'] == 5
-    def test_list_notifications_unread_only(self, mock_config, mock_supabase):
+    async def test_list_notifications_unread_only(self, mock_config, mock_supabase):
         """list_notifications should filter unread only when requested."""
         from src.api.notifications_routes import list_notifications
 
-        with patch("src.api.notifications_routes.SupabaseTool", return_value=mock_supabase):
-            result = list_notifications(
+        with patch_async_tool(mock_supabase):
+            result = await list_notifications(
                 config=mock_config,
                 user_id="user-123",
                 limit=20,
@@ -545,7 +551,7 @@ class TestListNotificationsUnit:
             )
 
         assert result['success'] is True
-    def test_list_notifications_error_handling(self, mock_config):
+    async def test_list_notifications_error_handling(self, mock_config):
         """list_notifications should handle errors gracefully."""
         from src.api.notifications_routes import list_notifications
         from fastapi import HTTPException
@@ -553,9 +559,9 @@ class TestListNotificationsUnit:
         mock_supabase = MagicMock()
         mock_supabase.client.table.side_effect = Exception("Database error")
 
-        with patch("src.api.notifications_routes.SupabaseTool", return_value=mock_supabase):
+        with patch_async_tool(mock_supabase):
             with pytest.raises(HTTPException) as exc_info:
-                list_notifications(
+                await list_notifications(
                     config=mock_config,
                     user_id="user-123",
                     limit=20,
@@ -567,7 +573,7 @@ class TestListNotificationsUnit:
 
 class TestUnreadCountUnit:
     """Unit tests for get_unread_count endpoint handler."""
-    def test_get_unread_count_success(self, mock_config):
+    async def test_get_unread_count_success(self, mock_config):
         """get_unread_count should return count of unread notifications."""
         from src.api.notifications_routes import get_unread_count
 
@@ -581,15 +587,15 @@ class TestUnreadCountUnit:
         mock_query.execute.return_value = mock_result
         mock_supabase.client.table.return_value = mock_query
 
-        with patch("src.api.notifications_routes.SupabaseTool", return_value=mock_supabase):
-            result = get_unread_count(
+        with patch_async_tool(mock_supabase):
+            result = await get_unread_count(
                 config=mock_config,
                 user_id="user-123"
             )
 
         assert result['success'] is True
         assert result['unread_count'] == 5
-    def test_get_unread_count_zero(self, mock_config):
+    async def test_get_unread_count_zero(self, mock_config):
         """get_unread_count should return 0 when no unread notifications."""
         from src.api.notifications_routes import get_unread_count
 
@@ -603,14 +609,14 @@ class TestUnreadCountUnit:
         mock_query.execute.return_value = mock_result
         mock_supabase.client.table.return_value = mock_query
 
-        with patch("src.api.notifications_routes.SupabaseTool", return_value=mock_supabase):
-            result = get_unread_count(
+        with patch_async_tool(mock_supabase):
+            result = await get_unread_count(
                 config=mock_config,
                 user_id="user-123"
             )
 
         assert result['unread_count'] == 0
-    def test_get_unread_count_error_raises_500(self, mock_config):
+    async def test_get_unread_count_error_raises_500(self, mock_config):
         """get_unread_count should raise 500 on error."""
         from src.api.notifications_routes import get_unread_count
         from fastapi import HTTPException
@@ -618,9 +624,9 @@ class TestUnreadCountUnit:
         mock_supabase = MagicMock()
         mock_supabase.client.table.side_effect = Exception("Database error")
 
-        with patch("src.api.notifications_routes.SupabaseTool", return_value=mock_supabase):
+        with patch_async_tool(mock_supabase):
             with pytest.raises(HTTPException) as exc_info:
-                get_unread_count(
+                await get_unread_count(
                     config=mock_config,
                     user_id="user-123"
                 )
@@ -630,7 +636,7 @@ class TestUnreadCountUnit:
 
 class TestMarkNotificationReadUnit:
     """Unit tests for mark_notification_read endpoint handler."""
-    def test_mark_notification_read_success(self, mock_config):
+    async def test_mark_notification_read_success(self, mock_config):
         """mark_notification_read should update notification as read."""
         from src.api.notifications_routes import mark_notification_read
 
@@ -642,8 +648,8 @@ class TestMarkNotificationReadUnit:
         mock_query.execute.return_value = MagicMock(data=[{'id': 'notif-123'}])
         mock_supabase.client.table.return_value = mock_query
 
-        with patch("src.api.notifications_routes.SupabaseTool", return_value=mock_supabase):
-            result = mark_notification_read(
+        with patch_async_tool(mock_supabase):
+            result = await mark_notification_read(
                 notification_id="notif-123",
                 config=mock_config,
                 user_id="user-123"
@@ -651,7 +657,7 @@ class TestMarkNotificationReadUnit:
 
         assert result['success'] is True
         assert result['message'] == 'Notification marked as read'
-    def test_mark_notification_read_error(self, mock_config):
+    async def test_mark_notification_read_error(self, mock_config):
         """mark_notification_read should handle errors."""
         from src.api.notifications_routes import mark_notification_read
         from fastapi import HTTPException
@@ -659,9 +665,9 @@ class TestMarkNotificationReadUnit:
         mock_supabase = MagicMock()
         mock_supabase.client.table.side_effect = Exception("Database error")
 
-        with patch("src.api.notifications_routes.SupabaseTool", return_value=mock_supabase):
+        with patch_async_tool(mock_supabase):
             with pytest.raises(HTTPException) as exc_info:
-                mark_notification_read(
+                await mark_notification_read(
                     notification_id="notif-123",
                     config=mock_config,
                     user_id="user-123"
@@ -671,7 +677,7 @@ class TestMarkNotificationReadUnit:
 
 class TestMarkAllReadUnit:
     """Unit tests for mark_all_read endpoint handler."""
-    def test_mark_all_read_success(self, mock_config):
+    async def test_mark_all_read_success(self, mock_config):
         """mark_all_read should update all notifications as read."""
         from src.api.notifications_routes import mark_all_read
 
@@ -683,15 +689,15 @@ class TestMarkAllReadUnit:
         mock_query.execute.return_value = MagicMock(data=[])
         mock_supabase.client.table.return_value = mock_query
 
-        with patch("src.api.notifications_routes.SupabaseTool", return_value=mock_supabase):
-            result = mark_all_read(
+        with patch_async_tool(mock_supabase):
+            result = await mark_all_read(
                 config=mock_config,
                 user_id="user-123"
             )
 
         assert result['success'] is True
         assert result['message'] == 'All notifications marked as read'
-    def test_mark_all_read_error(self, mock_config):
+    async def test_mark_all_read_error(self, mock_config):
         """mark_all_read should handle errors."""
         from src.api.notifications_routes import mark_all_read
         from fastapi import HTTPException
@@ -699,9 +705,9 @@ class TestMarkAllReadUnit:
         mock_supabase = MagicMock()
         mock_supabase.client.table.side_effect = Exception("Database error")
 
-        with patch("src.api.notifications_routes.SupabaseTool", return_value=mock_supabase):
+        with patch_async_tool(mock_supabase):
             with pytest.raises(HTTPException) as exc_info:
-                mark_all_read(
+                await mark_all_read(
                     config=mock_config,
                     user_id="user-123"
                 )
@@ -1244,12 +1250,12 @@ class TestReadUnreadStatus:
         mock_query.execute.return_value = MagicMock(data=[], count=0)
         mock.client.table.return_value = mock_query
         return mock
-    def test_mark_read_sets_read_at_timestamp(self, mock_config, mock_supabase):
+    async def test_mark_read_sets_read_at_timestamp(self, mock_config, mock_supabase):
         """mark_notification_read should set read_at with current timestamp."""
         from src.api.notifications_routes import mark_notification_read
 
-        with patch("src.api.notifications_routes.SupabaseTool", return_value=mock_supabase):
-            result = mark_notification_read(
+        with patch_async_tool(mock_supabase):
+            result = await mark_notification_read(
                 notification_id="notif-123",
                 config=mock_config,
                 user_id="user-123"
@@ -1261,19 +1267,19 @@ class TestReadUnreadStatus:
         update_data = update_call.call_args[0][0]
         assert update_data['read'] is True
         assert 'read_at' in update_data
-    def test_mark_all_read_updates_both_user_and_system(self, mock_config, mock_supabase):
+    async def test_mark_all_read_updates_both_user_and_system(self, mock_config, mock_supabase):
         """mark_all_read should update user notifications AND system notifications."""
         from src.api.notifications_routes import mark_all_read
 
-        with patch("src.api.notifications_routes.SupabaseTool", return_value=mock_supabase):
-            result = mark_all_read(
+        with patch_async_tool(mock_supabase):
+            result = await mark_all_read(
                 config=mock_config,
                 user_id="user-123"
             )
 
         # table should be called at least twice (user + system notifications)
         assert mock_supabase.client.table.call_count >= 2
-    def test_unread_count_returns_integer(self, mock_config, mock_supabase):
+    async def test_unread_count_returns_integer(self, mock_config, mock_supabase):
         """get_unread_count should always return an integer count."""
         from src.api.notifications_routes import get_unread_count
 
@@ -1281,8 +1287,8 @@ class TestReadUnreadStatus:
         mock_result.count = 42
         mock_supabase.client.table.return_value.execute.return_value = mock_result
 
-        with patch("src.api.notifications_routes.SupabaseTool", return_value=mock_supabase):
-            result = get_unread_count(config=mock_config, user_id="user-123")
+        with patch_async_tool(mock_supabase):
+            result = await get_unread_count(config=mock_config, user_id="user-123")
 
         assert isinstance(result['unread_count'], int)
         assert result['unread_count'] == 42
@@ -1377,12 +1383,12 @@ class TestNotificationsPagination:
         )
         mock.client.table.return_value = mock_query
         return mock
-    def test_pagination_returns_total_count(self, mock_config, mock_supabase_with_data):
+    async def test_pagination_returns_total_count(self, mock_config, mock_supabase_with_data):
         """list_notifications should return total count for pagination."""
         from src.api.notifications_routes import list_notifications
 
-        with patch("src.api.notifications_routes.SupabaseTool", return_value=mock_supabase_with_data):
-            result = list_notifications(
+        with patch_async_tool(mock_supabase_with_data):
+            result = await list_notifications(
                 config=mock_config, user_id="user-1",
                 limit=5, offset=0, unread_only=False
             )
@@ -1390,24 +1396,24 @@ class TestNotificationsPagination:
         assert 'total' in result
         assert 'limit' in result
         assert 'offset' in result
-    def test_pagination_respects_limit(self, mock_config, mock_supabase_with_data):
+    async def test_pagination_respects_limit(self, mock_config, mock_supabase_with_data):
         """list_notifications should pass limit to database query."""
         from src.api.notifications_routes import list_notifications
 
-        with patch("src.api.notifications_routes.SupabaseTool", return_value=mock_supabase_with_data):
-            result = list_notifications(
+        with patch_async_tool(mock_supabase_with_data):
+            result = await list_notifications(
                 config=mock_config, user_id="user-1",
                 limit=5, offset=10, unread_only=False
             )
 
         assert result['limit'] == 5
         assert result['offset'] == 10
-    def test_time_ago_in_notification_list(self, mock_config, mock_supabase_with_data):
+    async def test_time_ago_in_notification_list(self, mock_config, mock_supabase_with_data):
         """Each notification in list should include time_ago field."""
         from src.api.notifications_routes import list_notifications
 
-        with patch("src.api.notifications_routes.SupabaseTool", return_value=mock_supabase_with_data):
-            result = list_notifications(
+        with patch_async_tool(mock_supabase_with_data):
+            result = await list_notifications(
                 config=mock_config, user_id="user-1",
                 limit=20, offset=0, unread_only=False
             )
@@ -0,0 +1,111 @@
+"""
+PDF Cache Unit Tests
+
+Tests for the content-addressed PDF cache: key derivation, LRU eviction
+and ETag handling in the PDF download routes.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+
+@pytest.fixture
+def config():
+    config = MagicMock()
+    config.client_id = "tenant_a"
+    config.company_name = "Sunset Travel"
+    config.primary_color = "#112233"
+    return config
+
+
+class TestPdfCacheKey:
+    """Tests for pdf_cache_key and etag_matches."""
+
+    def test_key_changes_with_payload_and_branding(self, config):
+        """Any change to the document or the tenant branding should change the key."""
+        from src.services.pdf_cache import pdf_cache_key
+
+        key = pdf_cache_key("quote", config, [{"quote_id": "QT-1", "total_price": 100}])
+
+        assert key == pdf_cache_key("quote", config, [{"total_price": 100, "quote_id": "QT-1"}])
+        assert key != pdf_cache_key("quote", config, [{"quote_id": "QT-1", "total_price": 101}])
+        assert key != pdf_cache_key("invoice", config, [{"quote_id": "QT-1", "total_price": 100}])
+        config.primary_color = "#445566"
+        assert key != pdf_cache_key("quote", config, [{"quote_id": "QT-1", "total_price": 100}])
+
+    def test_etag_matching(self):
+        """If-None-Match lists, weak tags and * should all be understood."""
+        from src.services.pdf_cache import etag_matches
+
+        assert etag_matches('"abc"', "abc")
+        assert etag_matches('"x", W/"abc"', "abc")
+        assert etag_matches("*", "abc")
+        assert not etag_matches('"other"', "abc")
+        assert not etag_matches(None, "abc")
+
+
+class TestPdfCache:
+    """Tests for the disk store."""
+
+    def test_renders_once_then_serves_from_disk(self, tmp_path):
+        """A second request for the same key should not render again, even in a new process."""
+        from src.services.pdf_cache import PDFCache
+
+        render = MagicMock(return_value=b"%PDF-1")
+        assert PDFCache(tmp_path).get_or_render("k1", render) == b"%PDF-1"
+        assert PDFCache(tmp_path).get_or_render("k1", render) == b"%PDF-1"
+
+        render.assert_called_once()
+
+    def test_lru_eviction(self, tmp_path):
+        """Over budget, the least recently used PDF should be evicted."""
+        from src.services.pdf_cache import PDFCache
+
+        cache = PDFCache(tmp_path, max_bytes=10)
+        cache.put("a", b"1234")
+        cache.put("b", b"1234")
+        cache.get("a")  # a is now more recent than b
+        cache.put("c", b"1234")
+
+        assert cache.get("b") is None
+        assert cache.get("a") == b"1234"
+        assert cache.get("c") == b"1234"
+        assert not (tmp_path / "b.pdf").exists()
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_empty_render_not_cached(self, tmp_path):
+        """A failed (empty) render should be retried next time."""
+        from src.services.pdf_cache import PDFCache
+
+        cache = PDFCache(tmp_path)
+        cache.get_or_render("k", lambda: b"")
+
+        assert cache.get("k") is None
+
+
+class TestPdfRoutes:
+    """Tests for cached PDF responses."""
+
+    def test_quote_pdf_etag_and_304(self, config, tmp_path):
+        """The quote PDF should carry an ETag, and a matching If-None-Match gets 304 without rendering."""
+        from src.api.routes import download_quote_pdf
+        from src.services.pdf_cache import PDFCache
+
+        agent = MagicMock()
+        agent.get_quote.return_value = {"quote_id": "QT-1", "customer_name": "Ann", "hotels": []}
+        generator = MagicMock()
+        generator.return_value.generate_quote_pdf.return_value = b"%PDF-quote"
+
+        with patch("src.api.routes.get_quote_agent", return_value=agent), \
+                patch("src.utils.pdf_generator.PDFGenerator", generator), \
+                patch("src.services.pdf_cache.get_pdf_cache", return_value=PDFCache(tmp_path)):
+            first = download_quote_pdf("QT-1", config=config, user=MagicMock(), if_none_match=None)
+            etag = first.headers["etag"]
+            second = download_quote_pdf("QT-1", config=config, user=MagicMock(), if_none_match=etag)
+
+        assert first.status_code == 200
+        assert first.body == b"%PDF-quote"
+        assert second.status_code == 304
+        assert second.headers["etag"] == etag
+        generator.return_value.generate_quote_pdf.assert_called_once()
@@ -0,0 +1,127 @@
+"""
+PDF Render Service Unit Tests
+
+Tests for rendering quote/invoice PDFs through the render service: the
+in-process path, batch ordering, the async API, pool failure fallback and
+a round trip through a real worker process.
+"""
+
+from concurrent.futures.process import BrokenProcessPool
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+
+@pytest.fixture
+def config():
+    return SimpleNamespace(client_id="tenant_a", company_name="Sunset Travel", primary_color="#112233")
+
+
+@pytest.fixture
+def generator():
+    generator = MagicMock()
+    generator.return_value.generate_quote_pdf.return_value = b"%PDF-quote"
+    generator.return_value.generate_invoice_pdf.side_effect = lambda invoice, items, customer: (
+        f"%PDF-{invoice['invoice_id']}".encode()
+    )
+    with patch("src.utils.pdf_generator.PDFGenerator", generator):
+        yield generator
+
+
+class TestBrandingSnapshot:
+    """Tests for the config snapshot sent to worker processes."""
+
+    def test_snapshot_keeps_only_present_fields(self, config):
+        """Missing attributes should be left out so PDFGenerator's getattr defaults still apply."""
+        from src.services.pdf_render_service import branding_snapshot
+
+        snapshot = branding_snapshot(config)
+
+        assert snapshot == {"client_id": "tenant_a", "company_name": "Sunset Travel", "primary_color": "#112233"}
+
+
+class TestInlineRendering:
+    """Tests for PDF_RENDER_WORKERS=0 (render in the calling thread)."""
+
+    def test_render_calls_generator(self, config, generator):
+        """render() should call PDFGenerator with the tenant config and document."""
+        from src.services.pdf_render_service import PDFRenderService
+
+        service = PDFRenderService(workers=0)
+        pdf_bytes = service.render("quote", config, {"quote_id": "QT-1"}, [], {"name": "Ann"})
+
+        assert pdf_bytes == b"%PDF-quote"
+        generator.assert_called_once_with(config)
+        generator.return_value.generate_quote_pdf.assert_called_once_with({"quote_id": "QT-1"}, [], {"name": "Ann"})
+        assert service.get_stats()["inline"] == 1
+
+    def test_unknown_kind_rejected(self, config, generator):
+        """Only quote and invoice PDFs can be rendered."""
+        from src.services.pdf_render_service import PDFRenderService
+
+        with pytest.raises(ValueError):
+            PDFRenderService(workers=0).render("receipt", config, {})
+
+    def test_render_many_keeps_order(self, config, generator):
+        """A bulk run should return PDFs in the order the invoices were given."""
+        from src.services.pdf_render_service import PDFRenderService
+
+        invoices = [({"invoice_id": f"INV-{i}"}, [], {}) for i in range(5)]
+        pdfs = PDFRenderService(workers=0).render_many("invoice", config, invoices)
+
+        assert pdfs == [f"%PDF-INV-{i}".encode() for i in range(5)]
+
+    async def test_async_api(self, config, generator):
+        """render_quote_pdf / render_invoice_pdfs should be awaitable."""
+        from src.services.pdf_render_service import PDFRenderService, render_invoice_pdfs, render_quote_pdf
+
+        with patch("src.services.pdf_render_service.get_pdf_render_service",
+                   return_value=PDFRenderService(workers=0)):
+            quote_pdf = await render_quote_pdf(config, {"quote_id": "QT-1"}, [], {})
+            invoice_pdfs = await render_invoice_pdfs(config, [({"invoice_id": "INV-1"}, [], {})])
+
+        assert quote_pdf == b"%PDF-quote"
+        assert invoice_pdfs == [b"%PDF-INV-1"]
+
+    def test_pooled_generator_facade(self, config, generator):
+        """PooledPDFGenerator should expose the PDFGenerator methods."""
+        from src.services.pdf_render_service import PDFRenderService, PooledPDFGenerator
+
+        facade = PooledPDFGenerator(config, service=PDFRenderService(workers=0))
+
+        assert facade.generate_invoice_pdf({"invoice_id": "INV-9"}, [], {}) == b"%PDF-INV-9"
+
+
+class TestPooledRendering:
+    """Tests for rendering in worker processes."""
+
+    def test_broken_pool_falls_back_in_process(self, config, generator):
+        """If a worker dies, the PDF should still be rendered and the pool restarted next time."""
+        from src.services.pdf_render_service import PDFRenderService
+
+        service = PDFRenderService(workers=1)
+        pool = MagicMock()
+        pool.submit.return_value.result.side_effect = BrokenProcessPool("worker died")
+        service._pool = pool
+
+        pdf_bytes = service.render("quote", config, {"quote_id": "QT-1"}, [], {})
+
+        assert pdf_bytes == b"%PDF-quote"
+        assert service._pool is None
+        assert service.get_stats()["pool_restarts"] == 1
+        pool.shutdown.assert_called_once()
+
+    @pytest.mark.slow
+    def test_render_in_worker_process(self, config):
+        """A render should round-trip through a real worker process."""
+        from src.services.pdf_render_service import PDFRenderService
+
+        service = PDFRenderService(workers=1, timeout=60)
+        try:
+            pdf_bytes = service.render("quote", config, {"quote_id": "QT-1"}, [], {"name": "Ann"})
+        finally:
+            service.shutdown()
+
+        assert isinstance(pdf_bytes, bytes)
+        assert service.get_stats()["pooled"] == 1
@@ -16,6 +16,7 @@ Comprehensive tests for src/agents/quote_agent.py covering:
 All external dependencies (BigQuery, Supabase, PDF, Email, CRM, Rates) are mocked.
 """
 
+import asyncio
 import pytest
 from unittest.mock import patch, MagicMock, AsyncMock, PropertyMock
 from datetime import datetime, timedelta, date
@@ -73,7 +74,7 @@ def _build_quote_agent(mock_config, **overrides):
 
     with patch('src.agents.quote_agent.DatabaseTables', return_value=mocks['db']), \
          patch('src.agents.quote_agent.BigQueryTool', return_value=mocks['bq_tool']), \
-         patch('src.agents.quote_agent.PDFGenerator', return_value=mocks['pdf_generator']), \
+         patch('src.agents.quote_agent.PooledPDFGenerator', return_value=mocks['pdf_generator']), \
          patch('src.agents.quote_agent.EmailSender', return_value=mocks['email_sender']), \
          patch('src.tools.supabase_tool.SupabaseTool', return_value=mocks['supabase']), \
          patch('src.services.crm_service.CRMService', return_value=mocks['crm']), \
@@ -154,7 +155,7 @@ def sample_hotel_rows():
 
 @pytest.fixture
 def sample_pricing():
-    """Sample pricing breakdown returned by bq_tool.calculate_quote_price."""
+    """Sample pricing breakdown returned by bq_tool.calculate_quote_prices (per row)."""
     return {
         'per_person_rates': {'adult_sharing': 1500.00},
         'totals': {
@@ -609,14 +610,15 @@ class TestFindHotelsLive:
 class TestCalculateHotelOptions:
 
     def test_calculates_pricing_for_hotels(self, quote_agent, sample_hotel_rows, sample_pricing):
-        """Pricing calculated for each hotel via bq_tool."""
-        quote_agent.bq_tool.calculate_quote_price.return_value = sample_pricing
+        """All hotels are priced with one batched bq_tool call."""
+        quote_agent.bq_tool.calculate_quote_prices.return_value = [sample_pricing] * 3
         customer = {'adults': 2, 'children_ages': []}
 
         result = quote_agent._calculate_hotel_options(sample_hotel_rows, customer)
 
         assert len(result) == 3
-        assert quote_agent.bq_tool.calculate_quote_price.call_count == 3
+        quote_agent.bq_tool.calculate_quote_prices.assert_called_once()
+        quote_agent.bq_tool.calculate_quote_price.assert_not_called()
 
     def test_deduplicates_by_hotel_name(self, quote_agent, sample_pricing):
         """Duplicate hotel names are removed; only first kept."""
@@ -625,7 +627,7 @@ class TestCalculateHotelOptions:
             {'hotel_name': 'Same Hotel', 'rate_id': 'r2'},
             {'hotel_name': 'Different Hotel', 'rate_id': 'r3'},
         ]
-        quote_agent.bq_tool.calculate_quote_price.return_value = sample_pricing
+        quote_agent.bq_tool.calculate_quote_prices.return_value = [sample_pricing] * 3
         customer = {'adults': 2, 'children_ages': []}
 
         result = quote_agent._calculate_hotel_options(hotels, customer)
@@ -635,9 +637,9 @@ class TestCalculateHotelOptions:
         assert names.count('Same Hotel') == 1
 
     def test_skips_hotels_without_pricing(self, quote_agent):
-        """Hotels where calculate_quote_price returns None are skipped."""
+        """Hotels without pricing (None from calculate_quote_prices) are skipped."""
         hotels = [{'hotel_name': 'No Price Hotel', 'rate_id': 'r1'}]
-        quote_agent.bq_tool.calculate_quote_price.return_value = None
+        quote_agent.bq_tool.calculate_quote_prices.return_value = [None]
         customer = {'adults': 2, 'children_ages': []}
 
         result = quote_agent._calculate_hotel_options(hotels, customer)
@@ -658,7 +660,7 @@ class TestCalculateHotelOptions:
             'per_person_rates': {'adult_sharing': 1000},
             'totals': {'grand_total': 2000, 'accommodation': 2000, 'flights': 0, 'transfers': 0},
         }
-        quote_agent.bq_tool.calculate_quote_price.side_effect = [pricing_expensive, pricing_cheap]
+        quote_agent.bq_tool.calculate_quote_prices.return_value = [pricing_expensive, pricing_cheap]
         customer = {'adults': 2, 'children_ages': []}
 
         result = quote_agent._calculate_hotel_options(hotels, customer)
@@ -670,7 +672,7 @@ class TestCalculateHotelOptions:
         """Processing stops after max_hotels_per_quote * 2 unique options."""
         quote_agent.max_hotels_per_quote = 2
         hotels = [{'hotel_name': f'Hotel {i}', 'rate_id': f'r{i}'} for i in range(10)]
-        quote_agent.bq_tool.calculate_quote_price.return_value = sample_pricing
+        quote_agent.bq_tool.calculate_quote_prices.return_value = [sample_pricing] * 10
         customer = {'adults': 2, 'children_ages': []}
 
         result = quote_agent._calculate_hotel_options(hotels, customer)
@@ -679,7 +681,7 @@ class TestCalculateHotelOptions:
 
     def test_option_structure(self, quote_agent, sample_hotel_rows, sample_pricing):
         """Each option has expected keys."""
-        quote_agent.bq_tool.calculate_quote_price.return_value = sample_pricing
+        quote_agent.bq_tool.calculate_quote_prices.return_value = [sample_pricing]
         customer = {'adults': 2, 'children_ages': []}
         result = quote_agent._calculate_hotel_options(sample_hotel_rows[:1], customer)
 
@@ -1051,6 +1053,45 @@ class TestAddToCrm:
 
         assert result['success'] is False
 
+    def test_retried_crm_job_counts_quote_once(self, quote_agent):
+        """A retried quote.crm job doesn't increment quote_count or log the activity again."""
+        from src.services.job_queue import Job
+
+        job = Job(job_id='JOB-1', tenant_id='test_tenant', kind='quote.crm', reference_id='QT-008')
+        quote_agent.crm.get_client_by_email.return_value = {
+            'client_id': 'c1', 'pipeline_stage': 'QUOTED', 'quote_count': 1
+        }
+        quote_agent.crm.update_stage.side_effect = [Exception("CRM timeout"), None]
+
+        assert quote_agent._add_to_crm({'email': 'e@t.com', 'name': 'User'}, 'QT-008', job=job)['success'] is False
+        # The first attempt's count was written before the stage update failed
+        quote_agent.crm.get_client_by_email.return_value = {
+            'client_id': 'c1', 'pipeline_stage': 'QUOTED', 'quote_count': 2
+        }
+        assert quote_agent._add_to_crm({'email': 'e@t.com', 'name': 'User'}, 'QT-008', job=job)['success'] is True
+
+        quote_agent.crm.update_client.assert_called_once_with(client_id='c1', quote_count=2)
+        assert quote_agent.crm.update_stage.call_count == 2  # the stage move itself is repeatable
+        quote_agent.supabase.log_activity.assert_called_once()
+
+    def test_retry_after_creating_client_does_not_count_again(self, quote_agent):
+        """A client created by a failed attempt isn't treated as a repeat customer on retry."""
+        from src.services.job_queue import Job
+
+        job = Job(job_id='JOB-2', tenant_id='test_tenant', kind='quote.crm', reference_id='QT-009')
+        quote_agent.crm.get_client_by_email.return_value = None
+        quote_agent.crm.get_or_create_client.return_value = {'client_id': 'c2'}
+        quote_agent.supabase.log_activity.side_effect = [Exception("timeout"), None]
+
+        assert quote_agent._add_to_crm({'email': 'n@t.com', 'name': 'New'}, 'QT-009', job=job)['success'] is False
+        quote_agent.crm.get_client_by_email.return_value = {
+            'client_id': 'c2', 'pipeline_stage': 'QUOTED', 'quote_count': 1
+        }
+        assert quote_agent._add_to_crm({'email': 'n@t.com', 'name': 'New'}, 'QT-009', job=job)['success'] is True
+
+        quote_agent.crm.update_client.assert_not_called()
+        quote_agent.crm.update_stage.assert_not_called()
+
 
 # ---------------------------------------------------------------------------
 # 12. _schedule_follow_up_call Tests
@@ -1178,10 +1219,10 @@ class TestGenerateQuote:
              'room_type': 'Deluxe', 'meal_plan': 'AI'},
         ]
         # Pricing
-        mocks['bq_tool'].calculate_quote_price.return_value = {
+        mocks['bq_tool'].calculate_quote_prices.return_value = [{
             'per_person_rates': {'adult_sharing': 2500},
             'totals': {'grand_total': 5000, 'accommodation': 5000, 'flights': 0, 'transfers': 0},
-        }
+        }]
         # Consultant
         mocks['bq_tool'].get_next_consultant_round_robin.return_value = {
             'consultant_id': 'cons_1', 'name': 'Alice'
@@ -1227,6 +1268,8 @@ class TestGenerateQuote:
 
         assert result['success'] is False
         assert result['status'] == 'no_availability'
+        # A failed quote must not use up a consultant's round-robin turn
+        mocks['bq_tool'].get_next_consultant_round_robin.assert_not_called()
 
     def test_draft_mode_skips_email(self, mock_config, sample_customer_data):
         """Draft quotes do not send email."""
@@ -1418,6 +1461,81 @@ class TestGenerateQuote:
         assert result['success'] is True
         assert result['hotels_count'] <= 2
 
+    def test_deliver_async_returns_after_save(self, mock_config, sample_customer_data):
+        """deliver_async saves the quote and queues delivery instead of emailing inline."""
+        agent, mocks = _build_quote_agent(mock_config)
+        self._setup_successful_flow(agent, mocks)
+        queue = MagicMock()
+
+        with patch('src.agents.quote_agent.get_job_queue', return_value=queue):
+            result = agent.generate_quote(sample_customer_data, use_live_rates=False, deliver_async=True)
+
+        assert result['success'] is True
+        assert result['status'] == 'quoted'
+        assert result['email_sent'] is False
+        assert result['email_queued'] is True
+        mocks['pdf_generator'].generate_quote_pdf.assert_not_called()
+        mocks['email_sender'].send_quote_email.assert_not_called()
+        mocks['supabase'].client.table.return_value.insert.assert_called_once()
+        kinds = [c.args[1] for c in queue.enqueue.call_args_list]
+        assert kinds == ['quote.deliver', 'quote.crm', 'quote.notify']
+        assert all(c.kwargs['reference_id'] == result['quote_id'] for c in queue.enqueue.call_args_list)
+
+    def test_deliver_async_not_queued_when_save_fails(self, mock_config, sample_customer_data):
+        """Nothing is queued for a quote that was not persisted."""
+        agent, mocks = _build_quote_agent(mock_config)
+        self._setup_successful_flow(agent, mocks)
+        mocks['supabase'].client.table.return_value.insert.return_value.execute.return_value.data = []
+        queue = MagicMock()
+
+        with patch('src.agents.quote_agent.get_job_queue', return_value=queue):
+            result = agent.generate_quote(sample_customer_data, use_live_rates=False, deliver_async=True)
+
+        assert result['success'] is False
+        queue.enqueue.assert_not_called()
+
+    def test_queued_delivery_emails_once_across_retries(self, mock_config, sample_customer_data):
+        """A retried quote.deliver job doesn't re-send an email that already went out."""
+        from src.services.job_queue import Job
+
+        agent, mocks = _build_quote_agent(mock_config)
+        self._setup_successful_flow(agent, mocks)
+        customer = agent._normalize_customer_data({**sample_customer_data, 'phone': '+27123'})
+        quote = {'quote_id': 'QT-1', 'hotels': [{'hotel_name': 'Beach Hotel'}]}
+        job = Job(job_id='JOB-1', tenant_id='test_tenant', kind='quote.deliver',
+                  payload={'quote': quote, 'customer': customer})
+        update = mocks['supabase'].client.table.return_value.update
+        update.return_value.eq.return_value.eq.return_value.execute.side_effect = [Exception("timeout"), MagicMock()]
+
+        with patch.object(agent, '_schedule_follow_up_call', return_value=True) as schedule_call:
+            with pytest.raises(Exception, match="timeout"):
+                agent.deliver_queued_quote(job)
+            result = agent.deliver_queued_quote(job)
+
+        assert result == {'email_sent': True, 'call_queued': True}
+        mocks['email_sender'].send_quote_email.assert_called_once()
+        assert update.call_args.args[0]['status'] == 'sent'
+        schedule_call.assert_called_once()
+
+    def test_queued_delivery_retries_when_pdf_render_fails(self, mock_config, sample_customer_data):
+        """An empty render (timeout or failure) raises for a retry instead of emailing no PDF."""
+        from src.services.job_queue import Job
+
+        agent, mocks = _build_quote_agent(mock_config)
+        self._setup_successful_flow(agent, mocks)
+        mocks['pdf_generator'].generate_quote_pdf.return_value = b""
+        customer = agent._normalize_customer_data(sample_customer_data)
+        quote = {'quote_id': 'QT-1', 'hotels': [{'hotel_name': 'Beach Hotel'}]}
+        job = Job(job_id='JOB-1', tenant_id='test_tenant', kind='quote.deliver',
+                  payload={'quote': quote, 'customer': customer})
+
+        with pytest.raises(RuntimeError, match="not rendered"):
+            agent.deliver_queued_quote(job)
+
+        assert 'pdf_generated' not in job.state
+        mocks['email_sender'].send_quote_email.assert_not_called()
+        mocks['supabase'].client.table.return_value.update.assert_not_called()
+
 
 # ---------------------------------------------------------------------------
 # 15. send_draft_quote Tests
@@ -1710,15 +1828,42 @@ class TestRunAsync:
         from src.agents.quote_agent import run_async
         assert callable(run_async)
 
-    def test_run_async_calls_asyncio_run(self):
-        """run_async delegates to asyncio.run when no event loop is running."""
+    def test_run_async_reuses_bridge_loop(self):
+        """run_async runs every coroutine on the same persistent loop thread."""
+        import threading
         from src.agents.quote_agent import run_async
-        mock_coro = MagicMock()
 
-        with patch('src.agents.quote_agent.asyncio') as mock_asyncio:
-            mock_asyncio.get_event_loop.side_effect = RuntimeError("no loop")
-            mock_asyncio.run.return_value = 99
-            result = run_async(mock_coro)
+        async def current():
+            return asyncio.get_running_loop(), threading.current_thread().name
+
+        first = run_async(current())
+        second = run_async(current())
+
+        assert first == second
+        assert first[1] == 'async-bridge'
+
+    @pytest.mark.asyncio
+    async def test_generate_quote_async_awaits_live_rates(self, mock_config, sample_customer_data):
+        """generate_quote_async awaits the Rates Engine directly and skips the bridge."""
+        agent, mocks = _build_quote_agent(mock_config)
+        mocks['rates_client'].search_hotels = AsyncMock(return_value={
+            'success': True,
+            'hotels': [{
+                'hotel_name': 'Live Hotel',
+                'stars': 5,
+                'options': [{'room_type': 'Suite', 'meal_plan': 'AI', 'price_total': 8000}],
+            }],
+        })
+        mocks['bq_tool'].get_next_consultant_round_robin.return_value = {'consultant_id': 'cons_1'}
+        mocks['supabase'].client.table.return_value.insert.return_value.execute.return_value.data = [{'id': 1}]
+
+        with patch('src.agents.quote_agent.run_async') as mock_run_async, \
+                patch('src.agents.quote_agent.get_job_queue'):
+            result = await agent.generate_quote_async(
+                sample_customer_data, deliver_async=True)
 
-        mock_asyncio.run.assert_called_once_with(mock_coro)
-        assert result == 99
+        assert result['success'] is True
+        assert result['quote']['hotels'][0]['hotel_name'] == 'Live Hotel'
+        mocks['rates_client'].search_hotels.assert_awaited_once()
+        mock_run_async.assert_not_called()
+        mocks['bq_tool'].find_matching_hotels.assert_not_called()
\ No newline at end of file
@@ -569,7 +569,7 @@ class TestErrorHandling:
             'hotel_name': 'Test Hotel',
             'rate_id': 'rate_123'
         }]
-        agent.bq_tool.calculate_quote_price.return_value = None
+        agent.bq_tool.calculate_quote_prices.return_value = [None]
 
         result = agent.generate_quote({
             'name': 'Test',
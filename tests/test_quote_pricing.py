@@ -0,0 +1,87 @@
+"""
+Quote Pricing Kernel Tests
+
+Tests for the pure per-person pricing functions in src/services/quote_pricing.py.
+"""
+
+
+RATE = {'rate_id': 'r1', 'total_7nights_pps': 45000, 'total_7nights_single': 52000, 'total_7nights_child': 22000}
+
+
+class TestPriceRate:
+    """Tests for price_rate."""
+
+    def test_sharing_adults_with_child_and_infant(self):
+        """Adults share; children pay the child rate and infants a flat fee."""
+        from src.services.quote_pricing import price_rate
+
+        pricing = price_rate(45000, 52000, 22000, adults=2, children_ages=[8, 1])
+
+        assert pricing['traveler_counts'] == {'adults_sharing': 2, 'adults_single': 0, 'children': 1, 'infants': 1}
+        assert pricing['totals'] == {'adults': 90000, 'children': 22000, 'infants': 1000, 'grand_total': 113000}
+        assert pricing['per_person_rates']['adult_sharing'] == 45000
+
+    def test_single_traveler_pays_single_rate(self):
+        """One adult without children should pay the single rate."""
+        from src.services.quote_pricing import price_rate
+
+        pricing = price_rate(45000, 52000, 22000, adults=1)
+
+        assert pricing['per_person_rates']['adult_single'] == 52000
+        assert pricing['totals']['grand_total'] == 52000
+
+    def test_mixed_rooms_fall_back_to_sharing_rate(self):
+        """Single rooms without a single rate should cost the sharing rate."""
+        from src.services.quote_pricing import price_rate
+
+        pricing = price_rate(45000, None, None, adults=3, single_adults=1)
+
+        assert pricing['traveler_counts']['adults_single'] == 1
+        assert pricing['totals']['adults'] == 135000
+
+
+class TestPriceRates:
+    """Tests for price_rates and BigQueryTool.calculate_quote_prices."""
+
+    def test_price_rates_matches_price_rate(self):
+        """Batch pricing should give the same breakdown per row."""
+        from src.services.quote_pricing import price_rate, price_rates
+
+        rows = [RATE, {**RATE, 'total_7nights_pps': 30000}]
+
+        batch = price_rates(rows, adults=2, children_ages=[5])
+
+        assert batch[1] == price_rate(30000, 52000, 22000, adults=2, children_ages=[5])
+
+    def test_rows_with_prices_need_no_query(self, mock_config):
+        """Rows from find_matching_hotels should be priced without BigQuery."""
+        from unittest.mock import MagicMock, patch
+
+        with patch('src.tools.bigquery_tool.bigquery') as mock_bq:
+            client = MagicMock()
+            mock_bq.Client.return_value = client
+
+            from src.tools.bigquery_tool import BigQueryTool
+            prices = BigQueryTool(mock_config).calculate_quote_prices([RATE, RATE], adults=2)
+
+        assert [p['totals']['grand_total'] for p in prices] == [90000, 90000]
+        client.query.assert_not_called()
+
+    def test_missing_prices_fetched_in_one_query(self, mock_config):
+        """Rows with only a rate_id should be looked up together; unknown rates are None."""
+        from unittest.mock import MagicMock, patch
+
+        with patch('src.tools.bigquery_tool.bigquery') as mock_bq:
+            client = MagicMock()
+            client.query.return_value.result.return_value = [RATE]
+            mock_bq.Client.return_value = client
+
+            from src.tools.bigquery_tool import BigQueryTool
+            prices = BigQueryTool(mock_config).calculate_quote_prices(
+                [{'rate_id': 'r1'}, {'rate_id': 'unknown'}, {'rate_id': 'r1'}], adults=1
+            )
+
+        assert client.query.call_count == 1
+        assert prices[0]['totals']['grand_total'] == 52000
+        assert prices[1] is None
+        assert prices[2] == prices[0]
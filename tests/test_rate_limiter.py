@@ -1100,5 +1100,155 @@ class TestMiddleware429Response:
         assert "X-RateLimit-Remaining" in response.headers
 
 
+# ==================== Async Rate Limiter ====================
+
+class TestExpiryHeap:
+    """Tests for O(log n) expiry in InMemoryRateLimitStore."""
+
+    def test_clean_expired_only_touches_expired_heads(self):
+        """Expired keys are dropped while live keys stay untouched."""
+        store = InMemoryRateLimitStore()
+        store.increment("short", 1)
+        store.increment("long", 60)
+
+        with patch("src.middleware.rate_limiter.time.time", return_value=time.time() + 2):
+            store._clean_expired()
+
+        assert "short" not in store._counts
+        assert store.get_count("long") == 1
+        assert len(store._expiry_heap) == 1
+
+
+class TestLocalGCRA:
+    """Tests for the in-process GCRA limiter."""
+
+    def test_burst_then_deny(self):
+        """A full burst of `limit` requests is allowed, the next is denied with a retry time."""
+        from src.middleware.rate_limiter import LocalGCRA
+
+        gcra = LocalGCRA()
+        results = [gcra.acquire("k", 3, 60) for _ in range(4)]
+
+        assert [r[0] for r in results] == [1, 1, 1, 0]
+        assert [r[1] for r in results[:3]] == [2, 1, 0]
+        granted, remaining, reset_after, retry_after = results[3]
+        assert 19 < retry_after <= 20  # one token per 60s / 3
+        assert 59 < reset_after <= 60
+
+    def test_token_returns_after_interval(self):
+        """After limit/window seconds one more request is allowed."""
+        from src.middleware.rate_limiter import LocalGCRA
+
+        gcra = LocalGCRA()
+        now = time.monotonic()
+        with patch("src.middleware.rate_limiter.time.monotonic", return_value=now):
+            for _ in range(3):
+                gcra.acquire("k", 3, 60)
+            assert gcra.acquire("k", 3, 60)[0] == 0
+        with patch("src.middleware.rate_limiter.time.monotonic", return_value=now + 20):
+            assert gcra.acquire("k", 3, 60)[0] == 1
+
+    def test_expired_keys_evicted(self):
+        """Keys whose window has fully passed are dropped."""
+        from src.middleware.rate_limiter import LocalGCRA
+
+        gcra = LocalGCRA()
+        gcra.acquire("old", 10, 1)
+        with patch("src.middleware.rate_limiter.time.monotonic", return_value=time.monotonic() + 5):
+            gcra.acquire("new", 10, 60)
+
+        assert list(gcra._tat) == ["new"]
+
+
+class TestAsyncRateLimiter:
+    """Tests for Redis-backed checks with local token leases."""
+
+    def _limiter(self, script):
+        from src.middleware.rate_limiter import AsyncRateLimiter
+
+        limiter = AsyncRateLimiter("redis://localhost")
+        limiter._script = script
+        return limiter
+
+    async def test_lease_serves_requests_locally(self):
+        """One Redis call leases a batch; the following requests don't touch Redis."""
+        from unittest.mock import AsyncMock
+
+        script = AsyncMock(return_value=[12, 588, 1200, 0])
+        limiter = self._limiter(script)
+
+        results = [await limiter.check("ratelimit:t1:/api/v1/quotes", 600, 60) for _ in range(12)]
+
+        assert script.await_count == 1
+        assert script.await_args.kwargs["args"] == [600, 60, 12]
+        assert all(r.allowed for r in results)
+        assert [r.remaining for r in results[:3]] == [599, 598, 597]
+
+    async def test_denial_cached_until_retry(self):
+        """After Redis denies a key, repeat requests are denied locally."""
+        from unittest.mock import AsyncMock
+
+        script = AsyncMock(return_value=[0, 0, 60000, 5000])
+        limiter = self._limiter(script)
+
+        first = await limiter.check("k", 10, 60)
+        second = await limiter.check("k", 10, 60)
+
+        assert not first.allowed and not second.allowed
+        assert first.retry_after == 5
+        assert script.await_count == 1
+        assert (b"retry-after", b"5") in first.headers()
+
+    async def test_redis_error_falls_back_to_local_limit(self):
+        """If Redis fails the request is still limited in-process."""
+        from unittest.mock import AsyncMock
+
+        limiter = self._limiter(AsyncMock(side_effect=ConnectionError("down")))
+
+        results = [await limiter.check("k", 2, 60) for _ in range(3)]
+
+        assert [r.allowed for r in results] == [True, True, False]
+        assert limiter.get_stats()["redis_errors"] == 3
+
+
+class TestRouteTemplateKeys:
+    """Tests for keying limits by route template."""
+
+    def test_path_parameters_share_one_limit(self):
+        """/quotes/A and /quotes/B count against the same limit."""
+        app = FastAPI()
+        app.add_middleware(RateLimitMiddleware)
+
+        @app.get("/api/v1/quotes/{quote_id}")
+        def get_quote(quote_id: str):
+            return {"quote_id": quote_id}
+
+        client = TestClient(app)
+        headers = {"X-Client-ID": f"test_template_{time.time()}"}
+        with patch.object(RateLimitConfig, 'get_limit', return_value=(2, 60)):
+            client.get("/api/v1/quotes/Q-1", headers=headers)
+            client.get("/api/v1/quotes/Q-2", headers=headers)
+            response = client.get("/api/v1/quotes/Q-3", headers=headers)
+
+        assert response.status_code == 429
+        assert "Retry-After" in response.headers
+
+    def test_reset_header_is_seconds_until_full_quota(self):
+        """x-ratelimit-reset counts seconds until the quota is fully restored."""
+        app = FastAPI()
+        app.add_middleware(RateLimitMiddleware)
+
+        @app.get("/api/v1/ping")
+        def ping():
+            return {}
+
+        client = TestClient(app)
+        with patch.object(RateLimitConfig, 'get_limit', return_value=(60, 60)):
+            response = client.get("/api/v1/ping", headers={"X-Client-ID": f"test_reset_{time.time()}"})
+
+        assert response.headers["X-RateLimit-Remaining"] == "59"
+        assert response.headers["X-RateLimit-Reset"] == "1"
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -0,0 +1,208 @@
+"""
+Rates Replica Unit Tests
+
+Tests for the local hotel_rates / flight_prices replica: lookups must give
+the same rows, dedup and ordering as the BigQuery queries they replace.
+"""
+
+from datetime import date
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+
+def _rates(*rows):
+    columns = ("rate_id", "hotel_name", "hotel_rating", "destination", "room_type", "meal_plan",
+               "check_in_date", "check_out_date", "nights", "total_7nights_pps",
+               "total_7nights_single", "total_7nights_child", "is_active")
+    return {name: [row[i] for row in rows] for i, name in enumerate(columns)}
+
+
+RATES = _rates(
+    ("R1", "Zuri Zanzibar", 5, "Zanzibar", "Deluxe", "HB", date(2025, 3, 1), date(2025, 3, 31), 7, 45000, 52000, 22000, True),
+    # Older duplicate of R1's partition: dropped by the rate_id DESC dedup
+    ("R0", "Zuri Zanzibar", 5, "Zanzibar", "Deluxe", "HB", date(2025, 3, 1), date(2025, 3, 31), 7, 40000, 50000, 20000, True),
+    ("R2", "Melia Zanzibar", 5, "ZANZIBAR", "Garden", "AI", date(2025, 3, 8), date(2025, 3, 15), 7, 38000, None, None, True),
+    ("R3", "Riu Palace", 4, "Zanzibar", "Standard", "AI", date(2025, 2, 1), date(2025, 4, 30), 7, 30000, 35000, 15000, True),
+    ("R4", "Riu Palace", 4, "Zanzibar", "Standard", "AI", date(2025, 6, 1), date(2025, 6, 30), 7, 25000, 30000, 12000, True),
+    ("R5", "Inactive Lodge", 3, "Zanzibar", "Standard", "BB", date(2025, 3, 1), date(2025, 3, 31), 7, 10000, None, None, False),
+    ("R6", "Zuri Zanzibar", 5, "Zanzibar", "Deluxe", "HB", date(2025, 3, 1), date(2025, 3, 31), 5, 35000, None, None, True),
+)
+
+FLIGHTS = {
+    "destination": ["Zanzibar", "Zanzibar", "Mauritius"],
+    "departure_date": [date(2025, 3, 1), date(2025, 3, 20), date(2025, 3, 1)],
+    "price_per_person": [8500, 9900, 12000],
+}
+
+
+@pytest.fixture
+def snapshot():
+    from src.services.rates_replica import ReplicaSnapshot
+
+    return ReplicaSnapshot({"hotel_rates": RATES, "flight_prices": FLIGHTS})
+
+
+class TestReplicaLookups:
+    """Tests for ReplicaSnapshot lookups mirroring BigQueryTool queries."""
+
+    def test_find_matching_hotels(self, snapshot):
+        """Validity window, dedup and ORDER BY priority then price should match the SQL."""
+        hotels = snapshot.find_matching_hotels(["ZANZIBAR"], "2025-03-08", "2025-03-15", 7)
+
+        # R2 is an exact date match (priority 1); R1 and R3 contain the stay (priority 2, by price)
+        assert [h["rate_id"] for h in hotels] == ["R2", "R3", "R1"]
+        assert hotels[0]["check_in_date"] == date(2025, 3, 8)
+        assert set(hotels[0]) == {
+            "rate_id", "hotel_name", "hotel_rating", "room_type", "meal_plan", "total_7nights_pps",
+            "total_7nights_single", "total_7nights_child", "check_in_date", "check_out_date", "nights",
+        }
+
+    def test_find_matching_hotels_meal_plan(self, snapshot):
+        """The meal plan filter should apply before dedup and ordering."""
+        hotels = snapshot.find_matching_hotels(["ZANZIBAR"], "2025-03-08", "2025-03-15", 7, meal_plan="HB")
+
+        assert [h["rate_id"] for h in hotels] == ["R1"]
+
+    def test_find_rates_by_hotel_names(self, snapshot):
+        """Each hotel/room/meal keeps its best-priority rate; results ordered by name then price."""
+        hotels = snapshot.find_rates_by_hotel_names(["%riu%", "%zuri%"], 7, "2025-06-05", "2025-06-12")
+
+        assert [h["rate_id"] for h in hotels] == ["R4", "R1"]
+
+    def test_search_hotels_by_name(self, snapshot):
+        """Matching hotels should be grouped with price range and meal plans."""
+        results = snapshot.search_hotels_by_name("zuri")
+
+        assert results == [{
+            "hotel_name": "Zuri Zanzibar", "hotel_rating": 5, "destination": "Zanzibar",
+            "min_price_pps": 35000, "max_price_pps": 45000, "meal_plans": "HB", "room_types": "Deluxe",
+        }]
+
+    def test_rate_prices_and_flights(self, snapshot):
+        """Rate lookups by id and nearest-departure flight prices should work."""
+        assert snapshot.rate_prices(["R2", "missing"]) == {
+            "R2": {"rate_id": "R2", "total_7nights_pps": 38000, "total_7nights_single": None, "total_7nights_child": None}
+        }
+        assert snapshot.flight_price("zanzibar", "2025-03-15") == 9900
+        assert snapshot.flight_price("Seychelles", "2025-03-15") is None
+
+
+class TestReplicaLifecycle:
+    """Tests for serving, staleness and invalidation."""
+
+    def test_no_snapshot_falls_back_and_refreshes(self, tmp_path):
+        """Without a snapshot, callers should query BigQuery while one refresh starts."""
+        from src.services.rates_replica import RatesReplica
+
+        replica = RatesReplica("p.d", {}, tmp_path)
+        with patch.object(replica, "_start_refresh") as start_refresh:
+            assert replica.snapshot(MagicMock()) is None
+
+        start_refresh.assert_called_once()
+
+    def test_invalidate_stops_serving(self, tmp_path, snapshot):
+        """After a write, the old snapshot should no longer be served."""
+        from src.services.rates_replica import RatesReplica
+
+        replica = RatesReplica("p.d", {}, tmp_path)
+        replica._snapshot = snapshot
+        replica._disk_checked = True
+
+        with patch.object(replica, "_start_refresh"):
+            assert replica.snapshot(MagicMock()) is snapshot
+            replica.invalidate()
+            assert replica.snapshot(MagicMock()) is None
+
+    def test_invalidate_reaches_other_workers(self, tmp_path, snapshot):
+        """A write in one worker should stop the others sharing the snapshot files from serving it."""
+        from src.services.rates_replica import RatesReplica
+
+        writer = RatesReplica("p.d", {}, tmp_path)
+        other = RatesReplica("p.d", {}, tmp_path)
+        other._snapshot = snapshot
+        other._disk_checked = True
+
+        with patch.object(other, "_start_refresh"):
+            assert other.snapshot(MagicMock()) is snapshot
+            writer.invalidate()
+            other._next_invalidation_check = 0  # don't wait for the check interval
+            assert other.snapshot(MagicMock()) is None
+
+    def test_invalidate_broadcast_to_other_instances(self, tmp_path):
+        """A write should be published to Redis and mark the snapshot files stale."""
+        import json
+        from src.services import rates_replica
+
+        redis_client = MagicMock()
+        db = MagicMock(project="p", pricing_dataset="d")
+        with patch.object(rates_replica, "RATES_REPLICA_ENABLED", True), \
+                patch.object(rates_replica, "RATES_REPLICA_DIR", str(tmp_path)), \
+                patch.object(rates_replica, "_get_redis_client", return_value=redis_client):
+            rates_replica.invalidate_rates_replica(db)
+
+        channel, payload = redis_client.publish.call_args[0]
+        message = json.loads(payload)
+        assert channel == rates_replica.INVALIDATION_CHANNEL
+        assert message["key"] == "p.d"
+        assert message["origin"] == rates_replica.INSTANCE_ID
+        assert rates_replica._marked_invalidated_at(tmp_path / "p.d") == pytest.approx(message["invalidated_at"])
+
+    def test_refresh_persists_and_reloads(self, tmp_path):
+        """A refresh should write Arrow files that a new process can load."""
+        pa = pytest.importorskip("pyarrow")
+        from src.services.rates_replica import RatesReplica
+
+        client = MagicMock()
+        client.query.return_value.to_arrow.return_value = pa.table(RATES)
+        tables = {name: name for name in ("hotel_rates", "hotel_media", "flight_prices")}
+
+        RatesReplica("p.d", tables, tmp_path).refresh(client)
+        reloaded = RatesReplica("p.d", tables, tmp_path)
+
+        snapshot = reloaded.snapshot(client)
+        assert snapshot is not None
+        assert snapshot.get_rate("R2")["hotel_name"] == "Melia Zanzibar"
+
+    def test_reloaded_snapshot_converts_columns_lazily(self, tmp_path):
+        """Columns no lookup indexes should stay in Arrow until a row is returned."""
+        pa = pytest.importorskip("pyarrow")
+        from src.services.rates_replica import RatesReplica
+
+        client = MagicMock()
+        client.query.return_value.to_arrow.return_value = pa.table(RATES)
+        tables = {name: name for name in ("hotel_rates", "hotel_media", "flight_prices")}
+
+        RatesReplica("p.d", tables, tmp_path).refresh(client)
+        snapshot = RatesReplica("p.d", tables, tmp_path).snapshot(client)
+
+        assert "total_7nights_child" not in snapshot.rates.values
+        assert snapshot.rate_prices(["R1"])["R1"]["total_7nights_child"] == 22000
+        assert snapshot.get_rate("R2")["check_in_date"] == date(2025, 3, 8)
+        assert not list(tmp_path.glob("*.tmp"))
+
+
+class TestBigQueryToolReplica:
+    """Tests for BigQueryTool serving lookups from the replica."""
+
+    def test_lookups_skip_bigquery(self, mock_config, snapshot):
+        """With a snapshot available, BigQueryTool should not run queries."""
+        replica = MagicMock()
+        replica.snapshot.return_value = snapshot
+
+        with patch('src.tools.bigquery_tool.bigquery') as mock_bq, \
+                patch('src.tools.bigquery_tool.get_rates_replica', return_value=replica):
+            client = MagicMock()
+            mock_bq.Client.return_value = client
+            mock_config.get_destination_search_terms.return_value = ["Zanzibar"]
+
+            from src.tools.bigquery_tool import BigQueryTool
+            bq = BigQueryTool(mock_config)
+            hotels = bq.find_matching_hotels("Zanzibar", "2025-03-08", "2025-03-15", 7, 2)
+            price = bq.calculate_quote_price("R1", adults=2)
+            flight = bq.get_flight_price("Zanzibar", "2025-03-01")
+
+        assert [h["rate_id"] for h in hotels] == ["R2", "R3", "R1"]
+        assert price["totals"]["grand_total"] == 90000
+        assert flight == 8500
+        client.query.assert_not_called()
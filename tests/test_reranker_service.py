@@ -606,3 +606,108 @@ class TestModelInitializationDetails:
 
         r2 = get_reranker()
         assert module._reranker is r2
+
+
+class TestRerankCache:
+    """Tests for the (query, chunk) score cache."""
+
+    def test_cached_scores_skip_the_model(self):
+        """A repeated query over the same chunks should not call the model again."""
+        from src.services.reranker_service import ReRankerService
+
+        ReRankerService._instance = None
+        service = ReRankerService()
+        service.model = MagicMock()
+        service.model.predict.return_value = [0.2, 0.7]
+
+        service.rerank("beach hotels", [{"content": "a", "chunk_id": "1"}, {"content": "b", "chunk_id": "2"}])
+        service.model.predict.return_value = [0.9]
+        result = service.rerank("beach  hotels", [{"content": "b", "chunk_id": "2"}, {"content": "c", "chunk_id": "3"}])
+
+        assert service.model.predict.call_count == 2
+        assert service.model.predict.call_args[0][0] == [("beach  hotels", "c")]
+        assert [doc["rerank_score"] for doc in result] == [0.9, 0.7]
+        assert service.get_status()["cache_hit_rate"] == 0.25
+
+    def test_changed_content_is_rescored(self):
+        """The same chunk id with different content should miss the cache."""
+        from src.services.reranker_service import ReRankerService
+
+        ReRankerService._instance = None
+        service = ReRankerService()
+        service.model = MagicMock()
+        service.model.predict.return_value = [0.5]
+
+        service.rerank("query", [{"content": "old", "chunk_id": "1"}])
+        service.rerank("query", [{"content": "new", "chunk_id": "1"}])
+
+        assert service.model.predict.call_count == 2
+
+    def test_lru_eviction(self):
+        """The least recently used score should be evicted first."""
+        from src.services.reranker_service import ReRankerService
+
+        ReRankerService._instance = None
+        service = ReRankerService()
+
+        with patch('src.services.reranker_service.RERANKER_CACHE_SIZE', 2):
+            service._cache_put(("q", "a"), 0.1)
+            service._cache_put(("q", "b"), 0.2)
+            service._cache_get(("q", "a"))
+            service._cache_put(("q", "c"), 0.3)
+
+        assert list(service._cache) == [("q", "a"), ("q", "c")]
+
+
+class TestRerankBatching:
+    """Tests for the coalescing worker."""
+
+    def test_concurrent_requests_share_a_batch(self):
+        """Requests queued together should be scored in one model call and split back."""
+        from concurrent.futures import Future
+        from src.services.reranker_service import ReRankerService
+
+        ReRankerService._instance = None
+        service = ReRankerService()
+        service.model = MagicMock()
+        service.model.predict.side_effect = lambda pairs, **kwargs: [float(len(doc)) for _, doc in pairs]
+
+        futures = []
+        for docs in (["a", "bb"], ["ccc"]):
+            future = Future()
+            service._requests.put(([("q", d) for d in docs], future))
+            futures.append(future)
+        service._ensure_worker()
+
+        assert futures[0].result(timeout=5) == [1.0, 2.0]
+        assert futures[1].result(timeout=5) == [3.0]
+        assert service.model.predict.call_count == 1
+        assert service.model.predict.call_args[1]["batch_size"] == 32
+
+
+class TestRerankModelLoading:
+    """Tests for ONNX loading and warm-up."""
+
+    def test_onnx_falls_back_to_torch(self):
+        """An ONNX load failure should fall back to the PyTorch model."""
+        from src.services.reranker_service import ReRankerService
+
+        ReRankerService._instance = None
+        service = ReRankerService()
+        cross_encoder = MagicMock(side_effect=[TypeError("unexpected keyword 'backend'"), "torch-model"])
+
+        with patch('src.services.reranker_service.RERANKER_BACKEND', 'onnx'):
+            model = service._load_model(cross_encoder)
+
+        assert model == "torch-model"
+        assert cross_encoder.call_args_list[0][1]["backend"] == "onnx"
+
+    def test_warm_up_can_be_disabled(self):
+        """warm_up_reranker should not load anything when disabled."""
+        from src.services.reranker_service import warm_up_reranker
+
+        with patch('src.services.reranker_service.RERANKER_WARMUP', False), \
+                patch('src.services.reranker_service.get_reranker') as mock_get:
+            assert warm_up_reranker() is False
+
+        mock_get.assert_not_called()
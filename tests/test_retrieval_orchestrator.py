@@ -0,0 +1,177 @@
+"""
+Retrieval Orchestrator Unit Tests
+
+Tests for concurrent retrieval with per-source deadlines, and its use in
+the helpdesk and UnifiedRAGService.
+"""
+
+import time
+import asyncio
+import contextvars
+import pytest
+from unittest.mock import MagicMock, patch
+
+
+@pytest.fixture
+def orchestrator():
+    from src.services.retrieval_orchestrator import RetrievalOrchestrator
+
+    orch = RetrievalOrchestrator(max_workers=4)
+    yield orch
+    orch.shutdown()
+
+
+def _slow(value, seconds):
+    def fn():
+        time.sleep(seconds)
+        return value
+    return fn
+
+
+class TestRun:
+    """Tests for the synchronous fan-out."""
+
+    def test_sources_run_concurrently(self, orchestrator):
+        """Latency should be the slowest source, not the sum."""
+        start = time.monotonic()
+        outcomes = orchestrator.run({"a": _slow(1, 0.2), "b": _slow(2, 0.2)})
+        elapsed = time.monotonic() - start
+
+        assert outcomes["a"].result == 1 and outcomes["b"].result == 2
+        assert elapsed < 0.35
+
+    def test_missed_deadline_returns_partial_results(self, orchestrator):
+        """A slow source should time out without holding back the others."""
+        start = time.monotonic()
+        outcomes = orchestrator.run(
+            {"fast": _slow("ok", 0), "slow": _slow("late", 1)},
+            deadlines={"fast": 1, "slow": 0.1}
+        )
+
+        assert outcomes["fast"].value() == "ok"
+        assert outcomes["slow"].status == "timeout"
+        assert outcomes["slow"].value([]) == []
+        assert time.monotonic() - start < 0.5
+
+    def test_errors_are_captured(self, orchestrator):
+        """A failing source should be reported, not raised."""
+        def boom():
+            raise RuntimeError("backend down")
+
+        outcomes = orchestrator.run({"bad": boom, "good": _slow(1, 0)})
+
+        assert outcomes["bad"].status == "error"
+        assert outcomes["bad"].error == "backend down"
+        assert outcomes["good"].ok
+
+    def test_context_is_propagated(self, orchestrator):
+        """Sources should see the caller's context variables."""
+        request_id = contextvars.ContextVar("request_id", default=None)
+        request_id.set("req-1")
+
+        outcomes = orchestrator.run({"a": request_id.get})
+
+        assert outcomes["a"].result == "req-1"
+
+
+class TestGather:
+    """Tests for the async fan-out."""
+
+    async def test_mixes_coroutines_and_blocking_callables(self, orchestrator):
+        """Coroutines are awaited and callables offloaded, concurrently."""
+        async def remote():
+            await asyncio.sleep(0.2)
+            return "global"
+
+        start = time.monotonic()
+        outcomes = await orchestrator.gather({"global": remote(), "local": _slow("local", 0.2)})
+
+        assert outcomes["global"].result == "global"
+        assert outcomes["local"].result == "local"
+        assert time.monotonic() - start < 0.35
+
+    async def test_deadline(self, orchestrator):
+        """A coroutine that misses its deadline should time out."""
+        async def hang():
+            await asyncio.sleep(5)
+
+        outcomes = await orchestrator.gather({"global": hang()}, deadlines={"global": 0.05})
+
+        assert outcomes["global"].status == "timeout"
+
+    async def test_offload_does_not_block_the_loop(self, orchestrator):
+        """Offloaded work should leave the event loop free."""
+        ticks = []
+
+        async def ticker():
+            for _ in range(5):
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.02)
+
+        await asyncio.gather(orchestrator.offload(time.sleep, 0.15), ticker())
+
+        assert len(ticks) == 5
+
+
+class TestUnifiedRAGService:
+    """Tests for UnifiedRAGService.search on the orchestrator."""
+
+    async def test_global_only_search(self):
+        """Excluding local search should return the global answer."""
+        from src.services.unified_rag_service import UnifiedRAGService
+
+        client = MagicMock()
+
+        async def search(query, top_k):
+            return ("Zanzibar needs a visa", 0.9, [{"content": "visa"}], 0.8)
+
+        client.search = search
+        service = UnifiedRAGService(local_service=None, global_client=client)
+
+        response = await service.search("visa?", tenant_id="t1", include_local=False)
+
+        assert response.answer == "Zanzibar needs a visa"
+        assert response.timed_out == []
+
+    async def test_slow_global_returns_local_results(self):
+        """A global search past its deadline should leave local results."""
+        from src.services.unified_rag_service import LocalKnowledgeService, UnifiedRAGService
+
+        manager = MagicMock()
+        manager.search.return_value = [{"content": "Our rates", "score": 0.7, "document_id": "DOC-1"}]
+        manager.vector_search.return_value = []
+        client = MagicMock()
+
+        async def search(query, top_k):
+            await asyncio.sleep(5)
+
+        client.search = search
+        service = UnifiedRAGService(local_service=LocalKnowledgeService(manager), global_client=client)
+
+        with patch.dict("src.services.retrieval_orchestrator.DEFAULT_DEADLINES", {"global": 0.05}):
+            response = await service.search("rates", tenant_id="t1")
+
+        assert response.timed_out == ["global"]
+        assert [c["content"] for c in response.citations] == ["Our rates"]
+
+
+class TestDualKnowledgeBaseSearch:
+    """Tests for the helpdesk dual-KB search on the orchestrator."""
+
+    def test_slow_global_kb_returns_private_results(self, mock_config):
+        """Private results should come back when the global KB misses its deadline."""
+        from src.api.helpdesk_routes import search_dual_knowledge_base
+
+        def slow_global(*args, **kwargs):
+            time.sleep(1)
+            return {"success": True, "answer": "late", "citations": []}
+
+        with patch('src.api.helpdesk_routes.search_travel_platform_rag', side_effect=slow_global), \
+                patch('src.api.helpdesk_routes.search_private_knowledge_base',
+                      return_value=[{"content": "P1", "score": 0.7, "source_type": "private_kb"}]), \
+                patch.dict("src.services.retrieval_orchestrator.DEFAULT_DEADLINES", {"global": 0.1}):
+            result = search_dual_knowledge_base(mock_config, "test")
+
+        assert result["timed_out"] == ["global"]
+        assert result["answer"] == ""
+        assert result["sources_breakdown"]["private"] == 1
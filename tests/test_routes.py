@@ -5,7 +5,7 @@ Tests for Pydantic models, dependencies, and endpoint structure in routes.py.
 """
 
 import pytest
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 from pydantic import ValidationError
 from fastapi.testclient import TestClient
 
@@ -605,16 +605,17 @@ class TestGenerateQuoteUnit:
         config.currency = "USD"
         return config
 
-    def test_generate_quote_success(self, mock_config):
+    @pytest.mark.asyncio
+    async def test_generate_quote_success(self, mock_config):
         """generate_quote should return quote result."""
         from src.api.routes import generate_quote, QuoteGenerateRequest, TravelInquiry
 
         mock_agent = MagicMock()
-        mock_agent.generate_quote.return_value = {
+        mock_agent.generate_quote_async = AsyncMock(return_value={
             'success': True,
             'quote_id': 'quote-123',
             'total': 5000
-        }
+        })
 
         request = QuoteGenerateRequest(
             inquiry=TravelInquiry(
@@ -625,18 +626,20 @@ class TestGenerateQuoteUnit:
         )
 
         with patch('src.api.routes.get_quote_agent', return_value=mock_agent):
-            result = generate_quote(request=request, config=mock_config)
+            result = await generate_quote(request=request, config=mock_config)
 
         assert result['success'] is True
         assert result['quote_id'] == 'quote-123'
+        assert mock_agent.generate_quote_async.await_args.kwargs['deliver_async'] is True
 
-    def test_generate_quote_error(self, mock_config):
+    @pytest.mark.asyncio
+    async def test_generate_quote_error(self, mock_config):
         """generate_quote should handle errors."""
         from src.api.routes import generate_quote, QuoteGenerateRequest, TravelInquiry
         from fastapi import HTTPException
 
         mock_agent = MagicMock()
-        mock_agent.generate_quote.side_effect = Exception("Quote generation failed")
+        mock_agent.generate_quote_async = AsyncMock(side_effect=Exception("Quote generation failed"))
 
         request = QuoteGenerateRequest(
             inquiry=TravelInquiry(
@@ -648,7 +651,7 @@ class TestGenerateQuoteUnit:
 
         with patch('src.api.routes.get_quote_agent', return_value=mock_agent):
             with pytest.raises(HTTPException) as exc_info:
-                generate_quote(request=request, config=mock_config)
+                await generate_quote(request=request, config=mock_config)
 
             assert exc_info.value.status_code == 500
 
@@ -861,18 +864,19 @@ class TestListInvoicesUnit:
         config.client_id = "test-tenant"
         return config
 
-    def test_list_invoices_success(self, mock_config):
+    async def test_list_invoices_success(self, mock_config):
         """list_invoices should return list of invoices."""
         from src.api.routes import list_invoices
 
         mock_supabase = MagicMock()
+        mock_supabase.list_invoices = AsyncMock()
         mock_supabase.list_invoices.return_value = [
             {'invoice_id': 'inv-1', 'status': 'pending'},
             {'invoice_id': 'inv-2', 'status': 'paid'}
         ]
 
-        with patch('src.tools.supabase_tool.SupabaseTool', return_value=mock_supabase):
-            result = list_invoices(
+        with patch('src.tools.async_supabase_tool.AsyncSupabaseTool.create', new=AsyncMock(return_value=mock_supabase)):
+            result = await list_invoices(
                 status=None,
                 limit=50,
                 offset=0,
@@ -892,34 +896,36 @@ class TestGetInvoiceUnit:
         config.client_id = "test-tenant"
         return config
 
-    def test_get_invoice_success(self, mock_config):
+    async def test_get_invoice_success(self, mock_config):
         """get_invoice should return invoice by ID."""
         from src.api.routes import get_invoice
 
         mock_supabase = MagicMock()
+        mock_supabase.get_invoice = AsyncMock()
         mock_supabase.get_invoice.return_value = {
             'invoice_id': 'inv-1',
             'customer_name': 'John',
             'total_amount': 1000
         }
 
-        with patch('src.tools.supabase_tool.SupabaseTool', return_value=mock_supabase):
-            result = get_invoice(invoice_id="inv-1", config=mock_config)
+        with patch('src.tools.async_supabase_tool.AsyncSupabaseTool.create', new=AsyncMock(return_value=mock_supabase)):
+            result = await get_invoice(invoice_id="inv-1", config=mock_config)
 
         assert result['success'] is True
         assert result['data']['invoice_id'] == 'inv-1'
 
-    def test_get_invoice_not_found(self, mock_config):
+    async def test_get_invoice_not_found(self, mock_config):
         """get_invoice should raise 404 when not found."""
         from src.api.routes import get_invoice
         from fastapi import HTTPException
 
         mock_supabase = MagicMock()
+        mock_supabase.get_invoice = AsyncMock()
         mock_supabase.get_invoice.return_value = None
 
-        with patch('src.tools.supabase_tool.SupabaseTool', return_value=mock_supabase):
+        with patch('src.tools.async_supabase_tool.AsyncSupabaseTool.create', new=AsyncMock(return_value=mock_supabase)):
             with pytest.raises(HTTPException) as exc_info:
-                get_invoice(invoice_id="notfound", config=mock_config)
+                await get_invoice(invoice_id="notfound", config=mock_config)
 
             assert exc_info.value.status_code == 404
 
@@ -0,0 +1,151 @@
+"""
+Search Cache Unit Tests
+
+Tests for the single-flight, stale-while-revalidate search cache and its
+use by TravelPlatformRatesClient.
+"""
+
+import asyncio
+from datetime import date
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    from src.services.search_cache import SearchCache
+
+    monkeypatch.delenv("REDIS_URL", raising=False)
+    return SearchCache("hotels", ttl=60, stale_ttl=60)
+
+
+RESULT = {"success": True, "hotels": [{"name": "Zuri", "total_price": 1500}]}
+
+
+class TestSearchKey:
+    """Tests for key normalization."""
+
+    def test_case_whitespace_and_date_types(self):
+        """Equivalent destinations and dates should share a key."""
+        from src.services.search_cache import search_key
+
+        a = search_key("hotels", destination="Zanzibar ", check_in=date(2025, 3, 1), adults=2)
+        b = search_key("hotels", adults=2, check_in="2025-03-01", destination="zanzibar")
+
+        assert a == b
+
+    def test_occupancy_changes_key(self):
+        """Different occupancy should not share a key."""
+        from src.services.search_cache import search_key
+
+        assert search_key("hotels", destination="zanzibar", adults=2) != search_key("hotels", destination="zanzibar", adults=3)
+
+
+class TestSearchCache:
+    """Tests for single-flight, TTL and stale-while-revalidate behaviour."""
+
+    async def test_concurrent_requests_share_one_fetch(self, cache):
+        """Concurrent callers for the same key should trigger a single fetch."""
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return RESULT
+
+        results = await asyncio.gather(*(cache.get_or_fetch("k", fetch) for _ in range(10)))
+
+        assert calls == 1
+        assert all(r == RESULT for r in results)
+        assert cache.get_stats()["coalesced"] == 9
+
+    async def test_hits_are_independent_copies(self, cache):
+        """Mutating a returned result should not change the cached one."""
+        first = await cache.get_or_fetch("k", AsyncMock(return_value=RESULT))
+        first["hotels"][0]["total_price"] = 0
+
+        second = await cache.get_or_fetch("k", AsyncMock())
+
+        assert second["hotels"][0]["total_price"] == 1500
+
+    async def test_failures_are_not_cached(self, cache):
+        """An unsuccessful search should be retried on the next call."""
+        fetch = AsyncMock(return_value={"success": False, "error": "timeout"})
+
+        await cache.get_or_fetch("k", fetch)
+        await cache.get_or_fetch("k", fetch)
+
+        assert fetch.await_count == 2
+
+    async def test_stale_entry_served_while_refreshing(self, cache):
+        """An expired entry should be returned at once and refreshed in the background."""
+        fresh = {"success": True, "hotels": [{"name": "Zuri", "total_price": 1400}]}
+        await cache.get_or_fetch("k", AsyncMock(return_value=RESULT))
+        cache._entries["k"] = (cache._entries["k"][0] - 90, cache._entries["k"][1])
+
+        stale = await cache.get_or_fetch("k", AsyncMock(return_value=fresh))
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        refreshed = await cache.get_or_fetch("k", AsyncMock())
+
+        assert stale == RESULT
+        assert refreshed == fresh
+        assert cache.get_stats()["refreshes"] == 1
+
+    async def test_expired_entry_fetched_again(self, cache):
+        """An entry past the stale window should be fetched synchronously."""
+        fresh = {"success": True, "hotels": []}
+        await cache.get_or_fetch("k", AsyncMock(return_value=RESULT))
+        cache._entries["k"] = (cache._entries["k"][0] - 200, cache._entries["k"][1])
+
+        assert await cache.get_or_fetch("k", AsyncMock(return_value=fresh)) == fresh
+
+    async def test_redis_connects_off_the_event_loop(self, cache, monkeypatch):
+        """The first lookup should connect to and ping Redis in a worker thread."""
+        import threading
+
+        monkeypatch.setenv("REDIS_URL", "redis://localhost:6379")
+        ping_threads = []
+        client = MagicMock()
+        client.ping.side_effect = lambda: ping_threads.append(threading.get_ident())
+        client.get.return_value = None
+
+        with patch("redis.from_url", return_value=client):
+            assert await cache.get_or_fetch("k", AsyncMock(return_value=RESULT)) == RESULT
+
+        assert len(ping_threads) == 1
+        assert ping_threads[0] != threading.get_ident()
+        client.setex.assert_called_once()
+
+
+class TestRatesClientCaching:
+    """Tests for cached searches on TravelPlatformRatesClient."""
+
+    async def test_repeated_hotel_search_hits_engine_once(self, monkeypatch):
+        """Equivalent aggregated hotel searches should make one upstream call."""
+        from src.services.travel_platform_rates_client import TravelPlatformRatesClient
+
+        monkeypatch.delenv("REDIS_URL", raising=False)
+        client = TravelPlatformRatesClient()
+        response = MagicMock()
+        response.status_code = 200
+        response.json.return_value = RESULT
+
+        with patch('src.services.travel_platform_rates_client.rates_circuit') as circuit, \
+                patch('httpx.AsyncClient') as mock_client_class:
+            circuit.can_execute.return_value = True
+            http = AsyncMock()
+            http.get.return_value = response
+            mock_client_class.return_value = http
+
+            first, second = await asyncio.gather(
+                client.search_hotels_aggregated("Zanzibar", date(2025, 3, 1), date(2025, 3, 5)),
+                client.search_hotels_aggregated(" zanzibar", date(2025, 3, 1), date(2025, 3, 5), adults=2),
+            )
+            await client.search_hotels_aggregated("zanzibar", date(2025, 3, 1), date(2025, 3, 5))
+            await client.search_hotels_aggregated("zanzibar", date(2025, 3, 1), date(2025, 3, 5), adults=3)
+
+        assert http.get.await_count == 2
+        assert first["hotels"] == second["hotels"]
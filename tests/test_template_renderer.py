@@ -38,6 +38,16 @@ class TestTemplateRendererInit:
 
         assert renderer.env is not None
 
+    def test_renderers_share_compiled_templates(self, mock_config):
+        """Every renderer should use the shared environment, so a template compiles once."""
+        from src.utils.template_renderer import TemplateRenderer, get_template_environment
+
+        first = TemplateRenderer(mock_config)
+        second = TemplateRenderer(mock_config)
+
+        assert first.env is second.env is get_template_environment()
+        assert second.env.get_template("pdf/quote.html") is first.env.get_template("pdf/quote.html")
+
     def test_init_builds_base_context(self, mock_config):
         """Should build base context with client info."""
         from src.utils.template_renderer import TemplateRenderer
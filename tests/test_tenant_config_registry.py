@@ -0,0 +1,216 @@
+"""
+Tenant Config Registry Unit Tests
+
+Tests for the shared tenant config snapshots: loading, fallbacks,
+versioned change handling and broadcast to other instances.
+"""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+
+def make_registry(loader=None, **kwargs):
+    from src.services.tenant_config_registry import TenantConfigRegistry
+
+    return TenantConfigRegistry(configs={}, loader=loader or MagicMock(side_effect=lambda t: {"id": t}), **kwargs)
+
+
+class TestSnapshots:
+    """Tests for reading snapshots."""
+
+    def test_loaded_once_then_served_from_memory(self):
+        """The first read loads the tenant; later reads return the same snapshot."""
+        loader = MagicMock(side_effect=lambda t: {"id": t})
+        registry = make_registry(loader)
+
+        first = registry.get("t1")
+        second = registry.get("t1")
+
+        assert first is second
+        loader.assert_called_once_with("t1")
+        assert registry.configs["t1"] is first
+
+    def test_load_error_raised_without_fallback(self):
+        """Without a fallback the loader's error reaches the caller."""
+        registry = make_registry(MagicMock(side_effect=FileNotFoundError("missing")))
+
+        with pytest.raises(FileNotFoundError):
+            registry.get("missing")
+
+    def test_fallback_cached_until_miss_ttl(self):
+        """An unloadable tenant gets a fallback, retried only after miss_ttl."""
+        loader = MagicMock(side_effect=FileNotFoundError("missing"))
+        registry = make_registry(loader, miss_ttl=30)
+        fallback = MagicMock(side_effect=lambda t: f"fallback:{t}")
+
+        assert registry.get("t1", fallback=fallback) == "fallback:t1"
+        assert registry.get("t1", fallback=fallback) == "fallback:t1"
+        assert loader.call_count == 1
+        assert "t1" not in registry.configs
+
+        with patch("src.services.tenant_config_registry.time.monotonic", return_value=10 ** 9):
+            registry.get("t1", fallback=fallback)
+        assert loader.call_count == 2
+
+
+class TestChanges:
+    """Tests for versioned invalidation."""
+
+    def test_drop_forces_reload_and_notifies(self):
+        """Dropping a tenant reloads it on the next read and tells listeners."""
+        from src.services import tenant_config_registry
+
+        registry = make_registry()
+        registry.get("t1")
+        listener = MagicMock()
+        with patch.object(tenant_config_registry, "_listeners", [listener]):
+            registry.drop("t1", version=3)
+
+        assert "t1" not in registry.configs
+        listener.assert_called_once_with("t1")
+        assert registry._versions["t1"] == 3
+
+    def test_older_version_ignored(self):
+        """A broadcast not newer than the snapshot's version changes nothing."""
+        registry = make_registry()
+        registry.drop("t1", version=5)
+        snapshot = registry.get("t1")
+
+        registry.apply_change("t1", 4)
+        registry.apply_change("t1", 5)
+
+        assert registry.configs["t1"] is snapshot
+
+    def test_newer_version_swaps_snapshot(self):
+        """A newer version is loaded and replaces the snapshot as a whole."""
+        versions = iter(["old", "new"])
+        registry = make_registry(MagicMock(side_effect=lambda t: {"branding": next(versions)}))
+        old = registry.get("t1")
+
+        with patch.object(registry, "_schedule_refresh", side_effect=registry.refresh) as schedule:
+            registry.apply_change("t1", 1)
+
+        schedule.assert_called_once_with("t1")
+        assert old == {"branding": "old"}
+        assert registry.configs["t1"] == {"branding": "new"}
+        assert registry._snapshot_versions["t1"] == 1
+
+    def test_failed_refresh_keeps_snapshot(self):
+        """If a reload fails the current snapshot keeps being served."""
+        loader = MagicMock(side_effect=[{"id": "t1"}, ConnectionError("db down")])
+        registry = make_registry(loader)
+        snapshot = registry.get("t1")
+
+        assert registry.refresh("t1") is False
+        assert registry.configs["t1"] is snapshot
+
+    def test_stale_tenants_after_ttl(self):
+        """Snapshots older than the TTL are due for a background reload."""
+        registry = make_registry(ttl=300)
+        registry.get("t1")
+
+        assert registry.stale_tenants() == []
+        with patch("src.services.tenant_config_registry.time.monotonic", return_value=10 ** 9):
+            assert registry.stale_tenants() == ["t1"]
+
+
+class TestWarmUp:
+    """Tests for the one-query bulk load and startup warm-up."""
+
+    def test_load_all_stores_every_snapshot(self):
+        """One bulk query fills the snapshots; later reads never hit the loader."""
+        service = MagicMock()
+        service.load_all_configs.return_value = {"t1": {"id": "t1"}, "t2": {"id": "t2"}}
+        registry = make_registry(builder=lambda t, c: dict(c, built=True))
+
+        with patch("config.loader.get_config_service", return_value=service):
+            assert registry.load_all() == ["t1", "t2"]
+            assert registry.list_tenants() == ["t1", "t2"]
+
+        service.load_all_configs.assert_called_once_with(active_only=True)
+        assert registry.get("t2") == {"id": "t2", "built": True}
+        registry.loader.assert_not_called()
+
+    def test_change_during_bulk_load_not_overwritten(self):
+        """A tenant changed while the bulk query ran is left to reload on its next read."""
+        registry = make_registry(builder=lambda t, c: c)
+        service = MagicMock()
+
+        def load_all_configs(active_only):
+            registry.drop("t1", version=2)
+            return {"t1": {"id": "stale"}, "t2": {"id": "t2"}}
+
+        service.load_all_configs.side_effect = load_all_configs
+        with patch("config.loader.get_config_service", return_value=service):
+            registry.load_all()
+
+        assert "t1" not in registry.configs
+        assert "t2" in registry.configs
+
+    def test_warm_state_gates_readiness(self):
+        """Readiness is held back while warming, and released even if warm-up fails."""
+        from src.services import tenant_config_registry
+
+        registry = tenant_config_registry.get_tenant_config_registry()
+        assert registry.warm_state == "not_started"
+
+        states = []
+        with patch.object(registry, "load_all", side_effect=lambda: states.append(registry.warm_state)):
+            assert tenant_config_registry.warm_up_tenant_configs() is False
+        assert states == ["warming"]
+        assert registry.warm_state == "failed"
+
+        with patch.object(registry, "load_all", return_value=[]), \
+                patch.object(tenant_config_registry, "_open_supabase_clients", return_value=0):
+            assert tenant_config_registry.warm_up_tenant_configs() is True
+        assert registry.warm_state == "ready"
+        assert tenant_config_registry.is_tenant_config_warming() is False
+
+
+class TestPublish:
+    """Tests for publish_tenant_config_change."""
+
+    def test_publish_drops_shared_snapshot(self):
+        """Both config.loader and get_client_config stop serving the old snapshot."""
+        from config.loader import _config_cache
+        from src.api.dependencies import _client_configs
+        from src.services.tenant_config_registry import get_tenant_config_registry, publish_tenant_config_change
+
+        registry = get_tenant_config_registry()
+        with patch.object(registry, "loader", side_effect=lambda t: MagicMock(client_id=t)):
+            registry.get("t1")
+        assert _client_configs is _config_cache is registry.configs
+
+        with patch("src.services.tenant_config_registry._clear_service_cache"):
+            publish_tenant_config_change("t1")
+
+        assert "t1" not in _config_cache
+
+    def test_broadcast_when_redis_configured(self):
+        """With Redis the change is published with a cluster-wide version."""
+        from src.services import tenant_config_registry
+
+        redis_client = MagicMock()
+        redis_client.incr.return_value = 7
+        with patch.object(tenant_config_registry, "_get_redis_client", return_value=redis_client), \
+                patch.object(tenant_config_registry, "_clear_service_cache") as clear_service_cache, \
+                patch("config.loader._config_cache", {}):
+            tenant_config_registry.publish_tenant_config_change("t1")
+
+        clear_service_cache.assert_called_once_with("t1")
+        channel, message = redis_client.publish.call_args[0]
+        assert channel == tenant_config_registry.CHANGE_CHANNEL
+        assert json.loads(message) == {"tenant_id": "t1", "version": 7, "origin": tenant_config_registry.INSTANCE_ID}
+
+    def test_email_mapping_rebuilt_after_change(self):
+        """The email webhook's address mapping is rebuilt after a tenant changes."""
+        from src.webhooks import email_webhook
+        from src.services.tenant_config_registry import get_tenant_config_registry
+
+        email_webhook._tenant_email_cache.update({"data": {"a@t1.com": {"tenant_id": "t1"}}, "timestamp": 1e12})
+        get_tenant_config_registry().drop("t1")
+
+        assert "timestamp" not in email_webhook._tenant_email_cache
+        email_webhook._tenant_email_cache.clear()
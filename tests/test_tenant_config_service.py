@@ -408,6 +408,38 @@ class TestDatabaseLoadBehavior:
             assert result is None
 
 
+class TestBulkLoad:
+    """Test load_all_configs (startup warm-up)"""
+
+    def test_one_query_for_all_active_tenants(self):
+        """All active tenants are loaded and cached with a single query"""
+        service = TenantConfigService()
+
+        mock_supabase = MagicMock()
+        mock_query = mock_supabase.table.return_value.select.return_value
+        mock_query.eq.return_value.execute.return_value = MagicMock(data=[{'id': 'tenant_a'}, {'id': 'tenant_b'}])
+
+        with patch.object(service, '_get_supabase_client', return_value=mock_supabase), \
+                patch.object(service, '_build_config', side_effect=lambda row: {'client': {'id': row['id']}}), \
+                patch.object(service, '_set_cache_many') as mock_cache:
+            result = service.load_all_configs()
+
+        mock_supabase.table.assert_called_once_with("tenants")
+        mock_query.eq.assert_called_once_with("status", "active")
+        assert list(result) == ['tenant_a', 'tenant_b']
+        mock_cache.assert_called_once_with(result)
+
+    def test_returns_none_on_db_error(self):
+        """A failed query returns None so callers fall back to per-tenant loading"""
+        service = TenantConfigService()
+
+        mock_supabase = MagicMock()
+        mock_supabase.table.return_value.select.return_value.eq.return_value.execute.side_effect = Exception("DB error")
+
+        with patch.object(service, '_get_supabase_client', return_value=mock_supabase):
+            assert service.load_all_configs() is None
+
+
 # ==================================================================
 # NEW TESTS: _build_config / _build_client_info / _build_branding
 # ==================================================================
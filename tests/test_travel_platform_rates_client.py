@@ -500,6 +500,58 @@ class TestGetStatus:
         assert status["last_error"] == "Test error"
 
 
+# ==================== Connection Pool Tests ====================
+
+class TestConnectionPool:
+    """Tests for the shared pooled HTTP client."""
+
+    @pytest.mark.asyncio
+    async def test_client_reused_across_calls(self):
+        """Consecutive calls should share one client and its connections."""
+        from src.services.travel_platform_rates_client import TravelPlatformRatesClient
+
+        client = TravelPlatformRatesClient()
+        with patch('httpx.AsyncHTTPTransport.handle_async_request',
+                   new=AsyncMock(return_value=httpx.Response(200, json={"status": "healthy"}))):
+            await client.is_available()
+            first = client._http
+            await client.is_available()
+
+        assert client._http is first
+        stats = client.get_status()["pool"]
+        assert stats["clients_created"] == 1
+        assert stats["requests"] == 2
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_close_releases_client(self):
+        """close() should close the pool; the next call opens a new one."""
+        from src.services.travel_platform_rates_client import (
+            TravelPlatformRatesClient, close_travel_platform_rates_client
+        )
+
+        client = TravelPlatformRatesClient()
+        http = client._get_http_client()
+
+        await close_travel_platform_rates_client()
+
+        assert http.is_closed
+        assert client._http is None
+        assert client._get_http_client() is not http
+        await client.close()
+
+    def test_per_endpoint_timeout_override(self, monkeypatch):
+        """RATES_ENGINE_TIMEOUT_<ENDPOINT> should override one endpoint only."""
+        from src.services.travel_platform_rates_client import TravelPlatformRatesClient
+
+        monkeypatch.setenv("RATES_ENGINE_TIMEOUT_TRANSFERS", "20")
+        client = TravelPlatformRatesClient()
+
+        assert client._timeout("transfers").read == 20.0
+        assert client._timeout("activities").read == 60.0
+        assert client._timeout("hotels").read == client.timeout
+
+
 # ==================== Error Response Tests ====================
 
 class TestErrorResponse:
@@ -1161,5 +1213,6 @@ class TestHealthCheckEndpoint:
 
             await client.is_available()
 
-            call_kwargs = mock_client.get.call_args
-            assert call_kwargs.kwargs.get('timeout') == 10.0 or call_kwargs[1].get('timeout') == 10.0
+            timeout = mock_client.get.call_args.kwargs['timeout']
+            assert timeout.read == 10.0
+            assert timeout.connect == 5.0